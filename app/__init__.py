@@ -13,6 +13,11 @@ def create_app():
     app.config['DEBUG'] = os.getenv('FLASK_DEBUG', '1') == '1'
     app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max
     
+    # Serialización JSON (orjson si está instalado) y compresión de respuestas
+    from app.serialization import FastJSONProvider, init_compression
+    app.json = FastJSONProvider(app)
+    init_compression(app)
+    
     # Registrar blueprints
     from app.routes import main_bp, algorithms_bp
     app.register_blueprint(main_bp)
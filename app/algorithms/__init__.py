@@ -1,6 +1,8 @@
 from app.algorithms.base import AlgorithmBase
-from app.algorithms.sorting import BubbleSort, MergeSort, QuickSort, HeapSort
+from app.algorithms.sorting import BubbleSort, MergeSort, QuickSort, HeapSort, RadixSort, ExternalMergeSort, \
+    ParallelMergeSort, SampleSort, AdaptiveSort
 from app.algorithms.search import LinearSearch, BinarySearch
+from app.algorithms.selection import QuickSelect, PartialSort, HeapTopK
 
 # Registro de todos los algoritmos disponibles
 AVAILABLE_ALGORITHMS = {
@@ -8,6 +10,14 @@ AVAILABLE_ALGORITHMS = {
     'merge_sort': MergeSort(),
     'quick_sort': QuickSort(),
     'heap_sort': HeapSort(),
+    'radix_sort': RadixSort(),
+    'external_merge_sort': ExternalMergeSort(),
+    'parallel_merge_sort': ParallelMergeSort(),
+    'sample_sort': SampleSort(),
+    'auto': AdaptiveSort(),
+    'quickselect': QuickSelect(),
+    'partial_sort': PartialSort(),
+    'heap_top_k': HeapTopK(),
     'linear_search': LinearSearch(),
     'binary_search': BinarySearch(),
 }
@@ -1,30 +1,97 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import base64
+import copy
+import functools
+import math
 import time
-import tracemalloc
+from app.algorithms.memory import MEASUREMENT_SKIPPED, MemoryMeasurement, tracking_run
+from app.algorithms.trace import TRACE_NONE, TraceRecorder, TraceReplayer, default_trace_mode
+from app.algorithms.trace_codec import TRACE_ENCODING, encode_trace
+
+class ExecutionCancelled(Exception):
+    """Se lanza cuando una ejecución se cancela desde fuera (p. ej. un job)"""
+    pass
 
 class AlgorithmResult:
     """Clase para encapsular el resultado de un algoritmo"""
-    def __init__(self, result: Any, metadata: Dict[str, Any] = None):
+    def __init__(self, result: Any, metadata: Dict[str, Any] = None,
+                 steps: Sequence[Dict[str, Any]] = None, initial: List[Any] = None):
         self.result = result
         self.metadata = metadata or {}
+        self.steps = steps if steps is not None else []
+        self.initial = initial
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convierte el resultado a diccionario"""
-        return {
-            'result': self.result,
-            'metadata': self.metadata
-        }
+    def replayer(self) -> TraceReplayer:
+        """Devuelve un reproductor para reconstruir los frames de la traza"""
+        return TraceReplayer(self.initial or [], self.steps)
+    
+    def to_dict(self, include_steps: bool = False, trace_format: str = 'json',
+                include_result: bool = True) -> Dict[str, Any]:
+        """
+        Convierte el resultado a diccionario
+
+        Con trace_format 'binary' los pasos se envían en el formato binario de
+        trace_codec (comprimido y en base64) en 'trace' en lugar de 'steps'.
+        Con include_result=False se omite el resultado (p. ej. la lista
+        ordenada, que repite la entrada) y solo se envían las métricas.
+        """
+        data = {'result': self.result} if include_result else {'result_omitted': True}
+        data['metadata'] = self.metadata
+        if include_steps:
+            if trace_format == 'binary':
+                data['trace'] = base64.b64encode(encode_trace(self.steps)).decode('ascii')
+                data['trace_encoding'] = TRACE_ENCODING
+            else:
+                data['steps'] = list(self.steps)
+        return data
+
+def _per_invocation(method: Callable) -> Callable:
+    """Ejecuta el método sobre una copia propia del algoritmo (ver AlgorithmBase.invocation)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return method(self.invocation(), *args, **kwargs)
+    return wrapper
 
 class AlgorithmBase(ABC):
-    """Clase base abstracta para todos los algoritmos"""
+    """
+    Clase base abstracta para todos los algoritmos
+    
+    Las instancias registradas se comparten entre peticiones y entre hilos.
+    El estado de una ejecución (contadores, traza, métricas propias y evento
+    de cancelación) vive en la copia que devuelve invocation(): los métodos
+    que ejecutan con métricas (run_with_metrics, time_execution,
+    run_batch_with_metrics) trabajan siempre sobre una copia, así dos
+    ejecuciones simultáneas del mismo algoritmo no se mezclan.
+    """
+    
+    # Nombre del motor sin instrumentación usado por execute_fast (None si no tiene)
+    fast_engine: Optional[str] = None
+    
+    # Si es False el algoritmo solo lee la entrada y no se copia antes de ejecutarlo
+    mutates_input: bool = True
+    
+    # Si es True el algoritmo necesita el parámetro 'target' (búsquedas)
+    requires_target: bool = False
+    
+    # Si es True el algoritmo selecciona según el parámetro 'k' en lugar de ordenar todo
+    selection: bool = False
+    
+    # Métricas propias que son tiempos: con dos pasadas se informa el de la pasada limpia
+    timed_metrics: Tuple[str, ...] = ()
+    
+    # True en las copias creadas por invocation()
+    _private: bool = False
     
     def __init__(self, name: str, description: str = ""):
         self.name = name
         self.description = description
         self.comparisons = 0
         self.swaps = 0
-        self.steps = []
+        self.trace = TraceRecorder()
+        self.steps = self.trace.steps
+        self.extra_metrics: Dict[str, Any] = {}  # Métricas propias del algoritmo, se agregan a la metadata
+        self.cancel_event = None  # threading.Event opcional para cancelar la ejecución
     
     @abstractmethod
     def execute(self, data: List[Any], **kwargs) -> Any:
@@ -40,60 +107,279 @@ class AlgorithmBase(ABC):
         """
         pass
     
-    def reset_metrics(self):
+    def execute_fast(self, data: List[Any], **kwargs) -> Any:
+        """
+        Variante sin instrumentación (no cuenta comparaciones ni registra pasos)
+        
+        Por defecto usa la implementación instrumentada; los algoritmos con un
+        motor de producción la sobrescriben.
+        """
+        return self.execute(data, **kwargs)
+    
+    def execute_batch(self, data: List[Any], targets: List[Any], fast: bool = False,
+                      **kwargs) -> List[Any]:
+        """
+        Ejecuta el algoritmo para varios targets sobre los mismos datos
+        
+        Por defecto hace una ejecución por target; las búsquedas la
+        sobrescriben con estrategias que recorren los datos una sola vez.
+        
+        Returns:
+            Lista con el resultado de cada target, en el mismo orden
+        """
+        execute = self.execute_fast if fast else self.execute
+        return [execute(data, target=target, **kwargs) for target in targets]
+    
+    def reset_metrics(self, trace_mode: str = 'full', trace_every: int = 1,
+                      trace_sink: Optional[Callable[[Dict[str, Any]], None]] = None):
         """Reinicia las métricas del algoritmo"""
         self.comparisons = 0
         self.swaps = 0
-        self.steps = []
+        self.trace = TraceRecorder(trace_mode, trace_every, trace_sink)
+        self.steps = self.trace.steps
+        self.extra_metrics = {}
     
-    def run_with_metrics(self, data: List[Any], **kwargs) -> AlgorithmResult:
+    def __getstate__(self) -> Dict[str, Any]:
+        """Al serializar (p. ej. para enviar a otro proceso) no se copia el estado de la última ejecución"""
+        state = self.__dict__.copy()
+        state['comparisons'] = 0
+        state['swaps'] = 0
+        state['trace'] = TraceRecorder()
+        state['steps'] = state['trace'].steps
+        state['extra_metrics'] = {}
+        state['cancel_event'] = None
+        return state
+    
+    def invocation(self, cancel_event=None) -> 'AlgorithmBase':
+        """
+        Copia del algoritmo con estado propio para una ejecución
+        
+        La copia empieza con los contadores en cero. Sobre una copia ya
+        creada devuelve la misma copia (así quien la creó puede seguir sus
+        contadores, p. ej. para el progreso de un job).
+        
+        Args:
+            cancel_event: threading.Event opcional para cancelar la ejecución
+        """
+        if self._private:
+            run = self
+        else:
+            run = copy.copy(self)  # copy usa __getstate__: métricas en cero
+            run._private = True
+        if cancel_event is not None:
+            run.cancel_event = cancel_event
+        return run
+    
+    def estimate_comparisons(self, n: int) -> float:
+        """Número aproximado de comparaciones para una entrada de tamaño n (para estimar progreso)"""
+        return n * math.log2(n) if n > 1 else 1
+    
+    def _check_cancelled(self):
+        """Lanza ExecutionCancelled si se pidió cancelar la ejecución"""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ExecutionCancelled(f"Ejecución de '{self.name}' cancelada")
+    
+    def record_step(self, step: Dict[str, Any]):
+        """Registra un paso que no modifica el array"""
+        self._check_cancelled()
+        self.trace.record(step)
+    
+    def record_change(self, action: str, arr: Sequence[Any], indices: Sequence[int], **extra):
+        """Registra un paso que modifica las posiciones indicadas del array"""
+        self._check_cancelled()
+        self.trace.record_change(action, arr, indices, **extra)
+    
+    def record_segment(self, action: str, arr: Sequence[Any], indices: Sequence[int], **extra):
+        """Registra un paso que reescribe un bloque; en modo full guarda solo el bloque"""
+        self._check_cancelled()
+        self.trace.record_segment(action, arr, indices, **extra)
+    
+    @_per_invocation
+    def time_execution(self, data: List[Any], fast: bool = False, **kwargs) -> Tuple[Any, float]:
+        """
+        Ejecución limpia para medir tiempo: sin tracemalloc ni registro de pasos
+        
+        Args:
+            data: Lista de datos a procesar
+            fast: Usar la variante sin instrumentación (execute_fast)
+            **kwargs: Argumentos adicionales específicos del algoritmo
+        
+        Returns:
+            Tupla (resultado, tiempo en milisegundos)
+        """
+        # Las variantes rápidas no registran pasos: se cancelan entre fases
+        self._check_cancelled()
+        self.reset_metrics(TRACE_NONE)
+        arr = data.copy() if self.mutates_input else data
+        execute = self.execute_fast if fast else self.execute
+        
+        with tracking_run():
+            start_time = time.perf_counter()
+            result = execute(arr, **kwargs)
+            end_time = time.perf_counter()
+        
+        return result, (end_time - start_time) * 1000
+    
+    def _instrumented_execution(self, data: List[Any], trace_mode: str, trace_every: int,
+                                trace_sink: Optional[Callable] = None, fast: bool = False,
+                                **kwargs) -> Tuple[Any, float, Optional[float], Optional[float], str]:
+        """
+        Ejecución instrumentada: registra pasos y mide memoria con tracemalloc
+        
+        Con trace_sink (streaming) no se mide memoria: el ritmo lo marca el
+        consumidor de los pasos y la medición bloquearía a las demás.
+        
+        Returns:
+            Tupla (resultado, tiempo en ms, memoria usada en KB, memoria pico
+            en KB, calidad de la medición de memoria)
+        """
+        self._check_cancelled()
+        self.reset_metrics(trace_mode, trace_every, trace_sink)
+        execute = self.execute_fast if fast else self.execute
+        
+        # Medir memoria
+        measurement = MemoryMeasurement() if trace_sink is None else None
+        with measurement if measurement is not None else tracking_run():
+            # Medir tiempo
+            start_time = time.perf_counter()
+            result = execute(data.copy() if self.mutates_input else data, **kwargs)
+            end_time = time.perf_counter()
+        
+        execution_time = (end_time - start_time) * 1000  # Convertir a milisegundos
+        memory_used = memory_peak_kb = None
+        status = MEASUREMENT_SKIPPED
+        if measurement is not None and measurement.used_bytes is not None:
+            memory_used = measurement.used_bytes / 1024  # Convertir a KB
+            memory_peak_kb = measurement.peak_bytes / 1024  # Convertir a KB
+            status = measurement.status
+        
+        return result, execution_time, memory_used, memory_peak_kb, status
+    
+    @_per_invocation
+    def run_with_metrics(self, data: List[Any], trace_mode: Optional[str] = None,
+                         trace_every: int = 1, two_pass: bool = True,
+                         instrument: bool = True, trace_sink: Optional[Callable] = None,
+                         fast: bool = False, **kwargs) -> AlgorithmResult:
         """
         Ejecuta el algoritmo y mide tiempo y memoria
         
+        Por defecto se hacen dos pasadas: una ejecución limpia que da el tiempo
+        real (execution_time_ms) y una ejecución instrumentada que mide memoria
+        y registra pasos (instrumented_time_ms).
+        
         Args:
             data: Lista de datos a procesar
+            trace_mode: Modo de registro de pasos ('none', 'delta', 'full', 'sampled').
+                Por defecto 'full' para entradas pequeñas y 'delta' para grandes
+            trace_every: Intervalo de muestreo para el modo 'sampled'
+            two_pass: Si es False se hace una sola pasada instrumentada y el
+                tiempo reportado incluye el costo de tracemalloc
+            instrument: Si es False se omite la pasada instrumentada (sin
+                memoria ni pasos)
+            trace_sink: Función que recibe cada paso registrado en lugar de
+                acumularlo en memoria
+            fast: Ejecutar la variante sin instrumentación; no se cuentan
+                comparaciones ni se registran pasos, pero sí se mide memoria
             **kwargs: Argumentos adicionales específicos del algoritmo
             
         Returns:
             AlgorithmResult con resultado y métricas
         """
-        # Reiniciar métricas
-        self.reset_metrics()
+        if fast:
+            trace_mode = TRACE_NONE
+        elif trace_mode is None:
+            trace_mode = default_trace_mode(len(data))
         
-        # Medir memoria
-        tracemalloc.start()
-        memory_before = tracemalloc.get_traced_memory()[0]
+        clean_time = None
+        clean_metrics = {}
+        if two_pass or not instrument:
+            result, clean_time = self.time_execution(data, fast=fast, **kwargs)
+            clean_metrics = {key: self.extra_metrics[key] for key in self.timed_metrics if key in self.extra_metrics}
         
-        # Medir tiempo
-        start_time = time.perf_counter()
+        instrumented_time = memory_used = memory_peak_kb = memory_measurement = None
+        if instrument:
+            result, instrumented_time, memory_used, memory_peak_kb, memory_measurement = self._instrumented_execution(
+                data, trace_mode, trace_every, trace_sink, fast=fast, **kwargs
+            )
         
-        # Ejecutar algoritmo
-        try:
-            result = self.execute(data.copy(), **kwargs)
-        except Exception as e:
-            tracemalloc.stop()
-            raise e
+        if not instrument:
+            timing_mode = 'timing_only'
+        elif two_pass:
+            timing_mode = 'two_pass'
+        else:
+            timing_mode = 'single_pass'
+        execution_time = clean_time if clean_time is not None else instrumented_time
         
-        end_time = time.perf_counter()
-        memory_after, memory_peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
+        metadata = {
+            'execution_time_ms': round(execution_time, 4),
+            'instrumented_time_ms': round(instrumented_time, 4) if instrumented_time is not None else None,
+            'timing_mode': timing_mode,
+            'memory_used_kb': round(memory_used, 4) if memory_used is not None else None,
+            'memory_peak_kb': round(memory_peak_kb, 4) if memory_peak_kb is not None else None,
+            'memory_measurement': memory_measurement,
+            'comparisons': None if fast else self.comparisons,
+            'swaps': None if fast else self.swaps,
+            'input_size': len(data),
+            'steps_count': len(self.steps),
+            'steps_total': self.trace.total,
+            'trace_mode': trace_mode if instrument else TRACE_NONE,
+            'variant': 'fast' if fast else 'instrumented'
+        }
+        if fast:
+            metadata['engine'] = self.fast_engine or 'instrumented'
+            metadata['backend'] = 'python'
+        metadata.update(self.extra_metrics)
+        metadata.update(clean_metrics)
         
-        # Calcular métricas
-        execution_time = (end_time - start_time) * 1000  # Convertir a milisegundos
-        memory_used = (memory_after - memory_before) / 1024  # Convertir a KB
-        memory_peak_kb = memory_peak / 1024  # Convertir a KB
+        return AlgorithmResult(result, metadata, steps=self.steps, initial=data)
+    
+    @_per_invocation
+    def run_batch_with_metrics(self, data: List[Any], targets: List[Any], fast: bool = False,
+                               **kwargs) -> AlgorithmResult:
+        """
+        Ejecuta execute_batch y mide tiempo y métricas agregadas
+        
+        Los pasos no se registran (solo se cuentan) y no se mide memoria: es
+        una sola pasada pensada para miles de targets.
+        
+        Args:
+            data: Lista de datos
+            targets: Valores a procesar sobre los mismos datos
+            fast: Usar la variante sin instrumentación
+            **kwargs: Argumentos adicionales específicos del algoritmo
+            
+        Returns:
+            AlgorithmResult con un resultado por target y métricas agregadas
+        """
+        self.reset_metrics(TRACE_NONE)
+        
+        with tracking_run():
+            start_time = time.perf_counter()
+            results = self.execute_batch(data, targets, fast=fast, **kwargs)
+            execution_time = (time.perf_counter() - start_time) * 1000
         
+        results = [{'target': target, **result} for target, result in zip(targets, results)]
         metadata = {
             'execution_time_ms': round(execution_time, 4),
-            'memory_used_kb': round(memory_used, 4),
-            'memory_peak_kb': round(memory_peak_kb, 4),
-            'comparisons': self.comparisons,
-            'swaps': self.swaps,
+            'instrumented_time_ms': None,
+            'timing_mode': 'batch',
+            'memory_used_kb': None,
+            'memory_peak_kb': None,
+            'memory_measurement': None,
+            'comparisons': None if fast else self.comparisons,
+            'swaps': None if fast else self.swaps,
             'input_size': len(data),
-            'steps_count': len(self.steps)
+            'steps_count': 0,
+            'steps_total': self.trace.total,
+            'trace_mode': TRACE_NONE,
+            'variant': 'fast' if fast else 'instrumented',
+            'targets_count': len(targets),
+            'found_count': sum(1 for result in results if result.get('found')),
+            'comparisons_per_target': None if fast or not targets else round(self.comparisons / len(targets), 4)
         }
+        metadata.update(self.extra_metrics)
         
-        return AlgorithmResult(result, metadata)
+        return AlgorithmResult(results, metadata, initial=data)
     
     def __str__(self):
         return f"{self.name}: {self.description}"
@@ -0,0 +1,264 @@
+"""
+Formato binario de datasets con acceso por mmap
+
+Un archivo tiene una cabecera fija de 32 bytes seguida de un array contiguo
+de int64 ('q') o float64 ('d') en little-endian:
+
+    magic (4s) | versión (B) | tipo ('q'/'d') | reservado (2x) |
+    cantidad (Q) | flags (I) | relleno hasta 32 bytes
+
+Los algoritmos leen el archivo con MappedDataset, que mapea el archivo en
+memoria y lo expone como una secuencia de solo lectura sin parsear JSON ni
+crear un objeto por elemento. BinaryDatasetWriter escribe el formato por
+bloques, sin tener todos los datos en memoria.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from operator import indexOf
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+from app.algorithms import engines
+
+MAGIC = b'ALGD'
+VERSION = 1
+HEADER = struct.Struct('<4sBcxxQI12x')
+
+# Tipos de elemento admitidos
+TYPECODE_INT = 'q'
+TYPECODE_FLOAT = 'd'
+TYPECODES = (TYPECODE_INT, TYPECODE_FLOAT)
+
+# Flags de la cabecera
+FLAG_SORTED = 0x1
+FLAG_SORTED_KNOWN = 0x2
+
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+def typecode_for(data: Any) -> Optional[str]:
+    """
+    Tipo de elemento con el que se pueden guardar los datos ('q' o 'd')
+
+    Devuelve None si no son todos enteros de 64 bits o todos floats.
+    """
+    typecode = getattr(data, 'typecode', None)
+    if typecode is not None:
+        return typecode if typecode in TYPECODES else None
+    dtype = getattr(data, 'dtype', None)
+    if dtype is not None:
+        # Array NumPy
+        return {'i': TYPECODE_INT, 'f': TYPECODE_FLOAT}.get(dtype.kind) if dtype.itemsize == 8 else None
+    types = set(map(type, data))
+    if types == {int} and _INT64_MIN <= min(data) and max(data) <= _INT64_MAX:
+        return TYPECODE_INT
+    if types == {float}:
+        return TYPECODE_FLOAT
+    return None
+
+
+def read_header(path: str) -> Dict[str, Any]:
+    """Lee y valida la cabecera de un archivo de dataset"""
+    with open(path, 'rb') as f:
+        raw = f.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        raise ValueError("Archivo de dataset incompleto (sin cabecera)")
+    magic, version, typecode, count, flags = HEADER.unpack(raw)
+    typecode = typecode.decode('ascii', errors='replace')
+    if magic != MAGIC:
+        raise ValueError("No es un archivo de dataset binario")
+    if version != VERSION:
+        raise ValueError(f"Versión de formato no soportada: {version}")
+    if typecode not in TYPECODES:
+        raise ValueError(f"Tipo de elemento no soportado: {typecode!r}")
+    expected = HEADER.size + count * array(typecode).itemsize
+    if os.path.getsize(path) != expected:
+        raise ValueError("El tamaño del archivo no coincide con la cabecera")
+    return {
+        'typecode': typecode,
+        'count': count,
+        'is_sorted': bool(flags & FLAG_SORTED) if flags & FLAG_SORTED_KNOWN else None
+    }
+
+
+def file_fingerprint(path: str) -> str:
+    """Hash SHA-256 del contenido del archivo"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:32]
+
+
+class BinaryDatasetWriter:
+    """
+    Escribe un dataset binario por bloques
+
+    La cabecera se reescribe al cerrar con la cantidad final de elementos y
+    si quedaron ordenados (se calcula bloque a bloque mientras se escribe).
+    """
+
+    def __init__(self, path: str, typecode: str = TYPECODE_INT):
+        if typecode not in TYPECODES:
+            raise ValueError(f"Tipo de elemento no soportado: {typecode!r}")
+        self.path = path
+        self.typecode = typecode
+        self.count = 0
+        self.is_sorted = True
+        self._last = None
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, typecode.encode('ascii'), 0, 0))
+
+    def write(self, values: Iterable[Union[int, float]]):
+        """Agrega un bloque de valores al final del archivo"""
+        chunk = values if isinstance(values, array) and values.typecode == self.typecode \
+            else array(self.typecode, values)
+        if not chunk:
+            return
+        if self.is_sorted:
+            self.is_sorted = (self._last is None or self._last <= chunk[0]) and engines.is_sorted(chunk)
+        self._last = chunk[-1]
+        if sys.byteorder != 'little':
+            chunk = array(self.typecode, chunk)
+            chunk.byteswap()
+        chunk.tofile(self._file)
+        self.count += len(chunk)
+
+    def close(self):
+        """Completa la cabecera y cierra el archivo"""
+        if self._file.closed:
+            return
+        flags = FLAG_SORTED_KNOWN | (FLAG_SORTED if self.is_sorted else 0)
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, self.typecode.encode('ascii'), self.count, flags))
+        self._file.close()
+
+    def __enter__(self) -> 'BinaryDatasetWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        if exc_type is not None:
+            os.remove(self.path)
+
+
+def write_dataset(path: str, data: Iterable[Union[int, float]], typecode: Optional[str] = None,
+                  chunk_size: int = 65536) -> Dict[str, Any]:
+    """
+    Escribe una secuencia de números en el formato binario
+
+    Args:
+        path: Archivo destino
+        data: Valores (cualquier iterable; se consume por bloques)
+        typecode: 'q' o 'd'; por defecto según el tipo de los datos
+        chunk_size: Elementos por bloque escrito
+    """
+    data = iter(data)
+    first = next(data, None)
+    if typecode is None:
+        typecode = TYPECODE_FLOAT if isinstance(first, float) else TYPECODE_INT
+    with BinaryDatasetWriter(path, typecode) as writer:
+        chunk = [] if first is None else [first]
+        for value in data:
+            chunk.append(value)
+            if len(chunk) >= chunk_size:
+                writer.write(chunk)
+                chunk = []
+        writer.write(chunk)
+    return {'path': path, 'typecode': typecode, 'count': writer.count, 'is_sorted': writer.is_sorted}
+
+
+class MappedDataset:
+    """
+    Dataset binario mapeado en memoria, de solo lectura
+
+    Se comporta como una secuencia (len, índices, iteración, index) sobre un
+    memoryview del archivo: los elementos se crean solo al leerlos. copy()
+    devuelve una lista (para los algoritmos que ordenan en el lugar) y
+    __array__ permite al backend NumPy copiarlo sin pasar por objetos Python.
+    """
+
+    # La entrada no se puede modificar: no hace falta copiarla antes de ejecutar
+    read_only = True
+
+    def __init__(self, path: str):
+        header = read_header(path)
+        self.path = path
+        self.typecode = header['typecode']
+        self._sorted = header['is_sorted']
+        self.fingerprint: Optional[str] = None
+        self._file = open(path, 'rb')
+        self._mmap = None
+        self._view = memoryview(b'').cast(self.typecode)
+        if header['count']:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mmap)[HEADER.size:].cast(self.typecode)
+        if sys.byteorder != 'little':
+            raise ValueError("Los datasets binarios solo se pueden mapear en sistemas little-endian")
+
+    @property
+    def nbytes(self) -> int:
+        return self._view.nbytes
+
+    @property
+    def is_sorted(self) -> bool:
+        """Orden registrado en la cabecera (o calculado una vez si no se conoce)"""
+        if self._sorted is None:
+            self._sorted = engines.is_sorted(self._view)
+        return self._sorted
+
+    @property
+    def sortedness_known(self) -> bool:
+        return self._sorted is not None
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._view[index].tolist()
+        return self._view[index]
+
+    def __iter__(self) -> Iterator[Union[int, float]]:
+        return iter(self._view)
+
+    def __array__(self, dtype=None, copy=None):
+        import numpy as np
+        arr = np.frombuffer(self._view, dtype=np.int64 if self.typecode == TYPECODE_INT else np.float64)
+        return arr.astype(dtype) if dtype is not None and arr.dtype != dtype else arr
+
+    def index(self, value: Any) -> int:
+        """Primera posición de value (ValueError si no está)"""
+        return indexOf(self._view, value)
+
+    def bisect_left(self, value: Any) -> int:
+        """Posición de inserción por la izquierda (requiere datos ordenados)"""
+        return bisect_left(self._view, value)
+
+    def copy(self) -> List[Union[int, float]]:
+        """Copia los datos a una lista"""
+        return self._view.tolist()
+
+    def to_list(self) -> List[Union[int, float]]:
+        return self._view.tolist()
+
+    def close(self):
+        """Libera el mapeo y el archivo"""
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> 'MappedDataset':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"MappedDataset({self.path!r}, typecode={self.typecode!r}, count={len(self)})"
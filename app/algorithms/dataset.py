@@ -0,0 +1,59 @@
+from typing import Any, Iterable, Optional
+from app.algorithms import engines
+
+
+class Dataset(list):
+    """
+    Lista que recuerda si está ordenada
+
+    El orden se calcula una sola vez (en O(n)) o se indica al crearla, por
+    ejemplo al generar datos ordenados, y se reutiliza en cada búsqueda. Es
+    una lista normal para el resto del código; cualquier modificación
+    descarta lo que se sabía del orden y la huella del contenido.
+    """
+
+    def __init__(self, data: Iterable[Any] = (), is_sorted: Optional[bool] = None,
+                 fingerprint: Optional[str] = None):
+        super().__init__(data)
+        self._sorted = is_sorted
+        # Hash del contenido asignado por el registro de datasets (ya validado)
+        self.fingerprint = fingerprint
+
+    @property
+    def is_sorted(self) -> bool:
+        """Indica si la lista está ordenada (se comprueba solo la primera vez)"""
+        if self._sorted is None:
+            self._sorted = engines.is_sorted(self)
+        return self._sorted
+
+    @property
+    def sortedness_known(self) -> bool:
+        """Indica si el orden ya se conoce sin recorrer la lista"""
+        return self._sorted is not None
+
+    def _invalidate(self):
+        self._sorted = None
+        self.fingerprint = None
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self.fingerprint = None
+        self._sorted = None if kwargs.get('key') or kwargs.get('reverse') else True
+
+
+def _invalidating(method_name: str):
+    """Envuelve un método de list para que descarte el orden conocido"""
+    method = getattr(list, method_name)
+
+    def wrapper(self, *args, **kwargs):
+        self._invalidate()
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = method_name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _name in ('append', 'extend', 'insert', 'pop', 'remove', 'clear', 'reverse',
+              '__setitem__', '__delitem__', '__iadd__', '__imul__'):
+    setattr(Dataset, _name, _invalidating(_name))
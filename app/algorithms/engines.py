@@ -0,0 +1,518 @@
+"""
+Motores de ordenamiento, selección y búsqueda sin instrumentación
+
+Son las variantes "rápidas" de los algoritmos registrados: no cuentan
+comparaciones ni registran pasos, y usan las técnicas de las implementaciones
+de producción (iteración en vez de recursión, buffers reutilizados, pivote
+mediana de tres, corte a inserción, heapq/bisect en C).
+"""
+from bisect import bisect_left, bisect_right
+from itertools import compress, count, islice
+from operator import gt, le, lt
+from typing import Any, Dict, List, Sequence, Tuple
+import heapq
+import math
+
+# Debajo de este tamaño las particiones se ordenan por inserción
+INSERTION_SORT_CUTOFF = 16
+
+# Rango máximo de valores para usar Counting Sort en lugar de Radix Sort
+COUNTING_SORT_MAX_RANGE = 1 << 20
+
+# Bits por dígito (cubeta) en cada pasada de Radix Sort
+RADIX_BITS = 8
+
+# Largo promedio mínimo de las corridas para ordenar fusionándolas
+RUN_MERGE_MIN_AVERAGE_RUN = 32
+
+# Counting Sort si el rango de valores no supera este múltiplo del tamaño
+COUNTING_SORT_RANGE_FACTOR = 1
+
+# Radix Sort (en vez de comparar) desde este tamaño y hasta este rango de valores
+RADIX_SORT_MIN_SIZE = 1024
+RADIX_SORT_MAX_RANGE = 1 << 32
+
+# Elementos de la muestra para estimar inversiones y duplicados
+PROFILE_SAMPLE_SIZE = 1024
+
+# Hasta k = n * esta fracción un heap de k elementos (heapq.nsmallest) le gana a ordenar todo
+HEAP_SELECT_MAX_FRACTION = 1 / 16
+
+
+def is_sorted(data: List[Any]) -> bool:
+    """Comprueba en una sola pasada O(n) si la lista está ordenada"""
+    return all(map(le, data, islice(data, 1, None)))
+
+
+def bubble_sort(arr: List[Any]) -> List[Any]:
+    """Bubble Sort con salida temprana y límite de la última posición intercambiada"""
+    n = len(arr)
+    while n > 1:
+        last_swap = 0
+        for j in range(1, n):
+            if arr[j - 1] > arr[j]:
+                arr[j - 1], arr[j] = arr[j], arr[j - 1]
+                last_swap = j
+        n = last_swap
+    return arr
+
+
+def insertion_sort(arr: List[Any], low: int = 0, high: int = None) -> List[Any]:
+    """Ordena por inserción el rango [low, high] (incluido)"""
+    if high is None:
+        high = len(arr) - 1
+    for i in range(low + 1, high + 1):
+        value = arr[i]
+        j = i - 1
+        while j >= low and arr[j] > value:
+            arr[j + 1] = arr[j]
+            j -= 1
+        arr[j + 1] = value
+    return arr
+
+
+def bottom_up_merge_sort(arr: List[Any]) -> List[Any]:
+    """
+    Merge Sort iterativo (de abajo hacia arriba)
+
+    Primero ordena por inserción bloques de INSERTION_SORT_CUTOFF elementos y
+    luego fusiona bloques de ancho creciente alternando entre dos buffers
+    preasignados, sin recursión ni slices por nivel.
+    """
+    n = len(arr)
+    width = INSERTION_SORT_CUTOFF
+    for low in range(0, n, width):
+        insertion_sort(arr, low, min(low + width, n) - 1)
+
+    src, dst = arr, [None] * n
+    while width < n:
+        for low in range(0, n, 2 * width):
+            mid = min(low + width, n)
+            high = min(low + 2 * width, n)
+            i, j, k = low, mid, low
+            if mid >= high or src[mid - 1] <= src[mid]:
+                # Ya están en orden (o no hay mitad derecha): copiar el bloque
+                dst[low:high] = src[low:high]
+                continue
+            while i < mid and j < high:
+                if src[j] < src[i]:
+                    dst[k] = src[j]
+                    j += 1
+                else:
+                    dst[k] = src[i]
+                    i += 1
+                k += 1
+            if i < mid:
+                dst[k:high] = src[i:mid]
+            else:
+                dst[k:high] = src[j:high]
+        src, dst = dst, src
+        width *= 2
+
+    if src is not arr:
+        arr[:] = src
+    return arr
+
+
+def _median_of_three(arr: List[Any], low: int, high: int) -> int:
+    """Ordena arr[low], arr[mid], arr[high] y devuelve el índice de la mediana"""
+    mid = (low + high) // 2
+    if arr[mid] < arr[low]:
+        arr[low], arr[mid] = arr[mid], arr[low]
+    if arr[high] < arr[low]:
+        arr[low], arr[high] = arr[high], arr[low]
+    if arr[high] < arr[mid]:
+        arr[mid], arr[high] = arr[high], arr[mid]
+    return mid
+
+
+def _sift_down(arr: List[Any], start: int, root: int, end: int):
+    """Hunde arr[start + root] en el max heap que ocupa arr[start:start + end]"""
+    while True:
+        child = 2 * root + 1
+        if child >= end:
+            return
+        if child + 1 < end and arr[start + child] < arr[start + child + 1]:
+            child += 1
+        if arr[start + root] >= arr[start + child]:
+            return
+        arr[start + root], arr[start + child] = arr[start + child], arr[start + root]
+        root = child
+
+
+def _heap_sort_range(arr: List[Any], low: int, high: int):
+    """Heap Sort in-place del rango [low, high]"""
+    n = high - low + 1
+    for root in range(n // 2 - 1, -1, -1):
+        _sift_down(arr, low, root, n)
+    for end in range(n - 1, 0, -1):
+        arr[low], arr[low + end] = arr[low + end], arr[low]
+        _sift_down(arr, low, 0, end)
+
+
+def introsort(arr: List[Any]) -> List[Any]:
+    """
+    Quick Sort estilo introsort
+
+    Pivote mediana de tres con partición de Hoare, pila explícita que procesa
+    primero la partición menor (profundidad O(log n)), corte a inserción para
+    rangos pequeños y Heap Sort si la profundidad supera 2·log2(n).
+    """
+    n = len(arr)
+    if n < 2:
+        return arr
+    max_depth = 2 * int(math.log2(n))
+    stack = [(0, n - 1, 0)]
+    while stack:
+        low, high, depth = stack.pop()
+        while high - low + 1 > INSERTION_SORT_CUTOFF:
+            if depth > max_depth:
+                _heap_sort_range(arr, low, high)
+                break
+            depth += 1
+            pivot = arr[_median_of_three(arr, low, high)]
+            i, j = low, high
+            while i <= j:
+                while arr[i] < pivot:
+                    i += 1
+                while arr[j] > pivot:
+                    j -= 1
+                if i <= j:
+                    arr[i], arr[j] = arr[j], arr[i]
+                    i += 1
+                    j -= 1
+            # Continuar con la partición menor y apilar la mayor
+            if j - low < high - i:
+                stack.append((i, high, depth))
+                high = j
+            else:
+                stack.append((low, j, depth))
+                low = i
+        else:
+            insertion_sort(arr, low, high)
+    return arr
+
+
+def heapq_heap_sort(arr: List[Any]) -> List[Any]:
+    """Heap Sort usando el min heap de heapq (implementado en C)"""
+    heap = list(arr)
+    heapq.heapify(heap)
+    pop = heapq.heappop
+    arr[:] = [pop(heap) for _ in range(len(heap))]
+    return arr
+
+
+def counting_sort(arr: List[int]) -> List[int]:
+    """Counting Sort para enteros de rango acotado"""
+    if not arr:
+        return arr
+    low = min(arr)
+    counts = [0] * (max(arr) - low + 1)
+    for value in arr:
+        counts[value - low] += 1
+    position = 0
+    for offset, count in enumerate(counts):
+        if count:
+            arr[position:position + count] = [low + offset] * count
+            position += count
+    return arr
+
+
+def radix_sort(arr: List[int]) -> List[int]:
+    """Radix Sort LSD en dígitos de RADIX_BITS bits sobre (valor - mínimo)"""
+    if not arr:
+        return arr
+    low = min(arr)
+    max_key = max(arr) - low
+    mask = (1 << RADIX_BITS) - 1
+    shift = 0
+    while max_key >> shift:
+        buckets = [[] for _ in range(mask + 1)]
+        for value in arr:
+            buckets[((value - low) >> shift) & mask].append(value)
+        arr[:] = [value for bucket in buckets for value in bucket]
+        shift += RADIX_BITS
+    return arr
+
+
+def integer_sort(arr: List[int]) -> Tuple[List[int], str]:
+    """
+    Ordena enteros con Counting Sort si el rango es pequeño o Radix Sort si no
+
+    Returns:
+        Tupla (lista ordenada, nombre del motor usado)
+    """
+    if arr and max(arr) - min(arr) + 1 <= min(max(2 * len(arr), 1 << 16), COUNTING_SORT_MAX_RANGE):
+        return counting_sort(arr), 'counting_sort'
+    return radix_sort(arr), 'radix_sort'
+
+
+def run_starts(arr: Sequence[Any]) -> List[int]:
+    """Inicio de cada corrida ascendente (no decreciente) y el largo al final"""
+    descents = compress(count(1), map(gt, arr, islice(arr, 1, None)))
+    return [0, *descents, len(arr)] if arr else [0]
+
+
+def gallop_merge(left: List[Any], right: List[Any]) -> List[Any]:
+    """
+    Fusiona dos listas ordenadas copiando bloques
+
+    En vez de comparar elemento a elemento busca con bisect hasta dónde
+    sigue cada lista y copia el bloque entero; con corridas que casi no se
+    intercalan (datos casi ordenados) la fusión es prácticamente una copia.
+    """
+    if not left or not right or left[-1] <= right[0]:
+        return left + right
+    result = []
+    i = j = 0
+    while True:
+        k = bisect_right(left, right[j], i)
+        result += left[i:k]
+        i = k
+        if i == len(left):
+            break
+        k = bisect_left(right, left[i], j)
+        result += right[j:k]
+        j = k
+        if j == len(right):
+            break
+    result += left[i:]
+    result += right[j:]
+    return result
+
+
+def natural_merge_sort(arr: List[Any]) -> List[Any]:
+    """Merge Sort natural: fusiona de a pares las corridas ascendentes ya presentes"""
+    starts = run_starts(arr)
+    runs = [arr[low:high] for low, high in zip(starts, starts[1:])]
+    while len(runs) > 1:
+        runs = [gallop_merge(runs[i], runs[i + 1]) if i + 1 < len(runs) else runs[i]
+                for i in range(0, len(runs), 2)]
+    if runs:
+        arr[:] = runs[0]
+    return arr
+
+
+def _value_type(data: Sequence[Any]) -> str:
+    types = set(map(type, data))
+    if types == {int}:
+        return 'int'
+    if types == {float}:
+        return 'float'
+    if types <= {int, float}:
+        return 'number'
+    if types == {str}:
+        return 'str'
+    return 'mixed' if types else 'empty'
+
+
+def sample_profile(sample: List[Any]) -> Dict[str, float]:
+    """
+    Estima inversiones y duplicados a partir de una muestra (en orden)
+
+    inversion_ratio es la fracción de pares desordenados (0 si la muestra
+    está ordenada, 1 si está invertida) y duplicate_ratio la fracción de
+    elementos repetidos.
+    """
+    seen: List[Any] = []
+    inversions = 0
+    for position, value in enumerate(sample):
+        rank = bisect_right(seen, value)
+        inversions += position - rank
+        seen.insert(rank, value)
+    pairs = len(sample) * (len(sample) - 1) // 2
+    return {
+        'inversion_ratio': round(inversions / pairs, 4) if pairs else 0.0,
+        'duplicate_ratio': round(1 - len(set(sample)) / len(sample), 4) if sample else 0.0
+    }
+
+
+def profile_input(data: Sequence[Any]) -> Dict[str, Any]:
+    """
+    Características de la entrada para elegir cómo ordenarla, en O(n)
+
+    Las corridas se cuentan con pasadas sobre pares de vecinos (en C); las
+    inversiones y los duplicados se estiman con una muestra de
+    PROFILE_SAMPLE_SIZE elementos equiespaciados.
+
+    Returns:
+        size, dtype ('int', 'float', 'number', 'str', 'mixed' o 'empty'),
+        runs (corridas no decrecientes), descending_runs (corridas no
+        crecientes), min, max y value_range (solo numéricos),
+        inversion_ratio y duplicate_ratio (estimados)
+    """
+    n = len(data)
+    dtype = _value_type(data)
+    profile: Dict[str, Any] = {
+        'size': n,
+        'dtype': dtype,
+        'runs': sum(map(gt, data, islice(data, 1, None))) + 1 if n else 0,
+        'descending_runs': sum(map(lt, data, islice(data, 1, None))) + 1 if n else 0,
+        'min': None,
+        'max': None,
+        'value_range': None
+    }
+    if n and dtype in ('int', 'float', 'number'):
+        profile['min'] = min(data)
+        profile['max'] = max(data)
+        profile['value_range'] = profile['max'] - profile['min']
+
+    profile.update(sample_profile(list(islice(data, 0, None, max(1, n // PROFILE_SAMPLE_SIZE)))))
+    return profile
+
+
+def choose_sort_strategy(profile: Dict[str, Any]) -> str:
+    """
+    Elige el motor de ordenamiento según el perfil de la entrada
+
+    - 'already_sorted': una sola corrida, no hay nada que hacer
+    - 'run_merge' / 'reverse_run_merge': pocas corridas largas (ascendentes o
+      descendentes), se fusionan con natural_merge_sort
+    - 'counting_sort': enteros con rango chico respecto del tamaño
+    - 'radix_sort': enteros de rango acotado en listas grandes
+    - 'heap_sort': el caso general (heapq en C, O(n log n) garantizado)
+    """
+    n = profile['size']
+    if profile['runs'] <= 1:
+        return 'already_sorted'
+    min_average = RUN_MERGE_MIN_AVERAGE_RUN
+    if profile['descending_runs'] < profile['runs'] and profile['descending_runs'] * min_average <= n:
+        return 'reverse_run_merge'
+    if profile['runs'] * min_average <= n:
+        return 'run_merge'
+    if profile['dtype'] == 'int':
+        span = profile['value_range'] + 1
+        if span <= min(COUNTING_SORT_RANGE_FACTOR * n, COUNTING_SORT_MAX_RANGE):
+            return 'counting_sort'
+        if n >= RADIX_SORT_MIN_SIZE and span <= RADIX_SORT_MAX_RANGE:
+            return 'radix_sort'
+    return 'heap_sort'
+
+
+def adaptive_sort(arr: List[Any], strategy: str) -> Tuple[List[Any], str]:
+    """
+    Ordena con el motor de la estrategia elegida por choose_sort_strategy
+
+    Returns:
+        Tupla (lista ordenada, nombre del motor usado)
+    """
+    if strategy == 'already_sorted':
+        return arr, 'already_sorted'
+    if strategy in ('run_merge', 'reverse_run_merge'):
+        if strategy == 'reverse_run_merge':
+            arr.reverse()
+        return natural_merge_sort(arr), 'natural_merge_sort'
+    if strategy == 'counting_sort':
+        return counting_sort(arr), 'counting_sort'
+    if strategy == 'radix_sort':
+        return radix_sort(arr), 'radix_sort'
+    return heapq_heap_sort(arr), 'heapq_heap_sort'
+
+
+def smallest_k(data: Sequence[Any], k: int) -> Tuple[List[Any], str]:
+    """
+    Los k menores elementos, ordenados
+
+    Con k chico un heap acotado (heapq.nsmallest, O(n log k)); si no,
+    timsort de toda la lista y un corte.
+
+    Returns:
+        Tupla (k menores, nombre del motor usado)
+    """
+    if k <= len(data) * HEAP_SELECT_MAX_FRACTION:
+        return heapq.nsmallest(k, data), 'heapq_nsmallest'
+    return sorted(data)[:k], 'timsort_slice'
+
+
+def select_kth(data: Sequence[Any], k: int) -> Tuple[Any, str]:
+    """
+    El k-ésimo menor elemento (k desde 1)
+
+    Si k está cerca del final se buscan los n - k + 1 mayores, que son menos.
+
+    Returns:
+        Tupla (valor, nombre del motor usado)
+    """
+    from_top = len(data) - k + 1
+    if from_top < k and from_top <= len(data) * HEAP_SELECT_MAX_FRACTION:
+        return heapq.nlargest(from_top, data)[-1], 'heapq_nlargest'
+    values, engine = smallest_k(data, k)
+    return values[-1], engine
+
+
+def linear_search(data: List[Any], target: Any) -> Dict[str, Any]:
+    """Búsqueda lineal con list.index"""
+    try:
+        index = data.index(target)
+    except ValueError:
+        return {'found': False, 'index': -1, 'value': None}
+    return {'found': True, 'index': index, 'value': data[index]}
+
+
+def binary_search(data: List[Any], target: Any) -> Dict[str, Any]:
+    """Búsqueda binaria con bisect (devuelve la primera aparición)"""
+    index = bisect_left(data, target)
+    if index < len(data) and data[index] == target:
+        return {'found': True, 'index': index, 'value': data[index]}
+    return {'found': False, 'index': -1, 'value': None}
+
+
+def choose_batch_strategy(size: int, targets_count: int, targets_sorted: bool) -> str:
+    """
+    Elige cómo buscar muchos targets en una lista ordenada
+
+    Un barrido tipo merge cuesta O(n + m) y solo sirve con los targets
+    ordenados; m búsquedas binarias cuestan O(m log n). Se usa el barrido
+    cuando es más barato.
+    """
+    if targets_sorted and targets_count * math.log2(size + 1) >= size:
+        return 'merge_sweep'
+    return 'bisect'
+
+
+def merge_sweep_search(data: List[Any], targets: List[Any]) -> List[Dict[str, Any]]:
+    """Busca targets ordenados en una lista ordenada con un solo recorrido"""
+    results = []
+    n = len(data)
+    i = 0
+    for target in targets:
+        while i < n and data[i] < target:
+            i += 1
+        if i < n and data[i] == target:
+            results.append({'found': True, 'index': i, 'value': data[i]})
+        else:
+            results.append({'found': False, 'index': -1, 'value': None})
+    return results
+
+
+def bisect_batch_search(data: List[Any], targets: List[Any], targets_sorted: bool = False) -> List[Dict[str, Any]]:
+    """Una búsqueda binaria por target; con targets ordenados cada una empieza donde terminó la anterior"""
+    results = []
+    n = len(data)
+    low = 0
+    for target in targets:
+        index = bisect_left(data, target, low)
+        if targets_sorted:
+            low = index
+        if index < n and data[index] == target:
+            results.append({'found': True, 'index': index, 'value': data[index]})
+        else:
+            results.append({'found': False, 'index': -1, 'value': None})
+    return results
+
+
+def hash_batch_search(data: List[Any], targets: List[Any]) -> List[Dict[str, Any]]:
+    """Búsqueda lineal de muchos targets: un solo recorrido con un índice de primeras apariciones"""
+    pending = set(targets)
+    first_index = {}
+    for index, value in enumerate(data):
+        if value in pending:
+            first_index[value] = index
+            pending.discard(value)
+            if not pending:
+                break
+    return [
+        {'found': True, 'index': first_index[target], 'value': data[first_index[target]]}
+        if target in first_index else {'found': False, 'index': -1, 'value': None}
+        for target in targets
+    ]
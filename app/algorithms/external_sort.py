@@ -0,0 +1,177 @@
+"""
+Ordenamiento externo (fuera de memoria) por fusión
+
+Para datos que no entran en memoria: la entrada se lee por bloques que caben
+en el presupuesto de memoria, cada bloque se ordena y se escribe como una
+corrida (un archivo en el formato binario de binary_format.py) y luego las
+corridas se fusionan de a `fan_in` con un heap hasta que queda una sola. Los
+archivos se leen y escriben por buffers, así la memoria usada depende del
+presupuesto y no del tamaño de la entrada.
+"""
+import heapq
+import os
+import shutil
+import sys
+import tempfile
+from array import array
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from app.algorithms.binary_format import HEADER, BinaryDatasetWriter, MappedDataset, typecode_for
+
+# Memoria por defecto para las corridas y los buffers de fusión
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+# Corridas que se fusionan a la vez en cada pasada
+DEFAULT_FAN_IN = 64
+
+# Memoria aproximada por elemento en una lista (puntero más objeto int/float)
+ELEMENT_MEMORY_BYTES = 40
+
+# Mínimo de elementos por corrida y por buffer de lectura o escritura
+MIN_BUFFER_ELEMENTS = 1024
+
+
+class ExternalSorter:
+    """
+    Ordena una secuencia o un archivo binario con memoria acotada
+
+    Las corridas se ordenan con `sort_run` y se fusionan con `merge` (con la
+    firma de heapq.merge), así una versión instrumentada puede contar las
+    comparaciones sin cambiar el manejo de archivos. Las métricas de la
+    última ejecución quedan en `stats`.
+    """
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET, fan_in: int = DEFAULT_FAN_IN,
+                 tmp_dir: Optional[str] = None, sort_run: Callable[[List[Any]], List[Any]] = sorted,
+                 merge: Callable[..., Iterator[Any]] = heapq.merge,
+                 on_progress: Optional[Callable[[], None]] = None):
+        if memory_budget <= 0:
+            raise ValueError("El presupuesto de memoria debe ser positivo")
+        if fan_in < 2:
+            raise ValueError("fan_in debe ser al menos 2")
+        self.memory_budget = memory_budget
+        self.fan_in = fan_in
+        self.tmp_dir = tmp_dir
+        self.sort_run = sort_run
+        self.merge = merge
+        self.on_progress = on_progress
+        self.run_elements = max(MIN_BUFFER_ELEMENTS, memory_budget // ELEMENT_MEMORY_BYTES)
+        # Al fusionar, el presupuesto se reparte entre las corridas de entrada y la salida
+        self.buffer_elements = max(MIN_BUFFER_ELEMENTS, self.run_elements // (fan_in + 1))
+        self.stats: Dict[str, Any] = {}
+
+    def sort(self, source: Any, dst_path: str) -> Dict[str, Any]:
+        """
+        Ordena `source` y escribe el resultado en `dst_path` (formato binario)
+
+        Args:
+            source: Ruta de un archivo binario, MappedDataset o secuencia de
+                enteros de 64 bits o floats
+            dst_path: Archivo destino
+
+        Returns:
+            Métricas: corridas, pasadas de fusión y bytes leídos y escritos
+        """
+        if isinstance(source, str):
+            with MappedDataset(source) as mapped:
+                return self.sort(mapped, dst_path)
+
+        typecode = typecode_for(source) if len(source) else 'q'
+        if typecode is None:
+            raise ValueError("El ordenamiento externo solo admite enteros de 64 bits o floats")
+
+        self.stats = {
+            'runs': 0,
+            'merge_passes': 0,
+            'io_bytes_read': 0,
+            'io_bytes_written': 0,
+            'memory_budget_bytes': self.memory_budget,
+            'run_elements': self.run_elements,
+            'fan_in': self.fan_in
+        }
+        work_dir = tempfile.mkdtemp(prefix='extsort-', dir=self.tmp_dir)
+        try:
+            runs = self._create_runs(source, typecode, work_dir)
+            self.stats['runs'] = len(runs)
+            while len(runs) > self.fan_in:
+                runs = self._merge_pass(runs, typecode, work_dir)
+            if len(runs) == 1:
+                # Una sola corrida: ya es el resultado
+                shutil.move(runs[0], dst_path)
+            else:
+                self._merge_group(runs, dst_path, typecode)
+                self.stats['merge_passes'] += 1
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        return dict(self.stats)
+
+    def _progress(self):
+        if self.on_progress is not None:
+            self.on_progress()
+
+    def _chunks(self, source: Any) -> Iterator[List[Any]]:
+        """Bloques de la entrada del tamaño de una corrida"""
+        itemsize = array(source.typecode).itemsize if isinstance(source, MappedDataset) else 0
+        for start in range(0, len(source), self.run_elements):
+            chunk = source[start:start + self.run_elements]
+            self.stats['io_bytes_read'] += len(chunk) * itemsize
+            yield chunk
+
+    def _create_runs(self, source: Any, typecode: str, work_dir: str) -> List[str]:
+        """Ordena cada bloque de la entrada en memoria y lo escribe como corrida"""
+        runs = []
+        for chunk in self._chunks(source):
+            self._progress()
+            path = os.path.join(work_dir, f"run-0-{len(runs)}.bin")
+            self._write_run(path, self.sort_run(chunk), typecode)
+            runs.append(path)
+        if not runs:
+            path = os.path.join(work_dir, "run-0-0.bin")
+            self._write_run(path, [], typecode)
+            runs.append(path)
+        return runs
+
+    def _merge_pass(self, runs: List[str], typecode: str, work_dir: str) -> List[str]:
+        """Fusiona las corridas de a fan_in; devuelve las corridas resultantes"""
+        self.stats['merge_passes'] += 1
+        merged = []
+        for start in range(0, len(runs), self.fan_in):
+            path = os.path.join(work_dir, f"run-{self.stats['merge_passes']}-{len(merged)}.bin")
+            self._merge_group(runs[start:start + self.fan_in], path, typecode)
+            merged.append(path)
+        return merged
+
+    def _merge_group(self, runs: List[str], dst_path: str, typecode: str):
+        """Fusión k-way de varias corridas en un archivo, borrando las corridas leídas"""
+        readers = [self._read_run(path, typecode) for path in runs]
+        self._write_run(dst_path, self.merge(*readers), typecode)
+        for path in runs:
+            os.remove(path)
+
+    def _read_run(self, path: str, typecode: str) -> Iterator[Any]:
+        """Lee una corrida por buffers de buffer_elements elementos"""
+        itemsize = array(typecode).itemsize
+        with open(path, 'rb') as f:
+            f.seek(HEADER.size)
+            while True:
+                raw = f.read(self.buffer_elements * itemsize)
+                if not raw:
+                    return
+                self.stats['io_bytes_read'] += len(raw)
+                self._progress()
+                block = array(typecode)
+                block.frombytes(raw)
+                if sys.byteorder != 'little':
+                    block.byteswap()
+                yield from block
+
+    def _write_run(self, path: str, values: Iterable[Any], typecode: str):
+        """Escribe valores ya ordenados por buffers de buffer_elements elementos"""
+        with BinaryDatasetWriter(path, typecode) as writer:
+            values = iter(values)
+            while True:
+                block = list(islice(values, self.buffer_elements))
+                if not block:
+                    break
+                writer.write(block)
+        self.stats['io_bytes_written'] += HEADER.size + writer.count * array(typecode).itemsize
@@ -0,0 +1,92 @@
+"""
+Medición de memoria con tracemalloc en un servidor con varios hilos
+
+tracemalloc es global al proceso: si dos ejecuciones lo inician y lo
+detienen por su cuenta, la primera en terminar apaga la medición de la otra,
+y el pico incluye lo que reservan todos los hilos. Por eso las mediciones se
+hacen de a una (con una espera acotada: si otra medición tarda demasiado la
+ejecución sigue sin medir memoria), el rastreo solo se detiene si lo inició
+la propia medición, y se lleva la cuenta de las ejecuciones en curso para
+indicar si otra corrió al mismo tiempo y pudo sumar memoria al pico.
+"""
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Espera máxima por la medición de otra ejecución antes de seguir sin medir memoria
+MEMORY_LOCK_TIMEOUT_S = 5.0
+
+# Calidad de la medición (metadata 'memory_measurement')
+MEASUREMENT_EXACT = 'exact'              # ninguna otra ejecución corrió durante la medición
+MEASUREMENT_APPROXIMATE = 'approximate'  # otra ejecución pudo reservar memoria al mismo tiempo
+MEASUREMENT_SKIPPED = 'skipped'          # no se midió (otra medición en curso o streaming)
+
+_measure_lock = threading.Lock()
+_activity_lock = threading.Lock()
+_active_runs = 0
+_started_runs = 0
+
+
+@contextmanager
+def tracking_run() -> Iterator[None]:
+    """Marca una ejecución en curso (para detectar ejecuciones simultáneas)"""
+    global _active_runs, _started_runs
+    with _activity_lock:
+        _active_runs += 1
+        _started_runs += 1
+    try:
+        yield
+    finally:
+        with _activity_lock:
+            _active_runs -= 1
+
+
+class MemoryMeasurement:
+    """
+    Mide la memoria reservada dentro de un bloque with
+
+    Al salir quedan `used_bytes` y `peak_bytes` (None si no se midió) y
+    `status` con la calidad de la medición. El bloque cuenta como una
+    ejecución en curso aunque no se mida.
+    """
+
+    def __init__(self, timeout: float = MEMORY_LOCK_TIMEOUT_S):
+        self.timeout = timeout
+        self.used_bytes: Optional[int] = None
+        self.peak_bytes: Optional[int] = None
+        self.status = MEASUREMENT_SKIPPED
+        self._locked = False
+        self._run = tracking_run()
+
+    def __enter__(self) -> 'MemoryMeasurement':
+        self._locked = _measure_lock.acquire(timeout=self.timeout)
+        self._run.__enter__()
+        if not self._locked:
+            return self
+        with _activity_lock:
+            self._alone = _active_runs == 1
+            self._started = _started_runs
+        self._owns_tracing = not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start()
+        else:
+            tracemalloc.reset_peak()
+        self._before = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if self._locked:
+                current, peak = tracemalloc.get_traced_memory()
+                if self._owns_tracing:
+                    tracemalloc.stop()
+                self.used_bytes = current - self._before
+                self.peak_bytes = peak - self._before
+                with _activity_lock:
+                    alone = self._alone and _started_runs == self._started
+                self.status = MEASUREMENT_EXACT if alone else MEASUREMENT_APPROXIMATE
+        finally:
+            self._run.__exit__(exc_type, exc, tb)
+            if self._locked:
+                _measure_lock.release()
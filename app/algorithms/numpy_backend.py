@@ -0,0 +1,342 @@
+"""
+Backend vectorizado con NumPy para entradas numéricas homogéneas
+
+NumPy es una dependencia opcional: si no está instalado NUMPY_AVAILABLE es
+False y las variantes rápidas siguen usando los motores de engines.py. Las
+listas de solo enteros (que entran en int64) o solo floats se convierten a un
+array contiguo; los resultados se devuelven como lista si la entrada era una
+lista, así la respuesta tiene la misma forma que con el backend de Python.
+"""
+from typing import Any, Dict, Optional, Tuple
+
+from app.algorithms import engines
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+# Por debajo de este tamaño convertir una lista a array no compensa
+NUMPY_MIN_SIZE = 512
+
+# Tamaño de los bloques que se ordenan fila por fila antes de las fusiones
+MERGE_BLOCK_SIZE = 1024
+
+# Bits por dígito en cada pasada de Radix Sort
+RADIX_BITS = 16
+
+# Rango máximo de valores para usar Counting Sort (tamaño del histograma)
+COUNTING_SORT_MAX_RANGE = 1 << 24
+
+# Rangos distintos como máximo al generar datos con distribución de Zipf
+ZIPF_MAX_RANKS = 1 << 16
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+def is_array(data: Any) -> bool:
+    """Indica si los datos son un array NumPy"""
+    return NUMPY_AVAILABLE and isinstance(data, np.ndarray)
+
+
+def numeric_dtype(data: Any) -> Optional[str]:
+    """
+    Devuelve 'int64' o 'float64' si los datos son numéricos homogéneos
+
+    Las listas mixtas (enteros y floats), con booleanos, strings o enteros
+    fuera del rango de int64 devuelven None; lo mismo los arrays uint64 con
+    valores mayores que el máximo de int64 (al convertirlos darían la vuelta).
+    """
+    if not NUMPY_AVAILABLE:
+        return None
+    if isinstance(data, np.ndarray):
+        if data.ndim != 1:
+            return None
+        if data.dtype.kind == 'i':
+            return 'int64'
+        if data.dtype.kind == 'u':
+            if data.dtype.itemsize < 8 or data.size == 0 or int(data.max()) <= _INT64_MAX:
+                return 'int64'
+            return None
+        if data.dtype.kind == 'f':
+            return 'float64'
+        return None
+    typecode = getattr(data, 'typecode', None)
+    if typecode is not None:
+        # array.array o dataset binario mapeado: el tipo ya es homogéneo
+        return {'q': 'int64', 'd': 'float64'}.get(typecode)
+    if not data:
+        return None
+    types = set(map(type, data))
+    if types == {int}:
+        if min(data) < _INT64_MIN or max(data) > _INT64_MAX:
+            return None
+        return 'int64'
+    if types == {float}:
+        return 'float64'
+    return None
+
+
+def accepts(data: Any) -> bool:
+    """Indica si conviene ejecutar los datos con el backend NumPy"""
+    if not NUMPY_AVAILABLE:
+        return False
+    if not isinstance(data, np.ndarray) and len(data) < NUMPY_MIN_SIZE:
+        return False
+    return numeric_dtype(data) is not None
+
+
+def as_array(data: Any) -> 'np.ndarray':
+    """Copia los datos a un array contiguo de int64 o float64"""
+    return np.array(data, dtype=numeric_dtype(data))
+
+
+def to_output(arr: 'np.ndarray', like: Any) -> Any:
+    """Devuelve el array tal cual o como lista, según el tipo de la entrada"""
+    return arr if isinstance(like, np.ndarray) else arr.tolist()
+
+
+def is_sorted(arr: 'np.ndarray') -> bool:
+    """Comprueba en O(n) vectorizado si el array está ordenado"""
+    return bool(np.all(arr[:-1] <= arr[1:]))
+
+
+def merge_sort(arr: 'np.ndarray') -> 'np.ndarray':
+    """
+    Merge Sort de abajo hacia arriba con pasadas vectorizadas
+
+    Ordena bloques de MERGE_BLOCK_SIZE elementos y luego fusiona pares de
+    bloques de ancho creciente. Cada pasada ve el array como una matriz de
+    filas de 2·ancho elementos (dos bloques ordenados por fila) y las fusiona
+    todas en una sola llamada: el ordenamiento estable de NumPy (timsort)
+    detecta las dos corridas de cada fila y las fusiona en tiempo lineal.
+    """
+    n = arr.size
+    width = MERGE_BLOCK_SIZE
+    full = n - n % width
+    arr[:full].reshape(-1, width).sort(axis=1, kind='stable')
+    arr[full:].sort(kind='stable')
+
+    while width < n:
+        span = 2 * width
+        full = n - n % span
+        if full:
+            arr[:full].reshape(-1, span).sort(axis=1, kind='stable')
+        if n - full > width:
+            # Último par incompleto: un bloque entero y uno parcial
+            arr[full:].sort(kind='stable')
+        width = span
+    return arr
+
+
+def counting_sort(arr: 'np.ndarray') -> 'np.ndarray':
+    """Counting Sort para enteros de rango acotado (histograma con bincount)"""
+    low = int(arr.min())
+    counts = np.bincount(arr - low)
+    return np.repeat(np.arange(low, low + counts.size, dtype=arr.dtype), counts)
+
+
+def radix_sort(arr: 'np.ndarray') -> 'np.ndarray':
+    """
+    Radix Sort LSD de enteros de 64 bits en dígitos de RADIX_BITS bits
+
+    Las claves se llevan a uint64 preservando el orden (invirtiendo el bit de
+    signo) y se les resta la mínima, así solo se hacen las pasadas necesarias
+    para el rango real. Cada pasada es un reordenamiento estable por dígito.
+    """
+    keys = arr.astype(np.int64).view(np.uint64) ^ np.uint64(1 << 63)
+    keys = keys - keys.min()
+    mask = np.uint64((1 << RADIX_BITS) - 1)
+    shift = 0
+    max_key = int(keys.max())
+    while max_key >> shift:
+        digits = ((keys >> np.uint64(shift)) & mask).astype(np.uint16)
+        order = np.argsort(digits, kind='stable')
+        keys = keys[order]
+        arr = arr[order]
+        shift += RADIX_BITS
+    return arr
+
+
+def integer_sort(arr: 'np.ndarray') -> Tuple['np.ndarray', str]:
+    """
+    Ordena enteros con Counting Sort si el rango es pequeño o Radix Sort si no
+
+    Returns:
+        Tupla (array ordenado, nombre del motor usado)
+    """
+    if arr.size == 0:
+        return arr, 'numpy_counting_sort'
+    value_range = int(arr.max()) - int(arr.min()) + 1
+    if value_range <= min(max(2 * arr.size, 1 << 16), COUNTING_SORT_MAX_RANGE):
+        return counting_sort(arr), 'numpy_counting_sort'
+    return radix_sort(arr), 'numpy_radix_sort'
+
+
+def profile_input(arr: 'np.ndarray') -> Dict[str, Any]:
+    """Perfil de la entrada con las mismas claves que engines.profile_input, vectorizado"""
+    n = arr.size
+    profile: Dict[str, Any] = {
+        'size': n,
+        'dtype': 'int' if arr.dtype.kind in 'iu' else 'float',
+        'runs': int(np.count_nonzero(arr[1:] < arr[:-1])) + 1 if n else 0,
+        'descending_runs': int(np.count_nonzero(arr[1:] > arr[:-1])) + 1 if n else 0,
+        'min': arr.min().item() if n else None,
+        'max': arr.max().item() if n else None
+    }
+    profile['value_range'] = profile['max'] - profile['min'] if n else None
+    sample = arr[::max(1, n // engines.PROFILE_SAMPLE_SIZE)].tolist()
+    profile.update(engines.sample_profile(sample))
+    return profile
+
+
+def adaptive_sort(arr: 'np.ndarray', strategy: str) -> Tuple['np.ndarray', str]:
+    """
+    Ordena con el equivalente NumPy de la estrategia de engines.choose_sort_strategy
+
+    Las fusiones de corridas usan el ordenamiento estable (timsort, que
+    detecta las corridas) y el caso general el introsort de NumPy.
+
+    Returns:
+        Tupla (array ordenado, nombre del motor usado)
+    """
+    if strategy == 'already_sorted':
+        return arr, 'numpy_already_sorted'
+    if strategy in ('run_merge', 'reverse_run_merge'):
+        if strategy == 'reverse_run_merge':
+            arr = arr[::-1].copy()
+        arr.sort(kind='stable')
+        return arr, 'numpy_timsort'
+    if strategy == 'counting_sort':
+        return counting_sort(arr), 'numpy_counting_sort'
+    if strategy == 'radix_sort':
+        return radix_sort(arr), 'numpy_radix_sort'
+    arr.sort(kind='quicksort')
+    return arr, 'numpy_introsort'
+
+
+def smallest_k(arr: 'np.ndarray', k: int) -> 'np.ndarray':
+    """Los k menores, ordenados: partición O(n) con np.partition y orden de solo esos k"""
+    smallest = np.partition(arr, k - 1)[:k]
+    smallest.sort()
+    return smallest
+
+
+def select_kth(arr: 'np.ndarray', k: int) -> Any:
+    """El k-ésimo menor elemento (k desde 1) con np.partition (introselect)"""
+    return np.partition(arr, k - 1)[k - 1].item()
+
+
+def searchsorted_batch(sorted_arr: 'np.ndarray', targets: Any) -> Tuple['np.ndarray', 'np.ndarray']:
+    """
+    Busca muchos valores a la vez en un array ordenado
+
+    Returns:
+        Tupla (índice de la primera aparición o de inserción, máscara de encontrados)
+    """
+    targets = np.asarray(targets)
+    indices = np.searchsorted(sorted_arr, targets, side='left')
+    if sorted_arr.size == 0:
+        return indices, np.zeros(targets.shape, dtype=bool)
+    clipped = np.minimum(indices, sorted_arr.size - 1)
+    found = (indices < sorted_arr.size) & (sorted_arr[clipped] == targets)
+    return indices, found
+
+
+def batch_search(sorted_arr: 'np.ndarray', targets: Any) -> list:
+    """Búsqueda binaria vectorizada de muchos targets (en cualquier orden)"""
+    indices, found = searchsorted_batch(sorted_arr, targets)
+    values = sorted_arr[np.minimum(indices, max(sorted_arr.size - 1, 0))].tolist() if sorted_arr.size else []
+    return [
+        {'found': True, 'index': index, 'value': values[i]} if hit
+        else {'found': False, 'index': -1, 'value': None}
+        for i, (index, hit) in enumerate(zip(indices.tolist(), found.tolist()))
+    ]
+
+
+def binary_search(sorted_arr: 'np.ndarray', target: Any) -> dict:
+    """Búsqueda binaria de un valor con np.searchsorted"""
+    indices, found = searchsorted_batch(sorted_arr, [target])
+    if found[0]:
+        index = int(indices[0])
+        return {'found': True, 'index': index, 'value': sorted_arr[index].item()}
+    return {'found': False, 'index': -1, 'value': None}
+
+
+def linear_search(arr: 'np.ndarray', target: Any) -> dict:
+    """Búsqueda lineal vectorizada (primera aparición)"""
+    hits = np.flatnonzero(arr == target)
+    if hits.size:
+        index = int(hits[0])
+        return {'found': True, 'index': index, 'value': arr[index].item()}
+    return {'found': False, 'index': -1, 'value': None}
+
+
+def _sorted_uniform_ints(rng: 'np.random.Generator', size: int, min_val: int, max_val: int) -> 'np.ndarray':
+    """
+    Enteros uniformes ordenados sin ordenar: sumas acumuladas de size + 1
+    espaciamientos exponenciales, normalizadas, son los estadísticos de
+    orden de size uniformes en [0, 1)
+    """
+    spacings = np.cumsum(rng.standard_exponential(size + 1))
+    uniforms = spacings[:-1] / spacings[-1]
+    offsets = np.minimum((uniforms * (max_val - min_val + 1)).astype(np.int64), max_val - min_val)
+    return min_val + offsets
+
+
+def generate(data_type: str, size: int, min_val: int = 1, max_val: int = 1000,
+             swaps: int = 10, seed: Optional[int] = None, distinct: int = 10, teeth: int = 10,
+             exponent: float = 1.2) -> 'np.ndarray':
+    """
+    Genera datos numéricos directamente como array int64
+
+    Args:
+        data_type: 'random', 'sorted', 'reverse', 'nearly_sorted',
+            'many_duplicates', 'sawtooth', 'organ_pipe' o 'zipf'
+        size: Tamaño del array
+        min_val: Valor mínimo
+        max_val: Valor máximo
+        swaps: Intercambios aleatorios para 'nearly_sorted'
+        seed: Semilla del generador
+        distinct: Valores distintos para 'many_duplicates'
+        teeth: Rampas para 'sawtooth'
+        exponent: Exponente de 'zipf'
+    """
+    if not NUMPY_AVAILABLE:
+        raise ValueError("NumPy no está instalado")
+    if min_val > max_val:
+        raise ValueError("min_val no puede ser mayor que max_val")
+    rng = np.random.default_rng(seed)
+    span = max_val - min_val + 1
+    if data_type == 'random':
+        return rng.integers(min_val, max_val, size=size, endpoint=True, dtype=np.int64)
+    if data_type == 'sorted':
+        return _sorted_uniform_ints(rng, size, min_val, max_val)
+    if data_type == 'reverse':
+        return _sorted_uniform_ints(rng, size, min_val, max_val)[::-1].copy()
+    if data_type == 'nearly_sorted':
+        arr = _sorted_uniform_ints(rng, size, min_val, max_val)
+        i = rng.integers(0, size, size=swaps)
+        j = rng.integers(0, size, size=swaps)
+        for a, b in zip(i, j):
+            arr[a], arr[b] = arr[b], arr[a]
+        return arr
+    if data_type == 'many_duplicates':
+        values = min_val + rng.choice(span, size=min(distinct, span), replace=False)
+        return values[rng.integers(0, values.size, size=size)].astype(np.int64)
+    positions = np.arange(size, dtype=np.int64)
+    if data_type == 'sawtooth':
+        period = max(1, -(-size // teeth))
+        return min_val + ((positions % period) * (span / period)).astype(np.int64)
+    if data_type == 'organ_pipe':
+        half = max(1, (size + 1) // 2)
+        return min_val + (np.minimum(positions, size - 1 - positions) * (span / half)).astype(np.int64)
+    if data_type == 'zipf':
+        ranks = min(span, ZIPF_MAX_RANKS)
+        cum_weights = np.cumsum(np.arange(1, ranks + 1, dtype=np.float64) ** -exponent)
+        draws = rng.random(size) * cum_weights[-1]
+        return min_val + np.searchsorted(cum_weights, draws, side='right').astype(np.int64)
+    raise ValueError(f"Tipo de datos '{data_type}' no soportado para arrays")
@@ -0,0 +1,335 @@
+"""
+Ordenamientos paralelos en varios procesos
+
+Los datos numéricos homogéneos (enteros de 64 bits o floats) se copian una
+sola vez a memoria compartida y cada proceso ordena su partición en el
+lugar; solo viajan por el canal los límites de cada partición y los tiempos.
+El resto de los datos se envía por partición con pickle.
+
+- Merge Sort por bloques: cada proceso ordena un bloque contiguo y el proceso
+  principal fusiona los bloques ordenados.
+- Sample Sort (PSRS, ordenamiento paralelo por muestreo regular): cada
+  proceso ordena su bloque y toma muestras regulares; con ellas se eligen
+  los pivotes que dividen los datos en cubetas, y cada proceso fusiona la
+  parte de cada bloque que cae en su cubeta.
+
+Dentro de un proceso trabajador (daemon) no se pueden crear procesos hijos:
+en ese caso los ordenamientos se ejecutan con un solo proceso.
+
+Hay un único pool de `max_workers()` procesos (PARALLEL_MAX_WORKERS, por
+defecto los núcleos disponibles); cada ordenamiento envía al pool tantas
+particiones como procesos use, nunca más que ese máximo.
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.algorithms.binary_format import typecode_for
+from app.algorithms.trace import TRACE_NONE
+
+# Por debajo de este tamaño de partición no conviene agregar otro proceso
+MIN_PARTITION_SIZE = 4096
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_size = 0
+_executor_lock = threading.Lock()
+
+
+def default_workers() -> int:
+    """Cantidad de procesos por defecto (núcleos disponibles)"""
+    return os.cpu_count() or 1
+
+
+def max_workers() -> int:
+    """Máximo de procesos por ordenamiento y tamaño del pool (PARALLEL_MAX_WORKERS)"""
+    return max(1, int(os.getenv('PARALLEL_MAX_WORKERS') or default_workers()))
+
+
+def effective_workers(size: int, requested: Optional[int] = None) -> int:
+    """Procesos a usar: los pedidos, hasta max_workers() y sin particiones menores a MIN_PARTITION_SIZE"""
+    if multiprocessing.current_process().daemon:
+        return 1
+    workers = min(requested or default_workers(), max_workers())
+    return max(1, min(workers, size // MIN_PARTITION_SIZE))
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Pool de procesos compartido (se recrea solo si cambia max_workers())"""
+    global _executor, _executor_size
+    size = max_workers()
+    with _executor_lock:
+        previous = None
+        if _executor is not None and _executor_size != size:
+            previous, _executor = _executor, None
+        if _executor is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            _executor = ProcessPoolExecutor(max_workers=size, mp_context=context)
+            _executor_size = size
+        executor = _executor
+    if previous is not None:
+        previous.shutdown(wait=False)
+    return executor
+
+
+def shutdown_executors():
+    """Detiene el pool de procesos"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(cancel_futures=True)
+
+
+atexit.register(shutdown_executors)
+
+
+def partition_bounds(size: int, parts: int) -> List[Tuple[int, int]]:
+    """Divide [0, size) en `parts` rangos contiguos de tamaño parecido"""
+    return [(size * i // parts, size * (i + 1) // parts) for i in range(parts)]
+
+
+# Funciones que se ejecutan en los procesos trabajadores
+
+def _sort_shared_block(name: str, typecode: str, start: int, stop: int,
+                       samples: int = 0) -> Tuple[float, int, List[Any]]:
+    """Ordena en el lugar un bloque de la memoria compartida; devuelve tiempo, pid y muestras regulares"""
+    begin = time.perf_counter()
+    shm = SharedMemory(name=name)
+    view = shm.buf.cast(typecode)
+    try:
+        block = view[start:stop].tolist()
+        block.sort()
+        view[start:stop] = array(typecode, block)
+    finally:
+        view.release()
+        shm.close()
+    picks = [block[len(block) * i // samples] for i in range(samples)] if samples and block else []
+    return (time.perf_counter() - begin) * 1000, os.getpid(), picks
+
+
+def _merge_shared_segments(name: str, out_name: str, typecode: str, segments: List[Tuple[int, int]],
+                           offset: int) -> Tuple[float, int]:
+    """Fusiona segmentos ordenados de la entrada y escribe la cubeta en la salida desde offset"""
+    begin = time.perf_counter()
+    shm = SharedMemory(name=name)
+    out = SharedMemory(name=out_name)
+    view = shm.buf.cast(typecode)
+    out_view = out.buf.cast(typecode)
+    try:
+        # Concatenar corridas ordenadas y ordenar: timsort las detecta y solo las fusiona
+        bucket = list(chain.from_iterable(view[a:b].tolist() for a, b in segments))
+        bucket.sort()
+        out_view[offset:offset + len(bucket)] = array(typecode, bucket)
+    finally:
+        view.release()
+        out_view.release()
+        shm.close()
+        out.close()
+    return (time.perf_counter() - begin) * 1000, os.getpid()
+
+
+def _sort_list(values: List[Any], algorithm: Any = None) -> Tuple[List[Any], float, int, Optional[int]]:
+    """Ordena una partición enviada por pickle (con el algoritmo instrumentado si se indica)"""
+    begin = time.perf_counter()
+    comparisons = None
+    if algorithm is not None:
+        algorithm.reset_metrics(TRACE_NONE)
+        values = algorithm.execute(values)
+        comparisons = algorithm.comparisons
+    else:
+        values.sort()
+    return values, (time.perf_counter() - begin) * 1000, os.getpid(), comparisons
+
+
+# Orquestación en el proceso principal
+
+def _map(workers: int, fn: Callable, calls: List[tuple]) -> List[Any]:
+    """Ejecuta las llamadas en el pool (o en este proceso si workers == 1) respetando el orden"""
+    if workers == 1:
+        return [fn(*args) for args in calls]
+    executor = get_executor()
+    futures = [executor.submit(fn, *args) for args in calls]
+    return [future.result() for future in futures]
+
+
+def _shared_copy(data: List[Any], typecode: str) -> SharedMemory:
+    raw = array(typecode, data)
+    shm = SharedMemory(create=True, size=max(1, len(raw) * raw.itemsize))
+    view = shm.buf.cast(typecode)
+    view[:len(raw)] = raw
+    view.release()
+    return shm
+
+
+def _read_shared(shm: SharedMemory, typecode: str, size: int) -> List[Any]:
+    view = shm.buf.cast(typecode)
+    try:
+        return view[:size].tolist()
+    finally:
+        view.release()
+
+
+def _stats(workers: int, times: List[float], pids: List[int], sizes: List[int], phase_ms: float) -> Dict[str, Any]:
+    return {
+        'workers': workers,
+        'worker_times_ms': [round(t, 4) for t in times],
+        'worker_pids': pids,
+        'partition_sizes': sizes,
+        'partition_phase_ms': round(phase_ms, 4),
+        # Trabajo total de los procesos sobre el tiempo de pared de la fase paralela
+        'speedup_estimate': round(sum(times) / phase_ms, 3) if phase_ms > 0 else None
+    }
+
+
+def chunked_merge_sort(data: List[Any], workers: int,
+                       merge: Optional[Callable[[List[List[Any]]], List[Any]]] = None,
+                       algorithm: Any = None) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Merge Sort por bloques: cada proceso ordena un bloque y luego se fusionan
+
+    Args:
+        data: Datos a ordenar (no se modifican)
+        workers: Cantidad de procesos
+        merge: Fusión de los bloques ordenados (por defecto timsort sobre la
+            concatenación, que detecta los bloques como corridas)
+        algorithm: Algoritmo instrumentado para ordenar cada bloque (cuenta
+            comparaciones; fuerza el envío por pickle)
+
+    Returns:
+        Tupla (lista ordenada, métricas)
+    """
+    bounds = partition_bounds(len(data), workers)
+    # Con un solo proceso copiar a memoria compartida no aporta nada
+    typecode = typecode_for(data) if algorithm is None and workers > 1 and data else None
+    begin = time.perf_counter()
+
+    if typecode is not None:
+        shm = _shared_copy(data, typecode)
+        try:
+            outcomes = _map(workers, _sort_shared_block, [(shm.name, typecode, a, b) for a, b in bounds])
+            phase_ms = (time.perf_counter() - begin) * 1000
+            merged = _read_shared(shm, typecode, len(data))
+        finally:
+            shm.close()
+            shm.unlink()
+        blocks = [merged[a:b] for a, b in bounds] if merge is not None else None
+        comparisons = None
+    else:
+        outcomes = _map(workers, _sort_list, [(list(data[a:b]), algorithm) for a, b in bounds])
+        phase_ms = (time.perf_counter() - begin) * 1000
+        blocks = [outcome[0] for outcome in outcomes]
+        merged = list(chain.from_iterable(blocks))
+        outcomes = [outcome[1:] for outcome in outcomes]
+        comparisons = sum(outcome[2] for outcome in outcomes) if algorithm is not None else None
+
+    merge_begin = time.perf_counter()
+    if merge is not None:
+        merged = merge(blocks)
+    else:
+        merged.sort()
+    stats = _stats(workers, [o[0] for o in outcomes], [o[1] for o in outcomes],
+                   [b - a for a, b in bounds], phase_ms)
+    stats['merge_ms'] = round((time.perf_counter() - merge_begin) * 1000, 4)
+    stats['shared_memory'] = typecode is not None
+    if comparisons is not None:
+        stats['worker_comparisons'] = comparisons
+    return merged, stats
+
+
+def choose_splitters(samples: List[Any], buckets: int) -> List[Any]:
+    """Elige buckets - 1 pivotes equiespaciados de las muestras ordenadas"""
+    samples = sorted(samples)
+    return [samples[len(samples) * i // buckets] for i in range(1, buckets)]
+
+
+def sample_sort(data: List[Any], workers: int, oversampling: int = 0,
+                locate: Optional[Callable[[List[Any], Any], int]] = None,
+                algorithm: Any = None) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Sample Sort: divide los datos en cubetas con pivotes muestreados
+
+    Con datos numéricos usa PSRS en memoria compartida (ver el docstring del
+    módulo). Con el resto, el proceso principal muestrea, reparte cada
+    elemento en su cubeta (`locate`, por defecto bisect) y los procesos
+    ordenan las cubetas.
+
+    Args:
+        data: Datos a ordenar (no se modifican)
+        workers: Cantidad de procesos (y de cubetas)
+        oversampling: Muestras por cubeta (por defecto, tantas como cubetas)
+        locate: Cubeta de un valor dados los pivotes (para contar comparaciones)
+        algorithm: Algoritmo instrumentado para ordenar cada cubeta
+
+    Returns:
+        Tupla (lista ordenada, métricas)
+    """
+    oversampling = oversampling or workers
+    typecode = typecode_for(data) if algorithm is None and locate is None and workers > 1 and data else None
+    begin = time.perf_counter()
+
+    if typecode is not None:
+        bounds = partition_bounds(len(data), workers)
+        shm = _shared_copy(data, typecode)
+        out = SharedMemory(create=True, size=shm.size)
+        try:
+            # Fase 1: ordenar bloques y tomar muestras regulares
+            first = _map(workers, _sort_shared_block,
+                         [(shm.name, typecode, a, b, oversampling) for a, b in bounds])
+            splitters = choose_splitters(list(chain.from_iterable(o[2] for o in first)), workers)
+
+            # Límites de cada cubeta dentro de cada bloque ordenado
+            view = shm.buf.cast(typecode)
+            try:
+                cuts = [[a] + [bisect_right(view, s, a, b) for s in splitters] + [b] for a, b in bounds]
+            finally:
+                view.release()
+            segments = [[(cut[j], cut[j + 1]) for cut in cuts] for j in range(workers)]
+            sizes = [sum(b - a for a, b in bucket) for bucket in segments]
+            offsets = [sum(sizes[:j]) for j in range(workers)]
+
+            # Fase 2: cada proceso fusiona las partes de su cubeta
+            second = _map(workers, _merge_shared_segments,
+                          [(shm.name, out.name, typecode, segments[j], offsets[j]) for j in range(workers)])
+            phase_ms = (time.perf_counter() - begin) * 1000
+            result = _read_shared(out, typecode, len(data))
+        finally:
+            for segment in (shm, out):
+                segment.close()
+                segment.unlink()
+        times = [a[0] + b[0] for a, b in zip(first, second)]
+        stats = _stats(workers, times, [o[1] for o in second], sizes, phase_ms)
+        stats['splitters'] = splitters
+        stats['shared_memory'] = True
+        return result, stats
+
+    step = max(1, len(data) // (workers * oversampling))
+    splitters = choose_splitters(data[::step], workers)
+    locate = locate or bisect_right
+    if workers == 1:
+        buckets = [list(data)]
+    else:
+        buckets = [[] for _ in range(workers)]
+        for value in data:
+            buckets[locate(splitters, value)].append(value)
+    partition_ms = (time.perf_counter() - begin) * 1000
+
+    sort_begin = time.perf_counter()
+    outcomes = _map(workers, _sort_list, [(bucket, algorithm) for bucket in buckets])
+    phase_ms = (time.perf_counter() - sort_begin) * 1000
+    result = list(chain.from_iterable(outcome[0] for outcome in outcomes))
+    stats = _stats(workers, [o[1] for o in outcomes], [o[2] for o in outcomes],
+                   [len(bucket) for bucket in buckets], phase_ms)
+    stats['splitters'] = splitters
+    stats['bucketing_ms'] = round(partition_ms, 4)
+    stats['shared_memory'] = False
+    if algorithm is not None:
+        stats['worker_comparisons'] = sum(o[3] for o in outcomes)
+    return result, stats
@@ -1,15 +1,62 @@
 from app.algorithms.base import AlgorithmBase
+from app.algorithms import engines, numpy_backend
+from app.algorithms.dataset import Dataset
+from app.algorithms.binary_format import MappedDataset
+import math
 from typing import List, Any, Optional, Dict
 
 class LinearSearch(AlgorithmBase):
     """Implementación de Búsqueda Lineal"""
     
+    fast_engine = 'list_index'
+    mutates_input = False
+    requires_target = True
+    
     def __init__(self):
         super().__init__(
             name="Linear Search",
             description="Busca un elemento en una lista recorriéndola secuencialmente"
         )
     
+    def estimate_comparisons(self, n: int) -> float:
+        """La búsqueda lineal hace hasta n comparaciones"""
+        return max(1, n)
+    
+    def execute_fast(self, data: List[Any], **kwargs) -> Dict[str, Any]:
+        """Búsqueda lineal sin instrumentación"""
+        target = kwargs.get('target')
+        if target is None:
+            raise ValueError("Se requiere el parámetro 'target' para la búsqueda")
+        if numpy_backend.is_array(data):
+            self.extra_metrics.update(backend='numpy', engine='numpy_flatnonzero')
+            return numpy_backend.linear_search(data, target)
+        return engines.linear_search(data, target)
+    
+    def execute_batch(self, data: List[Any], targets: List[Any], fast: bool = False,
+                      **kwargs) -> List[Dict[str, Any]]:
+        """Busca todos los targets en un solo recorrido de la lista"""
+        self.extra_metrics['strategy'] = 'single_pass'
+        if fast:
+            return engines.hash_batch_search(data, targets)
+        
+        pending = set(targets)
+        first_index = {}
+        for i, item in enumerate(data):
+            if i % 1024 == 0:
+                self._check_cancelled()
+            self.comparisons += 1
+            if item in pending:
+                first_index[item] = i
+                pending.discard(item)
+                if not pending:
+                    break
+        
+        return [
+            {'found': True, 'index': first_index[target], 'value': data[first_index[target]]}
+            if target in first_index else {'found': False, 'index': -1, 'value': None}
+            for target in targets
+        ]
+    
     def execute(self, data: List[Any], **kwargs) -> Dict[str, Any]:
         """Ejecuta búsqueda lineal"""
         target = kwargs.get('target')
@@ -18,7 +65,7 @@ class LinearSearch(AlgorithmBase):
         
         for i, item in enumerate(data):
             self.comparisons += 1
-            self.steps.append({
+            self.record_step({
                 'action': 'compare',
                 'index': i,
                 'value': item,
@@ -41,22 +88,120 @@ class LinearSearch(AlgorithmBase):
 class BinarySearch(AlgorithmBase):
     """Implementación de Búsqueda Binaria"""
     
+    fast_engine = 'bisect'
+    mutates_input = False
+    requires_target = True
+    
     def __init__(self):
         super().__init__(
             name="Binary Search",
             description="Busca un elemento en una lista ordenada dividiendo repetidamente el espacio de búsqueda a la mitad"
         )
     
+    def estimate_comparisons(self, n: int) -> float:
+        """La búsqueda binaria hace hasta log2(n) + 1 comparaciones"""
+        return math.log2(n) + 1 if n > 0 else 1
+    
+    def _check_sorted(self, data: List[Any], assume_sorted: bool = False):
+        """
+        Verifica que la entrada esté ordenada sin ordenarla
+        
+        Con assume_sorted=True no se comprueba nada (el llamador garantiza el
+        orden); un Dataset o un dataset binario reutiliza el orden ya
+        calculado (o el registrado en la cabecera del archivo); en otro caso se
+        recorre la lista una vez, en O(n). La metadata indica qué se hizo.
+        """
+        if assume_sorted:
+            self.extra_metrics['sorted_check'] = 'trusted'
+            return
+        if isinstance(data, (Dataset, MappedDataset)):
+            self.extra_metrics['sorted_check'] = 'cached' if data.sortedness_known else 'scanned'
+            ordered = data.is_sorted
+        elif numpy_backend.is_array(data):
+            self.extra_metrics['sorted_check'] = 'scanned'
+            ordered = numpy_backend.is_sorted(data)
+        else:
+            self.extra_metrics['sorted_check'] = 'scanned'
+            ordered = engines.is_sorted(data)
+        if not ordered:
+            raise ValueError("La lista debe estar ordenada para usar Binary Search")
+    
+    def execute_fast(self, data: List[Any], **kwargs) -> Dict[str, Any]:
+        """Búsqueda binaria sin instrumentación (bisect, o np.searchsorted para arrays)"""
+        target = kwargs.get('target')
+        if target is None:
+            raise ValueError("Se requiere el parámetro 'target' para la búsqueda")
+        self._check_sorted(data, kwargs.get('assume_sorted', False))
+        if numpy_backend.is_array(data):
+            self.extra_metrics.update(backend='numpy', engine='numpy_searchsorted')
+            return numpy_backend.binary_search(data, target)
+        return engines.binary_search(data, target)
+    
+    def execute_batch(self, data: List[Any], targets: List[Any], fast: bool = False,
+                      **kwargs) -> List[Dict[str, Any]]:
+        """
+        Busca muchos targets verificando el orden una sola vez
+        
+        Con targets ordenados y suficientes como para que convenga, recorre la
+        lista una vez al estilo merge (O(n + m)); si no, hace una búsqueda
+        binaria por target (O(m log n)). Las variantes rápidas sobre arrays
+        usan np.searchsorted vectorizado.
+        """
+        self._check_sorted(data, kwargs.get('assume_sorted', False))
+        
+        if fast and numpy_backend.is_array(data):
+            self.extra_metrics.update(backend='numpy', strategy='searchsorted')
+            return numpy_backend.batch_search(data, targets)
+        
+        targets_sorted = engines.is_sorted(targets)
+        strategy = engines.choose_batch_strategy(len(data), len(targets), targets_sorted)
+        self.extra_metrics['strategy'] = strategy
+        
+        if fast:
+            if strategy == 'merge_sweep':
+                return engines.merge_sweep_search(data, targets)
+            return engines.bisect_batch_search(data, targets, targets_sorted)
+        
+        if strategy == 'bisect':
+            return [self._bisect(data, target) for target in targets]
+        
+        results = []
+        n = len(data)
+        i = 0
+        for target in targets:
+            self._check_cancelled()
+            while i < n:
+                self.comparisons += 1
+                if not data[i] < target:
+                    break
+                i += 1
+            if i < n:
+                self.comparisons += 1
+                if data[i] == target:
+                    results.append({'found': True, 'index': i, 'value': data[i]})
+                    continue
+            results.append({'found': False, 'index': -1, 'value': None})
+        return results
+    
     def execute(self, data: List[Any], **kwargs) -> Dict[str, Any]:
-        """Ejecuta búsqueda binaria"""
+        """
+        Ejecuta búsqueda binaria
+        
+        Args:
+            data: Lista ordenada (no se copia ni se ordena)
+            target: Valor a buscar
+            assume_sorted: Omitir la verificación de orden
+        """
         target = kwargs.get('target')
         if target is None:
             raise ValueError("Se requiere el parámetro 'target' para la búsqueda")
         
         # Verificar si la lista está ordenada
-        if data != sorted(data):
-            raise ValueError("La lista debe estar ordenada para usar Binary Search")
-        
+        self._check_sorted(data, kwargs.get('assume_sorted', False))
+        return self._bisect(data, target)
+    
+    def _bisect(self, data: List[Any], target: Any) -> Dict[str, Any]:
+        """Búsqueda binaria instrumentada sobre datos ya verificados"""
         left, right = 0, len(data) - 1
         
         while left <= right:
@@ -64,7 +209,7 @@ class BinarySearch(AlgorithmBase):
             mid_value = data[mid]
             
             self.comparisons += 1
-            self.steps.append({
+            self.record_step({
                 'action': 'compare',
                 'left': left,
                 'right': right,
@@ -0,0 +1,225 @@
+from app.algorithms.base import AlgorithmBase
+from app.algorithms.sorting import QuickSort
+from app.algorithms import engines, numpy_backend
+from itertools import islice
+from typing import List, Any, Optional, Dict
+import heapq
+import math
+
+def selection_k(data: List[Any], k: Optional[int]) -> int:
+    """Valida el parámetro k (desde 1); sin k se usa la mediana, (n + 1) // 2"""
+    n = len(data)
+    if k is None:
+        return (n + 1) // 2
+    if isinstance(k, bool) or not isinstance(k, int):
+        raise ValueError("El parámetro 'k' debe ser un entero")
+    if not 1 <= k <= n:
+        raise ValueError(f"El parámetro 'k' debe estar entre 1 y {n:,}")
+    return k
+
+def _fast_smallest_k(algorithm: AlgorithmBase, data: List[Any], k: int) -> List[Any]:
+    """k menores ordenados sin instrumentación (motor de PartialSort y HeapTopK)"""
+    if numpy_backend.accepts(data):
+        algorithm.extra_metrics.update(backend='numpy', engine='numpy_partition_sort')
+        arr = data if numpy_backend.is_array(data) else numpy_backend.as_array(data)
+        return numpy_backend.to_output(numpy_backend.smallest_k(arr, k), data)
+    result, algorithm.extra_metrics['engine'] = engines.smallest_k(data, k)
+    return result
+
+class QuickSelect(QuickSort):
+    """Implementación de Quickselect (introselect)"""
+    
+    fast_engine = 'select_kth'
+    selection = True
+    
+    # Particiones permitidas (por bit del tamaño) antes de pasar a Heap Sort
+    depth_factor = 2
+    
+    def __init__(self):
+        AlgorithmBase.__init__(
+            self,
+            name="Quickselect",
+            description="Encuentra el k-ésimo menor elemento particionando solo el lado que lo contiene"
+        )
+    
+    def estimate_comparisons(self, n: int) -> float:
+        """Con pivote mediana de tres, unas 3n comparaciones en promedio"""
+        return max(1, 3 * n)
+    
+    def execute_fast(self, data: List[Any], **kwargs) -> Dict[str, Any]:
+        """k-ésimo menor con heapq o timsort (np.partition si aplica)"""
+        k = selection_k(data, kwargs.get('k'))
+        if numpy_backend.accepts(data):
+            self.extra_metrics.update(backend='numpy', engine='numpy_introselect')
+            arr = data if numpy_backend.is_array(data) else numpy_backend.as_array(data)
+            return {'k': k, 'value': numpy_backend.select_kth(arr, k)}
+        value, self.extra_metrics['engine'] = engines.select_kth(data, k)
+        return {'k': k, 'value': value}
+    
+    def execute(self, data: List[Any], **kwargs) -> Dict[str, Any]:
+        """Ejecuta Quickselect; devuelve el k-ésimo menor elemento"""
+        arr = data.copy()
+        k = selection_k(arr, kwargs.get('k'))
+        self._select(arr, k - 1)
+        return {'k': k, 'value': arr[k - 1]}
+    
+    def _select(self, arr: List[Any], target: int):
+        """
+        Deja en arr[target] el valor que le corresponde en la lista ordenada,
+        con los menores o iguales antes y los mayores o iguales después
+        
+        Usa la partición de Hoare de Quick Sort pero sigue solo por el lado
+        que contiene la posición buscada: O(n) en promedio. Si las
+        particiones salen desparejas demasiadas veces (más de depth_factor
+        por bit del tamaño) el rango restante se ordena con Heap Sort, así el
+        peor caso queda en O(n log n).
+        """
+        low, high = 0, len(arr) - 1
+        depth = self.depth_factor * max(1, len(arr).bit_length())
+        partitions = 0
+        self.extra_metrics['heap_fallback'] = False
+        while low < high:
+            self._check_cancelled()
+            if partitions == depth:
+                self.extra_metrics['heap_fallback'] = True
+                self._heap_sort_range(arr, low, high)
+                break
+            partitions += 1
+            left_high, right_low = self._partition(arr, low, high)
+            if target <= left_high:
+                high = left_high
+            elif target >= right_low:
+                low = right_low
+            else:
+                # Entre las dos partes solo quedan valores iguales al pivote
+                break
+        self.extra_metrics['partitions'] = partitions
+    
+    def _heap_sort_range(self, arr: List[Any], low: int, high: int):
+        """Heap Sort de arr[low:high + 1] en el lugar"""
+        size = high - low + 1
+        for root in range(size // 2 - 1, -1, -1):
+            self._sift_down(arr, low, root, size)
+        for end in range(size - 1, 0, -1):
+            arr[low], arr[low + end] = arr[low + end], arr[low]
+            self.swaps += 1
+            self.record_change('swap', arr, [low, low + end])
+            self._sift_down(arr, low, 0, end)
+    
+    def _sift_down(self, arr: List[Any], offset: int, root: int, size: int):
+        """Hunde la raíz de un max heap guardado en arr[offset:offset + size]"""
+        while True:
+            child = 2 * root + 1
+            if child >= size:
+                return
+            if child + 1 < size:
+                self.comparisons += 1
+                if arr[offset + child] < arr[offset + child + 1]:
+                    child += 1
+            self.comparisons += 1
+            if not arr[offset + root] < arr[offset + child]:
+                return
+            parent, child_index = offset + root, offset + child
+            arr[parent], arr[child_index] = arr[child_index], arr[parent]
+            self.swaps += 1
+            self.record_change('heapify', arr, [parent, child_index])
+            root = child
+
+class PartialSort(QuickSelect):
+    """Implementación de ordenamiento parcial (los k menores, ordenados)"""
+    
+    fast_engine = 'smallest_k'
+    
+    def __init__(self):
+        AlgorithmBase.__init__(
+            self,
+            name="Partial Sort",
+            description="Ordena solo los k menores: los separa con Quickselect y ordena esos k con Quick Sort"
+        )
+    
+    def estimate_comparisons(self, n: int) -> float:
+        """Selección (unas 3n) más ordenar la mitad con el k por defecto"""
+        return 3 * n + (n / 2) * math.log2(n / 2) if n > 2 else 1
+    
+    def execute_fast(self, data: List[Any], **kwargs) -> List[Any]:
+        """k menores con heapq.nsmallest o timsort (np.partition si aplica)"""
+        return _fast_smallest_k(self, data, selection_k(data, kwargs.get('k')))
+    
+    def execute(self, data: List[Any], **kwargs) -> List[Any]:
+        """
+        Ejecuta el ordenamiento parcial
+        
+        Quickselect deja los k menores al principio (con el k-ésimo en su
+        lugar) y Quick Sort ordena los k - 1 anteriores: O(n + k log k).
+        """
+        arr = data.copy()
+        k = selection_k(arr, kwargs.get('k'))
+        self._select(arr, k - 1)
+        self._sort_range(arr, 0, k - 2)
+        return arr[:k]
+
+class _MaxHeapEntry:
+    """Valor en el heap de los k menores (orden invertido: heapq es un min-heap); cuenta las comparaciones"""
+    
+    __slots__ = ('value', 'owner')
+    
+    def __init__(self, value: Any, owner: AlgorithmBase):
+        self.value = value
+        self.owner = owner
+    
+    def __lt__(self, other: '_MaxHeapEntry') -> bool:
+        self.owner.comparisons += 1
+        return other.value < self.value
+
+class HeapTopK(AlgorithmBase):
+    """Implementación de top-k con un heap acotado"""
+    
+    fast_engine = 'smallest_k'
+    mutates_input = False
+    selection = True
+    
+    def __init__(self):
+        super().__init__(
+            name="Heap Top-k",
+            description="Obtiene los k menores recorriendo la lista una vez con un heap de k elementos"
+        )
+    
+    def estimate_comparisons(self, n: int) -> float:
+        """Una comparación por elemento contra la raíz más los reemplazos en el heap"""
+        return max(1, 2 * n)
+    
+    def execute_fast(self, data: List[Any], **kwargs) -> List[Any]:
+        """k menores con heapq.nsmallest o timsort (np.partition si aplica)"""
+        return _fast_smallest_k(self, data, selection_k(data, kwargs.get('k')))
+    
+    def execute(self, data: List[Any], **kwargs) -> List[Any]:
+        """
+        Ejecuta top-k con heapq
+        
+        Los primeros k elementos forman un max heap; cada elemento siguiente
+        se compara con la raíz (el mayor de los k menores vistos) y, si es
+        menor, la reemplaza. No modifica la entrada y usa O(k) memoria
+        adicional: O(n log k) comparaciones. Los intercambios cuentan los
+        reemplazos de la raíz.
+        """
+        k = selection_k(data, kwargs.get('k'))
+        values = iter(data)
+        heap = [_MaxHeapEntry(value, self) for value in islice(values, k)]
+        heapq.heapify(heap)
+        
+        for i, value in enumerate(values, k):
+            if i % 1024 == 0:
+                self._check_cancelled()
+            self.comparisons += 1
+            if value < heap[0].value:
+                evicted = heapq.heapreplace(heap, _MaxHeapEntry(value, self))
+                self.swaps += 1
+                self.record_step({
+                    'action': 'heap_replace',
+                    'index': i,
+                    'value': value,
+                    'evicted': evicted.value
+                })
+        
+        heap.sort()
+        return [entry.value for entry in reversed(heap)]
@@ -0,0 +1,407 @@
+"""
+Lista ordenada por bloques con métricas
+
+SortedList guarda los elementos en bloques ordenados de entre `load / 2` y
+`2 * load` elementos (como una lista ordenada por partes o un B-tree de un
+nivel), con el máximo de cada bloque en `_maxes` y un árbol de Fenwick
+sobre los tamaños de los bloques para pasar de posición a bloque y al
+revés. Insertar o borrar un elemento cuesta una búsqueda binaria en
+`_maxes`, otra dentro del bloque y mover a lo sumo 2 * load elementos; rank,
+bisect y el acceso por posición son O(log n).
+
+Como los algoritmos instrumentados, cuenta las comparaciones entre
+elementos (`comparisons`) y los elementos escritos o desplazados (`moves`),
+así el costo de mantener la colección se puede comparar con el de volver a
+ordenarla desde cero.
+"""
+from itertools import chain, islice
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+# Tamaño de referencia de los bloques
+DEFAULT_LOAD = 1000
+
+# Tamaño mínimo de los bloques admitido
+MIN_LOAD = 4
+
+
+class SortedList:
+    """Colección ordenada con inserción, borrado, rank y rangos en O(log n)"""
+
+    def __init__(self, values: Iterable[Any] = (), load: int = DEFAULT_LOAD):
+        if load < MIN_LOAD:
+            raise ValueError(f"load debe ser al menos {MIN_LOAD}")
+        self.load = load
+        self._chunks: List[List[Any]] = []
+        self._maxes: List[Any] = []
+        # Árbol de Fenwick con los tamaños de los bloques (None: hay que reconstruirlo)
+        self._index: Optional[List[int]] = None
+        self._len = 0
+        self.comparisons = 0
+        self.moves = 0
+        self.update(values)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Any]:
+        return chain.from_iterable(self._chunks)
+
+    def __contains__(self, value: Any) -> bool:
+        i = self._bisect_left(self._maxes, value)
+        if i == len(self._chunks):
+            return False
+        chunk = self._chunks[i]
+        pos = self._bisect_left(chunk, value)
+        self.comparisons += 1
+        return chunk[pos] == value
+
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("Índice fuera de rango")
+        chunk, offset = self._locate(index)
+        return self._chunks[chunk][offset]
+
+    def to_list(self) -> List[Any]:
+        return list(self)
+
+    def reset_metrics(self):
+        self.comparisons = 0
+        self.moves = 0
+
+    @property
+    def chunk_count(self) -> int:
+        return len(self._chunks)
+
+    # Búsquedas
+
+    def bisect_left(self, value: Any) -> int:
+        """Posición del primer elemento >= value"""
+        i = self._bisect_left(self._maxes, value)
+        if i == len(self._chunks):
+            return self._len
+        return self._prefix(i) + self._bisect_left(self._chunks[i], value)
+
+    def bisect_right(self, value: Any) -> int:
+        """Posición siguiente al último elemento <= value"""
+        i = self._bisect_right(self._maxes, value)
+        if i == len(self._chunks):
+            return self._len
+        return self._prefix(i) + self._bisect_right(self._chunks[i], value)
+
+    def rank(self, value: Any) -> int:
+        """Cantidad de elementos menores que value"""
+        return self.bisect_left(value)
+
+    def count(self, value: Any) -> int:
+        """Cantidad de elementos iguales a value"""
+        return self.bisect_right(value) - self.bisect_left(value)
+
+    def index(self, value: Any) -> int:
+        """Posición de la primera aparición de value (ValueError si no está)"""
+        pos = self.bisect_left(value)
+        if pos == self._len or self[pos] != value:
+            raise ValueError(f"{value!r} no está en la colección")
+        return pos
+
+    def irange(self, minimum: Any = None, maximum: Any = None,
+               inclusive: Tuple[bool, bool] = (True, True), limit: Optional[int] = None) -> List[Any]:
+        """
+        Elementos entre minimum y maximum, en orden
+
+        Args:
+            minimum, maximum: Extremos del rango (None: sin límite)
+            inclusive: Si se incluye cada extremo
+            limit: Máximo de elementos a devolver
+        """
+        start, stop = self.range_bounds(minimum, maximum, inclusive)
+        if limit is not None:
+            stop = min(stop, start + limit)
+        return self.slice(start, stop)
+
+    def range_bounds(self, minimum: Any = None, maximum: Any = None,
+                     inclusive: Tuple[bool, bool] = (True, True)) -> Tuple[int, int]:
+        """Posiciones [inicio, fin) de los elementos entre minimum y maximum"""
+        if minimum is None:
+            start = 0
+        else:
+            start = self.bisect_left(minimum) if inclusive[0] else self.bisect_right(minimum)
+        if maximum is None:
+            stop = self._len
+        else:
+            stop = self.bisect_right(maximum) if inclusive[1] else self.bisect_left(maximum)
+        return start, max(start, stop)
+
+    def slice(self, start: int, stop: int) -> List[Any]:
+        """Elementos de las posiciones [start, stop)"""
+        start, stop = max(0, start), min(self._len, stop)
+        if start >= stop:
+            return []
+        chunk, offset = self._locate(start)
+        values = islice(chain.from_iterable(self._chunks[chunk:]), offset, offset + stop - start)
+        return list(values)
+
+    # Modificaciones
+
+    def add(self, value: Any):
+        """Inserta un elemento"""
+        if not self._chunks:
+            self._chunks.append([value])
+            self._maxes.append(value)
+            self._index = None
+            self._len = 1
+            self.moves += 1
+            return
+
+        i = self._bisect_right(self._maxes, value)
+        if i == len(self._chunks):
+            i -= 1
+            self._chunks[i].append(value)
+            self._maxes[i] = value
+            self.moves += 1
+        else:
+            chunk = self._chunks[i]
+            pos = self._bisect_right(chunk, value)
+            chunk.insert(pos, value)
+            self.moves += len(chunk) - pos
+        self._len += 1
+        self._grown(i, 1)
+
+    def update(self, values: Iterable[Any]):
+        """
+        Inserta muchos elementos
+
+        El lote se ordena con un merge sort natural (aprovecha las corridas
+        ya ordenadas) y se reparte entre los bloques: en cada bloque se
+        fusiona o, si le tocan pocos elementos, se insertan uno a uno. Si el
+        lote es al menos tan grande como la colección, se fusiona todo y se
+        vuelven a armar los bloques.
+        """
+        batch = self._sort_batch(list(values))
+        if not batch:
+            return
+        if not self._len:
+            self.moves += len(batch)
+            self._rebuild(batch)
+            return
+        if len(batch) >= self._len:
+            self._rebuild(self._merge(list(self), batch))
+            return
+
+        start = 0
+        last = len(self._chunks) - 1
+        for i, chunk in enumerate(self._chunks):
+            if start == len(batch):
+                break
+            stop = len(batch) if i == last else self._bisect_right(batch, self._maxes[i], start)
+            if stop == start:
+                continue
+            part = batch[start:stop]
+            if len(part) * max(1, len(chunk).bit_length()) < len(chunk):
+                pos = 0
+                for value in part:
+                    pos = self._bisect_right(chunk, value, pos)
+                    chunk.insert(pos, value)
+                    self.moves += len(chunk) - pos
+                    pos += 1
+            else:
+                chunk[:] = self._merge(chunk, part)
+            self._maxes[i] = chunk[-1]
+            start = stop
+        self._len += len(batch)
+        self._index = None
+        self._split_oversized()
+
+    def remove(self, value: Any):
+        """Elimina una aparición de value (ValueError si no está)"""
+        if not self.discard(value):
+            raise ValueError(f"{value!r} no está en la colección")
+
+    def discard(self, value: Any) -> bool:
+        """Elimina una aparición de value; devuelve False si no estaba"""
+        i = self._bisect_left(self._maxes, value)
+        if i == len(self._chunks):
+            return False
+        chunk = self._chunks[i]
+        pos = self._bisect_left(chunk, value)
+        self.comparisons += 1
+        if chunk[pos] != value:
+            return False
+        del chunk[pos]
+        self.moves += len(chunk) - pos
+        self._len -= 1
+        self._shrunk(i)
+        return True
+
+    def discard_many(self, values: Iterable[Any]) -> int:
+        """Elimina una aparición de cada valor; devuelve cuántos se eliminaron"""
+        return sum(self.discard(value) for value in values)
+
+    # Búsqueda binaria contando comparaciones
+
+    def _bisect_left(self, seq: List[Any], value: Any, lo: int = 0) -> int:
+        hi = len(seq)
+        comparisons = 0
+        while lo < hi:
+            mid = (lo + hi) // 2
+            comparisons += 1
+            if seq[mid] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        self.comparisons += comparisons
+        return lo
+
+    def _bisect_right(self, seq: List[Any], value: Any, lo: int = 0) -> int:
+        hi = len(seq)
+        comparisons = 0
+        while lo < hi:
+            mid = (lo + hi) // 2
+            comparisons += 1
+            if value < seq[mid]:
+                hi = mid
+            else:
+                lo = mid + 1
+        self.comparisons += comparisons
+        return lo
+
+    # Ordenamiento y fusión de lotes
+
+    def _merge(self, left: List[Any], right: List[Any]) -> List[Any]:
+        """Fusiona dos listas ordenadas (estable: ante empates va primero left)"""
+        merged = []
+        append = merged.append
+        i = j = 0
+        n_left, n_right = len(left), len(right)
+        while i < n_left and j < n_right:
+            if right[j] < left[i]:
+                append(right[j])
+                j += 1
+            else:
+                append(left[i])
+                i += 1
+        self.comparisons += i + j
+        merged.extend(left[i:])
+        merged.extend(right[j:])
+        self.moves += len(merged)
+        return merged
+
+    def _sort_batch(self, values: List[Any]) -> List[Any]:
+        """Merge sort natural: separa las corridas ascendentes y las fusiona de a pares"""
+        if len(values) < 2:
+            return values
+        runs = []
+        start = 0
+        for i in range(1, len(values)):
+            if values[i] < values[i - 1]:
+                runs.append(values[start:i])
+                start = i
+        runs.append(values[start:])
+        self.comparisons += len(values) - 1
+        while len(runs) > 1:
+            runs = [self._merge(runs[k], runs[k + 1]) if k + 1 < len(runs) else runs[k]
+                    for k in range(0, len(runs), 2)]
+        return runs[0]
+
+    # Mantenimiento de los bloques
+
+    def _rebuild(self, values: List[Any]):
+        """Arma los bloques de `load` elementos a partir de una lista ordenada"""
+        load = self.load
+        self._chunks = [values[k:k + load] for k in range(0, len(values), load)]
+        self._maxes = [chunk[-1] for chunk in self._chunks]
+        self._index = None
+        self._len = len(values)
+
+    def _split_oversized(self):
+        """Divide en bloques de `load` elementos los que superan 2 * load"""
+        if all(len(chunk) <= 2 * self.load for chunk in self._chunks):
+            return
+        load = self.load
+        chunks = []
+        for chunk in self._chunks:
+            if len(chunk) <= 2 * load:
+                chunks.append(chunk)
+                continue
+            chunks.extend(chunk[k:k + load] for k in range(0, len(chunk), load))
+            self.moves += len(chunk) - load
+        self._chunks = chunks
+        self._maxes = [chunk[-1] for chunk in chunks]
+        self._index = None
+
+    def _grown(self, i: int, delta: int):
+        chunk = self._chunks[i]
+        if len(chunk) > 2 * self.load:
+            half = chunk[self.load:]
+            del chunk[self.load:]
+            self._chunks.insert(i + 1, half)
+            self._maxes[i] = chunk[-1]
+            self._maxes.insert(i + 1, half[-1])
+            self.moves += len(half)
+            self._index = None
+        elif self._index is not None:
+            self._index_add(i, delta)
+
+    def _shrunk(self, i: int):
+        chunk = self._chunks[i]
+        if not chunk:
+            del self._chunks[i]
+            del self._maxes[i]
+            self._index = None
+            return
+        self._maxes[i] = chunk[-1]
+        if len(chunk) < self.load // 2 and len(self._chunks) > 1:
+            # Se une con un vecino (y se vuelve a dividir si quedó grande)
+            if i == len(self._chunks) - 1:
+                i -= 1
+            left, right = self._chunks[i], self._chunks[i + 1]
+            left.extend(right)
+            self.moves += len(right)
+            del self._chunks[i + 1]
+            del self._maxes[i + 1]
+            self._maxes[i] = left[-1]
+            self._index = None
+            self._grown(i, 0)
+        elif self._index is not None:
+            self._index_add(i, -1)
+
+    # Árbol de Fenwick de los tamaños de los bloques
+
+    def _build_index(self) -> List[int]:
+        tree = [0] + [len(chunk) for chunk in self._chunks]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._index = tree
+        return tree
+
+    def _index_add(self, i: int, delta: int):
+        tree = self._index
+        i += 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, i: int) -> int:
+        """Cantidad de elementos en los bloques anteriores al bloque i"""
+        tree = self._index if self._index is not None else self._build_index()
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        """Bloque y posición dentro del bloque del elemento en la posición index"""
+        tree = self._index if self._index is not None else self._build_index()
+        chunk = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            following = chunk + step
+            if following < len(tree) and tree[following] <= index:
+                chunk = following
+                index -= tree[following]
+            step >>= 1
+        return chunk, index
@@ -1,16 +1,62 @@
 from app.algorithms.base import AlgorithmBase
-from typing import List, Any
+from app.algorithms import engines, numpy_backend
+from app.algorithms.binary_format import MappedDataset
+from app.algorithms.external_sort import ExternalSorter, DEFAULT_MEMORY_BUDGET, DEFAULT_FAN_IN
+from app.algorithms import parallel
+from typing import List, Any, Iterator, Tuple
 import heapq
+import os
+import tempfile
+import time
+
+class _MergePassView:
+    """
+    Estado del array durante una pasada de Merge Sort con dos buffers
+    
+    Los bloques ya fusionados en la pasada están en el destino y el resto en
+    el origen. La traza lee esta vista en vez de un buffer, así cada paso
+    'merge' muestra el array completo tal como está en ese momento.
+    """
+    
+    __slots__ = ('src', 'dst', 'boundary')
+    
+    def start_pass(self, src: List[Any], dst: List[Any]):
+        self.src = src
+        self.dst = dst
+        self.boundary = 0
+    
+    def __len__(self) -> int:
+        return len(self.src)
+    
+    def __getitem__(self, index: int) -> Any:
+        return self.dst[index] if index < self.boundary else self.src[index]
+    
+    def __iter__(self) -> Iterator[Any]:
+        yield from self.dst[:self.boundary]
+        yield from self.src[self.boundary:]
+    
+    def copy(self) -> List[Any]:
+        return self.dst[:self.boundary] + self.src[self.boundary:]
 
 class BubbleSort(AlgorithmBase):
     """Implementación de Bubble Sort"""
     
+    fast_engine = 'bubble_sort'
+    
     def __init__(self):
         super().__init__(
             name="Bubble Sort",
             description="Ordena una lista comparando elementos adyacentes e intercambiándolos si están en el orden incorrecto"
         )
     
+    def estimate_comparisons(self, n: int) -> float:
+        """Bubble Sort hace hasta n(n-1)/2 comparaciones"""
+        return max(1, n * (n - 1) / 2)
+    
+    def execute_fast(self, data: List[Any], **kwargs) -> List[Any]:
+        """Bubble Sort sin instrumentación con salida temprana"""
+        return engines.bubble_sort(data.copy())
+    
     def execute(self, data: List[Any], **kwargs) -> List[Any]:
         """Ejecuta Bubble Sort"""
         arr = data.copy()
@@ -24,11 +70,7 @@ class BubbleSort(AlgorithmBase):
                     arr[j], arr[j + 1] = arr[j + 1], arr[j]
                     self.swaps += 1
                     swapped = True
-                    self.steps.append({
-                        'action': 'swap',
-                        'indices': [j, j + 1],
-                        'array': arr.copy()
-                    })
+                    self.record_change('swap', arr, [j, j + 1])
             
             if not swapped:
                 break
@@ -38,27 +80,73 @@ class BubbleSort(AlgorithmBase):
 class MergeSort(AlgorithmBase):
     """Implementación de Merge Sort"""
     
+    fast_engine = 'bottom_up_merge_sort'
+    
     def __init__(self):
         super().__init__(
             name="Merge Sort",
-            description="Ordena una lista dividiéndola en mitades, ordenándolas recursivamente y luego fusionándolas"
+            description="Ordena una lista fusionando de a pares bloques ordenados de tamaño creciente (1, 2, 4...)"
         )
     
+    def execute_fast(self, data: List[Any], **kwargs) -> List[Any]:
+        """Merge Sort iterativo de abajo hacia arriba (fusiones vectorizadas con NumPy si aplica)"""
+        if numpy_backend.accepts(data):
+            self.extra_metrics.update(backend='numpy', engine='numpy_merge_sort')
+            return numpy_backend.to_output(numpy_backend.merge_sort(numpy_backend.as_array(data)), data)
+        return engines.bottom_up_merge_sort(data.copy())
+    
     def execute(self, data: List[Any], **kwargs) -> List[Any]:
         """Ejecuta Merge Sort"""
         arr = data.copy()
         return self._merge_sort(arr)
     
     def _merge_sort(self, arr: List[Any]) -> List[Any]:
-        """Función recursiva de Merge Sort"""
-        if len(arr) <= 1:
-            return arr
+        """
+        Merge Sort iterativo de abajo hacia arriba
         
-        mid = len(arr) // 2
-        left = self._merge_sort(arr[:mid])
-        right = self._merge_sort(arr[mid:])
+        Fusiona bloques de ancho 1, 2, 4... alternando entre el array y un
+        único buffer preasignado (en cada pasada uno es origen y el otro
+        destino), sin recursión ni slices por nivel. Cada fusión registra un
+        paso 'merge' con las posiciones y valores del bloque fusionado (sin
+        copia completa del array, ni en modo full).
+        """
+        n = len(arr)
+        src, dst = arr, [None] * n
+        view = _MergePassView()
+        width = 1
+        while width < n:
+            self._check_cancelled()
+            view.start_pass(src, dst)
+            for low in range(0, n, 2 * width):
+                mid = min(low + width, n)
+                high = min(low + 2 * width, n)
+                self._merge_into(src, dst, low, mid, high)
+                view.boundary = high
+                self.record_segment('merge', view, range(low, high))
+            src, dst = dst, src
+            width *= 2
         
-        return self._merge(left, right)
+        if src is not arr:
+            arr[:] = src
+        return arr
+    
+    def _merge_into(self, src: List[Any], dst: List[Any], low: int, mid: int, high: int):
+        """Fusiona src[low:mid] y src[mid:high] (ordenados) en dst[low:high]"""
+        i, j, k = low, mid, low
+        while i < mid and j < high:
+            if src[i] <= src[j]:
+                dst[k] = src[i]
+                i += 1
+            else:
+                dst[k] = src[j]
+                j += 1
+            k += 1
+        # Una comparación por elemento escrito antes de agotar una mitad
+        self.comparisons += k - low
+        if i < mid:
+            dst[k:high] = src[i:mid]
+        else:
+            dst[k:high] = src[j:high]
     
     def _merge(self, left: List[Any], right: List[Any]) -> List[Any]:
         """Fusiona dos listas ordenadas"""
@@ -77,7 +165,7 @@ class MergeSort(AlgorithmBase):
         result.extend(left[i:])
         result.extend(right[j:])
         
-        self.steps.append({
+        self.record_step({
             'action': 'merge',
             'left': left,
             'right': right,
@@ -85,65 +173,128 @@ class MergeSort(AlgorithmBase):
         })
         
         return result
+    
+    def _merge_blocks(self, blocks: List[List[Any]]) -> List[Any]:
+        """Fusiona los bloques ordenados de a pares hasta que queda uno"""
+        while len(blocks) > 1:
+            self._check_cancelled()
+            merged = [self._merge(blocks[i], blocks[i + 1]) for i in range(0, len(blocks) - 1, 2)]
+            if len(blocks) % 2:
+                merged.append(blocks[-1])
+            blocks = merged
+        return blocks[0] if blocks else []
 
 class QuickSort(AlgorithmBase):
     """Implementación de Quick Sort"""
     
+    fast_engine = 'introsort'
+    
     def __init__(self):
         super().__init__(
             name="Quick Sort",
             description="Ordena una lista usando el algoritmo de partición rápida"
         )
     
+    def execute_fast(self, data: List[Any], **kwargs) -> List[Any]:
+        """Introsort con mediana de tres y corte a inserción (el de NumPy si aplica)"""
+        if numpy_backend.accepts(data):
+            self.extra_metrics.update(backend='numpy', engine='numpy_introsort')
+            arr = numpy_backend.as_array(data)
+            arr.sort(kind='quicksort')
+            return numpy_backend.to_output(arr, data)
+        return engines.introsort(data.copy())
+    
     def execute(self, data: List[Any], **kwargs) -> List[Any]:
-        """Ejecuta Quick Sort"""
+        """
+        Ejecuta Quick Sort
+        
+        Iterativo con una pila explícita: después de particionar se apila la
+        parte más grande y se sigue con la más chica, así la pila no supera
+        log2(n) rangos. El pivote es la mediana de tres (primero, medio y
+        último) y la partición es la de Hoare, que reparte los elementos
+        iguales al pivote entre ambos lados: las entradas ordenadas,
+        invertidas o con muchos repetidos no degeneran en O(n²).
+        """
         arr = data.copy()
-        self._quick_sort(arr, 0, len(arr) - 1)
+        self._sort_range(arr, 0, len(arr) - 1)
         return arr
     
-    def _quick_sort(self, arr: List[Any], low: int, high: int):
-        """Función recursiva de Quick Sort"""
-        if low < high:
-            pi = self._partition(arr, low, high)
-            self._quick_sort(arr, low, pi - 1)
-            self._quick_sort(arr, pi + 1, high)
+    def _sort_range(self, arr: List[Any], low: int, high: int):
+        """Ordena arr[low:high + 1] en el lugar"""
+        stack = [(low, high)]
+        while stack:
+            self._check_cancelled()
+            low, high = stack.pop()
+            while low < high:
+                left_high, right_low = self._partition(arr, low, high)
+                if left_high - low < high - right_low:
+                    stack.append((right_low, high))
+                    high = left_high
+                else:
+                    stack.append((low, left_high))
+                    low = right_low
     
-    def _partition(self, arr: List[Any], low: int, high: int) -> int:
-        """Particiona el array y retorna el índice del pivote"""
-        pivot = arr[high]
-        i = low - 1
-        
-        for j in range(low, high):
+    def _median_of_three(self, arr: List[Any], low: int, high: int) -> Any:
+        """Valor mediano entre el primero, el del medio y el último del rango"""
+        a, b, c = arr[low], arr[(low + high) // 2], arr[high]
+        self.comparisons += 2
+        if a <= b:
+            if b <= c:
+                return b
             self.comparisons += 1
-            if arr[j] <= pivot:
-                i += 1
-                arr[i], arr[j] = arr[j], arr[i]
-                self.swaps += 1
-                self.steps.append({
-                    'action': 'swap',
-                    'indices': [i, j],
-                    'array': arr.copy()
-                })
-        
-        arr[i + 1], arr[high] = arr[high], arr[i + 1]
-        self.swaps += 1
-        self.steps.append({
-            'action': 'pivot',
-            'pivot_index': i + 1,
-            'array': arr.copy()
-        })
+            return c if a <= c else a
+        if a <= c:
+            return a
+        self.comparisons += 1
+        return c if b <= c else b
+    
+    def _partition(self, arr: List[Any], low: int, high: int) -> Tuple[int, int]:
+        """
+        Partición de Hoare alrededor de la mediana de tres
         
-        return i + 1
+        Returns:
+            Tupla (fin de la parte izquierda, inicio de la parte derecha):
+            todo arr[low:fin + 1] es <= pivote y todo arr[inicio:high + 1] es >= pivote
+        """
+        pivot = self._median_of_three(arr, low, high)
+        i, j = low, high
+        while i <= j:
+            start_i, start_j = i, j
+            while arr[i] < pivot:
+                i += 1
+            while arr[j] > pivot:
+                j -= 1
+            # Cada búsqueda compara una vez por posición avanzada y una más al detenerse
+            self.comparisons += (i - start_i) + (start_j - j) + 2
+            if i <= j:
+                if i < j:
+                    arr[i], arr[j] = arr[j], arr[i]
+                    self.swaps += 1
+                    self.record_change('swap', arr, [i, j])
+                i += 1
+                j -= 1
+        return j, i
 
 class HeapSort(AlgorithmBase):
     """Implementación de Heap Sort"""
     
+    fast_engine = 'heapq_heap_sort'
+    
     def __init__(self):
         super().__init__(
             name="Heap Sort",
             description="Ordena una lista usando una estructura de heap (montículo)"
         )
     
+    def execute_fast(self, data: List[Any], **kwargs) -> List[Any]:
+        """Heap Sort basado en heapq (el de NumPy si aplica)"""
+        if numpy_backend.accepts(data):
+            self.extra_metrics.update(backend='numpy', engine='numpy_heap_sort')
+            arr = numpy_backend.as_array(data)
+            arr.sort(kind='heapsort')
+            return numpy_backend.to_output(arr, data)
+        return engines.heapq_heap_sort(data.copy())
+    
     def execute(self, data: List[Any], **kwargs) -> List[Any]:
         """Ejecuta Heap Sort"""
         arr = data.copy()
@@ -157,11 +308,7 @@ class HeapSort(AlgorithmBase):
         for i in range(n - 1, 0, -1):
             arr[0], arr[i] = arr[i], arr[0]
             self.swaps += 1
-            self.steps.append({
-                'action': 'swap',
-                'indices': [0, i],
-                'array': arr.copy()
-            })
+            self.record_change('swap', arr, [0, i])
             self._heapify(arr, i, 0)
         
         return arr
@@ -185,9 +332,333 @@ class HeapSort(AlgorithmBase):
         if largest != i:
             arr[i], arr[largest] = arr[largest], arr[i]
             self.swaps += 1
-            self.steps.append({
-                'action': 'heapify',
-                'indices': [i, largest],
-                'array': arr.copy()
-            })
+            self.record_change('heapify', arr, [i, largest])
             self._heapify(arr, n, largest)
+
+class RadixSort(AlgorithmBase):
+    """Implementación de Radix Sort (LSD) para enteros"""
+    
+    fast_engine = 'integer_sort'
+    
+    def __init__(self):
+        super().__init__(
+            name="Radix Sort",
+            description="Ordena enteros distribuyéndolos en cubetas dígito a dígito, sin comparar elementos"
+        )
+    
+    def estimate_comparisons(self, n: int) -> float:
+        """Radix Sort no compara elementos"""
+        return 1
+    
+    @staticmethod
+    def _validate(data: List[Any]):
+        if any(type(value) is not int for value in data):
+            raise ValueError("Radix Sort solo admite números enteros")
+    
+    def execute_fast(self, data: List[Any], **kwargs) -> List[Any]:
+        """Counting Sort o Radix Sort según el rango (vectorizado con NumPy si aplica)"""
+        if numpy_backend.accepts(data) and numpy_backend.numeric_dtype(data) == 'int64':
+            arr, engine = numpy_backend.integer_sort(numpy_backend.as_array(data))
+            self.extra_metrics.update(backend='numpy', engine=engine)
+            return numpy_backend.to_output(arr, data)
+        self._validate(data)
+        arr, engine = engines.integer_sort(data.copy())
+        self.extra_metrics['engine'] = engine
+        return arr
+    
+    def execute(self, data: List[Any], **kwargs) -> List[Any]:
+        """Ejecuta Radix Sort con cubetas de RADIX_BITS bits"""
+        self._validate(data)
+        arr = data.copy()
+        low = min(arr)
+        max_key = max(arr) - low
+        mask = (1 << engines.RADIX_BITS) - 1
+        shift = 0
+        
+        while max_key >> shift:
+            self._check_cancelled()
+            buckets = [[] for _ in range(mask + 1)]
+            for value in arr:
+                buckets[((value - low) >> shift) & mask].append(value)
+            arr[:] = [value for bucket in buckets for value in bucket]
+            # Cada pasada mueve todos los elementos a su cubeta
+            self.swaps += len(arr)
+            self.record_change('radix_pass', arr, list(range(len(arr))), digit=shift // engines.RADIX_BITS)
+            shift += engines.RADIX_BITS
+        
+        return arr
+
+class _HeapEntry:
+    """Cabeza de una corrida en el heap de la fusión k-way (cuenta las comparaciones)"""
+    
+    __slots__ = ('value', 'index', 'run', 'owner')
+    
+    def __init__(self, value: Any, index: int, run: Iterator[Any], owner: AlgorithmBase):
+        self.value = value
+        self.index = index
+        self.run = run
+        self.owner = owner
+    
+    def __lt__(self, other: '_HeapEntry') -> bool:
+        self.owner.comparisons += 1
+        if self.value == other.value:
+            # Empates: primero la corrida anterior (fusión estable)
+            return self.index < other.index
+        return self.value < other.value
+
+class ExternalMergeSort(MergeSort):
+    """Implementación de Merge Sort externo (fuera de memoria)"""
+    
+    fast_engine = 'external_merge_sort'
+    mutates_input = False
+    
+    def __init__(self):
+        AlgorithmBase.__init__(
+            self,
+            name="External Merge Sort",
+            description="Ordena datos más grandes que la memoria en corridas ordenadas en disco y las fusiona con un heap"
+        )
+    
+    def execute_fast(self, data: List[Any], **kwargs) -> List[Any]:
+        """Corridas ordenadas con timsort y fusión con heapq.merge"""
+        return self._external_sort(data, self._sorter(sorted, heapq.merge, kwargs))
+    
+    def execute(self, data: List[Any], **kwargs) -> List[Any]:
+        """
+        Ejecuta Merge Sort externo
+        
+        Args:
+            data: Lista de números o dataset binario mapeado
+            memory_budget: Memoria en bytes para cada corrida y los buffers de fusión
+            fan_in: Corridas que se fusionan a la vez
+        """
+        return self._external_sort(data, self._sorter(self._sort_run, self._kway_merge, kwargs))
+    
+    def _sorter(self, sort_run, merge, kwargs) -> ExternalSorter:
+        return ExternalSorter(
+            memory_budget=int(kwargs.get('memory_budget', DEFAULT_MEMORY_BUDGET)),
+            fan_in=int(kwargs.get('fan_in', DEFAULT_FAN_IN)),
+            sort_run=sort_run,
+            merge=merge,
+            on_progress=self._check_cancelled
+        )
+    
+    def _external_sort(self, data: List[Any], sorter: ExternalSorter) -> List[Any]:
+        """Ordena a un archivo temporal y lo devuelve como lista; las métricas de E/S van a la metadata"""
+        fd, path = tempfile.mkstemp(suffix='.bin')
+        os.close(fd)
+        try:
+            self.extra_metrics.update(sorter.sort(data, path))
+            with MappedDataset(path) as result:
+                return result.copy()
+        finally:
+            os.remove(path)
+    
+    def _sort_run(self, chunk: List[Any]) -> List[Any]:
+        """Ordena una corrida en memoria con el Merge Sort instrumentado"""
+        self.record_step({'action': 'run', 'size': len(chunk)})
+        return self._merge_sort(chunk)
+    
+    def _kway_merge(self, *runs: Iterator[Any]) -> Iterator[Any]:
+        """Fusión k-way con un heap de las cabezas de cada corrida"""
+        self.record_step({'action': 'kway_merge', 'runs': len(runs)})
+        heap = []
+        for index, run in enumerate(runs):
+            for value in run:
+                heap.append(_HeapEntry(value, index, run, self))
+                break
+        heapq.heapify(heap)
+        
+        while heap:
+            entry = heap[0]
+            yield entry.value
+            for value in entry.run:
+                entry.value = value
+                heapq.heapreplace(heap, entry)
+                break
+            else:
+                heapq.heappop(heap)
+
+class ParallelMergeSort(MergeSort):
+    """Implementación de Merge Sort por bloques en varios procesos"""
+    
+    fast_engine = 'parallel_chunked_merge_sort'
+    
+    def __init__(self):
+        AlgorithmBase.__init__(
+            self,
+            name="Parallel Merge Sort",
+            description="Ordena bloques de la lista en paralelo, uno por proceso, y luego los fusiona"
+        )
+    
+    def execute_fast(self, data: List[Any], **kwargs) -> List[Any]:
+        """Bloques ordenados en memoria compartida y fusión con timsort"""
+        workers = parallel.effective_workers(len(data), kwargs.get('workers'))
+        result, stats = parallel.chunked_merge_sort(data, workers)
+        self.extra_metrics.update(stats)
+        return result
+    
+    def execute(self, data: List[Any], **kwargs) -> List[Any]:
+        """
+        Ejecuta Merge Sort paralelo
+        
+        Cada proceso ordena su bloque con el Merge Sort instrumentado y el
+        proceso principal fusiona los bloques de a pares con _merge. Las
+        comparaciones incluyen las de los procesos.
+        
+        Args:
+            data: Lista a ordenar
+            workers: Cantidad de procesos (por defecto, los núcleos disponibles)
+        """
+        workers = parallel.effective_workers(len(data), kwargs.get('workers'))
+        result, stats = parallel.chunked_merge_sort(data, workers, merge=self._merge_blocks, algorithm=MergeSort())
+        self.comparisons += stats.pop('worker_comparisons')
+        self.extra_metrics.update(stats)
+        return result
+
+class SampleSort(AlgorithmBase):
+    """Implementación de Sample Sort en varios procesos"""
+    
+    fast_engine = 'parallel_sample_sort'
+    
+    def __init__(self):
+        super().__init__(
+            name="Sample Sort",
+            description="Divide la lista en cubetas con pivotes tomados de una muestra y ordena cada cubeta en un proceso distinto"
+        )
+    
+    def execute_fast(self, data: List[Any], **kwargs) -> List[Any]:
+        """Muestreo regular en paralelo (PSRS) sobre memoria compartida"""
+        workers = parallel.effective_workers(len(data), kwargs.get('workers'))
+        result, stats = parallel.sample_sort(data, workers, int(kwargs.get('oversampling', 0)))
+        self.extra_metrics.update(stats)
+        return result
+    
+    def execute(self, data: List[Any], **kwargs) -> List[Any]:
+        """
+        Ejecuta Sample Sort
+        
+        El proceso principal reparte cada elemento en su cubeta con una
+        búsqueda binaria sobre los pivotes (contando comparaciones) y cada
+        proceso ordena una cubeta con el Merge Sort instrumentado.
+        
+        Args:
+            data: Lista a ordenar
+            workers: Cantidad de procesos y de cubetas
+            oversampling: Muestras por cubeta para elegir los pivotes
+        """
+        workers = parallel.effective_workers(len(data), kwargs.get('workers'))
+        result, stats = parallel.sample_sort(data, workers, int(kwargs.get('oversampling', 0)),
+                                             locate=self._locate, algorithm=MergeSort())
+        self.comparisons += stats.pop('worker_comparisons')
+        for bucket, size in enumerate(stats['partition_sizes']):
+            self.record_step({'action': 'bucket', 'bucket': bucket, 'size': size})
+        self.extra_metrics.update(stats)
+        return result
+    
+    def _locate(self, splitters: List[Any], value: Any) -> int:
+        """Cubeta de un valor: búsqueda binaria sobre los pivotes"""
+        low, high = 0, len(splitters)
+        while low < high:
+            mid = (low + high) // 2
+            self.comparisons += 1
+            if value < splitters[mid]:
+                high = mid
+            else:
+                low = mid + 1
+        return low
+
+class AdaptiveSort(MergeSort):
+    """Ordenamiento adaptativo: elige el algoritmo según las características de la entrada"""
+    
+    fast_engine = 'adaptive_sort'
+    timed_metrics = ('profile_ms',)
+    
+    def __init__(self):
+        AlgorithmBase.__init__(
+            self,
+            name="Auto",
+            description="Analiza la entrada en O(n) (corridas, inversiones, rango y tipo de valores, duplicados) y la ordena con el algoritmo más conveniente"
+        )
+    
+    def _profile(self, data: Any, profile_input) -> dict:
+        """Perfila la entrada, elige la estrategia y deja ambas en las métricas"""
+        start = time.perf_counter()
+        profile = profile_input(data)
+        strategy = engines.choose_sort_strategy(profile)
+        self.extra_metrics.update(
+            strategy=strategy,
+            profile_ms=round((time.perf_counter() - start) * 1000, 4),
+            profile=profile
+        )
+        return profile
+    
+    def execute_fast(self, data: List[Any], **kwargs) -> List[Any]:
+        """Perfil en O(n) y el motor sin instrumentación de la estrategia elegida"""
+        if numpy_backend.accepts(data):
+            arr = numpy_backend.as_array(data)
+            self._profile(arr, numpy_backend.profile_input)
+            arr, engine = numpy_backend.adaptive_sort(arr, self.extra_metrics['strategy'])
+            self.extra_metrics.update(backend='numpy', engine=engine)
+            return numpy_backend.to_output(arr, data)
+        arr = data.copy()
+        self._profile(arr, engines.profile_input)
+        arr, engine = engines.adaptive_sort(arr, self.extra_metrics['strategy'])
+        self.extra_metrics['engine'] = engine
+        return arr
+    
+    def execute(self, data: List[Any], **kwargs) -> List[Any]:
+        """
+        Ejecuta el ordenamiento adaptativo
+        
+        Las dos pasadas del perfil sobre los pares de vecinos cuentan como
+        comparaciones. Las fusiones de corridas usan _merge y los demás casos
+        delegan en Radix Sort, Heap Sort o un Counting Sort instrumentado,
+        sumando sus contadores y pasos a los de esta ejecución.
+        """
+        arr = data.copy()
+        profile = self._profile(arr, engines.profile_input)
+        strategy = self.extra_metrics['strategy']
+        self.comparisons += 2 * max(len(arr) - 1, 0)
+        self.record_step({'action': 'profile', 'strategy': strategy, 'runs': profile['runs'],
+                          'descending_runs': profile['descending_runs']})
+        
+        if strategy == 'already_sorted':
+            return arr
+        if strategy in ('run_merge', 'reverse_run_merge'):
+            if strategy == 'reverse_run_merge':
+                arr.reverse()
+                self.swaps += len(arr) // 2
+                self.record_change('reverse', arr, list(range(len(arr))))
+                # Las corridas cambian al invertir: se vuelven a buscar
+                self.comparisons += len(arr) - 1
+            starts = engines.run_starts(arr)
+            return self._merge_blocks([arr[low:high] for low, high in zip(starts, starts[1:])])
+        if strategy == 'counting_sort':
+            return self._counting_sort(arr, profile['min'], profile['value_range'])
+        return self._delegate(RadixSort() if strategy == 'radix_sort' else HeapSort(), arr)
+    
+    def _counting_sort(self, arr: List[int], low: int, value_range: int) -> List[int]:
+        """Counting Sort instrumentado: registra cada bloque de valores iguales que se escribe"""
+        counts = [0] * (value_range + 1)
+        for value in arr:
+            counts[value - low] += 1
+        position = 0
+        for offset, count in enumerate(counts):
+            if count:
+                arr[position:position + count] = [low + offset] * count
+                self.swaps += count
+                self.record_change('place', arr, list(range(position, position + count)))
+                position += count
+        return arr
+    
+    def _delegate(self, algorithm: AlgorithmBase, arr: List[Any]) -> List[Any]:
+        """Ejecuta otro algoritmo instrumentado sobre la misma traza y suma sus contadores"""
+        algorithm = algorithm.invocation(self.cancel_event)
+        algorithm.trace = self.trace
+        algorithm.steps = self.steps
+        result = algorithm.execute(arr)
+        self.comparisons += algorithm.comparisons
+        self.swaps += algorithm.swaps
+        self.extra_metrics.update(algorithm.extra_metrics)
+        return result
@@ -0,0 +1,170 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from app.algorithms.trace_codec import CompactTrace
+
+# Modos de registro de pasos disponibles
+TRACE_NONE = 'none'
+TRACE_DELTA = 'delta'
+TRACE_FULL = 'full'
+TRACE_SAMPLED = 'sampled'
+
+TRACE_MODES = (TRACE_NONE, TRACE_DELTA, TRACE_FULL, TRACE_SAMPLED)
+
+# Tamaño máximo de entrada para el que se guardan copias completas por defecto
+FULL_TRACE_MAX_SIZE = 1000
+
+
+def default_trace_mode(size: int) -> str:
+    """Modo de registro por defecto según el tamaño de la entrada"""
+    return TRACE_FULL if size <= FULL_TRACE_MAX_SIZE else TRACE_DELTA
+
+
+class TraceRecorder:
+    """
+    Registra los pasos de un algoritmo según el modo seleccionado
+
+    Modos:
+        none: no se guarda ningún paso
+        delta: solo se guardan los índices modificados y sus nuevos valores
+        full: se guarda una copia completa del array en cada paso
+        sampled: se guarda una copia completa cada `every` pasos
+
+    Si se indica `sink`, los pasos aceptados se entregan a esa función en vez
+    de acumularse en `steps` (p. ej. para enviarlos en streaming). Si no, se
+    acumulan en una CompactTrace (por columnas, sin un dict por paso).
+    """
+
+    def __init__(self, mode: str = TRACE_FULL, every: int = 1,
+                 sink: Optional[Callable[[Dict[str, Any]], None]] = None):
+        if mode not in TRACE_MODES:
+            raise ValueError(f"Modo de traza '{mode}' no soportado")
+        if every < 1:
+            raise ValueError("El intervalo de muestreo debe ser mayor que 0")
+        self.mode = mode
+        self.every = every
+        self.sink = sink
+        self.steps = CompactTrace()
+        self.total = 0
+
+    def _emit(self, step: Dict[str, Any]):
+        if self.sink is not None:
+            self.sink(step)
+        else:
+            self.steps.append(step)
+
+    def _accept(self) -> bool:
+        """Cuenta el paso y decide si debe guardarse"""
+        self.total += 1
+        if self.mode == TRACE_NONE:
+            return False
+        if self.mode == TRACE_SAMPLED:
+            return (self.total - 1) % self.every == 0
+        return True
+
+    def record(self, step: Dict[str, Any]):
+        """Registra un paso que no modifica el array (comparación, fusión...)"""
+        if self._accept():
+            self._emit(step)
+
+    def record_change(self, action: str, arr: Sequence[Any], indices: Sequence[int], **extra):
+        """
+        Registra un paso que modifica las posiciones `indices` del array
+
+        `indices` puede ser un range: solo se convierte a lista si el paso se
+        guarda.
+        """
+        if not self._accept():
+            return
+        if self.sink is None:
+            if self.mode == TRACE_DELTA:
+                self.steps.append_change(action, indices, values=[arr[i] for i in indices], extra=extra)
+            else:
+                self.steps.append_change(action, indices, array_copy=arr, step=self.total - 1, extra=extra)
+            return
+        step = {'action': action, 'indices': list(indices)}
+        step.update(extra)
+        if self.mode == TRACE_DELTA:
+            step['values'] = [arr[i] for i in indices]
+        else:
+            step['step'] = self.total - 1
+            step['array'] = arr.copy()
+        self._emit(step)
+
+    def record_segment(self, action: str, arr: Sequence[Any], indices: Sequence[int], **extra):
+        """
+        Registra un paso que reescribe un bloque de posiciones (p. ej. una fusión)
+
+        En modo full solo se guardan los valores del bloque, como en delta:
+        con una copia completa por bloque la traza crecería como n² en vez de
+        n log n. El replay reconstruye el array con los pasos anteriores. En
+        los demás modos es igual que record_change.
+        """
+        if self.mode != TRACE_FULL:
+            self.record_change(action, arr, indices, **extra)
+            return
+        if not self._accept():
+            return
+        values = [arr[i] for i in indices]
+        if self.sink is None:
+            self.steps.append_change(action, indices, values=values, step=self.total - 1, extra=extra)
+            return
+        step = {'action': action, 'indices': list(indices)}
+        step.update(extra)
+        step['values'] = values
+        step['step'] = self.total - 1
+        self._emit(step)
+
+
+class TraceReplayer:
+    """
+    Reconstruye bajo demanda el estado del array en cualquier paso
+
+    Funciona con trazas en modo delta (aplicando los cambios sobre la entrada
+    original) y en modo full/sampled (usando las copias guardadas). Para las
+    trazas delta se guardan puntos de control cada `checkpoint_every` pasos,
+    así reconstruir un frame no requiere recorrer la traza desde el inicio.
+    """
+
+    def __init__(self, initial: List[Any], steps: Sequence[Dict[str, Any]], checkpoint_every: int = 256):
+        self.initial = list(initial)
+        self.steps = steps
+        self.checkpoint_every = max(1, checkpoint_every)
+        self._checkpoints: Dict[int, List[Any]] = {-1: self.initial}
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    @staticmethod
+    def _apply(arr: List[Any], step: Dict[str, Any]):
+        """Aplica un paso sobre el array"""
+        if 'array' in step:
+            arr[:] = step['array']
+        elif 'values' in step:
+            for index, value in zip(step['indices'], step['values']):
+                arr[index] = value
+
+    def frame(self, index: int) -> List[Any]:
+        """Devuelve el estado del array después del paso `index`"""
+        if index < 0:
+            index += len(self.steps)
+        if index < 0 or index >= len(self.steps):
+            raise IndexError("Índice de frame fuera de rango")
+
+        step = self.steps[index]
+        if 'array' in step:
+            return list(step['array'])
+
+        # Partir del punto de control más cercano anterior al frame
+        start = max(i for i in self._checkpoints if i < index)
+        arr = list(self._checkpoints[start])
+        for i in range(start + 1, index + 1):
+            self._apply(arr, self.steps[i])
+            if (i + 1) % self.checkpoint_every == 0 and i not in self._checkpoints:
+                self._checkpoints[i] = list(arr)
+        return arr
+
+    def frames(self):
+        """Itera secuencialmente por todos los frames"""
+        arr = list(self.initial)
+        for step in self.steps:
+            self._apply(arr, step)
+            yield list(arr)
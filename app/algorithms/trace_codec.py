@@ -0,0 +1,345 @@
+"""
+Representación compacta de la traza de pasos y su formato binario
+
+CompactTrace guarda los pasos como columnas (struct-of-arrays) en lugar de un
+dict por paso: el código de acción en un array('B'), los índices de todos los
+pasos concatenados en un array('i') con sus desplazamientos, y los valores
+(los nuevos valores en modo delta o las copias completas en modo full) en un
+solo array('q'), o una lista si no son todos enteros de 64 bits. Los campos
+poco frecuentes (pivot_index, digit, los datos de una fusión...) se guardan
+aparte solo para los pasos que los tienen.
+
+Se comporta como una lista de solo lectura de dicts (los dicts se arman al
+leer cada paso), así TraceReplayer y el resto del código no cambian.
+
+Formato binario (little-endian), generado con encode_trace:
+
+    magic 'ALGT' (4s) | versión (B) | flags (B) | tipo de los valores (c) |
+    reservado (x) | cantidad de pasos (I) | relleno hasta 16 bytes
+
+seguido del cuerpo (comprimido con zlib si flags tiene el bit 0x1), que es
+una serie de secciones, cada una con su largo en bytes (I, más 4 de relleno)
+y rellenada hasta múltiplo de 8, así el cliente puede crear arrays tipados
+sobre el buffer sin copiar (ver static/js/trace_codec.js):
+
+    acciones (JSON) | códigos (u8) | flags por paso (u8) | número de paso (i32) |
+    offsets de índices (u32, n+1) | índices (i32) | offsets de valores (u32, n+1) |
+    valores (i64 'q', f64 'd' o JSON 'j') | extras (JSON: [[paso, {...}], ...])
+"""
+import json
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+MAGIC = b'ALGT'
+VERSION = 1
+HEADER = struct.Struct('<4sBBcxI4x')
+SECTION = struct.Struct('<I4x')
+
+# Nombre del formato en las respuestas de la API (traza en base64)
+TRACE_ENCODING = 'algt-v1'
+
+# Formatos de la traza en las respuestas: lista de dicts o binario
+TRACE_FORMATS = ('json', 'binary')
+
+# Flags de la cabecera
+FLAG_ZLIB = 0x1
+
+# Flags de cada paso: qué campos tiene
+STEP_INDICES = 0x1
+STEP_VALUES = 0x2
+STEP_ARRAY = 0x4
+STEP_NUMBER = 0x8
+
+# Tipo de la sección de valores
+VALUES_INT = 'q'
+VALUES_FLOAT = 'd'
+VALUES_JSON = 'j'
+
+# Claves con columna propia; el resto va a los extras del paso
+_COLUMN_KEYS = ('action', 'indices', 'values', 'array', 'step')
+
+_INT32_MIN = -(1 << 31)
+_INT32_MAX = (1 << 31) - 1
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+def _values_typecode(values: List[Any]) -> str:
+    """Tipo con el que se pueden guardar los valores sin perder información"""
+    if isinstance(values, array):
+        return values.typecode
+    if not values:
+        return VALUES_INT
+    types = set(map(type, values))
+    if types == {int} and _INT64_MIN <= min(values) and max(values) <= _INT64_MAX:
+        return VALUES_INT
+    if types == {float}:
+        return VALUES_FLOAT
+    return VALUES_JSON
+
+
+def _columnar(step: Dict[str, Any]) -> bool:
+    """Indica si los campos con columna propia tienen la forma esperada"""
+    if not isinstance(step.get('action'), str) or ('values' in step and 'array' in step):
+        return False
+    indices = step.get('indices')
+    if indices is not None and not (isinstance(indices, (list, tuple)) and
+                                    all(type(i) is int and _INT32_MIN <= i <= _INT32_MAX for i in indices)):
+        return False
+    number = step.get('step')
+    if number is not None and not (type(number) is int and 0 <= number <= _INT32_MAX):
+        return False
+    return all(isinstance(step.get(key), (list, tuple, type(None))) for key in ('values', 'array'))
+
+
+class CompactTrace(Sequence):
+    """Traza de pasos guardada por columnas"""
+
+    def __init__(self):
+        self.action_table: List[str] = []
+        self._action_codes: Dict[str, int] = {}
+        self.actions = array('B')
+        self.flags = array('B')
+        self.step_numbers = array('i')
+        self.index_offsets = array('I', [0])
+        self.indices = array('i')
+        self.value_offsets = array('I', [0])
+        # array('q') mientras todos los valores sean enteros de 64 bits; si no, lista
+        self.values: Union[array, List[Any]] = array(VALUES_INT)
+        self.extras: Dict[int, Dict[str, Any]] = {}
+
+    def _action_code(self, action: str) -> int:
+        code = self._action_codes.get(action)
+        if code is None:
+            if len(self.action_table) > 255:
+                raise ValueError("La traza admite como máximo 256 acciones distintas")
+            code = self._action_codes[action] = len(self.action_table)
+            self.action_table.append(action)
+        return code
+
+    def append_change(self, action: str, indices: Iterable[int], values: Optional[Iterable[Any]] = None,
+                      array_copy: Optional[Iterable[Any]] = None, step: Optional[int] = None,
+                      extra: Optional[Dict[str, Any]] = None):
+        """
+        Agrega un paso sin construir su dict
+
+        Args:
+            action: Nombre de la acción
+            indices: Posiciones modificadas
+            values: Nuevos valores de esas posiciones (modo delta)
+            array_copy: Estado completo del array (modos full/sampled)
+            step: Número del paso en la ejecución
+            extra: Otros campos del paso
+        """
+        flags = STEP_INDICES
+        self.actions.append(self._action_code(action))
+        self.indices.extend(indices)
+        self.index_offsets.append(len(self.indices))
+        if values is not None:
+            flags |= STEP_VALUES
+            self._extend_values(values)
+        if array_copy is not None:
+            flags |= STEP_ARRAY
+            self._extend_values(array_copy)
+        self.value_offsets.append(len(self.values))
+        if step is not None:
+            flags |= STEP_NUMBER
+        self.step_numbers.append(-1 if step is None else step)
+        self.flags.append(flags)
+        if extra:
+            self.extras[len(self.actions) - 1] = dict(extra)
+
+    def _extend_values(self, values: Iterable[Any]):
+        if isinstance(self.values, array):
+            try:
+                # fromlist no agrega nada si algún valor no entra en el array
+                self.values.fromlist(values if isinstance(values, list) else list(values))
+                return
+            except (TypeError, OverflowError):
+                # Un valor no es entero de 64 bits: se pasa todo a una lista
+                self.values = self.values.tolist()
+        self.values.extend(values)
+
+    def append(self, step: Dict[str, Any]):
+        """Agrega un paso dado como dict"""
+        if not _columnar(step):
+            # Campos con formas no previstas: el paso entero va a los extras
+            self._append_opaque(step)
+            return
+        indices = step.get('indices')
+        extra = {key: value for key, value in step.items() if key not in _COLUMN_KEYS}
+        self.append_change(step.get('action', ''), indices or (), step.get('values'),
+                           step.get('array'), step.get('step'), extra)
+        if indices is None:
+            self.flags[-1] &= ~STEP_INDICES
+
+    def _append_opaque(self, step: Dict[str, Any]):
+        action = step.get('action')
+        extra = {key: value for key, value in step.items() if key != 'action' or not isinstance(action, str)}
+        self.append_change(action if isinstance(action, str) else '', (), extra=extra)
+        self.flags[-1] &= ~STEP_INDICES
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("Índice de paso fuera de rango")
+
+        flags = self.flags[index]
+        step: Dict[str, Any] = {'action': self.action_table[self.actions[index]]}
+        if flags & STEP_INDICES:
+            step['indices'] = self.indices[self.index_offsets[index]:self.index_offsets[index + 1]].tolist()
+        extra = self.extras.get(index)
+        if extra:
+            step.update(extra)
+        values = self.values[self.value_offsets[index]:self.value_offsets[index + 1]]
+        if isinstance(values, array):
+            values = values.tolist()
+        if flags & STEP_VALUES:
+            step['values'] = values
+        if flags & STEP_NUMBER:
+            step['step'] = self.step_numbers[index]
+        if flags & STEP_ARRAY:
+            step['array'] = values
+        return step
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (CompactTrace, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __reduce__(self):
+        # Al serializar con pickle (caché de resultados, procesos) se usa el formato binario
+        if not self:
+            return CompactTrace, ()
+        try:
+            return decode_trace, (encode_trace(self, compress=False),)
+        except (TypeError, ValueError):
+            # Valores que no se pueden pasar a JSON: se copian los atributos tal cual
+            return _restore, (self.__dict__.copy(),)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Todos los pasos como lista de dicts (para JSON)"""
+        return list(self)
+
+    def __repr__(self) -> str:
+        return f"CompactTrace(steps={len(self)}, values={len(self.values)})"
+
+
+def _restore(state: Dict[str, Any]) -> CompactTrace:
+    trace = CompactTrace.__new__(CompactTrace)
+    trace.__dict__.update(state)
+    return trace
+
+
+def _section(blob: bytes) -> bytes:
+    padding = -len(blob) % 8
+    return SECTION.pack(len(blob)) + blob + b'\0' * padding
+
+
+def _typed(typecode: str, values: Iterable[Any]) -> bytes:
+    data = values if isinstance(values, array) and values.typecode == typecode else array(typecode, values)
+    if sys.byteorder != 'little':
+        data = array(typecode, data)
+        data.byteswap()
+    return data.tobytes()
+
+
+def _json(value: Any) -> bytes:
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+def encode_trace(trace: Iterable[Dict[str, Any]], compress: bool = True, level: int = 6) -> bytes:
+    """
+    Serializa una traza al formato binario
+
+    Args:
+        trace: CompactTrace o lista de pasos como dicts
+        compress: Comprimir el cuerpo con zlib
+        level: Nivel de compresión de zlib
+    """
+    if not isinstance(trace, CompactTrace):
+        compact = CompactTrace()
+        for step in trace:
+            compact.append(step)
+        trace = compact
+
+    typecode = _values_typecode(trace.values)
+    if typecode == VALUES_JSON:
+        values_blob = _json(trace.values)
+    else:
+        values_blob = _typed(typecode, trace.values)
+    body = b''.join((
+        _section(_json(trace.action_table)),
+        _section(trace.actions.tobytes()),
+        _section(trace.flags.tobytes()),
+        _section(_typed('i', trace.step_numbers)),
+        _section(_typed('I', trace.index_offsets)),
+        _section(_typed('i', trace.indices)),
+        _section(_typed('I', trace.value_offsets)),
+        _section(values_blob),
+        _section(_json([[index, extra] for index, extra in sorted(trace.extras.items())]))
+    ))
+    flags = 0
+    if compress:
+        body = zlib.compress(body, level)
+        flags |= FLAG_ZLIB
+    return HEADER.pack(MAGIC, VERSION, flags, typecode.encode('ascii'), len(trace)) + body
+
+
+def decode_trace(blob: bytes) -> CompactTrace:
+    """Reconstruye una CompactTrace desde el formato binario"""
+    if len(blob) < HEADER.size:
+        raise ValueError("Traza binaria incompleta (sin cabecera)")
+    magic, version, flags, typecode, count = HEADER.unpack_from(blob)
+    typecode = typecode.decode('ascii', errors='replace')
+    if magic != MAGIC:
+        raise ValueError("No es una traza binaria")
+    if version != VERSION:
+        raise ValueError(f"Versión de traza no soportada: {version}")
+    if typecode not in (VALUES_INT, VALUES_FLOAT, VALUES_JSON):
+        raise ValueError(f"Tipo de valores no soportado: {typecode!r}")
+
+    body = blob[HEADER.size:]
+    if flags & FLAG_ZLIB:
+        body = zlib.decompress(body)
+    sections = []
+    offset = 0
+    while offset < len(body):
+        (length,) = SECTION.unpack_from(body, offset)
+        start = offset + SECTION.size
+        sections.append(body[start:start + length])
+        offset = start + length + (-length % 8)
+    if len(sections) != 9:
+        raise ValueError("Traza binaria con secciones inválidas")
+
+    def typed(code: str, raw: bytes) -> array:
+        data = array(code)
+        data.frombytes(raw)
+        if sys.byteorder != 'little':
+            data.byteswap()
+        return data
+
+    trace = CompactTrace()
+    trace.action_table = json.loads(sections[0])
+    trace._action_codes = {action: code for code, action in enumerate(trace.action_table)}
+    trace.actions = typed('B', sections[1])
+    trace.flags = typed('B', sections[2])
+    trace.step_numbers = typed('i', sections[3])
+    trace.index_offsets = typed('I', sections[4])
+    trace.indices = typed('i', sections[5])
+    trace.value_offsets = typed('I', sections[6])
+    trace.values = json.loads(sections[7]) if typecode == VALUES_JSON else typed(typecode, sections[7])
+    trace.extras = {index: extra for index, extra in json.loads(sections[8])}
+    if len(trace.actions) != count or len(trace.index_offsets) != count + 1:
+        raise ValueError("La cantidad de pasos no coincide con la cabecera")
+    return trace
@@ -1,10 +1,99 @@
-from flask import Blueprint, request, jsonify
-from app.services import AlgorithmManager, DataGenerator
-from typing import List, Any
+from flask import Blueprint, Response, request, jsonify
+import itertools
+import json
+import os
+from app.services import AlgorithmManager, DataGenerator, BenchmarkRunner
+from app.algorithms.trace import TRACE_MODES
+from app.algorithms.trace_codec import TRACE_FORMATS
+from app.services.scaling import geometric_sizes
+from app.services.algorithm_manager import PARALLEL_COMPARE_MIN_SIZE, FAST_SUFFIX, MAX_INPUT_SIZE, \
+    MAX_BINARY_GENERATE_SIZE, MAX_BINARY_GENERATE_JOB_SIZE, MAX_STREAM_GENERATE_SIZE
+from app.services.job_manager import JobManager, JobQueueFull, JOB_KINDS
+from app.services.benchmark import BenchmarkBusy
+from app.services.step_stream import format_ndjson, format_sse
+from app.services.data_generator import GENERATOR_PARAMS, DEFAULT_CHUNK_SIZE
+from app.services.dataset_store import DatasetNotFound
+from app.services.collection_store import CollectionNotFound
+from app.algorithms.binary_format import MappedDataset
+from typing import List, Any, Optional
 
 algorithms_bp = Blueprint('algorithms', __name__, url_prefix='/api')
 algorithm_manager = AlgorithmManager()
 data_generator = DataGenerator()
+job_manager = JobManager(algorithm_manager)
+
+# Parámetros de generación que se toman de la petición (ver GENERATOR_PARAMS)
+GENERATOR_PARAM_NAMES = sorted({name for names in GENERATOR_PARAMS.values() for name in names})
+
+def _execution_kwargs(data: dict) -> dict:
+    """Argumentos de ejecución comunes (target, traza, modo de medición y variante)"""
+    kwargs = {}
+    if data.get('target') is not None:
+        kwargs['target'] = data['target']
+    if data.get('trace_mode') is not None:
+        kwargs['trace_mode'] = data['trace_mode']
+        kwargs['trace_every'] = int(data.get('trace_every', 1))
+    for option in ('two_pass', 'instrument', 'fast', 'assume_sorted'):
+        if option in data:
+            kwargs[option] = bool(data[option])
+    for option in ('memory_budget', 'fan_in', 'workers', 'oversampling'):
+        if option in data:
+            kwargs[option] = int(data[option])
+    if kwargs.get('workers', 1) < 1:
+        raise ValueError("El parámetro 'workers' debe ser un entero positivo")
+    if data.get('k') is not None:
+        kwargs['k'] = int(data['k'])
+    return kwargs
+
+def _with_fast_variants(algorithm_names: List[str]) -> List[str]:
+    """Intercala 'nombre:fast' después de cada algoritmo con motor rápido"""
+    expanded = []
+    for name in algorithm_names:
+        expanded.append(name)
+        algorithm = algorithm_manager.get_algorithm(name)
+        if algorithm and algorithm.fast_engine and not name.endswith(FAST_SUFFIX):
+            expanded.append(name + FAST_SUFFIX)
+    return expanded
+
+def _input_data(data: dict):
+    """Datos de entrada de la petición: la lista 'data' o un dataset guardado ('dataset_id')"""
+    if data.get('dataset_id') is not None:
+        return algorithm_manager.datasets.get(str(data['dataset_id']))
+    return data.get('data')
+
+def _cache_kwargs(data: dict) -> dict:
+    """Opción para omitir la caché de resultados"""
+    return {'use_cache': bool(data['use_cache'])} if 'use_cache' in data else {}
+
+def _strict_bool(value: Any, name: str) -> bool:
+    """Booleano de la petición: true/false (o 1/0, también como string); otro valor es un error"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in ('true', 'false', '1', '0'):
+        return value.strip().lower() in ('true', '1')
+    raise ValueError(f"El parámetro '{name}' debe ser true o false")
+
+def _benchmark_runner(data: dict) -> BenchmarkRunner:
+    """
+    Configuración de benchmark a partir de los parámetros de la petición
+    
+    BenchmarkRunner rechaza (ValueError, 400) los valores fuera de sus
+    límites: la medición toma un lock global y puede apagar el GC.
+    """
+    max_repeats = int(data.get('max_repeats', 200))
+    return BenchmarkRunner(
+        warmup=int(data.get('warmup', 2)),
+        min_repeats=int(data.get('min_repeats', min(5, max_repeats))),
+        max_repeats=max_repeats,
+        target_rel_error=float(data.get('target_rel_error', 0.02)),
+        max_time_s=float(data.get('max_time_s', 5.0)),
+        disable_gc=_strict_bool(data.get('disable_gc', True), 'disable_gc'),
+        bootstrap_resamples=int(data.get('bootstrap_resamples', 1000)),
+        confidence=float(data.get('confidence', 0.95)),
+        seed=data.get('seed')
+    )
 
 @algorithms_bp.route('/algorithms', methods=['GET'])
 def list_algorithms():
@@ -34,8 +123,11 @@ def run_algorithm():
             }), 400
         
         algorithm_name = data.get('algorithm')
-        input_data = data.get('data')
-        target = data.get('target')  # Para algoritmos de búsqueda
+        input_data = _input_data(data)
+        trace_mode = data.get('trace_mode')  # 'none', 'delta', 'full' o 'sampled'
+        include_steps = bool(data.get('include_steps', False))
+        trace_format = data.get('trace_format', 'json')  # 'json' o 'binary' (base64, ver trace_codec)
+        include_result = bool(data.get('include_result', True))  # False: solo métricas
         
         if not algorithm_name:
             return jsonify({
@@ -50,18 +142,77 @@ def run_algorithm():
             }), 400
         
         # Validar que input_data sea una lista
-        if not isinstance(input_data, list):
+        if not isinstance(input_data, (list, MappedDataset)):
             return jsonify({
                 'success': False,
                 'error': 'Los datos deben ser una lista'
             }), 400
         
+        if trace_mode is not None and trace_mode not in TRACE_MODES:
+            return jsonify({
+                'success': False,
+                'error': f"Modo de traza no soportado (opciones: {', '.join(TRACE_MODES)})"
+            }), 400
+        
+        if trace_format not in TRACE_FORMATS:
+            return jsonify({
+                'success': False,
+                'error': f"Formato de traza no soportado (opciones: {', '.join(TRACE_FORMATS)})"
+            }), 400
+        
         # Ejecutar algoritmo
-        kwargs = {}
-        if target is not None:
-            kwargs['target'] = target
+        kwargs = _execution_kwargs(data)
+        result = algorithm_manager.execute_algorithm(algorithm_name, input_data, include_steps=include_steps,
+                                                     **_cache_kwargs(data), **kwargs)
         
-        result = algorithm_manager.execute_algorithm(algorithm_name, input_data, **kwargs)
+        return jsonify({
+            'success': True,
+            'algorithm': algorithm_name,
+            'result': result.to_dict(include_steps=include_steps, trace_format=trace_format,
+                                     include_result=include_result)
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@algorithms_bp.route('/search/batch', methods=['POST'])
+def batch_search():
+    """Busca muchos targets sobre los mismos datos en una sola petición"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'success': False,
+                'error': 'No se proporcionaron datos'
+            }), 400
+        
+        algorithm_name = data.get('algorithm', 'binary_search')
+        input_data = _input_data(data)
+        targets = data.get('targets')
+        
+        if input_data is None:
+            return jsonify({
+                'success': False,
+                'error': 'Se requieren datos de entrada'
+            }), 400
+        
+        if not isinstance(targets, list) or not targets:
+            return jsonify({
+                'success': False,
+                'error': 'Se requiere una lista de targets'
+            }), 400
+        
+        kwargs = {option: bool(data[option]) for option in ('fast', 'assume_sorted') if option in data}
+        result = algorithm_manager.batch_search(algorithm_name, input_data, targets, **kwargs)
         
         return jsonify({
             'success': True,
@@ -80,6 +231,81 @@ def run_algorithm():
             'error': str(e)
         }), 500
 
+@algorithms_bp.route('/run/stream', methods=['POST'])
+def stream_algorithm():
+    """Ejecuta un algoritmo enviando los pasos por SSE o NDJSON a medida que ocurren"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'success': False,
+                'error': 'No se proporcionaron datos'
+            }), 400
+        
+        algorithm_name = data.get('algorithm')
+        input_data = _input_data(data)
+        trace_mode = data.get('trace_mode', 'delta')
+        stream_format = data.get('format', 'sse')
+        
+        if not algorithm_name:
+            return jsonify({
+                'success': False,
+                'error': 'Se requiere el nombre del algoritmo'
+            }), 400
+        
+        if not isinstance(input_data, (list, MappedDataset)):
+            return jsonify({
+                'success': False,
+                'error': 'Los datos deben ser una lista'
+            }), 400
+        
+        if trace_mode not in TRACE_MODES:
+            return jsonify({
+                'success': False,
+                'error': f"Modo de traza no soportado (opciones: {', '.join(TRACE_MODES)})"
+            }), 400
+        
+        if stream_format not in ('sse', 'ndjson'):
+            return jsonify({
+                'success': False,
+                'error': "Formato no soportado (opciones: sse, ndjson)"
+            }), 400
+        
+        kwargs = {}
+        if data.get('target') is not None:
+            kwargs['target'] = data['target']
+        
+        events = algorithm_manager.stream_algorithm(
+            algorithm_name,
+            input_data,
+            trace_mode=trace_mode,
+            trace_every=int(data.get('trace_every', 1)),
+            max_buffer=int(data.get('max_buffer', 256)),
+            max_fps=float(data.get('max_fps', 60)),
+            **kwargs
+        )
+        
+        if stream_format == 'sse':
+            body = (format_sse(event) for event in events)
+            mimetype = 'text/event-stream'
+        else:
+            body = (format_ndjson(event) for event in events)
+            mimetype = 'application/x-ndjson'
+        
+        return Response(body, mimetype=mimetype, headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @algorithms_bp.route('/generate', methods=['POST'])
 def generate_data():
     """Genera datos de prueba"""
@@ -88,8 +314,16 @@ def generate_data():
         
         data_type = data.get('type', 'random')
         size = data.get('size', 100)
-        min_val = data.get('min_val', 1)
-        max_val = data.get('max_val', 1000)
+        # Sin semilla se elige una y se devuelve, así el dataset se puede reproducir
+        seed = data.get('seed')
+        if seed is None:
+            seed = data_generator.new_seed()
+        params = {name: data[name] for name in GENERATOR_PARAM_NAMES if name in data}
+        
+        if data.get('format') == 'binary':
+            return _generate_binary(data_type, size, seed, params)
+        if data.get('format') == 'ndjson':
+            return _generate_stream(data_type, size, seed, params, int(data.get('chunk_size', DEFAULT_CHUNK_SIZE)))
         
         if size < 1 or size > 100000:
             return jsonify({
@@ -97,26 +331,353 @@ def generate_data():
                 'error': 'El tamaño debe estar entre 1 y 100,000'
             }), 400
         
-        generated_data = data_generator.generate_custom(
-            data_type,
-            size,
-            min_val=min_val,
-            max_val=max_val
-        )
+        generated_data = data_generator.generate_custom(data_type, size, seed=seed, **params)
         
-        return jsonify({
+        # Guardar en el registro para poder referenciarlo por id
+        dataset = algorithm_manager.store_dataset(generated_data, source=f'generate:{data_type}')
+        
+        response = {
             'success': True,
-            'data': generated_data,
+            'dataset_id': dataset['dataset_id'],
             'type': data_type,
-            'size': size
-        }), 200
+            'size': size,
+            'seed': seed
+        }
+        if data.get('include_data', True):
+            response['data'] = generated_data
+        return jsonify(response), 200
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def _generate_binary(data_type: str, size: int, seed: int, params: dict):
+    """Genera el dataset directamente en formato binario en el registro (sin devolver los datos)"""
+    if size < 1 or size > MAX_BINARY_GENERATE_SIZE:
+        return jsonify({
+            'success': False,
+            'error': f'El tamaño debe estar entre 1 y {MAX_BINARY_GENERATE_SIZE:,} '
+                     f'(hasta {MAX_BINARY_GENERATE_JOB_SIZE:,} con un job {{"type": "generate"}})'
+        }), 400
+    
+    dataset = algorithm_manager.generate_binary_dataset(data_type, size, seed=seed, **params)
+    
+    return jsonify({
+        'success': True,
+        'dataset_id': dataset['dataset_id'],
+        'type': data_type,
+        'size': size,
+        'seed': seed,
+        'format': 'binary',
+        'dataset': dataset
+    }), 200
+
+def _generate_stream(data_type: str, size: int, seed: int, params: dict, chunk_size: int):
+    """
+    Envía los datos generados en NDJSON, de a chunks, sin guardarlos
+    
+    La primera línea describe el dataset (tipo, tamaño y semilla), cada una
+    de las siguientes trae un chunk con su posición y la última indica el
+    total enviado.
+    """
+    if size < 1 or size > MAX_STREAM_GENERATE_SIZE:
+        return jsonify({
+            'success': False,
+            'error': f'El tamaño debe estar entre 1 y {MAX_STREAM_GENERATE_SIZE:,}'
+        }), 400
+    
+    chunks = data_generator.iter_chunks(data_type, size, chunk_size, seed, **params)
+    # El primer chunk se genera antes de responder: los parámetros inválidos dan 400
+    first = next(chunks)
+    
+    def events():
+        yield format_ndjson({'type': data_type, 'size': size, 'seed': seed})
+        offset = 0
+        for chunk in itertools.chain([first], chunks):
+            yield format_ndjson({'offset': offset, 'chunk': chunk})
+            offset += len(chunk)
+        yield format_ndjson({'done': True, 'count': offset})
+    
+    return Response(events(), mimetype='application/x-ndjson', headers={'Cache-Control': 'no-cache'})
+
+def _upload_binary():
+    """Escribe el cuerpo de la petición (formato binario) en el registro por bloques"""
+    path = algorithm_manager.datasets.new_binary_path()
+    try:
+        with open(path, 'wb') as f:
+            for block in iter(lambda: request.stream.read(1 << 20), b''):
+                f.write(block)
+    except Exception:
+        os.remove(path)
+        raise
+    return algorithm_manager.datasets.put_file(path)
+
+@algorithms_bp.route('/datasets', methods=['POST'])
+def upload_dataset():
+    """
+    Guarda un dataset en el servidor y devuelve su id
+    
+    Acepta JSON ({'data': [...]}) o el formato binario con
+    Content-Type: application/octet-stream.
+    """
+    try:
+        if request.mimetype == 'application/octet-stream':
+            return jsonify({
+                'success': True,
+                'dataset': _upload_binary()
+            }), 201
+        
+        data = request.get_json()
+        
+        if not data or data.get('data') is None:
+            return jsonify({
+                'success': False,
+                'error': 'Se requieren datos de entrada'
+            }), 400
+        
+        dataset = algorithm_manager.store_dataset(data['data'])
+        
+        return jsonify({
+            'success': True,
+            'dataset': dataset
+        }), 201
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@algorithms_bp.route('/datasets', methods=['GET'])
+def list_datasets():
+    """Lista los datasets guardados y el uso del registro"""
+    return jsonify({
+        'success': True,
+        'datasets': algorithm_manager.datasets.list_datasets(),
+        'stats': algorithm_manager.datasets.stats()
+    }), 200
+
+@algorithms_bp.route('/datasets/<dataset_id>', methods=['GET'])
+def get_dataset(dataset_id):
+    """Información de un dataset (con ?include_data=1 también los datos)"""
+    try:
+        info = algorithm_manager.datasets.info(dataset_id)
+        if request.args.get('include_data', '0').lower() in ('1', 'true'):
+            if info['size'] > MAX_INPUT_SIZE:
+                return jsonify({
+                    'success': False,
+                    'error': f'El dataset es demasiado grande para devolverlo (máximo {MAX_INPUT_SIZE:,} elementos)'
+                }), 400
+            info['data'] = list(algorithm_manager.datasets.get(dataset_id))
+    except DatasetNotFound as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 404
+    return jsonify({
+        'success': True,
+        'dataset': info
+    }), 200
+
+@algorithms_bp.route('/datasets/<dataset_id>/sort', methods=['POST'])
+def sort_dataset(dataset_id):
+    """Ordena un dataset con Merge Sort externo (memoria acotada) y guarda el resultado como otro dataset"""
+    try:
+        data = request.get_json(silent=True) or {}
+        kwargs = {}
+        if 'memory_budget_mb' in data:
+            kwargs['memory_budget'] = int(float(data['memory_budget_mb']) * 1024 * 1024)
+        if 'fan_in' in data:
+            kwargs['fan_in'] = int(data['fan_in'])
+        
+        result = algorithm_manager.sort_dataset(dataset_id, **kwargs)
+        
+        return jsonify({
+            'success': True,
+            'dataset_id': result['dataset']['dataset_id'],
+            'dataset': result['dataset'],
+            'metrics': result['metrics']
+        }), 201
         
+    except DatasetNotFound as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 404
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+@algorithms_bp.route('/datasets/<dataset_id>', methods=['DELETE'])
+def delete_dataset(dataset_id):
+    """Elimina un dataset del registro"""
+    if not algorithm_manager.datasets.delete(dataset_id):
+        return jsonify({
+            'success': False,
+            'error': f"Dataset '{dataset_id}' no encontrado o expirado"
+        }), 404
+    return jsonify({
+        'success': True
+    }), 200
+
+def _collection_response(action, success_status: int = 200):
+    """Ejecuta una operación sobre colecciones con las respuestas de error habituales"""
+    try:
+        return jsonify({'success': True, **action()}), success_status
+    except (CollectionNotFound, DatasetNotFound) as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 404
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def _batch_values(data: dict) -> list:
+    values = data.get('values')
+    if not isinstance(values, list):
+        raise ValueError("Se requiere una lista 'values'")
+    if len(values) > MAX_INPUT_SIZE:
+        raise ValueError(f"Demasiados valores (máximo {MAX_INPUT_SIZE:,} por petición)")
+    return values
+
+@algorithms_bp.route('/collections', methods=['POST'])
+def create_collection():
+    """
+    Crea una colección ordenada en el servidor
+    
+    Se inicializa con 'data', con un dataset guardado ('dataset_id') o vacía;
+    'load' fija el tamaño de referencia de los bloques.
+    """
+    data = request.get_json(silent=True) or {}
+    
+    def action():
+        kwargs = {'load': int(data['load'])} if 'load' in data else {}
+        values = _input_data(data)
+        return algorithm_manager.create_collection([] if values is None else values, **kwargs)
+    
+    return _collection_response(action, 201)
+
+@algorithms_bp.route('/collections', methods=['GET'])
+def list_collections():
+    """Lista las colecciones y el uso del registro"""
+    return jsonify({
+        'success': True,
+        'collections': algorithm_manager.collections.list_collections(),
+        'stats': algorithm_manager.collections.stats()
+    }), 200
+
+@algorithms_bp.route('/collections/<collection_id>', methods=['GET'])
+def get_collection(collection_id):
+    """Información de una colección (con ?include_data=1 también los valores)"""
+    def action():
+        info = algorithm_manager.collections.info(collection_id)
+        if request.args.get('include_data', '0').lower() in ('1', 'true'):
+            if info['size'] > MAX_INPUT_SIZE:
+                raise ValueError(f'La colección es demasiado grande para devolverla (máximo {MAX_INPUT_SIZE:,} elementos)')
+            info['data'] = algorithm_manager.collections.values(collection_id)
+        return {'collection': info}
+    
+    return _collection_response(action)
+
+@algorithms_bp.route('/collections/<collection_id>', methods=['DELETE'])
+def delete_collection(collection_id):
+    """Elimina una colección"""
+    if not algorithm_manager.collections.delete(collection_id):
+        return jsonify({
+            'success': False,
+            'error': f"Colección '{collection_id}' no encontrada o expirada"
+        }), 404
+    return jsonify({
+        'success': True
+    }), 200
+
+@algorithms_bp.route('/collections/<collection_id>/insert', methods=['POST'])
+def insert_into_collection(collection_id):
+    """Inserta un lote de valores ('values') en la colección"""
+    data = request.get_json(silent=True) or {}
+    return _collection_response(lambda: algorithm_manager.collections.insert(collection_id, _batch_values(data)))
+
+@algorithms_bp.route('/collections/<collection_id>/delete', methods=['POST'])
+def delete_from_collection(collection_id):
+    """Elimina de la colección una aparición de cada valor de 'values'"""
+    data = request.get_json(silent=True) or {}
+    return _collection_response(lambda: algorithm_manager.collections.remove(collection_id, _batch_values(data)))
+
+@algorithms_bp.route('/collections/<collection_id>/query', methods=['POST'])
+def query_collection(collection_id):
+    """
+    Consulta la colección: 'operation' es rank, bisect_left, bisect_right,
+    count o contains (con 'value' o una lista 'values'), select (con
+    'index') o range (con 'min', 'max', 'inclusive' y 'limit')
+    """
+    data = request.get_json(silent=True) or {}
+    
+    def action():
+        kwargs = {}
+        if 'values' in data:
+            kwargs['values'] = _batch_values(data)
+        if 'inclusive' in data:
+            if not isinstance(data['inclusive'], list) or len(data['inclusive']) != 2:
+                raise ValueError("inclusive debe tener dos valores [mínimo, máximo]")
+            kwargs['inclusive'] = tuple(bool(flag) for flag in data['inclusive'])
+        if data.get('limit') is not None:
+            kwargs['limit'] = int(data['limit'])
+        return algorithm_manager.collections.query(
+            collection_id, data.get('operation', ''), value=data.get('value'), index=data.get('index'),
+            minimum=data.get('min'), maximum=data.get('max'), **kwargs
+        )
+    
+    return _collection_response(action)
+
+@algorithms_bp.route('/collections/<collection_id>/snapshot', methods=['POST'])
+def snapshot_collection(collection_id):
+    """Guarda el contenido actual de la colección como dataset (marcado como ordenado)"""
+    return _collection_response(lambda: {'dataset': algorithm_manager.snapshot_collection(collection_id)}, 201)
+
+def _comparison_entry(name: str, result, include_result: bool, k: Optional[int]) -> dict:
+    """
+    Resultado de un algoritmo en /api/compare
+    
+    Con 'k' el resultado de los ordenamientos completos se recorta a los k
+    menores (ordenar todo y cortar), así se compara directamente con los
+    algoritmos de selección, que solo calculan esos k.
+    """
+    if isinstance(result, dict):
+        return {'error': result['error']}
+    algorithm = algorithm_manager.get_algorithm(name)
+    if k is not None and algorithm is not None and not (algorithm.selection or algorithm.requires_target) \
+            and isinstance(result.result, list):
+        result.result = result.result[:k]
+        result.metadata['sliced_to_k'] = k
+    return result.to_dict(include_result=include_result)
+
 @algorithms_bp.route('/compare', methods=['POST'])
 def compare_algorithms():
     """Compara múltiples algoritmos con los mismos datos"""
@@ -130,8 +691,7 @@ def compare_algorithms():
             }), 400
         
         algorithm_names = data.get('algorithms', [])
-        input_data = data.get('data')
-        target = data.get('target')
+        input_data = _input_data(data)
         
         if not algorithm_names:
             return jsonify({
@@ -145,31 +705,251 @@ def compare_algorithms():
                 'error': 'Se requieren datos de entrada'
             }), 400
         
-        if not isinstance(input_data, list):
+        if not isinstance(input_data, (list, MappedDataset)):
             return jsonify({
                 'success': False,
                 'error': 'Los datos deben ser una lista'
             }), 400
         
+        kwargs = _execution_kwargs(data)
+        kwargs.pop('trace_mode', None)
+        kwargs.pop('trace_every', None)
+        
+        if data.get('include_fast'):
+            # Agregar la variante sin instrumentación junto a cada algoritmo
+            algorithm_names = _with_fast_variants(algorithm_names)
+        
+        parallel = bool(data.get('parallel', len(input_data) >= PARALLEL_COMPARE_MIN_SIZE))
+        timeout = data.get('timeout_s')
+        timeout = float(timeout) if timeout is not None else None
+        include_result = bool(data.get('include_result', True))  # False: solo métricas
+        
+        if data.get('stream'):
+            # Un objeto JSON por línea, en el orden en que terminan los algoritmos
+            def generate():
+                for name, result in algorithm_manager.iter_compare(algorithm_names, input_data, timeout, **kwargs):
+                    payload = _comparison_entry(name, result, include_result, kwargs.get('k'))
+                    yield json.dumps({'algorithm': name, **payload}) + '\n'
+            
+            algorithm_manager._validate_input(input_data)
+            return Response(generate(), mimetype='application/x-ndjson')
+        
+        if not parallel:
+            kwargs.update(_cache_kwargs(data))
+        results = algorithm_manager.compare_algorithms(
+            algorithm_names, input_data, parallel=parallel, timeout=timeout, **kwargs
+        )
+        
+        # Convertir resultados a diccionario
+        comparison_results = {name: _comparison_entry(name, result, include_result, kwargs.get('k'))
+                              for name, result in results.items()}
+        
+        return jsonify({
+            'success': True,
+            'results': comparison_results
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@algorithms_bp.route('/benchmark', methods=['POST'])
+def benchmark_algorithms():
+    """Benchmark estadístico (calentamiento, repeticiones e intervalo de confianza)"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'success': False,
+                'error': 'No se proporcionaron datos'
+            }), 400
+        
+        algorithm_names = data.get('algorithms') or ([data['algorithm']] if data.get('algorithm') else [])
+        input_data = _input_data(data)
+        target = data.get('target')
+        
+        if not algorithm_names:
+            return jsonify({
+                'success': False,
+                'error': 'Se requiere al menos un algoritmo'
+            }), 400
+        
+        if not isinstance(input_data, (list, MappedDataset)):
+            return jsonify({
+                'success': False,
+                'error': 'Los datos deben ser una lista'
+            }), 400
+        
+        runner = _benchmark_runner(data)
+        
         kwargs = {}
         if target is not None:
             kwargs['target'] = target
         
-        results = algorithm_manager.compare_algorithms(algorithm_names, input_data, **kwargs)
+        results = algorithm_manager.benchmark_algorithms(algorithm_names, input_data, runner, **kwargs)
         
-        # Convertir resultados a diccionario
-        comparison_results = {}
-        for name, result in results.items():
-            if isinstance(result, dict) and 'error' in result:
-                comparison_results[name] = {'error': result['error']}
-            else:
-                comparison_results[name] = result.to_dict()
+        return jsonify({
+            'success': True,
+            'results': results
+        }), 200
+        
+    except BenchmarkBusy as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 503
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@algorithms_bp.route('/scaling', methods=['POST'])
+def scaling_sweep():
+    """Barrido de tamaños con ajuste empírico de complejidad"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'success': False,
+                'error': 'No se proporcionaron datos'
+            }), 400
+        
+        algorithm_names = data.get('algorithms', [])
+        if not algorithm_names:
+            return jsonify({
+                'success': False,
+                'error': 'Se requiere al menos un algoritmo'
+            }), 400
+        
+        sizes = data.get('sizes')
+        if sizes is None:
+            sizes = geometric_sizes(
+                int(data.get('min_size', 100)),
+                int(data.get('max_size', 10000)),
+                int(data.get('points', 8))
+            )
+        
+        # Las variantes rápidas con NumPy admiten arrays de hasta 10^7 elementos
+        max_size = algorithm_manager.max_input_size(algorithm_names)
+        if not sizes or any(not isinstance(size, int) or size < 1 or size > max_size for size in sizes):
+            return jsonify({
+                'success': False,
+                'error': f'Los tamaños deben estar entre 1 y {max_size:,}'
+            }), 400
+        
+        max_repeats = int(data.get('max_repeats', 10))
+        runner = BenchmarkRunner(
+            warmup=int(data.get('warmup', 1)),
+            min_repeats=int(data.get('min_repeats', min(3, max_repeats))),
+            max_repeats=max_repeats,
+            target_rel_error=float(data.get('target_rel_error', 0.05)),
+            max_time_s=float(data.get('max_time_s', 2.0))
+        )
+        
+        kwargs = {}
+        if data.get('target') is not None:
+            kwargs['target'] = data['target']
+        
+        result = algorithm_manager.scaling_sweep(
+            algorithm_names,
+            sizes,
+            data.get('type', 'random'),
+            runner,
+            float(data.get('time_budget_s', 10.0)),
+            **kwargs
+        )
         
         return jsonify({
             'success': True,
-            'results': comparison_results
+            **result
+        }), 200
+        
+    except BenchmarkBusy as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 503
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@algorithms_bp.route('/scaling/workers', methods=['POST'])
+def worker_scaling():
+    """Aceleración de un ordenamiento paralelo según la cantidad de procesos"""
+    try:
+        data = request.get_json() or {}
+        
+        name = data.get('algorithm', 'parallel_merge_sort')
+        size = data.get('size', 100000)
+        workers = data.get('workers', [1, 2, 4, 8])
+        
+        max_size = algorithm_manager.max_input_size([name])
+        if not isinstance(size, int) or size < 1 or size > max_size:
+            return jsonify({
+                'success': False,
+                'error': f'El tamaño debe estar entre 1 y {max_size:,}'
+            }), 400
+        if not isinstance(workers, list) or not workers:
+            return jsonify({
+                'success': False,
+                'error': 'Se requiere una lista de cantidades de procesos'
+            }), 400
+        
+        max_repeats = int(data.get('max_repeats', 5))
+        runner = BenchmarkRunner(
+            warmup=int(data.get('warmup', 1)),
+            min_repeats=int(data.get('min_repeats', min(3, max_repeats))),
+            max_repeats=max_repeats,
+            target_rel_error=float(data.get('target_rel_error', 0.05)),
+            max_time_s=float(data.get('max_time_s', 5.0))
+        )
+        
+        result = algorithm_manager.worker_scaling(
+            name,
+            size,
+            workers,
+            data.get('type', 'random'),
+            runner,
+            **_execution_kwargs({key: value for key, value in data.items() if key != 'workers'})
+        )
+        
+        return jsonify({
+            'success': True,
+            **result
         }), 200
         
+    except BenchmarkBusy as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 503
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -178,16 +958,171 @@ def compare_algorithms():
 
 @algorithms_bp.route('/history', methods=['GET'])
 def get_history():
-    """Obtiene el historial de ejecuciones"""
+    """Obtiene el historial de ejecuciones (filtrado y paginado, del más reciente al más antiguo)"""
+    try:
+        page = algorithm_manager.get_history(
+            limit=request.args.get('limit', 10, type=int),
+            offset=request.args.get('offset', 0, type=int),
+            algorithm=request.args.get('algorithm') or None,
+            min_size=request.args.get('min_size', type=int),
+            max_size=request.args.get('max_size', type=int),
+            since=request.args.get('since', type=float),
+            until=request.args.get('until', type=float)
+        )
+        return jsonify({
+            'success': True,
+            'history': page['records'],
+            'total': page['total'],
+            'limit': page['limit'],
+            'offset': page['offset']
+        }), 200
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@algorithms_bp.route('/history/stats', methods=['GET'])
+def get_history_stats():
+    """Estadísticas acumuladas del historial por algoritmo"""
     try:
-        limit = request.args.get('limit', 10, type=int)
-        history = algorithm_manager.get_history(limit)
+        stats = algorithm_manager.history_stats(request.args.get('algorithm') or None)
         return jsonify({
             'success': True,
-            'history': history
+            'stats': stats
         }), 200
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
+
+@algorithms_bp.route('/jobs', methods=['POST'])
+def submit_job():
+    """Encola una ejecución larga y devuelve el id del job inmediatamente"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'success': False,
+                'error': 'No se proporcionaron datos'
+            }), 400
+        
+        kind = data.get('type', 'run')
+        if kind not in JOB_KINDS:
+            return jsonify({
+                'success': False,
+                'error': f"Tipo de job no soportado (opciones: {', '.join(JOB_KINDS)})"
+            }), 400
+        
+        if kind == 'generate':
+            # La generación no lleva algoritmos ni datos: el resultado es el dataset binario
+            seed = data.get('seed')
+            if seed is None:
+                seed = data_generator.new_seed()
+            params = {name: data[name] for name in GENERATOR_PARAM_NAMES if name in data}
+            job = job_manager.submit_generate(data.get('data_type', 'random'), data.get('size'), seed, **params)
+            return jsonify({
+                'success': True,
+                'job': job.to_dict()
+            }), 202
+        
+        algorithm_names = data.get('algorithms') or ([data['algorithm']] if data.get('algorithm') else [])
+        if kind == 'run':
+            algorithm_names = algorithm_names[:1]
+        input_data = _input_data(data)
+        
+        if input_data is None:
+            return jsonify({
+                'success': False,
+                'error': 'Se requieren datos de entrada'
+            }), 400
+        
+        kwargs = _execution_kwargs(data) if kind != 'benchmark' else (
+            {'target': data['target']} if data.get('target') is not None else {}
+        )
+        runner = _benchmark_runner(data) if kind == 'benchmark' else None
+        
+        job = job_manager.submit(kind, algorithm_names, input_data, runner, **kwargs)
+        
+        return jsonify({
+            'success': True,
+            'job': job.to_dict()
+        }), 202
+        
+    except JobQueueFull as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 503
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@algorithms_bp.route('/jobs', methods=['GET'])
+def list_jobs():
+    """Lista los jobs (sin resultados)"""
+    return jsonify({
+        'success': True,
+        'jobs': [job.to_dict(include_result=False) for job in job_manager.list_jobs()]
+    }), 200
+
+@algorithms_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Estado, progreso y resultado de un job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Job no encontrado'
+        }), 404
+    return jsonify({
+        'success': True,
+        'job': job.to_dict()
+    }), 200
+
+@algorithms_bp.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancela un job en cola o en ejecución"""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Job no encontrado'
+        }), 404
+    return jsonify({
+        'success': True,
+        'job': job.to_dict(include_result=False),
+        # False si corre una variante rápida: se detiene al terminar la fase en curso
+        'interruptible': job.interruptible
+    }), 200
+
+@algorithms_bp.route('/cache', methods=['GET'])
+def cache_stats():
+    """Estadísticas de la caché de resultados"""
+    return jsonify({
+        'success': True,
+        'cache': algorithm_manager.result_cache.stats()
+    }), 200
+
+@algorithms_bp.route('/cache', methods=['DELETE'])
+def clear_cache():
+    """Vacía la caché de resultados"""
+    algorithm_manager.result_cache.clear()
+    return jsonify({
+        'success': True,
+        'cache': algorithm_manager.result_cache.stats()
+    }), 200
@@ -0,0 +1,121 @@
+"""
+Serialización JSON rápida y compresión de las respuestas
+
+FastJSONProvider reemplaza al proveedor JSON de Flask (lo usa jsonify): si
+orjson está instalado serializa con él, que es varias veces más rápido con
+listas grandes, y si no (o si orjson no admite algún valor, p. ej. enteros
+de más de 64 bits) usa el módulo json de la biblioteca estándar. orjson es
+una dependencia opcional.
+
+init_compression registra un after_request que comprime con gzip o deflate
+las respuestas JSON grandes según el Accept-Encoding del cliente. Los
+tiempos de serialización y compresión se informan en las cabeceras
+X-Serialization-Time-Ms y X-Compression-Time-Ms.
+"""
+import gzip
+import json
+import os
+import time
+import zlib
+from typing import Any
+
+from flask import Flask, Response, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+ORJSON_AVAILABLE = orjson is not None
+
+# Codificaciones de contenido soportadas, en orden de preferencia
+COMPRESSION_ENCODINGS = ('gzip', 'deflate')
+
+# Por debajo de este tamaño comprimir no compensa
+COMPRESSION_MIN_BYTES = 1024
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Proveedor JSON de Flask con orjson como camino rápido"""
+
+    # 'orjson' o 'json'; con 'json' se usa siempre la biblioteca estándar
+    encoder = 'orjson' if ORJSON_AVAILABLE else 'json'
+
+    def _orjson_options(self) -> int:
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        """Serializa a bytes UTF-8 (sin pasar por str con orjson)"""
+        if self.encoder == 'orjson':
+            try:
+                return orjson.dumps(obj, default=self.default, option=self._orjson_options())
+            except TypeError:
+                # Valores que orjson no admite: se usa la biblioteca estándar
+                pass
+        return json.dumps(obj, default=self.default, ensure_ascii=self.ensure_ascii,
+                          sort_keys=self.sort_keys, separators=(',', ':')).encode('utf-8')
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode('utf-8')
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Respuesta JSON (lo que devuelve jsonify) con el tiempo de serialización en una cabecera"""
+        obj = self._prepare_response_obj(args, kwargs)
+        start = time.perf_counter()
+        body = self.dumps_bytes(obj)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        response = self._app.response_class(body, mimetype=self.mimetype)
+        response.headers['X-Serialization-Time-Ms'] = f"{elapsed_ms:.3f}"
+        response.headers['X-JSON-Encoder'] = self.encoder
+        return response
+
+
+def _compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    # 'deflate' en HTTP es el formato zlib (RFC 1950)
+    return zlib.compress(body, level)
+
+
+def init_compression(app: Flask):
+    """
+    Comprime las respuestas JSON según Accept-Encoding
+
+    Configuración: COMPRESS_RESPONSES (True por defecto),
+    COMPRESSION_MIN_BYTES y COMPRESSION_LEVEL (1 por defecto: con listas de
+    números los niveles altos ganan poco tamaño y tardan varias veces más).
+    """
+    app.config.setdefault('COMPRESS_RESPONSES', os.getenv('COMPRESS_RESPONSES', '1') == '1')
+    app.config.setdefault('COMPRESSION_MIN_BYTES', int(os.getenv('COMPRESSION_MIN_BYTES', str(COMPRESSION_MIN_BYTES))))
+    app.config.setdefault('COMPRESSION_LEVEL', int(os.getenv('COMPRESSION_LEVEL', '1')))
+
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        if not app.config['COMPRESS_RESPONSES']:
+            return response
+        if response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers:
+            return response
+        if response.mimetype != 'application/json':
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = request.accept_encodings.best_match(COMPRESSION_ENCODINGS)
+        if encoding is None:
+            return response
+        body = response.get_data()
+        if len(body) < app.config['COMPRESSION_MIN_BYTES']:
+            return response
+
+        start = time.perf_counter()
+        compressed = _compress(body, encoding, app.config['COMPRESSION_LEVEL'])
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        response.headers['X-Compression-Time-Ms'] = f"{elapsed_ms:.3f}"
+        response.headers['X-Uncompressed-Length'] = str(len(body))
+        return response
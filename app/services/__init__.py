@@ -1,4 +1,5 @@
 from app.services.algorithm_manager import AlgorithmManager
 from app.services.data_generator import DataGenerator
+from app.services.benchmark import BenchmarkRunner
 
-__all__ = ['AlgorithmManager', 'DataGenerator']
+__all__ = ['AlgorithmManager', 'DataGenerator', 'BenchmarkRunner']
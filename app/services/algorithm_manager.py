@@ -1,39 +1,119 @@
 from app.algorithms import AVAILABLE_ALGORITHMS
 from app.algorithms.base import AlgorithmBase, AlgorithmResult
-from typing import List, Any, Dict, Optional
+from app.services.benchmark import BenchmarkRunner, BenchmarkBusy
+from app.services.scaling import ScalingAnalyzer
+from app.services.process_pool import get_process_pool
+from app.services.step_stream import stream_steps
+from app.services.result_cache import ResultCache
+from app.services.dataset_store import DatasetStore
+from app.services.history_store import HistoryStore
+from app.services.collection_store import CollectionStore
+from app.services.data_generator import DataGenerator
+from app.algorithms.dataset import Dataset
+from app.algorithms.binary_format import MappedDataset, file_fingerprint
+from app.algorithms.external_sort import ExternalSorter, DEFAULT_MEMORY_BUDGET, DEFAULT_FAN_IN
+from app.algorithms.selection import selection_k
+from app.algorithms.trace import default_trace_mode, TRACE_NONE
+from app.algorithms import numpy_backend
+from typing import List, Any, Dict, Iterator, Optional, Tuple, Union
+import os
+import threading
+import time
+
+# Tamaño de entrada a partir del cual /api/compare usa el pool de procesos por defecto
+PARALLEL_COMPARE_MIN_SIZE = 5000
+
+# Sufijo que selecciona la variante sin instrumentación ('merge_sort:fast')
+FAST_SUFFIX = ':fast'
+
+# Tamaño máximo de las listas de entrada
+MAX_INPUT_SIZE = 100000
+
+# Tamaño máximo de los arrays NumPy (solo variantes rápidas)
+MAX_ARRAY_INPUT_SIZE = 10 ** 7
+
+# Tamaño máximo de los datasets binarios mapeados para algoritmos que no los copian
+MAX_MAPPED_INPUT_SIZE = 10 ** 9
+
+# Tamaño máximo de los datasets binarios generados en la petición (los más
+# grandes se generan con un job 'generate')
+MAX_BINARY_GENERATE_SIZE = int(os.getenv('BINARY_GENERATE_MAX_SIZE', str(MAX_ARRAY_INPUT_SIZE)))
+
+# Tamaño máximo de los datasets binarios generados en un job
+MAX_BINARY_GENERATE_JOB_SIZE = int(os.getenv('BINARY_GENERATE_JOB_MAX_SIZE', str(10 ** 8)))
+
+# Tamaño máximo de los datos generados en streaming (NDJSON, no se guardan)
+MAX_STREAM_GENERATE_SIZE = 10 ** 8
 
 class AlgorithmManager:
     """Gestor de algoritmos para registro y ejecución"""
     
-    def __init__(self):
+    def __init__(self, result_cache: Optional[ResultCache] = None,
+                 dataset_store: Optional[DatasetStore] = None,
+                 history_store: Optional[HistoryStore] = None,
+                 collection_store: Optional[CollectionStore] = None):
         self.algorithms = AVAILABLE_ALGORITHMS.copy()
-        self.execution_history = []
+        self.history = history_store or HistoryStore.from_env()
+        self.result_cache = result_cache or ResultCache(
+            max_bytes=int(os.getenv('RESULT_CACHE_MAX_MB', '64')) * 1024 * 1024,
+            persist_dir=os.getenv('RESULT_CACHE_DIR') or None
+        )
+        self.datasets = dataset_store or DatasetStore.from_env()
+        self.collections = collection_store or CollectionStore.from_env()
     
     def register_algorithm(self, name: str, algorithm: AlgorithmBase):
         """Registra un nuevo algoritmo"""
         self.algorithms[name] = algorithm
     
     def get_algorithm(self, name: str) -> Optional[AlgorithmBase]:
-        """Obtiene un algoritmo por nombre"""
+        """Obtiene un algoritmo por nombre (acepta el sufijo de variante rápida)"""
+        if name.endswith(FAST_SUFFIX):
+            name = name[:-len(FAST_SUFFIX)]
         return self.algorithms.get(name)
     
+    @staticmethod
+    def is_fast(name: str, kwargs: Optional[Dict[str, Any]] = None) -> bool:
+        """Indica si se pidió la variante sin instrumentación"""
+        return name.endswith(FAST_SUFFIX) or bool((kwargs or {}).get('fast'))
+    
+    def max_input_size(self, algorithm_names: List[str]) -> int:
+        """Tamaño máximo de entrada para un conjunto de algoritmos"""
+        if numpy_backend.NUMPY_AVAILABLE and algorithm_names and all(map(self.is_fast, algorithm_names)):
+            return MAX_ARRAY_INPUT_SIZE
+        return MAX_INPUT_SIZE
+    
+    @staticmethod
+    def _variant_kwargs(name: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Agrega fast=True si el nombre pide la variante sin instrumentación"""
+        if name.endswith(FAST_SUFFIX):
+            return {**kwargs, 'fast': True}
+        return kwargs
+    
     def list_algorithms(self) -> Dict[str, Dict[str, str]]:
         """Lista todos los algoritmos disponibles"""
         return {
             name: {
                 'name': algo.name,
-                'description': algo.description
+                'description': algo.description,
+                'fast_engine': algo.fast_engine,
+                'requires_target': algo.requires_target,
+                'selection': algo.selection
             }
             for name, algo in self.algorithms.items()
         }
     
-    def execute_algorithm(self, name: str, data: List[Any], **kwargs) -> AlgorithmResult:
+    def execute_algorithm(self, name: str, data: List[Any], use_cache: bool = True,
+                          include_steps: bool = False, **kwargs) -> AlgorithmResult:
         """
         Ejecuta un algoritmo por nombre
         
         Args:
             name: Nombre del algoritmo
             data: Datos de entrada
+            use_cache: Reutilizar un resultado previo con los mismos datos y
+                argumentos (la metadata indica 'cached': True)
+            include_steps: Se van a devolver los pasos; si es False y no se
+                indica trace_mode no se registra ninguno
             **kwargs: Argumentos adicionales para el algoritmo
             
         Returns:
@@ -47,35 +127,243 @@ class AlgorithmManager:
         if not algorithm:
             raise ValueError(f"Algoritmo '{name}' no encontrado")
         
+        # Sin pasos pedidos no se construye la traza (sería descartada)
+        if not include_steps and kwargs.get('trace_mode') is None:
+            kwargs['trace_mode'] = TRACE_NONE
+        
         # Validar entrada
-        self._validate_input(data)
+        kwargs = self._variant_kwargs(name, kwargs)
+        self._validate_input(data, fast=kwargs.get('fast', False), algorithm=algorithm)
+        if algorithm.selection:
+            selection_k(data, kwargs.get('k'))
+        if numpy_backend.is_array(data) or (isinstance(data, MappedDataset) and not data.fingerprint):
+            use_cache = False
+        
+        cache_key = self._cache_key(name, algorithm, data, kwargs, include_steps) if use_cache else None
+        if cache_key:
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                cached.initial = data
+                cached.metadata['cached'] = True
+                self._record_history(name, data, cached)
+                return cached
         
         # Ejecutar algoritmo
         try:
             result = algorithm.run_with_metrics(data, **kwargs)
+        except Exception as e:
+            raise Exception(f"Error ejecutando algoritmo '{name}': {str(e)}")
+        
+        result.metadata['cached'] = False
+        if cache_key:
+            self.result_cache.put(cache_key, result, include_steps=include_steps)
+        self._record_history(name, data, result)
+        return result
+    
+    def batch_search(self, name: str, data: List[Any], targets: List[Any], **kwargs) -> AlgorithmResult:
+        """
+        Busca muchos targets sobre los mismos datos en una sola ejecución
+        
+        Args:
+            name: Nombre del algoritmo de búsqueda (acepta el sufijo ':fast')
+            data: Datos de entrada
+            targets: Valores a buscar
+            **kwargs: Argumentos adicionales (assume_sorted, fast)
             
-            # Guardar en historial
-            self.execution_history.append({
-                'algorithm': name,
-                'input_size': len(data),
-                'result': result.to_dict(),
-                'timestamp': None  # Se puede agregar datetime si se necesita
-            })
-            
-            return result
+        Returns:
+            AlgorithmResult con un resultado por target y métricas agregadas
+        """
+        algorithm = self.get_algorithm(name)
+        if not algorithm:
+            raise ValueError(f"Algoritmo '{name}' no encontrado")
+        if not algorithm.requires_target:
+            raise ValueError(f"El algoritmo '{name}' no es de búsqueda")
+        
+        kwargs = self._variant_kwargs(name, kwargs)
+        self._validate_input(data, fast=kwargs.get('fast', False), algorithm=algorithm)
+        if not isinstance(targets, list) or not targets:
+            raise ValueError("Se requiere una lista de targets no vacía")
+        if len(targets) > MAX_INPUT_SIZE:
+            raise ValueError(f"Demasiados targets (máximo {MAX_INPUT_SIZE:,})")
+        if not all(isinstance(target, (int, float, str)) for target in targets):
+            raise ValueError("Los targets deben ser números o strings")
+        
+        try:
+            result = algorithm.run_batch_with_metrics(data, targets, **kwargs)
+        except ValueError:
+            raise
         except Exception as e:
             raise Exception(f"Error ejecutando algoritmo '{name}': {str(e)}")
+        
+        self._record_history(name, data, result)
+        return result
+    
+    def _cache_key(self, name: str, algorithm: AlgorithmBase, data: List[Any], kwargs: Dict[str, Any],
+                   include_steps: bool = False) -> str:
+        """
+        Clave de caché: algoritmo, datos y argumentos efectivos (incluido el
+        modo de traza); las entradas sin pasos se guardan con otra clave
+        """
+        effective = dict(kwargs)
+        if effective.get('trace_mode') is None:
+            effective['trace_mode'] = default_trace_mode(len(data))
+        if include_steps:
+            effective['include_steps'] = True
+        algorithm_id = f"{name}:{type(algorithm).__module__}.{type(algorithm).__qualname__}"
+        if isinstance(data, MappedDataset) and not data.fingerprint:
+            data.fingerprint = file_fingerprint(data.path)
+        if isinstance(data, (Dataset, MappedDataset)) and data.fingerprint:
+            # Dataset del registro: su id ya es el hash del contenido
+            return ResultCache.make_key(algorithm_id, {'dataset_id': data.fingerprint}, effective)
+        return ResultCache.make_key(algorithm_id, data, effective)
+    
+    def stream_algorithm(self, name: str, data: List[Any], **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        Ejecuta un algoritmo entregando sus pasos a medida que ocurren
+        
+        Args:
+            name: Nombre del algoritmo
+            data: Datos de entrada
+            **kwargs: Argumentos de stream_steps y del algoritmo
+            
+        Returns:
+            Generador de eventos (start, step, result o error)
+        """
+        algorithm = self.get_algorithm(name)
+        if not algorithm:
+            raise ValueError(f"Algoritmo '{name}' no encontrado")
+        
+        self._validate_input(data, algorithm=algorithm)
+        
+        def generate():
+            for event in stream_steps(algorithm, data, **kwargs):
+                if event['type'] == 'result':
+                    self._record_history(name, data, AlgorithmResult(event['result'], event['metadata']))
+                yield event
+        
+        return generate()
+    
+    def _record_history(self, name: str, data: List[Any], result: AlgorithmResult):
+        """Guarda una ejecución en el historial (solo métricas, sin resultado ni pasos)"""
+        self.history.record(name, len(data), result.metadata)
     
-    def _validate_input(self, data: List[Any]):
-        """Valida los datos de entrada"""
+    def store_dataset(self, data: List[Any], source: str = 'upload') -> Dict[str, Any]:
+        """Valida y guarda un dataset en el registro; devuelve su información con el id"""
+        self._validate_input(data)
+        return self.datasets.put(data, source)
+    
+    def generate_binary_dataset(self, data_type: str, size: int, seed: Optional[int] = None,
+                                cancel_event: Optional[threading.Event] = None, **params) -> Dict[str, Any]:
+        """
+        Genera un dataset directamente en formato binario en el registro
+        
+        Returns:
+            Información del dataset (con su id)
+        """
+        path = self.datasets.new_binary_path()
+        try:
+            DataGenerator.write_binary(path, data_type, size, seed=seed, cancel_event=cancel_event, **params)
+        except BaseException:
+            # El escritor ya borra el archivo si falla a mitad; si no llegó a abrirlo, queda el temporal
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+        return self.datasets.put_file(path, source=f'generate:{data_type}')
+    
+    def create_collection(self, data: List[Any], **kwargs) -> Dict[str, Any]:
+        """
+        Crea una colección ordenada a partir de una lista o de un dataset guardado
+        
+        Los datasets del registro ya se validaron al guardarlos; las listas se
+        validan como cualquier entrada, salvo la lista vacía (colección vacía).
+        """
+        if not isinstance(data, (Dataset, MappedDataset)) and data != []:
+            self._validate_input(data)
+        return self.collections.create(list(data), **kwargs)
+    
+    def snapshot_collection(self, collection_id: str) -> Dict[str, Any]:
+        """
+        Guarda el contenido actual de una colección como dataset
+        
+        El dataset queda marcado como ordenado, así las búsquedas sobre su id
+        no vuelven a verificar el orden.
+        """
+        values = self.collections.values(collection_id)
+        if not values:
+            raise ValueError("La colección está vacía")
+        return self.datasets.put(Dataset(values, is_sorted=True), source=f'collection:{collection_id}')
+    
+    def sort_dataset(self, dataset_id: str, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                     fan_in: int = DEFAULT_FAN_IN) -> Dict[str, Any]:
+        """
+        Ordena un dataset guardado con Merge Sort externo y guarda el resultado
+        
+        La memoria usada está acotada por memory_budget sin importar el tamaño
+        del dataset; las corridas intermedias se escriben en el directorio del
+        registro y el resultado queda como un nuevo dataset binario.
+        
+        Returns:
+            Diccionario con la información del dataset ordenado y las métricas
+            (corridas, pasadas de fusión, bytes leídos y escritos, tiempo)
+        """
+        source = self.datasets.get(dataset_id)
+        sorter = ExternalSorter(memory_budget=memory_budget, fan_in=fan_in, tmp_dir=self.datasets.spill_dir)
+        path = self.datasets.new_binary_path()
+        start_time = time.perf_counter()
+        try:
+            metrics = sorter.sort(source, path)
+        except Exception:
+            os.remove(path)
+            raise
+        metrics['execution_time_ms'] = round((time.perf_counter() - start_time) * 1000, 4)
+        metrics['input_size'] = len(source)
+        dataset = self.datasets.put_file(path, source=f'external_sort:{dataset_id}')
+        return {'dataset': dataset, 'metrics': metrics}
+    
+    def _validate_input(self, data: List[Any], fast: bool = False, algorithm: Optional[AlgorithmBase] = None):
+        """
+        Valida los datos de entrada
+        
+        Las variantes rápidas aceptan arrays NumPy. Los datasets binarios
+        mapeados ya se validaron al escribirlos; su límite depende de si el
+        algoritmo los lee en el lugar y devuelve un resultado pequeño
+        (búsquedas) o produce una lista del mismo tamaño (ordenamientos).
+        """
+        if isinstance(data, MappedDataset):
+            if len(data) == 0:
+                raise ValueError("La lista no puede estar vacía")
+            if algorithm is not None and not algorithm.mutates_input and algorithm.requires_target:
+                limit = MAX_MAPPED_INPUT_SIZE
+            else:
+                limit = MAX_ARRAY_INPUT_SIZE if fast else MAX_INPUT_SIZE
+            if len(data) > limit:
+                hint = "" if fast else "; use la variante rápida (':fast')"
+                raise ValueError(f"El dataset es demasiado grande (máximo {limit:,} elementos{hint})")
+            return
+        
+        if numpy_backend.is_array(data):
+            if not fast:
+                raise ValueError("Los arrays NumPy solo se admiten en las variantes rápidas")
+            if numpy_backend.numeric_dtype(data) is None:
+                raise ValueError("El array debe ser de enteros o floats")
+            if data.size == 0:
+                raise ValueError("La lista no puede estar vacía")
+            if data.size > MAX_ARRAY_INPUT_SIZE:
+                raise ValueError(f"El array es demasiado grande (máximo {MAX_ARRAY_INPUT_SIZE:,} elementos)")
+            return
+        
+        if isinstance(data, Dataset) and data.fingerprint:
+            # Ya validado al guardarlo en el registro
+            return
+        
         if not isinstance(data, list):
             raise ValueError("Los datos deben ser una lista")
         
         if len(data) == 0:
             raise ValueError("La lista no puede estar vacía")
         
-        if len(data) > 100000:  # Límite de seguridad
-            raise ValueError("La lista es demasiado grande (máximo 100,000 elementos)")
+        if len(data) > MAX_INPUT_SIZE:  # Límite de seguridad
+            raise ValueError(f"La lista es demasiado grande (máximo {MAX_INPUT_SIZE:,} elementos)")
         
         # Validar tipos de datos
         if data:
@@ -83,22 +371,39 @@ class AlgorithmManager:
             if not all(isinstance(item, (int, float, str)) for item in data):
                 raise ValueError("Los elementos deben ser números o strings")
     
-    def get_history(self, limit: int = 10) -> List[Dict]:
-        """Obtiene el historial de ejecuciones"""
-        return self.execution_history[-limit:]
+    def get_history(self, limit: int = 10, offset: int = 0, **filters) -> Dict[str, Any]:
+        """
+        Obtiene el historial de ejecuciones, del más reciente al más antiguo
+
+        Los filtros (algorithm, min_size, max_size, since, until) se pasan a
+        HistoryStore.query; devuelve los registros de la página y el total.
+        """
+        return self.history.query(limit=limit, offset=offset, **filters)
+    
+    def history_stats(self, algorithm: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Estadísticas acumuladas del historial por algoritmo"""
+        return self.history.stats(algorithm)
     
-    def compare_algorithms(self, algorithm_names: List[str], data: List[Any], **kwargs) -> Dict[str, AlgorithmResult]:
+    def compare_algorithms(self, algorithm_names: List[str], data: List[Any], parallel: bool = False,
+                           timeout: Optional[float] = None, **kwargs) -> Dict[str, AlgorithmResult]:
         """
         Compara múltiples algoritmos con los mismos datos
         
         Args:
             algorithm_names: Lista de nombres de algoritmos a comparar
             data: Datos de entrada
+            parallel: Ejecutar cada algoritmo en un proceso del pool
+            timeout: Tiempo máximo por algoritmo en segundos (solo en paralelo)
             **kwargs: Argumentos adicionales
             
         Returns:
             Diccionario con resultados de cada algoritmo
         """
+        if parallel:
+            results = dict(self.iter_compare(algorithm_names, data, timeout, **kwargs))
+            # Mantener el orden solicitado
+            return {name: results[name] for name in algorithm_names if name in results}
+        
         results = {}
         
         for name in algorithm_names:
@@ -109,3 +414,128 @@ class AlgorithmManager:
                 results[name] = {'error': str(e)}
         
         return results
+    
+    def iter_compare(self, algorithm_names: List[str], data: List[Any], timeout: Optional[float] = None,
+                     **kwargs) -> Iterator[Tuple[str, Union[AlgorithmResult, Dict[str, str]]]]:
+        """
+        Ejecuta los algoritmos en el pool de procesos y entrega cada resultado
+        en cuanto termina
+        
+        Args:
+            algorithm_names: Lista de nombres de algoritmos a comparar
+            data: Datos de entrada (se copian una sola vez a memoria compartida)
+            timeout: Tiempo máximo por algoritmo en segundos
+            **kwargs: Argumentos adicionales
+            
+        Yields:
+            Tuplas (nombre, AlgorithmResult o {'error': mensaje})
+        """
+        self._validate_input(data)
+        
+        tasks = {}
+        for name in algorithm_names:
+            algorithm = self.get_algorithm(name)
+            if not algorithm:
+                yield name, {'error': f"Algoritmo '{name}' no encontrado"}
+            else:
+                tasks[name] = algorithm
+        
+        # Los pasos no se devuelven en la comparación: no registrarlos en los procesos
+        kwargs.setdefault('trace_mode', TRACE_NONE)
+        
+        task_kwargs = {name: self._variant_kwargs(name, kwargs) for name in tasks}
+        cache_keys = {name: self._cache_key(name, algorithm, data, task_kwargs[name])
+                      for name, algorithm in tasks.items()}
+        for name in list(tasks):
+            cached = self.result_cache.get(cache_keys[name])
+            if cached is not None:
+                del tasks[name]
+                cached.metadata['cached'] = True
+                self._record_history(name, data, cached)
+                yield name, cached
+        
+        if not tasks:
+            return
+        
+        for name, ok, value in get_process_pool().run(tasks, data, timeout, task_kwargs=task_kwargs, **kwargs):
+            if not ok:
+                yield name, {'error': f"Error ejecutando algoritmo '{name}': {value}"}
+                continue
+            result = AlgorithmResult(value[0], value[1])
+            result.metadata['cached'] = False
+            self.result_cache.put(cache_keys[name], result)
+            self._record_history(name, data, result)
+            yield name, result
+    
+    def benchmark_algorithm(self, name: str, data: List[Any], runner: Optional[BenchmarkRunner] = None,
+                            **kwargs) -> Dict[str, Any]:
+        """
+        Ejecuta un benchmark estadístico de un algoritmo
+        
+        Args:
+            name: Nombre del algoritmo
+            data: Datos de entrada
+            runner: Configuración del benchmark (por defecto BenchmarkRunner())
+            **kwargs: Argumentos adicionales para el algoritmo
+            
+        Returns:
+            Diccionario con muestras, estadísticas e intervalo de confianza
+        """
+        algorithm = self.get_algorithm(name)
+        if not algorithm:
+            raise ValueError(f"Algoritmo '{name}' no encontrado")
+        
+        kwargs = self._variant_kwargs(name, kwargs)
+        self._validate_input(data, fast=kwargs.get('fast', False), algorithm=algorithm)
+        
+        result = (runner or BenchmarkRunner()).run(algorithm, data, **kwargs)
+        result['algorithm_key'] = name
+        return result
+    
+    def benchmark_algorithms(self, algorithm_names: List[str], data: List[Any],
+                             runner: Optional[BenchmarkRunner] = None, **kwargs) -> Dict[str, Dict[str, Any]]:
+        """Ejecuta el benchmark de varios algoritmos con los mismos datos"""
+        results = {}
+        
+        for name in algorithm_names:
+            try:
+                results[name] = self.benchmark_algorithm(name, data, runner, **kwargs)
+            except BenchmarkBusy:
+                raise
+            except Exception as e:
+                results[name] = {'error': str(e)}
+        
+        return results
+    
+    def scaling_sweep(self, algorithm_names: List[str], sizes: List[int], data_type: str = 'random',
+                      runner: Optional[BenchmarkRunner] = None, time_budget_s: float = 10.0,
+                      **kwargs) -> Dict[str, Any]:
+        """
+        Barrido de tamaños con ajuste de curvas de complejidad (n, n log n, n²)
+        
+        Args:
+            algorithm_names: Algoritmos a medir
+            sizes: Tamaños de entrada
+            data_type: Tipo de datos de DataGenerator
+            runner: Configuración de las mediciones por tamaño
+            time_budget_s: Tiempo máximo por medición antes de dejar de escalar
+            **kwargs: Argumentos adicionales para los algoritmos
+        """
+        analyzer = ScalingAnalyzer(self, runner, time_budget_s)
+        return analyzer.sweep(algorithm_names, sizes, data_type, **kwargs)
+    
+    def worker_scaling(self, name: str, size: int, workers: List[int], data_type: str = 'random',
+                       runner: Optional[BenchmarkRunner] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Aceleración de un ordenamiento paralelo según la cantidad de procesos
+        
+        Args:
+            name: Algoritmo paralelo (p. ej. 'parallel_merge_sort' o 'sample_sort')
+            size: Tamaño de la entrada
+            workers: Cantidades de procesos a medir
+            data_type: Tipo de datos de DataGenerator
+            runner: Configuración de las mediciones por punto
+            **kwargs: Argumentos adicionales para el algoritmo
+        """
+        analyzer = ScalingAnalyzer(self, runner)
+        return analyzer.worker_sweep(name, size, workers, data_type, **kwargs)
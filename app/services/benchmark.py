@@ -0,0 +1,194 @@
+import gc
+import math
+import os
+import random
+import statistics
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from app.algorithms.base import AlgorithmBase
+
+# gc.disable() afecta a todo el proceso: las mediciones se hacen de a una, así
+# un benchmark no apaga ni vuelve a encender el GC en medio de otro
+_MEASUREMENT_LOCK = threading.Lock()
+
+# Límites de la configuración: el lock y el GC apagado duran lo que dure la medición
+MAX_WARMUP = 20
+MAX_REPEATS = 1000
+MAX_BENCHMARK_TIME_S = 30.0
+MAX_BOOTSTRAP_RESAMPLES = 10000
+
+# Espera máxima por el lock antes de rechazar el benchmark
+LOCK_TIMEOUT_S = float(os.getenv('BENCHMARK_LOCK_TIMEOUT_S', '30'))
+
+
+class BenchmarkBusy(Exception):
+    """Otro benchmark está midiendo y no terminó dentro del tiempo de espera"""
+    pass
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentil con interpolación lineal (pct entre 0 y 100)"""
+    ordered = sorted(values)
+    if not ordered:
+        raise ValueError("Se requiere al menos una muestra")
+    position = (len(ordered) - 1) * pct / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return ordered[lower]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def relative_error(samples: List[float]) -> float:
+    """Error estándar de la media relativo a la media"""
+    if len(samples) < 2:
+        return math.inf
+    mean = statistics.fmean(samples)
+    if mean == 0:
+        return 0.0
+    return statistics.stdev(samples) / math.sqrt(len(samples)) / mean
+
+
+def bootstrap_ci(samples: List[float], statistic: Callable[[List[float]], float] = statistics.median,
+                 confidence: float = 0.95, resamples: int = 1000,
+                 rng: Optional[random.Random] = None) -> Dict[str, float]:
+    """
+    Intervalo de confianza por bootstrap (método de percentiles)
+
+    Args:
+        samples: Muestras de tiempo
+        statistic: Estadístico a estimar (mediana por defecto)
+        confidence: Nivel de confianza
+        resamples: Número de remuestreos
+        rng: Generador aleatorio (para resultados reproducibles)
+    """
+    rng = rng or random.Random()
+    n = len(samples)
+    estimates = [statistic(rng.choices(samples, k=n)) for _ in range(resamples)]
+    alpha = (1 - confidence) / 2 * 100
+    return {
+        'low': percentile(estimates, alpha),
+        'high': percentile(estimates, 100 - alpha),
+        'confidence': confidence
+    }
+
+
+def summarize_samples(samples: List[float]) -> Dict[str, float]:
+    """Estadísticas descriptivas de una lista de tiempos"""
+    return {
+        'min': min(samples),
+        'max': max(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.fmean(samples),
+        'stddev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'p95': percentile(samples, 95)
+    }
+
+
+class BenchmarkRunner:
+    """
+    Motor de benchmarks con calentamiento, repeticiones adaptativas y control del GC
+
+    Cada muestra es una ejecución limpia (AlgorithmBase.time_execution). Se
+    repite hasta que el error relativo de la media baja de `target_rel_error`,
+    o hasta alcanzar `max_repeats` o `max_time_s`. El límite de tiempo incluye
+    el calentamiento y se comprueba después de cada ejecución (siempre hay al
+    menos una muestra). Los benchmarks del proceso se miden de a uno; si el
+    lock no se obtiene en `lock_timeout_s` segundos se lanza BenchmarkBusy.
+    """
+
+    def __init__(self, warmup: int = 2, min_repeats: int = 5, max_repeats: int = 200,
+                 target_rel_error: float = 0.02, max_time_s: float = 5.0,
+                 disable_gc: bool = True, confidence: float = 0.95,
+                 bootstrap_resamples: int = 1000, seed: Optional[int] = None,
+                 lock_timeout_s: Optional[float] = None):
+        if not 0 <= warmup <= MAX_WARMUP:
+            raise ValueError(f"Las iteraciones de calentamiento deben estar entre 0 y {MAX_WARMUP}")
+        if min_repeats < 1 or max_repeats < min_repeats or max_repeats > MAX_REPEATS:
+            raise ValueError(f"Se requiere 1 <= min_repeats <= max_repeats <= {MAX_REPEATS}")
+        if not 0 < max_time_s <= MAX_BENCHMARK_TIME_S:
+            raise ValueError(f"max_time_s debe ser mayor que 0 y no mayor que {MAX_BENCHMARK_TIME_S:g}")
+        if not target_rel_error > 0:
+            raise ValueError("target_rel_error debe ser mayor que 0")
+        if not 0 < confidence < 1:
+            raise ValueError("El nivel de confianza debe estar entre 0 y 1")
+        if not 1 <= bootstrap_resamples <= MAX_BOOTSTRAP_RESAMPLES:
+            raise ValueError(f"bootstrap_resamples debe estar entre 1 y {MAX_BOOTSTRAP_RESAMPLES}")
+        self.warmup = warmup
+        self.min_repeats = min_repeats
+        self.max_repeats = max_repeats
+        self.target_rel_error = target_rel_error
+        self.max_time_s = max_time_s
+        self.disable_gc = disable_gc
+        self.confidence = confidence
+        self.bootstrap_resamples = bootstrap_resamples
+        self.seed = seed
+        self.lock_timeout_s = LOCK_TIMEOUT_S if lock_timeout_s is None else lock_timeout_s
+
+    def run(self, algorithm: AlgorithmBase, data: List[Any], **kwargs) -> Dict[str, Any]:
+        """
+        Ejecuta el benchmark de un algoritmo sobre los datos
+
+        Args:
+            algorithm: Algoritmo a medir
+            data: Datos de entrada
+            **kwargs: Argumentos adicionales del algoritmo
+
+        Returns:
+            Diccionario con las muestras, estadísticas e intervalo de confianza
+        """
+        algorithm = algorithm.invocation()
+        if not _MEASUREMENT_LOCK.acquire(timeout=self.lock_timeout_s):
+            raise BenchmarkBusy("Hay otro benchmark en curso, intente más tarde")
+        gc_was_enabled = gc.isenabled()
+        try:
+            deadline = time.perf_counter() + self.max_time_s
+            gc.collect()
+            if self.disable_gc:
+                gc.disable()
+
+            for _ in range(self.warmup):
+                algorithm.time_execution(data, **kwargs)
+                if time.perf_counter() >= deadline:
+                    break
+
+            samples = []
+            converged = False
+            while len(samples) < self.max_repeats:
+                _, elapsed = algorithm.time_execution(data, **kwargs)
+                samples.append(elapsed)
+                if len(samples) >= self.min_repeats and relative_error(samples) <= self.target_rel_error:
+                    converged = True
+                    break
+                if time.perf_counter() >= deadline:
+                    break
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+            _MEASUREMENT_LOCK.release()
+
+        rng = random.Random(self.seed)
+        stats = {key: round(value, 6) for key, value in summarize_samples(samples).items()}
+        ci = bootstrap_ci(samples, confidence=self.confidence,
+                          resamples=self.bootstrap_resamples, rng=rng)
+
+        return {
+            'algorithm': algorithm.name,
+            'input_size': len(data),
+            'warmup': self.warmup,
+            'repeats': len(samples),
+            'converged': converged,
+            'relative_error': round(relative_error(samples), 6) if len(samples) > 1 else None,
+            'gc_disabled': self.disable_gc,
+            'variant': 'fast' if kwargs.get('fast') else 'instrumented',
+            'comparisons': None if kwargs.get('fast') else algorithm.comparisons,
+            'swaps': None if kwargs.get('fast') else algorithm.swaps,
+            'stats_ms': stats,
+            'median_ci_ms': {
+                'low': round(ci['low'], 6),
+                'high': round(ci['high'], 6),
+                'confidence': ci['confidence']
+            },
+            'samples_ms': [round(sample, 6) for sample in samples]
+        }
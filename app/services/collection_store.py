@@ -0,0 +1,321 @@
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from app.algorithms.sorted_list import SortedList, DEFAULT_LOAD
+
+# Consultas admitidas por CollectionStore.query
+COLLECTION_QUERIES = ('rank', 'bisect_left', 'bisect_right', 'count', 'contains', 'select', 'range')
+
+# Consultas que reciben un valor (o una lista de valores en 'values')
+_POINT_QUERIES = ('rank', 'bisect_left', 'bisect_right', 'count', 'contains')
+
+
+class CollectionNotFound(ValueError):
+    """La colección no existe o ya expiró"""
+    pass
+
+
+class _Collection:
+    """Colección guardada: la lista ordenada, su lock y su información"""
+
+    def __init__(self, collection_id: str, values: SortedList, kind: Optional[str], source: str,
+                 ttl_s: float):
+        self.values = values
+        self.kind = kind
+        self.lock = threading.Lock()
+        # Elementos que cuenta el registro para su límite total (se cambia con el lock del registro)
+        self.counted = 0
+        now = time.time()
+        self.info = {
+            'collection_id': collection_id,
+            'size': len(values),
+            'load': values.load,
+            'chunks': values.chunk_count,
+            'source': source,
+            'operations': 0,
+            'comparisons': 0,
+            'moves': 0,
+            'created_at': now,
+            'updated_at': now,
+            'expires_at': now + ttl_s
+        }
+
+
+def _value_kind(values: List[Any]) -> Optional[str]:
+    """'number' o 'string' según los elementos (ValueError si se mezclan o no son válidos)"""
+    kinds = set()
+    for value in values:
+        if isinstance(value, str):
+            kinds.add('string')
+        elif isinstance(value, (int, float)):
+            # NaN no es comparable: rompería el orden de la lista
+            if value != value:
+                raise ValueError("Los elementos no pueden ser NaN")
+            kinds.add('number')
+        else:
+            raise ValueError("Los elementos deben ser números o strings")
+    if len(kinds) > 1:
+        raise ValueError("Los elementos deben ser todos números o todos strings")
+    return kinds.pop() if kinds else None
+
+
+class CollectionStore:
+    """
+    Colecciones ordenadas del lado del servidor
+
+    Para cargas que intercalan inserciones y búsquedas: en lugar de volver a
+    ordenar toda la lista después de cada lote, la colección se mantiene
+    ordenada (SortedList) y cada operación cuesta O(log n) por elemento. Cada
+    operación devuelve sus métricas (comparaciones, movimientos y tiempo) y
+    la colección acumula los totales.
+
+    Las colecciones se modifican en el lugar, así que su id es aleatorio (no
+    un hash del contenido como en los datasets). Expiran tras `ttl_s`
+    segundos sin usarse; con `max_collections` vigentes no se admiten más, y
+    entre todas no pueden superar `max_elements` elementos.
+    """
+
+    def __init__(self, max_collections: int = 64, max_size: int = 10 ** 6, ttl_s: float = 3600.0,
+                 max_elements: int = 10 ** 7):
+        self.max_collections = max_collections
+        self.max_size = max_size
+        self.max_elements = max_elements
+        self.ttl_s = ttl_s
+        self._collections: Dict[str, _Collection] = {}
+        self._lock = threading.Lock()
+        self._elements = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_env(cls) -> 'CollectionStore':
+        """Crea el registro con los límites de las variables de entorno"""
+        return cls(
+            max_collections=int(os.getenv('COLLECTIONS_MAX', '64')),
+            max_size=int(os.getenv('COLLECTION_MAX_SIZE', str(10 ** 6))),
+            ttl_s=float(os.getenv('COLLECTION_TTL_S', '3600')),
+            max_elements=int(os.getenv('COLLECTIONS_MAX_ELEMENTS', str(10 ** 7)))
+        )
+
+    def create(self, values: List[Any], load: int = DEFAULT_LOAD, source: str = 'upload') -> Dict[str, Any]:
+        """
+        Crea una colección con los valores dados (se ordenan una sola vez)
+
+        Returns:
+            Información de la colección ('collection') y métricas de la carga ('metadata')
+        """
+        if len(values) > self.max_size:
+            raise ValueError(f"La colección es demasiado grande (máximo {self.max_size:,} elementos)")
+        kind = _value_kind(values)
+        with self._lock:
+            self._purge_expired(time.time())
+            if len(self._collections) >= self.max_collections:
+                raise ValueError(f"Se alcanzó el máximo de colecciones ({self.max_collections})")
+            self._check_elements(len(values))
+
+        start = time.perf_counter()
+        sorted_values = SortedList(values, load=load)
+        elapsed = time.perf_counter() - start
+        collection = _Collection(uuid.uuid4().hex, sorted_values, kind, source, self.ttl_s)
+        metadata = self._account(collection, 'create', elapsed)
+        with self._lock:
+            if len(self._collections) >= self.max_collections:
+                raise ValueError(f"Se alcanzó el máximo de colecciones ({self.max_collections})")
+            self._check_elements(len(values))
+            self._collections[collection.info['collection_id']] = collection
+            self._count(collection, len(values))
+        return {'collection': dict(collection.info), 'metadata': metadata}
+
+    def insert(self, collection_id: str, values: List[Any]) -> Dict[str, Any]:
+        """Inserta un lote de valores"""
+        collection = self._get(collection_id)
+        kind = _value_kind(values)
+        with collection.lock:
+            if kind is not None and collection.kind not in (None, kind):
+                raise ValueError("Los elementos deben ser del mismo tipo que los de la colección")
+            if len(collection.values) + len(values) > self.max_size:
+                raise ValueError(f"La colección es demasiado grande (máximo {self.max_size:,} elementos)")
+            with self._lock:
+                if self._collections.get(collection.info['collection_id']) is not collection:
+                    raise CollectionNotFound(f"Colección '{collection_id}' no encontrada o expirada")
+                self._check_elements(len(values))
+                self._count(collection, len(values))
+            collection.kind = collection.kind or kind
+            start = time.perf_counter()
+            collection.values.update(values)
+            metadata = self._account(collection, 'insert', time.perf_counter() - start)
+            return {'inserted': len(values), 'collection': dict(collection.info), 'metadata': metadata}
+
+    def remove(self, collection_id: str, values: List[Any]) -> Dict[str, Any]:
+        """Elimina una aparición de cada valor del lote (los que no están se ignoran)"""
+        collection = self._get(collection_id)
+        with collection.lock:
+            self._check_kind(collection, values)
+            start = time.perf_counter()
+            removed = collection.values.discard_many(values)
+            with self._lock:
+                if self._collections.get(collection.info['collection_id']) is collection:
+                    self._count(collection, -removed)
+            metadata = self._account(collection, 'delete', time.perf_counter() - start)
+            return {'removed': removed, 'collection': dict(collection.info), 'metadata': metadata}
+
+    def query(self, collection_id: str, operation: str, value: Any = None, values: Optional[List[Any]] = None,
+              index: Optional[int] = None, minimum: Any = None, maximum: Any = None,
+              inclusive: Tuple[bool, bool] = (True, True), limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Consulta la colección sin modificarla
+
+        Args:
+            operation: 'rank' (elementos menores que value), 'bisect_left',
+                'bisect_right', 'count', 'contains', 'select' (valor en la
+                posición index) o 'range' (elementos entre minimum y maximum)
+            value: Valor de las consultas puntuales
+            values: Lista de valores para hacer la consulta puntual de a lote
+            index: Posición para 'select' (acepta negativas)
+            minimum, maximum, inclusive, limit: Rango para 'range' (sin
+                extremo si es None) y máximo de elementos a devolver
+
+        Returns:
+            Resultado ('result') y métricas de la consulta ('metadata')
+        """
+        if operation not in COLLECTION_QUERIES:
+            raise ValueError(f"Consulta '{operation}' no soportada (use una de {', '.join(COLLECTION_QUERIES)})")
+        collection = self._get(collection_id)
+        with collection.lock:
+            start = time.perf_counter()
+            if operation in _POINT_QUERIES:
+                method = self._point_query(collection.values, operation)
+                if values is not None:
+                    self._check_kind(collection, values)
+                    result = [method(item) for item in values]
+                else:
+                    if value is None:
+                        raise ValueError(f"La consulta '{operation}' requiere 'value' o 'values'")
+                    self._check_kind(collection, [value])
+                    result = method(value)
+            elif operation == 'select':
+                if not isinstance(index, int):
+                    raise ValueError("La consulta 'select' requiere un 'index' entero")
+                try:
+                    result = collection.values[index]
+                except IndexError:
+                    raise ValueError(f"Índice fuera de rango (la colección tiene {len(collection.values):,} elementos)")
+            else:
+                self._check_kind(collection, [bound for bound in (minimum, maximum) if bound is not None])
+                if limit is not None and limit < 0:
+                    raise ValueError("limit no puede ser negativo")
+                first, stop = collection.values.range_bounds(minimum, maximum, inclusive)
+                count = stop - first
+                if limit is not None:
+                    stop = min(stop, first + limit)
+                result = {'start': first, 'count': count, 'values': collection.values.slice(first, stop)}
+            metadata = self._account(collection, operation, time.perf_counter() - start)
+            return {'result': result, 'metadata': metadata}
+
+    def values(self, collection_id: str) -> List[Any]:
+        """Copia de los valores de la colección, en orden"""
+        collection = self._get(collection_id)
+        with collection.lock:
+            return collection.values.to_list()
+
+    def info(self, collection_id: str) -> Dict[str, Any]:
+        """Información de una colección"""
+        collection = self._get(collection_id)
+        with collection.lock:
+            return dict(collection.info)
+
+    def delete(self, collection_id: str) -> bool:
+        """Elimina una colección; devuelve False si no existía"""
+        with self._lock:
+            collection = self._collections.pop(collection_id, None)
+            if collection is None:
+                return False
+            self._count(collection, -collection.counted)
+            return True
+
+    def list_collections(self) -> List[Dict[str, Any]]:
+        """Información de todas las colecciones vigentes"""
+        with self._lock:
+            self._purge_expired(time.time())
+            return [dict(collection.info) for collection in self._collections.values()]
+
+    def clear(self):
+        """Elimina todas las colecciones"""
+        with self._lock:
+            self._collections.clear()
+            self._elements = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Uso del registro de colecciones"""
+        with self._lock:
+            return {
+                'collections': len(self._collections),
+                'max_collections': self.max_collections,
+                'elements': self._elements,
+                'max_elements': self.max_elements,
+                'max_size': self.max_size,
+                'ttl_s': self.ttl_s,
+                'expirations': self.expirations
+            }
+
+    @staticmethod
+    def _point_query(values: SortedList, operation: str):
+        if operation == 'contains':
+            return values.__contains__
+        return getattr(values, operation)
+
+    @staticmethod
+    def _check_kind(collection: _Collection, values: List[Any]):
+        """Evita comparar números con strings (los valores de otro tipo no se pueden ubicar)"""
+        kind = _value_kind(values)
+        if kind is not None and collection.kind not in (None, kind):
+            raise ValueError("Los elementos deben ser del mismo tipo que los de la colección")
+
+    @staticmethod
+    def _account(collection: _Collection, operation: str, elapsed_s: float) -> Dict[str, Any]:
+        """Métricas de la operación recién hecha; se suman a los totales de la colección"""
+        values = collection.values
+        metadata = {
+            'operation': operation,
+            'size': len(values),
+            'comparisons': values.comparisons,
+            'moves': values.moves,
+            'execution_time_ms': round(elapsed_s * 1000, 4)
+        }
+        values.reset_metrics()
+        info = collection.info
+        info['size'] = len(values)
+        info['chunks'] = values.chunk_count
+        info['operations'] += 1
+        info['comparisons'] += metadata['comparisons']
+        info['moves'] += metadata['moves']
+        info['updated_at'] = time.time()
+        return metadata
+
+    def _get(self, collection_id: str) -> _Collection:
+        with self._lock:
+            self._purge_expired(time.time())
+            collection = self._collections.get(collection_id)
+            if collection is None:
+                raise CollectionNotFound(f"Colección '{collection_id}' no encontrada o expirada")
+            collection.info['expires_at'] = time.time() + self.ttl_s
+            return collection
+
+    # Se llama con el lock tomado
+
+    def _purge_expired(self, now: float):
+        expired = [collection_id for collection_id, collection in self._collections.items()
+                   if collection.info['expires_at'] <= now]
+        for collection_id in expired:
+            collection = self._collections.pop(collection_id)
+            self._count(collection, -collection.counted)
+            self.expirations += 1
+
+    def _check_elements(self, added: int):
+        if self._elements + added > self.max_elements:
+            raise ValueError(f"Se alcanzó el máximo de elementos entre todas las colecciones ({self.max_elements:,})")
+
+    def _count(self, collection: _Collection, delta: int):
+        collection.counted += delta
+        self._elements += delta
@@ -1,63 +1,359 @@
+"""
+Generación de datasets de prueba
+
+Todos los tipos se generan por bloques de GENERATOR_BLOCK_SIZE elementos con
+un random.Random propio sembrado con `seed`: con la misma semilla y los
+mismos parámetros los datos son idénticos, se pidan como lista o por chunks
+de cualquier tamaño (iter_chunks). Los números aleatorios se sacan en bloque
+(random.choices, randbytes) y los datos ordenados se construyen directamente, sin
+ordenar: los estadísticos de orden de n uniformes se obtienen de mayor a
+menor multiplicando factores U^(1/k) (Bentley y Saxe), así también se
+pueden generar de a bloques.
+
+Los arrays NumPy (generate_array) usan el generador de NumPy: con una
+semilla también son reproducibles, pero no coinciden con las listas.
+"""
 import random
-from typing import List, Any
+from itertools import accumulate, islice
+from operator import mul
+import threading
+from typing import List, Any, Dict, Iterator, Optional
+from app.algorithms import numpy_backend
+from app.algorithms.base import ExecutionCancelled
+from app.algorithms.dataset import Dataset
+from app.algorithms.binary_format import BinaryDatasetWriter
+
+# Elementos por bloque generado (los datos no dependen del tamaño de chunk pedido)
+GENERATOR_BLOCK_SIZE = 65536
+
+# Elementos por chunk en iter_chunks si no se indica otro
+DEFAULT_CHUNK_SIZE = 65536
+
+# Tipos de datos numéricos (se pueden generar como array o en formato binario)
+NUMERIC_DATA_TYPES = ('random', 'sorted', 'reverse', 'nearly_sorted', 'many_duplicates',
+                      'sawtooth', 'organ_pipe', 'zipf')
+
+DATA_TYPES = NUMERIC_DATA_TYPES + ('strings',)
+
+# Parámetros admitidos por cada tipo de datos (además de seed)
+GENERATOR_PARAMS = {
+    'random': ('min_val', 'max_val'),
+    'sorted': ('min_val', 'max_val'),
+    'reverse': ('min_val', 'max_val'),
+    'nearly_sorted': ('min_val', 'max_val', 'swaps'),
+    'many_duplicates': ('min_val', 'max_val', 'distinct'),
+    'sawtooth': ('min_val', 'max_val', 'teeth'),
+    'organ_pipe': ('min_val', 'max_val'),
+    'zipf': ('min_val', 'max_val', 'exponent'),
+    'strings': ('min_length', 'max_length')
+}
+
+# Rangos distintos como máximo en 'zipf' (cada uno tiene su peso acumulado)
+ZIPF_MAX_RANKS = numpy_backend.ZIPF_MAX_RANKS
+
+STRING_CHARS = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+
+# Bytes aleatorios a caracteres: se usan los 6 bits bajos y se descartan los
+# valores 62 y 63, así cada carácter de STRING_CHARS es igual de probable
+_CHAR_TABLE = bytes(ord(STRING_CHARS[b & 63]) if b & 63 < len(STRING_CHARS) else 0 for b in range(256))
+_REJECTED_BYTES = bytes(b for b in range(256) if b & 63 >= len(STRING_CHARS))
+
+
+def _block_counts(size: int) -> Iterator[int]:
+    for start in range(0, size, GENERATOR_BLOCK_SIZE):
+        yield min(GENERATOR_BLOCK_SIZE, size - start)
+
+
+def _value_span(min_val: int, max_val: int) -> int:
+    if min_val > max_val:
+        raise ValueError("min_val no puede ser mayor que max_val")
+    return max_val - min_val + 1
+
+
+def _uniform_ints(rng: random.Random, min_val: int, span: int, count: int) -> List[int]:
+    if span <= 1 << 53:
+        # choices saca un random() por elemento: mucho más rápido que randint
+        return rng.choices(range(min_val, min_val + span), k=count)
+    return [min_val + rng.randrange(span) for _ in range(count)]
+
+
+def _random_blocks(rng: random.Random, size: int, min_val: int = 1, max_val: int = 1000) -> Iterator[List[int]]:
+    span = _value_span(min_val, max_val)
+    for count in _block_counts(size):
+        yield _uniform_ints(rng, min_val, span, count)
+
+
+def _sorted_blocks(rng: random.Random, size: int, min_val: int = 1, max_val: int = 1000,
+                   descending: bool = False) -> Iterator[List[int]]:
+    """
+    Enteros uniformes ya ordenados, sin ordenar
+
+    `current` recorre los estadísticos de orden de `size` uniformes en (0, 1)
+    de mayor a menor: el máximo de k uniformes es U^(1/k) y, dado el
+    máximo, los demás son uniformes por debajo de él. Los valores
+    ascendentes se obtienen reflejando (max_val - ...).
+    """
+    span = _value_span(min_val, max_val)
+    draw = rng.random
+    current = 1.0
+    remaining = size
+    for count in _block_counts(size):
+        factors = [draw() ** (1.0 / k) for k in range(remaining, remaining - count, -1)]
+        uniforms = list(accumulate(factors, mul, initial=current))[1:]
+        current = uniforms[-1]
+        remaining -= count
+        offsets = [int(u * span) for u in uniforms]
+        if span > 1 << 53:
+            # Con rangos enormes el producto en float puede redondear hasta span
+            offsets = [min(offset, span - 1) for offset in offsets]
+        if descending:
+            yield [min_val + offset for offset in offsets]
+        else:
+            yield [max_val - offset for offset in offsets]
+
+
+def _nearly_sorted_blocks(rng: random.Random, size: int, min_val: int = 1, max_val: int = 1000,
+                          swaps: int = 10) -> Iterator[List[int]]:
+    """Datos ordenados con `swaps` intercambios, cada uno dentro de un mismo bloque"""
+    if swaps < 0:
+        raise ValueError("swaps no puede ser negativo")
+    positions = sorted(rng.randrange(size) for _ in range(swaps)) if size else []
+    next_swap = 0
+    start = 0
+    for block in _sorted_blocks(rng, size, min_val, max_val):
+        while next_swap < len(positions) and positions[next_swap] < start + len(block):
+            i = positions[next_swap] - start
+            j = rng.randrange(len(block))
+            block[i], block[j] = block[j], block[i]
+            next_swap += 1
+        start += len(block)
+        yield block
+
+
+def _many_duplicates_blocks(rng: random.Random, size: int, min_val: int = 1, max_val: int = 1000,
+                            distinct: int = 10) -> Iterator[List[int]]:
+    """Valores elegidos al azar entre `distinct` valores distintos del rango"""
+    span = _value_span(min_val, max_val)
+    if distinct < 1:
+        raise ValueError("distinct debe ser al menos 1")
+    values = rng.sample(range(min_val, max_val + 1), min(distinct, span))
+    for count in _block_counts(size):
+        yield rng.choices(values, k=count)
+
+
+def _sawtooth_blocks(rng: random.Random, size: int, min_val: int = 1, max_val: int = 1000,
+                     teeth: int = 10) -> Iterator[List[int]]:
+    """`teeth` rampas ascendentes seguidas que recorren todo el rango"""
+    span = _value_span(min_val, max_val)
+    if teeth < 1:
+        raise ValueError("teeth debe ser al menos 1")
+    period = max(1, -(-size // teeth))
+    start = 0
+    for count in _block_counts(size):
+        yield [min_val + (i % period) * span // period for i in range(start, start + count)]
+        start += count
+
+
+def _organ_pipe_blocks(rng: random.Random, size: int, min_val: int = 1, max_val: int = 1000) -> Iterator[List[int]]:
+    """Ascendente hasta la mitad y descendente después (forma de tubos de órgano)"""
+    span = _value_span(min_val, max_val)
+    half = max(1, (size + 1) // 2)
+    start = 0
+    for count in _block_counts(size):
+        yield [min_val + min(i, size - 1 - i) * span // half for i in range(start, start + count)]
+        start += count
+
+
+def _zipf_blocks(rng: random.Random, size: int, min_val: int = 1, max_val: int = 1000,
+                 exponent: float = 1.2) -> Iterator[List[int]]:
+    """Ley de Zipf: el valor min_val + k - 1 aparece con probabilidad proporcional a 1/k^exponent"""
+    ranks = min(_value_span(min_val, max_val), ZIPF_MAX_RANKS)
+    if exponent <= 0:
+        raise ValueError("exponent debe ser positivo")
+    cum_weights = list(accumulate(k ** -exponent for k in range(1, ranks + 1)))
+    population = range(min_val, min_val + ranks)
+    for count in _block_counts(size):
+        yield rng.choices(population, cum_weights=cum_weights, k=count)
+
+
+def _random_text(rng: random.Random, length: int) -> str:
+    """Texto de `length` caracteres de STRING_CHARS a partir de bytes aleatorios (translate en C)"""
+    parts = []
+    missing = length
+    while missing > 0:
+        # Se piden algunos bytes de más para compensar los descartados
+        part = rng.randbytes(missing + missing // 16 + 16).translate(_CHAR_TABLE, _REJECTED_BYTES)[:missing]
+        parts.append(part)
+        missing -= len(part)
+    return b''.join(parts).decode('ascii')
+
+
+def _string_blocks(rng: random.Random, size: int, min_length: int = 3, max_length: int = 10) -> Iterator[List[str]]:
+    """Strings alfanuméricos: el texto de todo el bloque se genera de una vez y se corta"""
+    if not 0 <= min_length <= max_length:
+        raise ValueError("Se requiere 0 <= min_length <= max_length")
+    for count in _block_counts(size):
+        lengths = rng.choices(range(min_length, max_length + 1), k=count)
+        text = _random_text(rng, sum(lengths))
+        ends = list(accumulate(lengths))
+        yield [text[end - length:end] for end, length in zip(ends, lengths)]
+
+
+_BLOCK_GENERATORS = {
+    'random': _random_blocks,
+    'sorted': _sorted_blocks,
+    'reverse': lambda rng, size, **params: _sorted_blocks(rng, size, descending=True, **params),
+    'nearly_sorted': _nearly_sorted_blocks,
+    'many_duplicates': _many_duplicates_blocks,
+    'sawtooth': _sawtooth_blocks,
+    'organ_pipe': _organ_pipe_blocks,
+    'zipf': _zipf_blocks,
+    'strings': _string_blocks
+}
+
 
 class DataGenerator:
     """Generador de datasets para pruebas"""
     
     @staticmethod
-    def generate_random(size: int, min_val: int = 1, max_val: int = 1000) -> List[int]:
+    def new_seed() -> int:
+        """Semilla nueva al azar (para informarla y poder reproducir los datos)"""
+        return random.SystemRandom().randrange(1 << 32)
+    
+    @staticmethod
+    def iter_chunks(data_type: str, size: int, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    seed: Optional[int] = None, **params) -> Iterator[List[Any]]:
+        """
+        Genera los datos de a chunks, sin tenerlos todos en memoria
+    
+        Los chunks concatenados son idénticos a generate_custom con la misma
+        semilla y parámetros, cualquiera sea chunk_size.
+    
+        Args:
+            data_type: Uno de DATA_TYPES
+            size: Cantidad total de elementos
+            chunk_size: Elementos por chunk
+            seed: Semilla del generador (None: semilla al azar)
+            **params: Parámetros del tipo (ver GENERATOR_PARAMS); los de
+                otros tipos se ignoran
+        """
+        if data_type not in _BLOCK_GENERATORS:
+            raise ValueError(f"Tipo de datos '{data_type}' no soportado")
+        known = {name for names in GENERATOR_PARAMS.values() for name in names}
+        unknown = set(params) - known
+        if unknown:
+            raise ValueError(f"Parámetros no soportados: {', '.join(sorted(unknown))}")
+        if size < 0 or chunk_size < 1:
+            raise ValueError("size no puede ser negativo y chunk_size debe ser positivo")
+    
+        relevant = {name: value for name, value in params.items() if name in GENERATOR_PARAMS[data_type]}
+        blocks = _BLOCK_GENERATORS[data_type](random.Random(seed), size, **relevant)
+        if chunk_size == GENERATOR_BLOCK_SIZE:
+            yield from blocks
+            return
+        values = (value for block in blocks for value in block)
+        while True:
+            chunk = list(islice(values, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+    
+    @staticmethod
+    def _generate(data_type: str, size: int, seed: Optional[int], **params) -> List[Any]:
+        result: List[Any] = []
+        for chunk in DataGenerator.iter_chunks(data_type, size, GENERATOR_BLOCK_SIZE, seed, **params):
+            result.extend(chunk)
+        return result
+    
+    @staticmethod
+    def generate_random(size: int, min_val: int = 1, max_val: int = 1000, seed: Optional[int] = None) -> List[int]:
         """Genera una lista aleatoria de enteros"""
-        return [random.randint(min_val, max_val) for _ in range(size)]
+        return DataGenerator._generate('random', size, seed, min_val=min_val, max_val=max_val)
     
     @staticmethod
-    def generate_sorted(size: int, min_val: int = 1, max_val: int = 1000) -> List[int]:
-        """Genera una lista ordenada de enteros"""
-        return sorted(DataGenerator.generate_random(size, min_val, max_val))
+    def generate_sorted(size: int, min_val: int = 1, max_val: int = 1000, seed: Optional[int] = None) -> List[int]:
+        """Genera una lista ordenada de enteros (un Dataset que ya sabe que está ordenado)"""
+        return Dataset(DataGenerator._generate('sorted', size, seed, min_val=min_val, max_val=max_val),
+                       is_sorted=True)
     
     @staticmethod
-    def generate_reverse_sorted(size: int, min_val: int = 1, max_val: int = 1000) -> List[int]:
+    def generate_reverse_sorted(size: int, min_val: int = 1, max_val: int = 1000,
+                                seed: Optional[int] = None) -> List[int]:
         """Genera una lista inversamente ordenada de enteros"""
-        return sorted(DataGenerator.generate_random(size, min_val, max_val), reverse=True)
+        return DataGenerator._generate('reverse', size, seed, min_val=min_val, max_val=max_val)
     
     @staticmethod
-    def generate_nearly_sorted(size: int, min_val: int = 1, max_val: int = 1000, swaps: int = 10) -> List[int]:
+    def generate_nearly_sorted(size: int, min_val: int = 1, max_val: int = 1000, swaps: int = 10,
+                               seed: Optional[int] = None) -> List[int]:
         """Genera una lista casi ordenada con algunos elementos intercambiados"""
-        arr = DataGenerator.generate_sorted(size, min_val, max_val)
-        for _ in range(swaps):
-            i = random.randint(0, size - 1)
-            j = random.randint(0, size - 1)
-            arr[i], arr[j] = arr[j], arr[i]
-        return arr
+        return DataGenerator._generate('nearly_sorted', size, seed, min_val=min_val, max_val=max_val, swaps=swaps)
     
     @staticmethod
-    def generate_strings(size: int, min_length: int = 3, max_length: int = 10) -> List[str]:
+    def generate_strings(size: int, min_length: int = 3, max_length: int = 10,
+                         seed: Optional[int] = None) -> List[str]:
         """Genera una lista aleatoria de strings"""
-        chars = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
-        return [
-            ''.join(random.choice(chars) for _ in range(random.randint(min_length, max_length)))
-            for _ in range(size)
-        ]
+        return DataGenerator._generate('strings', size, seed, min_length=min_length, max_length=max_length)
     
     @staticmethod
-    def generate_custom(data_type: str, size: int, **kwargs) -> List[Any]:
+    def generate_custom(data_type: str, size: int, seed: Optional[int] = None, **kwargs) -> List[Any]:
         """
         Genera datos personalizados según el tipo especificado
-        
+    
         Args:
-            data_type: Tipo de datos ('random', 'sorted', 'reverse', 'nearly_sorted', 'strings')
+            data_type: Tipo de datos ('random', 'sorted', 'reverse', 'nearly_sorted', 'strings',
+                'many_duplicates', 'sawtooth', 'organ_pipe', 'zipf')
             size: Tamaño de la lista
-            **kwargs: Parámetros adicionales según el tipo
-        """
-        generators = {
-            'random': DataGenerator.generate_random,
-            'sorted': DataGenerator.generate_sorted,
-            'reverse': DataGenerator.generate_reverse_sorted,
-            'nearly_sorted': DataGenerator.generate_nearly_sorted,
-            'strings': DataGenerator.generate_strings
-        }
-        
-        generator = generators.get(data_type)
-        if not generator:
-            raise ValueError(f"Tipo de datos '{data_type}' no soportado")
-        
-        return generator(size, **kwargs)
+            seed: Semilla del generador (None: semilla al azar)
+            **kwargs: Parámetros adicionales según el tipo (ver GENERATOR_PARAMS)
+        """
+        data = DataGenerator._generate(data_type, size, seed, **kwargs)
+        return Dataset(data, is_sorted=True) if data_type == 'sorted' else data
+    
+    @staticmethod
+    def generate_array(data_type: str, size: int, **kwargs) -> Any:
+        """
+        Genera datos numéricos directamente como array NumPy de int64
+    
+        Permite tamaños mucho mayores que las listas (hasta 10^7) sin crear un
+        objeto int por elemento. Requiere NumPy.
+    
+        Args:
+            data_type: Uno de NUMERIC_DATA_TYPES
+            size: Tamaño del array
+            **kwargs: Parámetros adicionales (los de GENERATOR_PARAMS y seed)
+        """
+        return numpy_backend.generate(data_type, size, **kwargs)
+    
+    @staticmethod
+    def write_binary(path: str, data_type: str, size: int, min_val: int = 1, max_val: int = 1000,
+                     seed: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     cancel_event: Optional[threading.Event] = None, **params) -> Dict[str, Any]:
+        """
+        Genera enteros directamente en un archivo de formato binario
+    
+        Escribe de a chunks de iter_chunks, así el tamaño no está limitado por
+        la memoria y el contenido es el mismo que el de la lista generada con
+        la misma semilla.
+    
+        Args:
+            path: Archivo destino
+            data_type: Uno de NUMERIC_DATA_TYPES
+            size: Cantidad de elementos
+            min_val: Valor mínimo
+            max_val: Valor máximo
+            seed: Semilla del generador
+            chunk_size: Elementos por bloque escrito
+            cancel_event: Evento que detiene la escritura entre bloques (ExecutionCancelled)
+            **params: Otros parámetros del tipo (swaps, distinct, teeth, exponent)
+        """
+        if data_type not in NUMERIC_DATA_TYPES:
+            raise ValueError(f"Tipo de datos '{data_type}' no soportado en formato binario")
+        chunks = DataGenerator.iter_chunks(data_type, size, chunk_size, seed,
+                                           min_val=min_val, max_val=max_val, **params)
+        with BinaryDatasetWriter(path) as writer:
+            for chunk in chunks:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExecutionCancelled("Generación cancelada")
+                writer.write(chunk)
+    
+        return {'path': path, 'count': writer.count, 'is_sorted': writer.is_sorted}
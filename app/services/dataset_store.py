@@ -0,0 +1,302 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Union
+from app.algorithms.dataset import Dataset
+from app.algorithms.binary_format import MappedDataset, file_fingerprint, read_header
+
+
+class DatasetNotFound(ValueError):
+    """El dataset no existe o ya expiró"""
+    pass
+
+
+def dataset_fingerprint(data: List[Any]) -> str:
+    """Id del dataset: hash SHA-256 de su contenido (los mismos datos dan el mismo id)"""
+    payload = json.dumps(data, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+def estimate_bytes(data: List[Any]) -> int:
+    """Tamaño aproximado en memoria de la lista y sus elementos"""
+    return sys.getsizeof(data) + sum(map(sys.getsizeof, data))
+
+
+class DatasetStore:
+    """
+    Registro de datasets del lado del servidor
+
+    Los datos se suben (o generan) una vez y luego se referencian por id. Los
+    datasets se guardan en memoria; cuando se supera `max_memory_bytes` los
+    menos usados recientemente se escriben a disco y se vuelven a cargar al
+    pedirlos. Si el disco supera `max_disk_bytes` se descartan los más
+    antiguos. Cada dataset expira tras `ttl_s` segundos sin usarse.
+
+    Los datasets en formato binario (put_file) no pasan por memoria: el
+    archivo queda en el directorio del registro y se mapea con mmap. Ocupan
+    disco y compiten por `max_disk_bytes` con los datasets volcados.
+    """
+
+    def __init__(self, max_memory_bytes: int = 256 * 1024 * 1024, max_disk_bytes: int = 1024 * 1024 * 1024,
+                 ttl_s: float = 3600.0, spill_dir: Optional[str] = None):
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_s = ttl_s
+        self._spill_dir = spill_dir
+        self._memory: 'OrderedDict[str, Dataset]' = OrderedDict()
+        self._disk: 'OrderedDict[str, int]' = OrderedDict()
+        self._mapped: 'OrderedDict[str, MappedDataset]' = OrderedDict()
+        self._info: Dict[str, Dict[str, Any]] = {}
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._mapped_bytes = 0
+        self._lock = threading.Lock()
+        self.spills = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_env(cls) -> 'DatasetStore':
+        """Crea el registro con los límites de las variables de entorno"""
+        return cls(
+            max_memory_bytes=int(os.getenv('DATASET_STORE_MAX_MB', '256')) * 1024 * 1024,
+            max_disk_bytes=int(os.getenv('DATASET_STORE_DISK_MAX_MB', '1024')) * 1024 * 1024,
+            ttl_s=float(os.getenv('DATASET_TTL_S', '3600')),
+            spill_dir=os.getenv('DATASET_STORE_DIR') or None
+        )
+
+    @property
+    def spill_dir(self) -> str:
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix='datasets-')
+        os.makedirs(self._spill_dir, exist_ok=True)
+        return self._spill_dir
+
+    def _path(self, dataset_id: str) -> str:
+        return os.path.join(self.spill_dir, f"{dataset_id}.pkl")
+
+    def _binary_path(self, dataset_id: str) -> str:
+        return os.path.join(self.spill_dir, f"{dataset_id}.bin")
+
+    def new_binary_path(self) -> str:
+        """Ruta temporal dentro del registro para escribir un archivo binario antes de put_file"""
+        fd, path = tempfile.mkstemp(suffix='.bin.tmp', dir=self.spill_dir)
+        os.close(fd)
+        return path
+
+    def put(self, data: List[Any], source: str = 'upload') -> Dict[str, Any]:
+        """
+        Guarda un dataset y devuelve su información (incluido el id)
+
+        El orden se calcula aquí una sola vez (o se reutiliza si los datos ya
+        lo conocen), así las búsquedas posteriores no vuelven a verificarlo.
+        """
+        dataset = data if isinstance(data, Dataset) else Dataset(data)
+        dataset_id = dataset.fingerprint or dataset_fingerprint(dataset)
+        dataset.fingerprint = dataset_id
+        is_sorted = dataset.is_sorted
+        size_bytes = estimate_bytes(dataset)
+        now = time.time()
+
+        with self._lock:
+            self._purge_expired(now)
+            info = self._info.get(dataset_id)
+            if info is not None:
+                info['expires_at'] = now + self.ttl_s
+                return dict(info)
+
+            info = {
+                'dataset_id': dataset_id,
+                'size': len(dataset),
+                'bytes': size_bytes,
+                'is_sorted': is_sorted,
+                'source': source,
+                'created_at': now,
+                'expires_at': now + self.ttl_s,
+                'location': 'memory'
+            }
+            self._info[dataset_id] = info
+            self._memory[dataset_id] = dataset
+            self._memory_bytes += size_bytes
+            self._enforce_limits()
+            return dict(info)
+
+    def put_file(self, path: str, source: str = 'upload') -> Dict[str, Any]:
+        """
+        Registra un archivo en formato binario y devuelve su información
+
+        El registro se queda con el archivo (se mueve a su directorio). El id
+        es el hash del contenido del archivo y el orden se toma de la cabecera.
+        """
+        try:
+            header = read_header(path)
+            dataset_id = file_fingerprint(path)
+        except Exception:
+            os.remove(path)
+            raise
+        now = time.time()
+
+        with self._lock:
+            self._purge_expired(now)
+            info = self._info.get(dataset_id)
+            if info is not None:
+                os.remove(path)
+                info['expires_at'] = now + self.ttl_s
+                return dict(info)
+
+            target = self._binary_path(dataset_id)
+            if os.path.abspath(path) != os.path.abspath(target):
+                shutil.move(path, target)
+            mapped = MappedDataset(target)
+            mapped.fingerprint = dataset_id
+            size_bytes = os.path.getsize(target)
+            info = {
+                'dataset_id': dataset_id,
+                'size': header['count'],
+                'bytes': size_bytes,
+                'is_sorted': mapped.is_sorted,
+                'source': source,
+                'created_at': now,
+                'expires_at': now + self.ttl_s,
+                'location': 'mapped',
+                'format': 'binary',
+                'dtype': 'int64' if mapped.typecode == 'q' else 'float64'
+            }
+            self._info[dataset_id] = info
+            self._mapped[dataset_id] = mapped
+            self._mapped_bytes += size_bytes
+            self._enforce_limits()
+            return dict(info)
+
+    def get(self, dataset_id: str) -> Union[Dataset, MappedDataset]:
+        """Devuelve el dataset (cargándolo del disco si hace falta) y renueva su TTL"""
+        now = time.time()
+        with self._lock:
+            self._purge_expired(now)
+            info = self._info.get(dataset_id)
+            if info is None:
+                raise DatasetNotFound(f"Dataset '{dataset_id}' no encontrado o expirado")
+
+            dataset = self._memory.get(dataset_id)
+            if dataset_id in self._mapped:
+                dataset = self._mapped[dataset_id]
+                self._mapped.move_to_end(dataset_id)
+            elif dataset is not None:
+                self._memory.move_to_end(dataset_id)
+            else:
+                with open(self._path(dataset_id), 'rb') as f:
+                    dataset = pickle.load(f)
+                self._remove_from_disk(dataset_id)
+                self._memory[dataset_id] = dataset
+                self._memory_bytes += info['bytes']
+                info['location'] = 'memory'
+                self._enforce_limits()
+
+            info['expires_at'] = now + self.ttl_s
+            return dataset
+
+    def info(self, dataset_id: str) -> Dict[str, Any]:
+        """Información de un dataset sin cargar los datos"""
+        with self._lock:
+            self._purge_expired(time.time())
+            info = self._info.get(dataset_id)
+            if info is None:
+                raise DatasetNotFound(f"Dataset '{dataset_id}' no encontrado o expirado")
+            return dict(info)
+
+    def delete(self, dataset_id: str) -> bool:
+        """Elimina un dataset; devuelve False si no existía"""
+        with self._lock:
+            return self._remove(dataset_id)
+
+    def list_datasets(self) -> List[Dict[str, Any]]:
+        """Información de todos los datasets vigentes"""
+        with self._lock:
+            self._purge_expired(time.time())
+            return [dict(info) for info in self._info.values()]
+
+    def clear(self):
+        """Elimina todos los datasets"""
+        with self._lock:
+            for dataset_id in list(self._info):
+                self._remove(dataset_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Uso de memoria y disco del registro"""
+        with self._lock:
+            return {
+                'datasets': len(self._info),
+                'in_memory': len(self._memory),
+                'on_disk': len(self._disk),
+                'mapped': len(self._mapped),
+                'mapped_bytes': self._mapped_bytes,
+                'memory_bytes': self._memory_bytes,
+                'max_memory_bytes': self.max_memory_bytes,
+                'disk_bytes': self._disk_bytes,
+                'max_disk_bytes': self.max_disk_bytes,
+                'ttl_s': self.ttl_s,
+                'spills': self.spills,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+    # Los métodos siguientes se llaman con el lock tomado
+
+    def _purge_expired(self, now: float):
+        expired = [dataset_id for dataset_id, info in self._info.items() if info['expires_at'] <= now]
+        for dataset_id in expired:
+            self._remove(dataset_id)
+            self.expirations += 1
+
+    def _remove(self, dataset_id: str) -> bool:
+        info = self._info.pop(dataset_id, None)
+        if info is None:
+            return False
+        if self._memory.pop(dataset_id, None) is not None:
+            self._memory_bytes -= info['bytes']
+        if dataset_id in self._disk:
+            self._remove_from_disk(dataset_id)
+        if self._mapped.pop(dataset_id, None) is not None:
+            # El mapeo sigue siendo válido para quien lo esté usando; se libera al recolectarlo
+            self._mapped_bytes -= info['bytes']
+            try:
+                os.remove(self._binary_path(dataset_id))
+            except FileNotFoundError:
+                pass
+        return True
+
+    def _remove_from_disk(self, dataset_id: str):
+        self._disk_bytes -= self._disk.pop(dataset_id)
+        try:
+            os.remove(self._path(dataset_id))
+        except FileNotFoundError:
+            pass
+
+    def _enforce_limits(self):
+        """Pasa a disco los datasets menos usados y descarta los más antiguos del disco"""
+        while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+            dataset_id, dataset = self._memory.popitem(last=False)
+            info = self._info[dataset_id]
+            self._memory_bytes -= info['bytes']
+            blob = pickle.dumps(dataset, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path = self._path(dataset_id) + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp_path, self._path(dataset_id))
+            self._disk[dataset_id] = len(blob)
+            self._disk_bytes += len(blob)
+            info['location'] = 'disk'
+            self.spills += 1
+
+        while self._disk_bytes + self._mapped_bytes > self.max_disk_bytes and \
+                (self._disk or len(self._mapped) > 1):
+            dataset_id = next(iter(self._disk or self._mapped))
+            self._remove(dataset_id)
+            self.evictions += 1
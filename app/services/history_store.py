@@ -0,0 +1,259 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+# Métricas de la metadata que se guardan en cada registro (sin resultado ni pasos)
+RECORD_METRICS = ('execution_time_ms', 'memory_peak_kb', 'comparisons', 'swaps', 'variant', 'cached')
+
+# Máximo de registros por página en las consultas
+MAX_PAGE_SIZE = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    algorithm TEXT NOT NULL,
+    input_size INTEGER NOT NULL,
+    timestamp REAL NOT NULL,
+    execution_time_ms REAL,
+    memory_peak_kb REAL,
+    comparisons INTEGER,
+    swaps INTEGER,
+    variant TEXT,
+    cached INTEGER
+);
+CREATE INDEX IF NOT EXISTS history_algorithm ON history (algorithm, timestamp);
+CREATE INDEX IF NOT EXISTS history_input_size ON history (input_size);
+CREATE INDEX IF NOT EXISTS history_timestamp ON history (timestamp);
+CREATE TABLE IF NOT EXISTS history_stats (
+    algorithm TEXT PRIMARY KEY,
+    runs INTEGER NOT NULL,
+    timed_runs INTEGER NOT NULL,
+    total_time_ms REAL NOT NULL,
+    min_time_ms REAL,
+    max_time_ms REAL,
+    total_input_size INTEGER NOT NULL,
+    last_run REAL NOT NULL
+);
+"""
+
+
+class HistoryStore:
+    """
+    Historial de ejecuciones acotado
+
+    Cada ejecución se guarda como un registro liviano (algoritmo, tamaño de
+    entrada, fecha y algunas métricas), sin los datos ordenados ni los pasos.
+    En memoria se conservan los últimos `max_records` registros en un buffer
+    circular. Con `db_path` los registros se guardan en SQLite en su lugar,
+    con índices por algoritmo, tamaño y fecha, y la base conserva todo el
+    historial.
+
+    Las estadísticas por algoritmo se acumulan al registrar (en memoria y en
+    la tabla history_stats), así consultarlas no recorre el historial.
+    """
+
+    def __init__(self, max_records: int = 1000, db_path: Optional[str] = None):
+        if max_records < 1:
+            raise ValueError("El historial debe admitir al menos un registro")
+        self.max_records = max_records
+        self.db_path = db_path
+        self._records: 'deque[Dict[str, Any]]' = deque(maxlen=max_records)
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            directory = os.path.dirname(os.path.abspath(db_path))
+            os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.row_factory = sqlite3.Row
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+            self._db.executescript(_SCHEMA)
+
+    @classmethod
+    def from_env(cls) -> 'HistoryStore':
+        """Crea el historial con la configuración de las variables de entorno"""
+        return cls(
+            max_records=int(os.getenv('HISTORY_MAX_RECORDS', '1000')),
+            db_path=os.getenv('HISTORY_DB') or None
+        )
+
+    def record(self, algorithm: str, input_size: int, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Registra una ejecución y devuelve el registro guardado"""
+        record = {
+            'id': None,
+            'algorithm': algorithm,
+            'input_size': input_size,
+            'timestamp': time.time()
+        }
+        for key in RECORD_METRICS:
+            record[key] = metadata.get(key)
+        record['cached'] = bool(record['cached'])
+
+        with self._lock:
+            if self._db is not None:
+                record['id'] = self._insert(record)
+            else:
+                record['id'] = self._next_id
+                self._next_id += 1
+                self._records.append(record)
+                self._accumulate(record)
+        return dict(record)
+
+    def query(self, algorithm: Optional[str] = None, min_size: Optional[int] = None,
+              max_size: Optional[int] = None, since: Optional[float] = None,
+              until: Optional[float] = None, limit: int = 10, offset: int = 0) -> Dict[str, Any]:
+        """
+        Busca registros, del más reciente al más antiguo
+
+        Args:
+            algorithm: Solo las ejecuciones de este algoritmo
+            min_size, max_size: Rango del tamaño de entrada (inclusive)
+            since, until: Rango de fechas (timestamps en segundos)
+            limit: Registros por página
+            offset: Registros a saltear
+
+        Returns:
+            Registros de la página y total de registros que cumplen el filtro
+        """
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit debe estar entre 1 y {MAX_PAGE_SIZE}")
+        if offset < 0:
+            raise ValueError("offset no puede ser negativo")
+
+        filters = {'algorithm': algorithm, 'min_size': min_size, 'max_size': max_size,
+                   'since': since, 'until': until}
+        with self._lock:
+            if self._db is not None:
+                records, total = self._query_db(filters, limit, offset)
+            else:
+                matching = [record for record in reversed(self._records) if self._matches(record, filters)]
+                records = [dict(record) for record in matching[offset:offset + limit]]
+                total = len(matching)
+        return {'records': records, 'total': total, 'limit': limit, 'offset': offset}
+
+    def stats(self, algorithm: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Estadísticas acumuladas por algoritmo (de todo el historial)"""
+        with self._lock:
+            if self._db is not None:
+                sql = 'SELECT * FROM history_stats'
+                params: tuple = ()
+                if algorithm is not None:
+                    sql += ' WHERE algorithm = ?'
+                    params = (algorithm,)
+                rows = [dict(row) for row in self._db.execute(sql, params)]
+            else:
+                rows = [dict(row, algorithm=name) for name, row in self._stats.items()
+                        if algorithm is None or name == algorithm]
+        return {row['algorithm']: self._summary(row) for row in rows}
+
+    def clear(self):
+        """Elimina todo el historial"""
+        with self._lock:
+            self._records.clear()
+            self._stats.clear()
+            if self._db is not None:
+                with self._db:
+                    self._db.execute('DELETE FROM history')
+                    self._db.execute('DELETE FROM history_stats')
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._db is not None:
+                return self._db.execute('SELECT COUNT(*) FROM history').fetchone()[0]
+            return len(self._records)
+
+    @staticmethod
+    def _summary(row: Dict[str, Any]) -> Dict[str, Any]:
+        timed = row['timed_runs']
+        return {
+            'runs': row['runs'],
+            'mean_time_ms': round(row['total_time_ms'] / timed, 4) if timed else None,
+            'min_time_ms': row['min_time_ms'],
+            'max_time_ms': row['max_time_ms'],
+            'mean_input_size': round(row['total_input_size'] / row['runs'], 2) if row['runs'] else None,
+            'last_run': row['last_run']
+        }
+
+    # Los métodos siguientes se llaman con el lock tomado
+
+    def _accumulate(self, record: Dict[str, Any]):
+        """Actualiza las estadísticas en memoria (sin base de datos)"""
+        stats = self._stats.setdefault(record['algorithm'], {
+            'runs': 0, 'timed_runs': 0, 'total_time_ms': 0.0, 'min_time_ms': None,
+            'max_time_ms': None, 'total_input_size': 0, 'last_run': 0.0
+        })
+        stats['runs'] += 1
+        stats['total_input_size'] += record['input_size']
+        stats['last_run'] = record['timestamp']
+        elapsed = record['execution_time_ms']
+        if elapsed is not None:
+            stats['timed_runs'] += 1
+            stats['total_time_ms'] += elapsed
+            stats['min_time_ms'] = elapsed if stats['min_time_ms'] is None else min(stats['min_time_ms'], elapsed)
+            stats['max_time_ms'] = elapsed if stats['max_time_ms'] is None else max(stats['max_time_ms'], elapsed)
+
+    def _insert(self, record: Dict[str, Any]) -> int:
+        columns = ('algorithm', 'input_size', 'timestamp') + RECORD_METRICS
+        elapsed = record['execution_time_ms']
+        with self._db:
+            cursor = self._db.execute(
+                f"INSERT INTO history ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                [record[column] for column in columns]
+            )
+            self._db.execute(
+                """
+                INSERT INTO history_stats VALUES (?, 1, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (algorithm) DO UPDATE SET
+                    runs = runs + 1,
+                    timed_runs = timed_runs + excluded.timed_runs,
+                    total_time_ms = total_time_ms + excluded.total_time_ms,
+                    min_time_ms = COALESCE(MIN(min_time_ms, excluded.min_time_ms), min_time_ms, excluded.min_time_ms),
+                    max_time_ms = COALESCE(MAX(max_time_ms, excluded.max_time_ms), max_time_ms, excluded.max_time_ms),
+                    total_input_size = total_input_size + excluded.total_input_size,
+                    last_run = excluded.last_run
+                """,
+                (record['algorithm'], int(elapsed is not None), elapsed or 0.0, elapsed, elapsed,
+                 record['input_size'], record['timestamp'])
+            )
+        return cursor.lastrowid
+
+    def _query_db(self, filters: Dict[str, Any], limit: int, offset: int):
+        conditions = []
+        params: List[Any] = []
+        for key, clause in (('algorithm', 'algorithm = ?'), ('min_size', 'input_size >= ?'),
+                            ('max_size', 'input_size <= ?'), ('since', 'timestamp >= ?'),
+                            ('until', 'timestamp <= ?')):
+            if filters[key] is not None:
+                conditions.append(clause)
+                params.append(filters[key])
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+        total = self._db.execute(f'SELECT COUNT(*) FROM history{where}', params).fetchone()[0]
+        rows = self._db.execute(
+            f'SELECT * FROM history{where} ORDER BY id DESC LIMIT ? OFFSET ?', params + [limit, offset]
+        ).fetchall()
+        records = []
+        for row in rows:
+            record = dict(row)
+            record['cached'] = bool(record['cached'])
+            records.append(record)
+        return records, total
+
+    @staticmethod
+    def _matches(record: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+        return (
+            (filters['algorithm'] is None or record['algorithm'] == filters['algorithm']) and
+            (filters['min_size'] is None or record['input_size'] >= filters['min_size']) and
+            (filters['max_size'] is None or record['input_size'] <= filters['max_size']) and
+            (filters['since'] is None or record['timestamp'] >= filters['since']) and
+            (filters['until'] is None or record['timestamp'] <= filters['until'])
+        )
@@ -0,0 +1,278 @@
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from app.algorithms.base import AlgorithmBase, ExecutionCancelled
+from app.algorithms.trace import TRACE_NONE
+from app.services.benchmark import BenchmarkRunner
+from app.services.data_generator import NUMERIC_DATA_TYPES
+from app.services.algorithm_manager import MAX_BINARY_GENERATE_JOB_SIZE
+
+# Estados de un job
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+
+JOB_KINDS = ('run', 'compare', 'benchmark', 'generate')
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+
+class JobQueueFull(Exception):
+    """La cola de jobs está llena"""
+    pass
+
+
+class Job:
+    """Ejecución en segundo plano de uno o varios algoritmos"""
+
+    def __init__(self, kind: str, algorithm_names: List[str], data: List[Any],
+                 kwargs: Optional[Dict[str, Any]] = None, runner=None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.algorithm_names = algorithm_names
+        self.data = data
+        self.input_size = len(data) if data is not None else 0
+        self.kwargs = kwargs or {}
+        self.runner = runner
+        self.status = JOB_QUEUED
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self._completed_units = 0
+        self._current: Optional[AlgorithmBase] = None
+        self._fast = False
+        self._progress = 0.0
+
+    @property
+    def interruptible(self) -> bool:
+        """
+        False mientras corre una variante rápida: no registra pasos, así que
+        solo se cancela entre fases (pasada limpia, instrumentada, repetición)
+        """
+        return not (self.status == JOB_RUNNING and self._fast)
+
+    @property
+    def progress(self) -> float:
+        """Progreso estimado entre 0 y 1 a partir del contador de comparaciones"""
+        if self.status == JOB_COMPLETED:
+            return 1.0
+        total = max(1, len(self.algorithm_names))
+        fraction = 0.0
+        current = self._current
+        if current is not None:
+            expected = current.estimate_comparisons(self.input_size)
+            fraction = min(current.comparisons / expected, 0.99)
+        # El progreso nunca retrocede (p. ej. entre la pasada limpia y la instrumentada)
+        self._progress = max(self._progress, (self._completed_units + fraction) / total)
+        return round(min(self._progress, 0.99), 4)
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        """Estado del job en formato serializable"""
+        data = {
+            'job_id': self.id,
+            'kind': self.kind,
+            'algorithms': self.algorithm_names,
+            'status': self.status,
+            'progress': self.progress,
+            'input_size': self.input_size,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+        if self.error is not None:
+            data['error'] = self.error
+        if include_result and self.status == JOB_COMPLETED:
+            data['result'] = self.result
+        return data
+
+
+class JobManager:
+    """
+    Ejecuta jobs en hilos de fondo con una cola acotada
+
+    Cada job usa su propia copia de los algoritmos, así el contador de
+    comparaciones sirve para estimar el progreso y la cancelación no afecta a
+    otras ejecuciones. La cancelación es cooperativa: se comprueba cada vez que
+    el algoritmo registra un paso (las variantes rápidas, entre fases). Los
+    cambios de estado QUEUED → RUNNING y QUEUED → CANCELLED se hacen con el
+    lock tomado, y un job terminado ya no cambia de estado.
+    """
+
+    def __init__(self, manager, max_workers: int = 2, max_queue: int = 32, max_finished: int = 256):
+        self.manager = manager
+        self.max_workers = max_workers
+        self.max_finished = max_finished
+        self._queue: 'queue.Queue[Job]' = queue.Queue(maxsize=max_queue)
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+
+    def _ensure_workers(self):
+        """Arranca los hilos de trabajo la primera vez que se necesitan"""
+        with self._lock:
+            while len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._worker_loop, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, kind: str, algorithm_names: List[str], data: List[Any],
+               runner=None, **kwargs) -> Job:
+        """
+        Encola un job y devuelve inmediatamente
+
+        Raises:
+            ValueError: Si el tipo de job, los algoritmos o los datos no son válidos
+            JobQueueFull: Si la cola de jobs está llena
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Tipo de job '{kind}' no soportado")
+        if not algorithm_names:
+            raise ValueError("Se requiere al menos un algoritmo")
+        for name in algorithm_names:
+            if not self.manager.get_algorithm(name):
+                raise ValueError(f"Algoritmo '{name}' no encontrado")
+        self.manager._validate_input(data)
+
+        return self._enqueue(Job(kind, list(algorithm_names), data, kwargs, runner))
+
+    def _enqueue(self, job: Job) -> Job:
+        self._ensure_workers()
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            raise JobQueueFull("La cola de jobs está llena, intente más tarde")
+
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict_finished()
+        return job
+
+    def submit_generate(self, data_type: str, size: int, seed: Optional[int] = None, **params) -> Job:
+        """
+        Encola la generación de un dataset binario en el registro (el
+        resultado del job es la información del dataset)
+
+        Raises:
+            ValueError: Si el tipo o el tamaño no son válidos
+            JobQueueFull: Si la cola de jobs está llena
+        """
+        if data_type not in NUMERIC_DATA_TYPES:
+            raise ValueError(f"Tipo de datos '{data_type}' no soportado en formato binario")
+        if not isinstance(size, int) or not 1 <= size <= MAX_BINARY_GENERATE_JOB_SIZE:
+            raise ValueError(f"El tamaño debe estar entre 1 y {MAX_BINARY_GENERATE_JOB_SIZE:,}")
+        job = Job('generate', [], None, {'data_type': data_type, 'size': size, 'seed': seed, **params})
+        job.input_size = size
+        return self._enqueue(job)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Obtiene un job por id"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[Job]:
+        """Lista los jobs conocidos (del más antiguo al más reciente)"""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Pide la cancelación de un job; los jobs en cola se cancelan sin ejecutarse"""
+        job = self.get(job_id)
+        if job is None:
+            return None
+        with self._lock:
+            if job.status in FINISHED_STATES:
+                return job
+            # Con el evento marcado bajo el lock el worker ya no puede arrancarlo
+            job.cancel_event.set()
+            queued = job.status == JOB_QUEUED
+        if queued:
+            self._finish(job, JOB_CANCELLED)
+        return job
+
+    def _evict_finished(self):
+        """Descarta los jobs terminados más antiguos si hay demasiados"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED_STATES]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def _finish(self, job: Job, status: str, result: Any = None, error: Optional[str] = None):
+        """Pasa el job a un estado final (no hace nada si ya terminó)"""
+        with self._lock:
+            if job.status in FINISHED_STATES:
+                return
+            job.result = result
+            job.error = error
+            job.finished_at = time.time()
+            job.status = status
+            job._current = None
+            # Liberar la entrada: el job ya no la necesita
+            job.data = None
+
+    def _worker_loop(self):
+        while True:
+            job = self._queue.get()
+            try:
+                with self._lock:
+                    if job.cancel_event.is_set() or job.status != JOB_QUEUED:
+                        continue
+                    job.status = JOB_RUNNING
+                    job.started_at = time.time()
+                try:
+                    result = self._execute(job)
+                except ExecutionCancelled:
+                    self._finish(job, JOB_CANCELLED)
+                except Exception as e:
+                    self._finish(job, JOB_FAILED, error=str(e))
+                else:
+                    self._finish(job, JOB_COMPLETED, result=result)
+            finally:
+                self._queue.task_done()
+
+    def _execute(self, job: Job) -> Any:
+        """Ejecuta el trabajo de un job según su tipo"""
+        if job.kind == 'generate':
+            return self.manager.generate_binary_dataset(cancel_event=job.cancel_event, **job.kwargs)
+        results = {}
+        for name in job.algorithm_names:
+            if job.cancel_event.is_set():
+                raise ExecutionCancelled("Job cancelado")
+
+            # Copia propia del algoritmo: contadores aislados y cancelación por job
+            algorithm = self.manager.get_algorithm(name).invocation(job.cancel_event)
+            job._current = algorithm
+            kwargs = self.manager._variant_kwargs(name, job.kwargs)
+            job._fast = bool(kwargs.get('fast'))
+
+            try:
+                if job.kind == 'benchmark':
+                    results[name] = self._benchmark(job, algorithm, name, kwargs)
+                else:
+                    # Los pasos no se devuelven en el job: no registrarlos
+                    result = algorithm.run_with_metrics(job.data, **{'trace_mode': TRACE_NONE, **kwargs})
+                    self.manager._record_history(name, job.data, result)
+                    results[name] = result.to_dict()
+            except ExecutionCancelled:
+                raise
+            except Exception as e:
+                if job.kind == 'run':
+                    raise
+                results[name] = {'error': str(e)}
+
+            job._completed_units += 1
+
+        if job.kind == 'run':
+            return results[job.algorithm_names[0]]
+        return results
+
+    def _benchmark(self, job: Job, algorithm: AlgorithmBase, name: str,
+                   kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        result = (job.runner or BenchmarkRunner()).run(algorithm, job.data, **kwargs)
+        result['algorithm_key'] = name
+        return result
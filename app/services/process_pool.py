@@ -0,0 +1,254 @@
+import atexit
+import multiprocessing
+import os
+import pickle
+import queue
+import threading
+import time
+from array import array
+from multiprocessing.connection import wait
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from app.algorithms.base import AlgorithmBase
+from app.algorithms.binary_format import MappedDataset
+
+# Tipos de contenido de la memoria compartida
+PAYLOAD_INT = 'q'
+PAYLOAD_FLOAT = 'd'
+PAYLOAD_PICKLE = 'pickle'
+PAYLOAD_MAPPED = 'mapped'
+
+# Intervalo de sondeo cuando hay tareas esperando un proceso libre
+_IDLE_POLL_S = 0.05
+
+
+def _payload_kind(data: List[Any]) -> str:
+    """Elige la codificación más compacta para los datos"""
+    if all(type(item) is int for item in data):
+        if all(-(1 << 63) <= item < (1 << 63) for item in data):
+            return PAYLOAD_INT
+    elif all(type(item) is float for item in data):
+        return PAYLOAD_FLOAT
+    return PAYLOAD_PICKLE
+
+
+def share_data(data: List[Any]) -> Tuple[Optional[SharedMemory], Tuple[str, str, int]]:
+    """
+    Copia los datos una sola vez a un segmento de memoria compartida
+
+    Las listas homogéneas de enteros o flotantes se guardan como arrays
+    contiguos (int64/float64); el resto se serializa con pickle. Los datasets
+    binarios mapeados no se copian: cada proceso mapea el mismo archivo.
+
+    Returns:
+        Tupla (segmento o None, descriptor para leerlo desde los procesos)
+    """
+    if isinstance(data, MappedDataset):
+        return None, (data.path, PAYLOAD_MAPPED, data.nbytes)
+    kind = _payload_kind(data)
+    if kind == PAYLOAD_PICKLE:
+        raw = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    else:
+        raw = array(kind, data).tobytes()
+    shm = SharedMemory(create=True, size=max(1, len(raw)))
+    shm.buf[:len(raw)] = raw
+    return shm, (shm.name, kind, len(raw))
+
+
+def load_shared_data(descriptor: Tuple[str, str, int]) -> List[Any]:
+    """Lee los datos de un segmento de memoria compartida"""
+    name, kind, nbytes = descriptor
+    if kind == PAYLOAD_MAPPED:
+        return MappedDataset(name)
+    shm = SharedMemory(name=name)
+    try:
+        view = shm.buf[:nbytes]
+        if kind == PAYLOAD_PICKLE:
+            data = pickle.loads(view)
+        else:
+            data = view.cast(kind).tolist()
+        view.release()
+        return data
+    finally:
+        shm.close()
+
+
+def _worker_main(conn):
+    """Bucle de un proceso trabajador: recibe tareas y devuelve resultados"""
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if message is None:
+            break
+        algorithm, descriptor, kwargs = message
+        try:
+            data = load_shared_data(descriptor)
+            result = algorithm.run_with_metrics(data, **kwargs)
+            conn.send((True, (result.result, result.metadata)))
+        except Exception as e:
+            conn.send((False, str(e)))
+
+
+class _Worker:
+    """Proceso trabajador con su canal de comunicación"""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def stop(self, force: bool = False):
+        """Detiene el proceso (terminándolo si force es True)"""
+        if not force:
+            try:
+                self.conn.send(None)
+            except (OSError, ValueError):
+                force = True
+        if force:
+            self.process.terminate()
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class AlgorithmProcessPool:
+    """
+    Pool persistente de procesos para ejecutar algoritmos en paralelo
+
+    Los datos de entrada se copian una vez a memoria compartida por llamada y
+    cada proceso los lee desde allí. Las tareas que superan el tiempo límite
+    se cancelan terminando su proceso, que se reemplaza por uno nuevo.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, start_method: Optional[str] = None):
+        if start_method is None:
+            methods = multiprocessing.get_all_start_methods()
+            start_method = 'forkserver' if 'forkserver' in methods else 'spawn'
+        self._context = multiprocessing.get_context(start_method)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._idle: 'queue.Queue[_Worker]' = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(self.max_workers):
+            self._add_worker()
+
+    def _add_worker(self) -> _Worker:
+        worker = _Worker(self._context)
+        with self._lock:
+            self._workers.append(worker)
+        self._idle.put(worker)
+        return worker
+
+    def _replace_worker(self, worker: _Worker):
+        """Termina un proceso ocupado y lo reemplaza"""
+        worker.stop(force=True)
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+            closed = self._closed
+        if not closed:
+            self._add_worker()
+
+    def run(self, tasks: Dict[str, AlgorithmBase], data: List[Any], timeout: Optional[float] = None,
+            task_kwargs: Optional[Dict[str, Dict[str, Any]]] = None,
+            **kwargs) -> Iterator[Tuple[str, bool, Any]]:
+        """
+        Ejecuta varios algoritmos sobre los mismos datos
+
+        Args:
+            tasks: Diccionario nombre -> algoritmo
+            data: Datos de entrada (se comparten una sola vez)
+            timeout: Tiempo máximo por algoritmo en segundos
+            task_kwargs: Argumentos propios de cada tarea (reemplazan a kwargs)
+            **kwargs: Argumentos para run_with_metrics
+
+        Yields:
+            Tuplas (nombre, éxito, (resultado, metadata) o mensaje de error)
+            en el orden en que terminan
+        """
+        if self._closed:
+            raise RuntimeError("El pool de procesos está cerrado")
+
+        shm, descriptor = share_data(data)
+        pending = list(tasks.items())
+        running: Dict[Any, Tuple[str, _Worker, Optional[float]]] = {}
+
+        try:
+            while pending or running:
+                # Asignar tareas a procesos libres
+                while pending:
+                    try:
+                        worker = self._idle.get(block=not running)
+                    except queue.Empty:
+                        break
+                    name, algorithm = pending.pop(0)
+                    deadline = time.monotonic() + timeout if timeout else None
+                    try:
+                        worker.conn.send((algorithm, descriptor, (task_kwargs or {}).get(name, kwargs)))
+                    except Exception as e:
+                        self._idle.put(worker)
+                        yield name, False, str(e)
+                        continue
+                    running[worker.conn] = (name, worker, deadline)
+
+                if not running:
+                    continue
+
+                deadlines = [deadline for _, _, deadline in running.values() if deadline is not None]
+                wait_timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+                if pending:
+                    wait_timeout = _IDLE_POLL_S if wait_timeout is None else min(wait_timeout, _IDLE_POLL_S)
+
+                for conn in wait(list(running), timeout=wait_timeout):
+                    name, worker, _ = running.pop(conn)
+                    try:
+                        ok, value = conn.recv()
+                    except (EOFError, OSError):
+                        self._replace_worker(worker)
+                        yield name, False, "El proceso trabajador terminó inesperadamente"
+                        continue
+                    self._idle.put(worker)
+                    yield name, ok, value
+
+                now = time.monotonic()
+                for conn, (name, worker, deadline) in list(running.items()):
+                    if deadline is not None and now >= deadline:
+                        running.pop(conn)
+                        self._replace_worker(worker)
+                        yield name, False, f"Tiempo límite excedido ({timeout} s)"
+        finally:
+            # Si el consumidor abandona la iteración, cancelar lo que siga en curso
+            for name, worker, _ in running.values():
+                self._replace_worker(worker)
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+    def shutdown(self):
+        """Detiene todos los procesos del pool"""
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.stop()
+
+
+_default_pool: Optional[AlgorithmProcessPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> AlgorithmProcessPool:
+    """Devuelve el pool compartido del proceso, creándolo la primera vez"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = AlgorithmProcessPool()
+            atexit.register(_default_pool.shutdown)
+        return _default_pool
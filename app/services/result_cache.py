@@ -0,0 +1,144 @@
+import hashlib
+import io
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from app.algorithms.base import AlgorithmResult
+
+
+class _EntryTooLarge(Exception):
+    pass
+
+
+class _BoundedBuffer(io.BytesIO):
+    """Buffer que corta la serialización en cuanto se pasa del límite"""
+
+    def __init__(self, limit: int):
+        super().__init__()
+        self.limit = limit
+
+    def write(self, data) -> int:
+        if self.tell() + len(data) > self.limit:
+            raise _EntryTooLarge()
+        return super().write(data)
+
+
+class ResultCache:
+    """
+    Caché de resultados direccionada por contenido
+
+    La clave es un hash de (algoritmo, datos de entrada, argumentos). Los
+    resultados se guardan serializados, así el tamaño en bytes es exacto y
+    cada acierto devuelve una copia independiente. Se descartan los menos
+    usados recientemente cuando se supera `max_bytes`. Con `persist_dir` los
+    resultados también se escriben a disco y sobreviven a reinicios. Los
+    resultados que no caben en `max_bytes` no se guardan en ningún lado (la
+    serialización se corta al pasar el límite).
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, persist_dir: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.persist_dir = persist_dir
+        if persist_dir:
+            os.makedirs(persist_dir, exist_ok=True)
+        self._entries: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.oversized = 0
+
+    @staticmethod
+    def make_key(name: str, data: List[Any], kwargs: Dict[str, Any]) -> str:
+        """Hash SHA-256 del algoritmo, los datos y los argumentos"""
+        payload = json.dumps([name, data, kwargs], sort_keys=True, default=repr, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.persist_dir, f"{key}.pkl")
+
+    def get(self, key: str) -> Optional[AlgorithmResult]:
+        """Devuelve una copia del resultado guardado o None"""
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            elif self.persist_dir and os.path.exists(self._path(key)) \
+                    and os.path.getsize(self._path(key)) <= self.max_bytes:
+                with open(self._path(key), 'rb') as f:
+                    blob = f.read()
+                self._store(key, blob)
+                self.hits += 1
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+                return None
+
+        result, metadata, steps = pickle.loads(blob)
+        return AlgorithmResult(result, metadata, steps=steps)
+
+    def put(self, key: str, result: AlgorithmResult, include_steps: bool = True):
+        """Guarda un resultado si cabe en el límite de memoria (sin los pasos si include_steps es False)"""
+        steps = result.steps if include_steps else []
+        buffer = _BoundedBuffer(self.max_bytes)
+        try:
+            pickle.Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump((result.result, result.metadata, steps))
+        except _EntryTooLarge:
+            with self._lock:
+                self.oversized += 1
+            return
+        blob = buffer.getvalue()
+        with self._lock:
+            self._store(key, blob)
+            if self.persist_dir:
+                tmp_path = self._path(key) + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(blob)
+                os.replace(tmp_path, self._path(key))
+
+    def _store(self, key: str, blob: bytes):
+        """Guarda en memoria y aplica la política LRU (llamar con el lock tomado)"""
+        if len(blob) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        self._entries[key] = blob
+        self._bytes += len(blob)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        """Vacía la caché en memoria y en disco"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self.persist_dir:
+                for filename in os.listdir(self.persist_dir):
+                    if filename.endswith('.pkl'):
+                        os.remove(os.path.join(self.persist_dir, filename))
+
+    def stats(self) -> Dict[str, Any]:
+        """Estadísticas de uso de la caché"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'oversized': self.oversized,
+                'persistent': bool(self.persist_dir)
+            }
@@ -0,0 +1,237 @@
+import math
+from typing import Any, Dict, List, Optional, Sequence
+from app.services.benchmark import BenchmarkRunner, BenchmarkBusy
+from app.services.data_generator import DataGenerator, NUMERIC_DATA_TYPES
+from app.algorithms import numpy_backend, parallel
+
+# Tipos de datos que se pueden generar directamente como array NumPy
+ARRAY_DATA_TYPES = NUMERIC_DATA_TYPES
+
+# Modelos de crecimiento candidatos: f(n)
+GROWTH_MODELS = {
+    'n': lambda n: n,
+    'n_log_n': lambda n: n * math.log2(n) if n > 1 else 0.0,
+    'n^2': lambda n: n * n,
+}
+
+
+def geometric_sizes(min_size: int, max_size: int, points: int) -> List[int]:
+    """Genera tamaños en escala geométrica entre min_size y max_size (incluidos)"""
+    if min_size < 1 or max_size < min_size:
+        raise ValueError("Se requiere 1 <= min_size <= max_size")
+    if points < 2 or min_size == max_size:
+        return [min_size] if min_size == max_size else [min_size, max_size]
+    ratio = (max_size / min_size) ** (1 / (points - 1))
+    sizes = sorted({int(round(min_size * ratio ** i)) for i in range(points)})
+    sizes[-1] = max_size
+    return sizes
+
+
+def _r_squared(values: Sequence[float], predicted: Sequence[float]) -> float:
+    """Coeficiente de determinación"""
+    mean = sum(values) / len(values)
+    ss_tot = sum((v - mean) ** 2 for v in values)
+    ss_res = sum((v - p) ** 2 for v, p in zip(values, predicted))
+    if ss_tot == 0:
+        return 1.0 if ss_res == 0 else 0.0
+    return 1 - ss_res / ss_tot
+
+
+def fit_power_law(sizes: Sequence[int], values: Sequence[float]) -> Optional[Dict[str, float]]:
+    """Ajusta log(y) = k·log(n) + b y devuelve el exponente empírico k"""
+    pairs = [(math.log(n), math.log(v)) for n, v in zip(sizes, values) if n > 0 and v > 0]
+    if len(pairs) < 2:
+        return None
+    xs, ys = zip(*pairs)
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    if sxx == 0:
+        return None
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sxx
+    intercept = mean_y - slope * mean_x
+    return {
+        'exponent': round(slope, 4),
+        'r_squared': round(_r_squared(ys, [slope * x + intercept for x in xs]), 4)
+    }
+
+
+def fit_complexity(sizes: Sequence[int], values: Sequence[float]) -> Optional[Dict[str, Any]]:
+    """
+    Ajusta y = c·f(n) para cada modelo de crecimiento por mínimos cuadrados
+
+    Returns:
+        Diccionario con el mejor modelo, los ajustes de cada modelo y el
+        exponente empírico (ajuste log-log), o None si no hay suficientes puntos
+    """
+    if len(sizes) < 2:
+        return None
+
+    models = {}
+    for name, f in GROWTH_MODELS.items():
+        fs = [f(n) for n in sizes]
+        denominator = sum(x * x for x in fs)
+        if denominator == 0:
+            continue
+        coefficient = sum(x * y for x, y in zip(fs, values)) / denominator
+        models[name] = {
+            'coefficient': coefficient,
+            'r_squared': round(_r_squared(values, [coefficient * x for x in fs]), 4)
+        }
+
+    best = max(models, key=lambda name: models[name]['r_squared'])
+    return {
+        'best_model': best,
+        'models': models,
+        'power_law': fit_power_law(sizes, values)
+    }
+
+
+class ScalingAnalyzer:
+    """Barrido de tamaños de entrada con ajuste empírico de la complejidad"""
+
+    def __init__(self, manager, runner: Optional[BenchmarkRunner] = None,
+                 time_budget_s: float = 10.0):
+        """
+        Args:
+            manager: AlgorithmManager usado para validar y obtener algoritmos
+            runner: Configuración de las mediciones por punto
+            time_budget_s: Si la mediana de un tamaño supera este tiempo no se
+                prueban tamaños mayores para ese algoritmo
+        """
+        self.manager = manager
+        self.runner = runner or BenchmarkRunner(warmup=1, min_repeats=3, max_repeats=10,
+                                                target_rel_error=0.05, max_time_s=2.0)
+        self.time_budget_s = time_budget_s
+
+    def sweep(self, algorithm_names: List[str], sizes: List[int], data_type: str = 'random',
+              data_kwargs: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Mide tiempo, comparaciones e intercambios para cada algoritmo y tamaño
+
+        Args:
+            algorithm_names: Claves de AVAILABLE_ALGORITHMS
+            sizes: Tamaños de entrada a probar
+            data_type: Tipo de datos de DataGenerator
+            data_kwargs: Parámetros adicionales para DataGenerator
+            **kwargs: Argumentos adicionales para los algoritmos
+
+        Returns:
+            Diccionario con los puntos medidos y los ajustes por algoritmo
+        """
+        for name in algorithm_names:
+            if not self.manager.get_algorithm(name):
+                raise ValueError(f"Algoritmo '{name}' no encontrado")
+
+        # Si todos son variantes rápidas los datos se generan como array (hasta 10^7)
+        use_arrays = (numpy_backend.NUMPY_AVAILABLE and data_type in ARRAY_DATA_TYPES
+                      and all(self.manager.is_fast(name, kwargs) for name in algorithm_names))
+
+        points = {name: [] for name in algorithm_names}
+        stopped = {name: None for name in algorithm_names}
+        errors = {}
+
+        for size in sorted(sizes):
+            active = [name for name in algorithm_names if stopped[name] is None and name not in errors]
+            if not active:
+                break
+            # Mismos datos para todos los algoritmos en cada tamaño
+            if use_arrays:
+                data = DataGenerator.generate_array(data_type, size, **(data_kwargs or {}))
+            else:
+                data = DataGenerator.generate_custom(data_type, size, **(data_kwargs or {}))
+            for name in active:
+                try:
+                    bench = self.manager.benchmark_algorithm(name, data, self.runner, **kwargs)
+                except BenchmarkBusy:
+                    raise
+                except Exception as e:
+                    errors[name] = str(e)
+                    continue
+                median_ms = bench['stats_ms']['median']
+                points[name].append({
+                    'size': size,
+                    'time_ms': median_ms,
+                    'time_p95_ms': bench['stats_ms']['p95'],
+                    'comparisons': bench['comparisons'],
+                    'swaps': bench['swaps'],
+                    'repeats': bench['repeats']
+                })
+                if median_ms / 1000 > self.time_budget_s:
+                    stopped[name] = size
+
+        results = {}
+        for name in algorithm_names:
+            measured = points[name]
+            measured_sizes = [p['size'] for p in measured]
+            within_budget = [p['size'] for p in measured if p['time_ms'] / 1000 <= self.time_budget_s]
+            results[name] = {
+                'points': measured,
+                'max_size_within_budget': within_budget[-1] if within_budget else None,
+                'stopped_at_size': stopped[name],
+                'fit': {
+                    metric: fit_complexity(measured_sizes, [p[metric] for p in measured])
+                    for metric in ('time_ms', 'comparisons', 'swaps')
+                    # Las variantes rápidas no cuentan comparaciones ni intercambios
+                    if all(p[metric] is not None for p in measured)
+                }
+            }
+            if name in errors:
+                results[name]['error'] = errors[name]
+
+        return {
+            'data_type': data_type,
+            'backend_input': 'numpy' if use_arrays else 'list',
+            'sizes': sorted(sizes),
+            'results': results
+        }
+
+    def worker_sweep(self, algorithm_name: str, size: int, workers: List[int], data_type: str = 'random',
+                     data_kwargs: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Mide un algoritmo paralelo con distintas cantidades de procesos
+
+        Args:
+            algorithm_name: Clave de AVAILABLE_ALGORITHMS (un ordenamiento paralelo)
+            size: Tamaño de la entrada (la misma para todas las mediciones)
+            workers: Cantidades de procesos a probar (siempre se mide 1 como base)
+            data_type: Tipo de datos de DataGenerator
+            data_kwargs: Parámetros adicionales para DataGenerator
+            **kwargs: Argumentos adicionales para el algoritmo
+
+        Returns:
+            Diccionario con el tiempo, la aceleración (speedup) respecto de un
+            proceso y la eficiencia (speedup / procesos) de cada punto
+        """
+        if not self.manager.get_algorithm(algorithm_name):
+            raise ValueError(f"Algoritmo '{algorithm_name}' no encontrado")
+        if any(not isinstance(count, int) or count < 1 for count in workers):
+            raise ValueError("Las cantidades de procesos deben ser enteros positivos")
+
+        data = DataGenerator.generate_custom(data_type, size, **(data_kwargs or {}))
+        points = []
+        baseline_ms = None
+        for count in sorted(set(workers) | {1}):
+            bench = self.manager.benchmark_algorithm(algorithm_name, data, self.runner, workers=count, **kwargs)
+            median_ms = bench['stats_ms']['median']
+            if baseline_ms is None:
+                baseline_ms = median_ms
+            speedup = baseline_ms / median_ms if median_ms > 0 else None
+            effective = parallel.effective_workers(size, count)
+            points.append({
+                'workers': count,
+                'effective_workers': effective,
+                'time_ms': median_ms,
+                'time_p95_ms': bench['stats_ms']['p95'],
+                'speedup': round(speedup, 4) if speedup is not None else None,
+                'efficiency': round(speedup / effective, 4) if speedup is not None else None,
+                'repeats': bench['repeats']
+            })
+
+        return {
+            'algorithm': algorithm_name,
+            'data_type': data_type,
+            'size': size,
+            'cpu_count': parallel.default_workers(),
+            'points': points
+        }
@@ -0,0 +1,168 @@
+import json
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+from app.algorithms.base import AlgorithmBase, ExecutionCancelled
+from app.algorithms.trace import TRACE_DELTA
+
+# Marcadores internos de la cola
+_DONE = object()
+
+# Espera máxima de cada intento de encolar antes de revisar la cancelación
+_PUT_POLL_S = 0.1
+
+# Pasos que el hilo del algoritmo agrupa antes de encolarlos
+STREAM_CHUNK_SIZE = 64
+
+
+def merge_frames(pending: Optional[Dict[str, Any]], step: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combina un paso con el frame pendiente de enviar
+
+    Los cambios delta se fusionan (último valor por índice), así el frame
+    combinado sigue siendo reproducible sobre el estado anterior. Un paso con
+    copia completa reemplaza todo lo pendiente. Los pasos que no modifican el
+    array solo se cuentan.
+    """
+    if pending is None:
+        pending = {'action': 'batch', 'count': 0, 'changes': {}}
+    pending['count'] += 1
+    if pending['count'] == 1:
+        pending['step'] = step
+    if 'array' in step:
+        pending['array'] = step['array']
+        pending['changes'] = {}
+    elif 'values' in step:
+        for index, value in zip(step['indices'], step['values']):
+            pending['changes'][index] = value
+    pending['last'] = {key: value for key, value in step.items() if key not in ('array', 'values')}
+    return pending
+
+
+def _finalize_frame(pending: Dict[str, Any]) -> Dict[str, Any]:
+    """Convierte un frame combinado al formato de paso"""
+    if pending['count'] == 1:
+        return pending['step']
+    frame = {'action': 'batch', 'count': pending['count'], 'last': pending['last']}
+    if 'array' in pending:
+        array = list(pending['array'])
+        for index, value in pending['changes'].items():
+            array[index] = value
+        frame['array'] = array
+    elif pending['changes']:
+        frame['indices'] = list(pending['changes'])
+        frame['values'] = list(pending['changes'].values())
+    return frame
+
+
+def stream_steps(algorithm: AlgorithmBase, data: List[Any], trace_mode: str = TRACE_DELTA,
+                 trace_every: int = 1, max_buffer: int = 256, max_fps: float = 0,
+                 **kwargs) -> Iterator[Dict[str, Any]]:
+    """
+    Ejecuta un algoritmo en un hilo y entrega sus pasos a medida que ocurren
+
+    El hilo del algoritmo escribe en una cola acotada (en bloques de hasta
+    STREAM_CHUNK_SIZE pasos, con como máximo `max_buffer` pasos en espera):
+    si el consumidor es más lento, el algoritmo se bloquea (backpressure) y
+    nunca se guarda la traza completa en memoria. Con `max_fps` se envían como máximo esa cantidad de
+    frames por segundo, fusionando los pasos intermedios.
+
+    Yields:
+        Eventos {'type': 'start' | 'step' | 'result' | 'error', ...}
+    """
+    worker = algorithm.invocation(threading.Event())
+    chunk_size = max(1, min(STREAM_CHUNK_SIZE, max_buffer))
+    events: 'queue.Queue[Any]' = queue.Queue(maxsize=max(1, max_buffer // chunk_size))
+    outcome: Dict[str, Any] = {}
+    chunk: List[Dict[str, Any]] = []
+
+    def put(item):
+        while True:
+            try:
+                events.put(item, timeout=_PUT_POLL_S)
+                return
+            except queue.Full:
+                if worker.cancel_event.is_set():
+                    raise ExecutionCancelled("Streaming cancelado")
+
+    def sink(step):
+        chunk.append(step)
+        if len(chunk) >= chunk_size:
+            put(chunk[:])
+            chunk.clear()
+
+    def run():
+        try:
+            outcome['result'] = worker.run_with_metrics(
+                data, trace_mode=trace_mode, trace_every=trace_every,
+                two_pass=False, trace_sink=sink, **kwargs
+            )
+        except ExecutionCancelled:
+            outcome['cancelled'] = True
+        except Exception as e:
+            outcome['error'] = str(e)
+        finally:
+            try:
+                if chunk:
+                    put(chunk[:])
+                put(_DONE)
+            except ExecutionCancelled:
+                pass
+
+    thread = threading.Thread(target=run, daemon=True)
+    interval = 1 / max_fps if max_fps and max_fps > 0 else 0
+    pending = None
+    next_emit = 0.0
+
+    try:
+        thread.start()
+        yield {'type': 'start', 'algorithm': algorithm.name, 'input_size': len(data),
+               'trace_mode': trace_mode}
+
+        while True:
+            timeout = None
+            if pending is not None:
+                timeout = max(0.0, next_emit - time.monotonic())
+            try:
+                batch = events.get(timeout=timeout)
+            except queue.Empty:
+                batch = []
+
+            if batch is _DONE:
+                break
+            for item in batch:
+                if not interval:
+                    yield {'type': 'step', **item}
+                    continue
+                pending = merge_frames(pending, item)
+                if time.monotonic() >= next_emit:
+                    yield {'type': 'step', **_finalize_frame(pending)}
+                    pending = None
+                    next_emit = time.monotonic() + interval
+
+            if pending is not None and time.monotonic() >= next_emit:
+                yield {'type': 'step', **_finalize_frame(pending)}
+                pending = None
+                next_emit = time.monotonic() + interval
+
+        if pending is not None:
+            yield {'type': 'step', **_finalize_frame(pending)}
+
+        if 'error' in outcome:
+            yield {'type': 'error', 'error': outcome['error']}
+        elif 'result' in outcome:
+            yield {'type': 'result', **outcome['result'].to_dict()}
+    finally:
+        # Si el cliente se desconecta, detener el algoritmo
+        worker.cancel_event.set()
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Formatea un evento como Server-Sent Event"""
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+def format_ndjson(event: Dict[str, Any]) -> str:
+    """Formatea un evento como una línea NDJSON"""
+    return json.dumps(event) + '\n'
@@ -93,7 +93,8 @@ async function compareAlgorithms() {
     
     const requestBody = {
         algorithms: selectedAlgorithms,
-        data: inputData
+        data: inputData,
+        include_fast: document.getElementById('includeFast').checked
     };
     
     if (targetInput && hasSearchAlgorithms) {
@@ -129,6 +130,13 @@ async function compareAlgorithms() {
     }
 }
 
+function algorithmLabel(algoName) {
+    // Las variantes rápidas llegan como 'nombre:fast'
+    const [baseName, variant] = algoName.split(':');
+    const label = algorithms[baseName]?.name || baseName;
+    return variant === 'fast' ? `${label} (rápido)` : label;
+}
+
 function displayCompareResults(results) {
     const resultsContent = document.getElementById('compareResultsContent');
     let html = '';
@@ -136,17 +144,24 @@ function displayCompareResults(results) {
     for (const [algoName, result] of Object.entries(results)) {
         if (result.error) {
             html += `<div class="algorithm-result border-danger">`;
-            html += `<h6>${algorithms[algoName]?.name || algoName}</h6>`;
+            html += `<h6>${algorithmLabel(algoName)}</h6>`;
             html += `<div class="error-message">${result.error}</div>`;
             html += `</div>`;
         } else {
             html += `<div class="algorithm-result">`;
-            html += `<h6>${algorithms[algoName]?.name || algoName}</h6>`;
+            html += `<h6>${algorithmLabel(algoName)}</h6>`;
             html += `<pre class="bg-light p-2 rounded small">${JSON.stringify(result.result, null, 2)}</pre>`;
             html += `<div class="mt-2">`;
             html += `<span class="metric-badge">Tiempo: ${result.metadata.execution_time_ms} ms</span>`;
+            if (result.metadata.instrumented_time_ms !== null && result.metadata.instrumented_time_ms !== undefined) {
+                html += `<span class="metric-badge">Tiempo Instrumentado: ${result.metadata.instrumented_time_ms} ms</span>`;
+            }
             html += `<span class="metric-badge">Memoria: ${result.metadata.memory_used_kb} KB</span>`;
-            html += `<span class="metric-badge">Comparaciones: ${result.metadata.comparisons}</span>`;
+            if (result.metadata.comparisons !== null) {
+                html += `<span class="metric-badge">Comparaciones: ${result.metadata.comparisons}</span>`;
+            } else {
+                html += `<span class="metric-badge">Motor: ${result.metadata.engine}</span>`;
+            }
             html += `</div>`;
             html += `</div>`;
         }
@@ -158,12 +173,14 @@ function displayCompareResults(results) {
 function updateCompareCharts(results) {
     const algorithmNames = [];
     const times = [];
+    const instrumentedTimes = [];
     const memories = [];
     
     for (const [algoName, result] of Object.entries(results)) {
         if (!result.error) {
-            algorithmNames.push(algorithms[algoName]?.name || algoName);
+            algorithmNames.push(algorithmLabel(algoName));
             times.push(result.metadata.execution_time_ms);
+            instrumentedTimes.push(result.metadata.instrumented_time_ms);
             memories.push(result.metadata.memory_used_kb);
         }
     }
@@ -181,6 +198,10 @@ function updateCompareCharts(results) {
                 label: 'Tiempo de Ejecución (ms)',
                 data: times,
                 backgroundColor: 'rgba(54, 162, 235, 0.6)'
+            }, {
+                label: 'Tiempo Instrumentado (ms)',
+                data: instrumentedTimes,
+                backgroundColor: 'rgba(153, 102, 255, 0.6)'
             }]
         },
         options: {
@@ -1,5 +1,6 @@
 let algorithms = {};
 let metricsChart = null;
+let animationChart = null;
 
 // Cargar algoritmos disponibles al cargar la página
 document.addEventListener('DOMContentLoaded', function() {
@@ -102,6 +103,17 @@ async function runAlgorithm() {
     resultsCard.style.display = 'block';
     resultsContent.innerHTML = '<div class="loading">Ejecutando algoritmo...</div>';
     
+    if (document.getElementById('streamSteps').checked && !algorithmName.includes('search')) {
+        await runAlgorithmStream(requestBody);
+        return;
+    }
+    
+    const replay = document.getElementById('replaySteps').checked && !algorithmName.includes('search');
+    if (replay) {
+        // Traza en formato binario: mucho más chica que la lista de pasos en JSON
+        Object.assign(requestBody, {include_steps: true, trace_format: 'binary', trace_mode: 'delta'});
+    }
+    
     try {
         const response = await fetch('/api/run', {
             method: 'POST',
@@ -116,6 +128,9 @@ async function runAlgorithm() {
         if (data.success) {
             displayResults(data.result);
             updateMetricsChart(data.result);
+            if (data.result.trace) {
+                await replayTrace(inputData, await decodeTrace(data.result.trace));
+            }
         } else {
             showError(data.error || 'Error ejecutando algoritmo');
         }
@@ -125,6 +140,119 @@ async function runAlgorithm() {
     }
 }
 
+async function runAlgorithmStream(requestBody) {
+    // Recibe los pasos como NDJSON y anima desde el primer frame
+    const frame = requestBody.data.slice();
+    const status = document.getElementById('animationStatus');
+    document.getElementById('animationCard').style.display = 'block';
+    initAnimationChart(frame);
+    let frames = 0;
+    
+    try {
+        const response = await fetch('/api/run/stream', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({...requestBody, format: 'ndjson', trace_mode: 'delta', max_fps: 30})
+        });
+        
+        if (!response.ok) {
+            const data = await response.json();
+            showError(data.error || 'Error ejecutando algoritmo');
+            return;
+        }
+        
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        
+        while (true) {
+            const {value, done} = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, {stream: true});
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            
+            for (const line of lines) {
+                if (!line.trim()) continue;
+                const event = JSON.parse(line);
+                if (event.type === 'step') {
+                    applyStep(frame, event);
+                    frames++;
+                    status.textContent = `(${frames} frames)`;
+                    animationChart.data.datasets[0].data = frame;
+                    animationChart.update('none');
+                } else if (event.type === 'result') {
+                    displayResults(event);
+                    updateMetricsChart(event);
+                } else if (event.type === 'error') {
+                    showError(event.error);
+                }
+            }
+        }
+    } catch (error) {
+        console.error('Error en el streaming:', error);
+        showError('Error al ejecutar el algoritmo');
+    }
+}
+
+async function replayTrace(initial, trace) {
+    // Anima la traza decodificando cada paso recién al mostrarlo
+    const frame = initial.slice();
+    const status = document.getElementById('animationStatus');
+    document.getElementById('animationCard').style.display = 'block';
+    initAnimationChart(frame);
+    const stepsPerFrame = Math.max(1, Math.ceil(trace.length / 600));
+    
+    for (let i = 0; i < trace.length; i += stepsPerFrame) {
+        for (let j = i; j < Math.min(i + stepsPerFrame, trace.length); j++) {
+            applyStep(frame, trace.step(j));
+        }
+        status.textContent = `(paso ${Math.min(i + stepsPerFrame, trace.length)} de ${trace.length})`;
+        animationChart.data.datasets[0].data = frame;
+        animationChart.update('none');
+        await new Promise(resolve => requestAnimationFrame(resolve));
+    }
+}
+
+function applyStep(frame, step) {
+    if (step.array) {
+        frame.splice(0, frame.length, ...step.array);
+    }
+    if (step.indices && step.values) {
+        step.indices.forEach((index, i) => { frame[index] = step.values[i]; });
+    }
+}
+
+function initAnimationChart(frame) {
+    const ctx = document.getElementById('animationChart').getContext('2d');
+    
+    if (animationChart) {
+        animationChart.destroy();
+    }
+    
+    animationChart = new Chart(ctx, {
+        type: 'bar',
+        data: {
+            labels: frame.map((_, i) => i),
+            datasets: [{
+                label: 'Valores',
+                data: frame,
+                backgroundColor: 'rgba(54, 162, 235, 0.6)'
+            }]
+        },
+        options: {
+            animation: false,
+            responsive: true,
+            scales: {
+                x: { display: false },
+                y: { beginAtZero: true }
+            }
+        }
+    });
+}
+
 function displayResults(result) {
     const resultsContent = document.getElementById('resultsContent');
     
@@ -134,6 +262,9 @@ function displayResults(result) {
     
     html += '<h6 class="mt-3">Métricas:</h6>';
     html += `<div class="metric-badge">Tiempo: ${result.metadata.execution_time_ms} ms</div>`;
+    if (result.metadata.instrumented_time_ms !== null && result.metadata.instrumented_time_ms !== undefined) {
+        html += `<div class="metric-badge">Tiempo Instrumentado: ${result.metadata.instrumented_time_ms} ms</div>`;
+    }
     html += `<div class="metric-badge">Memoria: ${result.metadata.memory_used_kb} KB</div>`;
     html += `<div class="metric-badge">Memoria Pico: ${result.metadata.memory_peak_kb} KB</div>`;
     html += `<div class="metric-badge">Comparaciones: ${result.metadata.comparisons}</div>`;
@@ -0,0 +1,119 @@
+// Decodificador de la traza binaria (formato algt-v1, ver app/algorithms/trace_codec.py)
+//
+// Las columnas se leen como arrays tipados sobre el buffer recibido, sin
+// copiarlas; cada paso se arma como objeto recién al pedirlo con step(i).
+
+const TRACE_MAGIC = 'ALGT';
+const TRACE_HEADER_SIZE = 16;
+const TRACE_FLAG_ZLIB = 0x1;
+
+const STEP_INDICES = 0x1;
+const STEP_VALUES = 0x2;
+const STEP_ARRAY = 0x4;
+const STEP_NUMBER = 0x8;
+
+function base64ToBytes(base64) {
+    const binary = atob(base64);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    return bytes;
+}
+
+async function inflateBytes(bytes) {
+    // zlib (RFC 1950) es el formato 'deflate' de DecompressionStream
+    const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('deflate'));
+    return new Uint8Array(await new Response(stream).arrayBuffer());
+}
+
+class CompactTrace {
+    constructor(body, valueType, count) {
+        const view = new DataView(body.buffer, body.byteOffset, body.byteLength);
+        const textDecoder = new TextDecoder();
+        const sections = [];
+        let offset = 0;
+        while (offset < body.byteLength) {
+            const length = view.getUint32(offset, true);
+            const start = body.byteOffset + offset + 8;
+            sections.push({start, length});
+            offset += 8 + length + ((8 - length % 8) % 8);
+        }
+        if (sections.length !== 9) {
+            throw new Error('Traza binaria con secciones inválidas');
+        }
+
+        const buffer = body.buffer;
+        const text = (s) => textDecoder.decode(new Uint8Array(buffer, s.start, s.length));
+        const typed = (Type, s) => new Type(buffer, s.start, s.length / Type.BYTES_PER_ELEMENT);
+
+        this.length = count;
+        this.actionTable = JSON.parse(text(sections[0]));
+        this.actions = typed(Uint8Array, sections[1]);
+        this.flags = typed(Uint8Array, sections[2]);
+        this.stepNumbers = typed(Int32Array, sections[3]);
+        this.indexOffsets = typed(Uint32Array, sections[4]);
+        this.indices = typed(Int32Array, sections[5]);
+        this.valueOffsets = typed(Uint32Array, sections[6]);
+        if (valueType === 'q') {
+            this.values = typed(BigInt64Array, sections[7]);
+        } else if (valueType === 'd') {
+            this.values = typed(Float64Array, sections[7]);
+        } else {
+            this.values = JSON.parse(text(sections[7]));
+        }
+        this.extras = new Map(JSON.parse(text(sections[8])));
+    }
+
+    valuesOf(i) {
+        const slice = this.values.slice(this.valueOffsets[i], this.valueOffsets[i + 1]);
+        return slice instanceof BigInt64Array ? Array.from(slice, Number) : Array.from(slice);
+    }
+
+    step(i) {
+        // Mismo objeto que un paso de la traza JSON
+        const flags = this.flags[i];
+        const step = {action: this.actionTable[this.actions[i]]};
+        if (flags & STEP_INDICES) {
+            step.indices = Array.from(this.indices.subarray(this.indexOffsets[i], this.indexOffsets[i + 1]));
+        }
+        Object.assign(step, this.extras.get(i));
+        if (flags & STEP_VALUES) {
+            step.values = this.valuesOf(i);
+        }
+        if (flags & STEP_NUMBER) {
+            step.step = this.stepNumbers[i];
+        }
+        if (flags & STEP_ARRAY) {
+            step.array = this.valuesOf(i);
+        }
+        return step;
+    }
+
+    *[Symbol.iterator]() {
+        for (let i = 0; i < this.length; i++) {
+            yield this.step(i);
+        }
+    }
+}
+
+async function decodeTrace(base64) {
+    const bytes = base64ToBytes(base64);
+    const header = new DataView(bytes.buffer, 0, TRACE_HEADER_SIZE);
+    const magic = String.fromCharCode(...bytes.subarray(0, 4));
+    if (magic !== TRACE_MAGIC) {
+        throw new Error('No es una traza binaria');
+    }
+    const version = header.getUint8(4);
+    if (version !== 1) {
+        throw new Error(`Versión de traza no soportada: ${version}`);
+    }
+    const flags = header.getUint8(5);
+    const valueType = String.fromCharCode(header.getUint8(6));
+    const count = header.getUint32(8, true);
+    let body = bytes.subarray(TRACE_HEADER_SIZE);
+    if (flags & TRACE_FLAG_ZLIB) {
+        body = await inflateBytes(body);
+    }
+    return new CompactTrace(body, valueType, count);
+}
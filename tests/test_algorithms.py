@@ -1,6 +1,17 @@
 import pytest
-from app.algorithms.sorting import BubbleSort, MergeSort, QuickSort, HeapSort
+from app.algorithms.sorting import BubbleSort, MergeSort, QuickSort, HeapSort, RadixSort, ExternalMergeSort, \
+    ParallelMergeSort, SampleSort, AdaptiveSort
 from app.algorithms.search import LinearSearch, BinarySearch
+from app.algorithms import engines, numpy_backend, parallel
+from app.algorithms.dataset import Dataset
+from app.algorithms.binary_format import BinaryDatasetWriter, MappedDataset, write_dataset
+from app.algorithms.external_sort import ExternalSorter
+from app.algorithms.trace_codec import CompactTrace, decode_trace, encode_trace
+from app.algorithms.trace import TraceReplayer
+from app.algorithms.sorted_list import SortedList
+from app.algorithms.selection import QuickSelect, PartialSort, HeapTopK
+import bisect
+import random
 
 class TestSortingAlgorithms:
     """Tests para algoritmos de ordenamiento"""
@@ -48,6 +59,34 @@ class TestSortingAlgorithms:
         data = [1, 2, 3, 4, 5]
         result = algo.execute(data)
         assert result == [1, 2, 3, 4, 5]
+    
+    @pytest.mark.parametrize('algorithm', [MergeSort, QuickSort])
+    def test_large_adversarial_inputs_without_recursion(self, algorithm):
+        n = 20000
+        for data in (list(range(n)), list(range(n, 0, -1)), [7] * n, [i % 3 for i in range(n)]):
+            algo = algorithm()
+            algo.reset_metrics('none')
+            assert algo.execute(data) == sorted(data)
+            # O(n log n) comparaciones aun con pivotes malos para Lomuto o muchos repetidos
+            assert algo.comparisons < 2 * n * 15
+    
+    @pytest.mark.parametrize('algorithm', [MergeSort, QuickSort])
+    def test_trace_frames_match_between_modes(self, algorithm):
+        data = [random.randint(0, 20) for _ in range(101)]
+        full = algorithm().run_with_metrics(data, trace_mode='full')
+        delta = algorithm().run_with_metrics(data, trace_mode='delta')
+        frames = list(TraceReplayer(data, delta.steps).frames())
+        assert list(TraceReplayer(data, full.steps).frames()) == frames
+        assert frames[-1] == sorted(data)
+    
+    def test_full_merge_trace_stores_only_merged_blocks(self):
+        n = 1024
+        data = random.sample(range(n), n)
+        result = MergeSort().run_with_metrics(data, trace_mode='full')
+        assert all('array' not in step for step in result.steps)
+        # Cada pasada guarda n valores: O(n log n) en total y no O(n²)
+        assert sum(len(step['values']) for step in result.steps) == n * 10
+        assert list(result.replayer().frames())[-1] == sorted(data)
 
 class TestSearchAlgorithms:
     """Tests para algoritmos de búsqueda"""
@@ -88,6 +127,381 @@ class TestSearchAlgorithms:
         with pytest.raises(ValueError):
             algo.execute(data, target=25)
 
+class TestSortedness:
+    """Tests para la verificación de orden de Binary Search"""
+    
+    def test_dataset_remembers_and_invalidates_order(self):
+        data = Dataset([1, 2, 3], is_sorted=True)
+        assert data.sortedness_known and data.is_sorted
+        data.append(0)
+        assert not data.sortedness_known
+        assert not data.is_sorted
+        data.sort()
+        assert data.sortedness_known and data.is_sorted
+        data[0] = 10
+        assert not data.is_sorted
+    
+    def test_binary_search_reuses_dataset_order(self):
+        algo = BinarySearch()
+        data = Dataset(range(0, 1000, 2))
+        first = algo.run_with_metrics(data, target=10, two_pass=False)
+        assert first.metadata['sorted_check'] == 'scanned'
+        second = algo.run_with_metrics(data, target=11)
+        assert second.metadata['sorted_check'] == 'cached'
+        assert second.result['found'] == False
+    
+    def test_binary_search_trusted_flag_skips_check(self):
+        algo = BinarySearch()
+        result = algo.run_with_metrics([1, 3, 5, 7], target=5, assume_sorted=True)
+        assert result.result['index'] == 2
+        assert result.metadata['sorted_check'] == 'trusted'
+        with pytest.raises(ValueError):
+            algo.execute(Dataset([3, 1, 2]), target=1)
+    
+    def test_searches_do_not_copy_input(self):
+        class Spy(list):
+            def copy(self):
+                raise AssertionError("la búsqueda no debe copiar la entrada")
+        assert BinarySearch().run_with_metrics(Spy([1, 2, 3]), target=2).result['found']
+        assert LinearSearch().run_with_metrics(Spy([1, 2, 3]), target=3, fast=True).result['found']
+
+class TestBinaryFormat:
+    """Tests para el formato binario de datasets y su lectura con mmap"""
+    
+    def test_roundtrip(self, tmp_path):
+        path = str(tmp_path / 'data.bin')
+        info = write_dataset(path, [5, -3, 2 ** 40, 0], chunk_size=2)
+        assert info['count'] == 4 and info['is_sorted'] == False
+        with MappedDataset(path) as data:
+            assert len(data) == 4 and data.typecode == 'q'
+            assert data[2] == 2 ** 40 and data[1:3] == [-3, 2 ** 40]
+            assert list(data) == [5, -3, 2 ** 40, 0] and data.copy() == [5, -3, 2 ** 40, 0]
+            assert data.index(0) == 3
+            assert data.sortedness_known and not data.is_sorted
+        
+        write_dataset(path, [0.5, 1.5])
+        with MappedDataset(path) as data:
+            assert data.typecode == 'd' and data.is_sorted
+    
+    def test_writer_tracks_order_across_chunks(self, tmp_path):
+        path = str(tmp_path / 'data.bin')
+        with BinaryDatasetWriter(path) as writer:
+            writer.write([1, 2, 3])
+            writer.write([3, 4])
+        assert writer.is_sorted
+        with BinaryDatasetWriter(path) as writer:
+            writer.write([1, 2, 3])
+            writer.write([2, 4])
+        assert not writer.is_sorted
+    
+    def test_rejects_invalid_files(self, tmp_path):
+        path = tmp_path / 'data.bin'
+        path.write_bytes(b'not a dataset' * 4)
+        with pytest.raises(ValueError):
+            MappedDataset(str(path))
+    
+    def test_algorithms_on_mapped_data(self, tmp_path):
+        path = str(tmp_path / 'data.bin')
+        write_dataset(path, range(0, 2000, 2))
+        with MappedDataset(path) as data:
+            result = BinarySearch().run_with_metrics(data, target=1000)
+            assert result.result['index'] == 500
+            assert result.metadata['sorted_check'] == 'cached'
+            assert BinarySearch().run_with_metrics(data, target=1000, fast=True).result['index'] == 500
+            assert LinearSearch().run_with_metrics(data, target=4, fast=True).result['index'] == 2
+            assert MergeSort().run_with_metrics(data, fast=True).result == list(range(0, 2000, 2))
+
+class TestExternalSort:
+    """Tests para el Merge Sort externo"""
+    
+    def test_sorts_with_small_budget(self):
+        data = [random.randint(-10 ** 12, 10 ** 12) for _ in range(5000)]
+        for fast in (False, True):
+            result = ExternalMergeSort().run_with_metrics(data, memory_budget=40 * 1024, fan_in=2, fast=fast)
+            assert result.result == sorted(data)
+            # 5 corridas de 1024 elementos con fan_in 2: 3 pasadas de fusión
+            assert result.metadata['runs'] == 5
+            assert result.metadata['merge_passes'] == 3
+            assert result.metadata['io_bytes_written'] > result.metadata['io_bytes_read'] > 0
+        assert result.metadata['comparisons'] is None
+    
+    def test_counts_merge_comparisons(self):
+        data = list(range(3000, 0, -1))
+        result = ExternalMergeSort().run_with_metrics(data, memory_budget=40 * 1024, fan_in=4, two_pass=False)
+        assert result.result == sorted(data)
+        assert result.metadata['comparisons'] > 3000
+    
+    def test_sorts_mapped_file(self, tmp_path):
+        source = str(tmp_path / 'source.bin')
+        target = str(tmp_path / 'sorted.bin')
+        values = [random.random() for _ in range(3000)]
+        write_dataset(source, values)
+        stats = ExternalSorter(memory_budget=40 * 1024, fan_in=8, tmp_dir=str(tmp_path)).sort(source, target)
+        assert stats['runs'] == 3 and stats['merge_passes'] == 1
+        with MappedDataset(target) as data:
+            assert data.typecode == 'd' and data.sortedness_known and data.is_sorted
+            assert data.copy() == sorted(values)
+    
+    def test_rejects_non_numeric(self):
+        with pytest.raises(ValueError):
+            ExternalMergeSort().execute(['b', 'a'])
+
+class TestParallelSorts:
+    """Tests para Merge Sort paralelo y Sample Sort"""
+    
+    @pytest.fixture(autouse=True)
+    def max_workers(self, monkeypatch):
+        # Independiente de los núcleos de la máquina que corre los tests
+        monkeypatch.setenv('PARALLEL_MAX_WORKERS', '4')
+    
+    def test_workers_are_capped_and_share_one_pool(self):
+        assert parallel.effective_workers(10 ** 7, 5000) == 4
+        assert parallel.effective_workers(10 ** 7, 3) == 3
+        executor = parallel.get_executor()
+        for workers in (2, 3):
+            ParallelMergeSort().run_with_metrics(list(range(20000, 0, -1)), fast=True, workers=workers,
+                                                 instrument=False)
+        assert parallel.get_executor() is executor
+    
+    @pytest.mark.parametrize('algorithm', [ParallelMergeSort, SampleSort])
+    def test_fast_variant_uses_workers(self, algorithm):
+        data = [random.randint(-1000, 1000) for _ in range(10000)]
+        result = algorithm().run_with_metrics(data, fast=True, workers=2, instrument=False)
+        assert result.result == sorted(data)
+        assert result.metadata['workers'] == 2 and result.metadata['shared_memory']
+        assert len(result.metadata['worker_times_ms']) == 2
+        assert sum(result.metadata['partition_sizes']) == len(data)
+        assert result.metadata['speedup_estimate'] > 0
+    
+    @pytest.mark.parametrize('algorithm', [ParallelMergeSort, SampleSort])
+    def test_instrumented_counts_worker_comparisons(self, algorithm):
+        data = [random.random() for _ in range(9000)]
+        result = algorithm().run_with_metrics(data, workers=2, two_pass=False, trace_mode='none')
+        assert result.result == sorted(data)
+        assert result.metadata['comparisons'] > 9000
+        assert not result.metadata['shared_memory']
+    
+    def test_small_inputs_and_strings_stay_sequential(self):
+        result = SampleSort().run_with_metrics(['b', 'c', 'a'], fast=True, workers=8)
+        assert result.result == ['a', 'b', 'c']
+        assert result.metadata['workers'] == 1
+        data = [str(i) for i in range(9000)]
+        assert ParallelMergeSort().run_with_metrics(data, fast=True, workers=2).result == sorted(data)
+
+class TestAdaptiveSort:
+    """Tests para el ordenamiento adaptativo ('auto')"""
+    
+    @staticmethod
+    def _cases():
+        rng = random.Random(21)
+        nearly = list(range(5000))
+        for _ in range(5):
+            i, j = rng.randrange(5000), rng.randrange(5000)
+            nearly[i], nearly[j] = nearly[j], nearly[i]
+        return {
+            'already_sorted': list(range(5000)),
+            'reverse_run_merge': list(range(5000, 0, -1)),
+            'run_merge': nearly,
+            'counting_sort': [rng.randint(-100, 100) for _ in range(5000)],
+            'radix_sort': [rng.randint(0, 10**9) for _ in range(5000)],
+            'heap_sort': [rng.random() for _ in range(5000)]
+        }
+    
+    def test_profile_input(self):
+        profile = engines.profile_input([3, 1, 2, 2, 5])
+        assert profile['size'] == 5 and profile['dtype'] == 'int'
+        assert profile['runs'] == 2 and profile['descending_runs'] == 3
+        assert (profile['min'], profile['max'], profile['value_range']) == (1, 5, 4)
+        assert profile['inversion_ratio'] == 0.3
+        assert profile['duplicate_ratio'] == 0.2
+        assert engines.profile_input(list(range(10, 0, -1)))['inversion_ratio'] == 1.0
+        assert engines.profile_input(['b', 'a'])['value_range'] is None
+        assert engines.profile_input([1, 2.5])['dtype'] == 'number'
+    
+    def test_strategy_follows_input_shape(self):
+        for strategy, data in self._cases().items():
+            assert engines.choose_sort_strategy(engines.profile_input(data)) == strategy
+            assert engines.adaptive_sort(data.copy(), strategy)[0] == sorted(data)
+    
+    @pytest.mark.parametrize('fast', [True, False])
+    def test_metadata_reports_strategy_and_profile_cost(self, fast):
+        for strategy, data in self._cases().items():
+            result = AdaptiveSort().run_with_metrics(data, fast=fast, trace_mode='none')
+            assert result.result == sorted(data)
+            assert result.metadata['strategy'] == strategy
+            assert result.metadata['profile_ms'] >= 0
+            assert result.metadata['profile']['size'] == len(data)
+    
+    def test_instrumented_counts_profile_and_delegate(self):
+        data = [random.random() for _ in range(500)]
+        result = AdaptiveSort().run_with_metrics(data, trace_mode='delta')
+        assert result.result == sorted(data)
+        # Las dos pasadas del perfil más las comparaciones de Heap Sort
+        assert result.metadata['comparisons'] > 2 * 499 + 500
+        assert result.steps[0]['action'] == 'profile'
+        assert {step['action'] for step in result.steps} >= {'swap', 'heapify'}
+    
+    def test_run_merge_uses_merge_steps(self):
+        data = list(range(100, 200)) + list(range(100))
+        result = AdaptiveSort().run_with_metrics(data)
+        assert result.result == sorted(data)
+        assert [step['action'] for step in result.steps] == ['profile', 'merge']
+        assert result.metadata['comparisons'] == 2 * 199 + 100
+    
+    def test_strings_and_empty_input(self):
+        assert AdaptiveSort().run_with_metrics(['pera', 'kiwi', 'uva'], fast=True).result == ['kiwi', 'pera', 'uva']
+        result = AdaptiveSort().run_with_metrics([])
+        assert result.result == [] and result.metadata['strategy'] == 'already_sorted'
+
+class TestSelection:
+    """Tests para los algoritmos de selección (k menores sin ordenar todo)"""
+    
+    def test_results_match_full_sort(self):
+        rng = random.Random(12)
+        for n in (1, 2, 7, 300):
+            for data in ([rng.randint(0, 20) for _ in range(n)], list(range(n)), list(range(n, 0, -1))):
+                expected = sorted(data)
+                for k in {1, n, (n + 1) // 2, rng.randint(1, n)}:
+                    for fast in (False, True):
+                        assert QuickSelect().run_with_metrics(data, k=k, fast=fast).result == \
+                            {'k': k, 'value': expected[k - 1]}
+                        assert PartialSort().run_with_metrics(data, k=k, fast=fast).result == expected[:k]
+                        assert HeapTopK().run_with_metrics(data, k=k, fast=fast).result == expected[:k]
+    
+    def test_default_k_is_median_and_invalid_k(self):
+        assert QuickSelect().run_with_metrics([5, 1, 4, 2, 3]).result == {'k': 3, 'value': 3}
+        for k in (0, 6, 2.5, True):
+            with pytest.raises(ValueError):
+                PartialSort().execute([5, 1, 4, 2, 3], k=k)
+    
+    def test_fewer_comparisons_than_full_sort(self):
+        rng = random.Random(3)
+        data = [rng.randint(0, 10 ** 6) for _ in range(20000)]
+        full_sort = MergeSort().run_with_metrics(data, trace_mode='none').metadata['comparisons']
+        for algorithm in (QuickSelect(), PartialSort(), HeapTopK()):
+            result = algorithm.run_with_metrics(data, k=50, trace_mode='none')
+            assert result.metadata['comparisons'] < full_sort / 5
+            assert result.metadata['swaps'] > 0
+    
+    def test_heap_fallback_bounds_worst_case(self):
+        algorithm = QuickSelect()
+        algorithm.depth_factor = 0
+        rng = random.Random(1)
+        data = [rng.random() for _ in range(200)]
+        result = algorithm.run_with_metrics(data, k=40)
+        assert result.result['value'] == sorted(data)[39]
+        assert result.metadata['heap_fallback'] == True and result.metadata['partitions'] == 0
+        assert result.replayer().frame(-1) == sorted(data)
+    
+    def test_heap_top_k_reads_input_once(self):
+        data = [9, 3, 7, 1, 8, 2]
+        result = HeapTopK().run_with_metrics(data, k=2)
+        assert data == [9, 3, 7, 1, 8, 2]
+        assert [step['value'] for step in result.steps] == [7, 1, 2]
+        assert result.metadata['swaps'] == 3
+
+class TestSortedList:
+    """Tests para la lista ordenada por bloques"""
+    
+    def test_matches_sorted_list_under_random_operations(self):
+        rng = random.Random(4)
+        values = SortedList(load=8)
+        reference = []
+        for _ in range(2000):
+            roll = rng.random()
+            if roll < 0.4:
+                value = rng.randint(0, 300)
+                values.add(value)
+                bisect.insort(reference, value)
+            elif roll < 0.5:
+                batch = [rng.randint(0, 300) for _ in range(rng.choice((3, 40, 400)))]
+                values.update(batch)
+                reference = sorted(reference + batch)
+            elif roll < 0.8:
+                value = rng.randint(0, 300)
+                assert values.discard(value) == (value in reference)
+                if value in reference:
+                    reference.remove(value)
+            else:
+                value = rng.randint(-5, 305)
+                assert values.rank(value) == bisect.bisect_left(reference, value)
+                assert values.bisect_right(value) == bisect.bisect_right(reference, value)
+                assert values.irange(value, value + 30, limit=5) == \
+                    [x for x in reference if value <= x <= value + 30][:5]
+                if reference:
+                    index = rng.randrange(len(reference))
+                    assert values[index] == reference[index]
+            assert len(values) == len(reference)
+        assert list(values) == reference
+        assert all(len(chunk) <= 16 for chunk in values._chunks)
+    
+    def test_queries_and_errors(self):
+        values = SortedList(['pera', 'banana', 'uva', 'banana'], load=4)
+        assert values.count('banana') == 2 and values.index('pera') == 2
+        assert values[-1] == 'uva' and 'kiwi' not in values
+        assert values.irange('banana', 'uva', inclusive=(False, False)) == ['pera']
+        with pytest.raises(ValueError):
+            values.remove('kiwi')
+        with pytest.raises(IndexError):
+            values[4]
+        with pytest.raises(ValueError):
+            SortedList(load=2)
+    
+    def test_metrics_are_logarithmic(self):
+        values = SortedList(range(0, 200000, 2))
+        values.reset_metrics()
+        values.add(1001)
+        assert values.comparisons <= 2 * 18
+        assert values.moves <= 2 * values.load
+        values.reset_metrics()
+        assert values.rank(150001) == 75002
+        assert 0 < values.comparisons <= 2 * 18
+        
+        # Un lote ya ordenado se detecta en una pasada
+        values = SortedList(range(1000))
+        assert values.comparisons == 999 and values.moves == 1000
+
+class TestBatchSearch:
+    """Tests para la búsqueda de muchos targets en una ejecución"""
+    
+    def test_binary_search_batch_strategies(self):
+        data = list(range(0, 200, 2))
+        many_sorted = list(range(-1, 201))
+        few_unsorted = [50, 3, 198]
+        for fast in (False, True):
+            sweep = BinarySearch().run_batch_with_metrics(data, many_sorted, fast=fast)
+            assert sweep.metadata['strategy'] == 'merge_sweep'
+            assert sweep.metadata['found_count'] == 100
+            assert all(r['found'] == (r['target'] in data) for r in sweep.result)
+            
+            bisect = BinarySearch().run_batch_with_metrics(data, few_unsorted, fast=fast)
+            assert bisect.metadata['strategy'] == 'bisect'
+            assert [r['found'] for r in bisect.result] == [True, False, True]
+    
+    def test_batch_counts_comparisons_once(self):
+        result = BinarySearch().run_batch_with_metrics(list(range(1000)), [10, 500, 999])
+        assert result.metadata['targets_count'] == 3
+        assert result.metadata['comparisons'] <= 3 * 11
+        assert result.metadata['comparisons_per_target'] == pytest.approx(result.metadata['comparisons'] / 3)
+    
+    def test_batch_reports_sorted_check(self):
+        result = BinarySearch().run_batch_with_metrics(list(range(10)), [3, 4])
+        assert result.metadata['strategy'] == 'bisect'
+        assert result.metadata['sorted_check'] == 'scanned'
+        result = BinarySearch().run_batch_with_metrics(list(range(10)), [3, 4], assume_sorted=True)
+        assert result.metadata['sorted_check'] == 'trusted'
+    
+    def test_linear_search_batch_single_pass(self):
+        data = [5, 3, 8, 3, 1]
+        result = LinearSearch().run_batch_with_metrics(data, [3, 7, 1])
+        assert [r['index'] for r in result.result] == [1, -1, 4]
+        assert result.metadata['comparisons'] == len(data)
+        assert LinearSearch().run_batch_with_metrics(data, [3, 7, 1], fast=True).result == result.result
+    
+    def test_batch_requires_sorted_data(self):
+        with pytest.raises(ValueError):
+            BinarySearch().run_batch_with_metrics([3, 1, 2], [1])
+
 class TestMetrics:
     """Tests para métricas de algoritmos"""
     
@@ -111,3 +525,309 @@ class TestMetrics:
         assert 'execution_time_ms' in result.metadata
         assert 'memory_used_kb' in result.metadata
         assert 'comparisons' in result.metadata
+
+class TestTraceModes:
+    """Tests para los modos de registro de pasos"""
+    
+    def test_full_mode_stores_arrays(self):
+        algo = BubbleSort()
+        result = algo.run_with_metrics([3, 2, 1], trace_mode='full')
+        assert result.metadata['trace_mode'] == 'full'
+        assert all('array' in step for step in result.steps)
+    
+    def test_delta_mode_stores_only_changes(self):
+        algo = QuickSort()
+        result = algo.run_with_metrics([5, 1, 4, 2, 3], trace_mode='delta')
+        assert result.steps
+        for step in result.steps:
+            assert 'array' not in step
+            assert len(step['values']) == len(step['indices'])
+    
+    def test_none_mode_counts_without_storing(self):
+        algo = HeapSort()
+        result = algo.run_with_metrics([5, 1, 4, 2, 3], trace_mode='none')
+        assert result.result == [1, 2, 3, 4, 5]
+        assert result.metadata['steps_count'] == 0
+        assert result.metadata['steps_total'] > 0
+    
+    def test_sampled_mode(self):
+        algo = BubbleSort()
+        data = list(range(20, 0, -1))
+        full = algo.run_with_metrics(data, trace_mode='full')
+        sampled = algo.run_with_metrics(data, trace_mode='sampled', trace_every=5)
+        assert sampled.metadata['steps_count'] == (len(full.steps) + 4) // 5
+        assert sampled.steps[1]['array'] == full.steps[5]['array']
+    
+    def test_default_mode_skips_full_snapshots_for_large_inputs(self):
+        algo = HeapSort()
+        result = algo.run_with_metrics(list(range(2000, 0, -1)))
+        assert result.metadata['trace_mode'] == 'delta'
+    
+    def test_replayer_rebuilds_frames(self):
+        algo = HeapSort()
+        data = [9, 4, 7, 1, 8, 2, 6, 3, 5]
+        full = algo.run_with_metrics(data, trace_mode='full')
+        delta = algo.run_with_metrics(data, trace_mode='delta')
+        replayer = delta.replayer()
+        replayer.checkpoint_every = 4
+        assert len(replayer) == len(full.steps)
+        for i in reversed(range(len(replayer))):
+            assert replayer.frame(i) == full.steps[i]['array']
+        assert list(replayer.frames())[-1] == sorted(data)
+    
+    def test_invalid_trace_mode(self):
+        with pytest.raises(ValueError):
+            BubbleSort().run_with_metrics([2, 1], trace_mode='invalid')
+
+class TestCompactTrace:
+    """Pruebas de la traza por columnas y su formato binario"""
+    
+    def test_steps_are_compact(self):
+        result = QuickSort().run_with_metrics([5, 1, 4, 2, 3], trace_mode='delta')
+        assert isinstance(result.steps, CompactTrace)
+        assert result.steps[0]['action'] in ('swap', 'pivot')
+        assert set(result.steps[0]) >= {'action', 'indices', 'values'}
+    
+    @pytest.mark.parametrize('algorithm,mode,data', [
+        (HeapSort, 'full', [9, 4, 7, 1, 8, 2, 6, 3, 5]),
+        (QuickSort, 'delta', [2.5, -1.0, 3.25, 0.5]),
+        (MergeSort, 'full', [3, 1, 2]),
+        (RadixSort, 'delta', [170, 45, 75, 90, 2]),
+        (BubbleSort, 'delta', ['b', 'c', 'a'])
+    ])
+    def test_binary_round_trip(self, algorithm, mode, data):
+        steps = algorithm().run_with_metrics(data, trace_mode=mode).steps
+        for compress in (True, False):
+            assert decode_trace(encode_trace(steps, compress=compress)) == list(steps)
+    
+    def test_encode_dict_steps(self):
+        steps = [{'action': 'compare', 'index': 0, 'value': 3, 'target': 3},
+                 {'action': 'swap', 'indices': [0, 1], 'values': [1, 2]},
+                 {'action': 'odd', 'indices': ['a']}]
+        assert decode_trace(encode_trace(steps)) == steps
+    
+    def test_binary_smaller_than_json(self):
+        import json
+        steps = HeapSort().run_with_metrics(random.sample(range(1000), 300), trace_mode='full').steps
+        assert len(encode_trace(steps)) * 10 < len(json.dumps(list(steps)))
+    
+    def test_replayer_over_decoded_trace(self):
+        data = [9, 4, 7, 1, 8, 2, 6, 3, 5]
+        result = HeapSort().run_with_metrics(data, trace_mode='delta')
+        result.steps = decode_trace(encode_trace(result.steps))
+        assert list(result.replayer().frames())[-1] == sorted(data)
+    
+    def test_invalid_blob(self):
+        with pytest.raises(ValueError):
+            decode_trace(b'not a trace at all')
+
+class TestConcurrentRuns:
+    """Ejecuciones simultáneas sobre la misma instancia"""
+    
+    def test_shared_instance_is_not_mutated(self):
+        algo = HeapSort()
+        algo.run_with_metrics([3, 1, 2])
+        assert algo.comparisons == 0
+        assert len(algo.steps) == 0
+    
+    def test_concurrent_runs_keep_their_metrics(self):
+        from concurrent.futures import ThreadPoolExecutor
+        algo = BubbleSort()
+        inputs = [list(range(size, 0, -1)) for size in (50, 120, 200, 80) * 3]
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            results = list(pool.map(lambda data: algo.run_with_metrics(data, trace_mode='none'), inputs))
+        for data, result in zip(inputs, results):
+            n = len(data)
+            assert result.result == sorted(data)
+            assert result.metadata['comparisons'] == n * (n - 1) // 2
+            assert result.metadata['swaps'] == n * (n - 1) // 2
+            assert result.metadata['memory_peak_kb'] is None or result.metadata['memory_peak_kb'] >= 0
+    
+    def test_memory_measurement_status(self):
+        import tracemalloc
+        result = MergeSort().run_with_metrics(list(range(100, 0, -1)))
+        assert result.metadata['memory_measurement'] in ('exact', 'approximate')
+        assert result.metadata['memory_peak_kb'] > 0
+        assert not tracemalloc.is_tracing()
+    
+    def test_measurement_keeps_external_tracing(self):
+        import tracemalloc
+        tracemalloc.start()
+        try:
+            result = MergeSort().run_with_metrics([3, 1, 2])
+            assert tracemalloc.is_tracing()
+            assert result.metadata['memory_peak_kb'] is not None
+        finally:
+            tracemalloc.stop()
+    
+    def test_invocation_is_reused(self):
+        import threading
+        event = threading.Event()
+        run = HeapSort().invocation(event)
+        assert run.invocation() is run
+        assert run.cancel_event is event
+        run.run_with_metrics([2, 1])
+        assert run.comparisons > 0
+
+class TestTimingModes:
+    """Tests para la separación entre medición de tiempo e instrumentación"""
+    
+    def test_two_pass_reports_both_times(self):
+        algo = MergeSort()
+        result = algo.run_with_metrics([5, 3, 8, 1, 9, 2])
+        assert result.metadata['timing_mode'] == 'two_pass'
+        assert result.metadata['execution_time_ms'] >= 0
+        assert result.metadata['instrumented_time_ms'] is not None
+        assert result.metadata['memory_peak_kb'] is not None
+        assert result.metadata['comparisons'] > 0
+    
+    def test_timing_only_skips_instrumentation(self):
+        algo = BubbleSort()
+        result = algo.run_with_metrics([3, 2, 1], instrument=False)
+        assert result.result == [1, 2, 3]
+        assert result.metadata['timing_mode'] == 'timing_only'
+        assert result.metadata['memory_used_kb'] is None
+        assert result.metadata['steps_count'] == 0
+    
+    def test_single_pass(self):
+        algo = BubbleSort()
+        result = algo.run_with_metrics([3, 2, 1], two_pass=False)
+        assert result.metadata['timing_mode'] == 'single_pass'
+        assert result.metadata['execution_time_ms'] == result.metadata['instrumented_time_ms']
+
+class TestFastEngines:
+    """Tests para las variantes sin instrumentación"""
+    
+    @pytest.mark.parametrize('engine', [
+        engines.bubble_sort, engines.bottom_up_merge_sort,
+        engines.introsort, engines.heapq_heap_sort
+    ])
+    def test_engines_sort_correctly(self, engine):
+        rng = random.Random(7)
+        cases = [
+            [], [1], [rng.randint(0, 1000) for _ in range(500)],
+            list(range(300)), list(range(300, 0, -1)),
+            [rng.randint(0, 3) for _ in range(200)],
+            ['pera', 'manzana', 'uva', 'kiwi']
+        ]
+        for data in cases:
+            assert engine(data.copy()) == sorted(data)
+    
+    def test_integer_engines(self):
+        rng = random.Random(3)
+        small_range = [rng.randint(-50, 50) for _ in range(300)]
+        wide_range = [rng.randint(-10**12, 10**12) for _ in range(300)]
+        assert engines.counting_sort(small_range.copy()) == sorted(small_range)
+        assert engines.radix_sort(wide_range.copy()) == sorted(wide_range)
+        assert engines.integer_sort(small_range.copy()) == (sorted(small_range), 'counting_sort')
+        assert engines.integer_sort(wide_range.copy()) == (sorted(wide_range), 'radix_sort')
+    
+    def test_radix_sort_algorithm(self):
+        algo = RadixSort()
+        data = [170, -45, 75, 90, 802, 24, 2, 66]
+        result = algo.run_with_metrics(data)
+        assert result.result == sorted(data)
+        assert result.metadata['comparisons'] == 0
+        assert result.metadata['swaps'] > 0
+        with pytest.raises(ValueError):
+            algo.execute([1.5, 2])
+    
+    def test_introsort_handles_adversarial_inputs(self):
+        data = list(range(10000))
+        assert engines.introsort(data.copy()) == data
+        assert engines.introsort([5] * 10000) == [5] * 10000
+    
+    def test_fast_variant_metadata(self):
+        result = MergeSort().run_with_metrics([5, 3, 8, 1], fast=True)
+        assert result.result == [1, 3, 5, 8]
+        assert result.metadata['variant'] == 'fast'
+        assert result.metadata['engine'] == 'bottom_up_merge_sort'
+        assert result.metadata['comparisons'] is None
+        assert result.metadata['steps_count'] == 0
+    
+    def test_fast_binary_search(self):
+        algo = BinarySearch()
+        result = algo.run_with_metrics([1, 3, 3, 7], target=3, fast=True)
+        assert result.result == {'found': True, 'index': 1, 'value': 3}
+        with pytest.raises(ValueError):
+            algo.execute_fast([3, 1, 2], target=1)
+
+class TestNumpyBackend:
+    """Tests para el backend NumPy (se omiten si NumPy no está instalado)"""
+    
+    @pytest.fixture(autouse=True)
+    def np(self):
+        return pytest.importorskip('numpy')
+    
+    def test_numeric_dtype_requires_homogeneous_input(self):
+        assert numpy_backend.numeric_dtype([1, 2, 3]) == 'int64'
+        assert numpy_backend.numeric_dtype([1.5, 2.0]) == 'float64'
+        assert numpy_backend.numeric_dtype([1, 2.5]) is None
+        assert numpy_backend.numeric_dtype(['a', 'b']) is None
+        assert numpy_backend.numeric_dtype([1, 2 ** 70]) is None
+    
+    def test_unsigned_arrays_above_int64_are_rejected(self, np):
+        big = np.array([2 ** 63 + 5, 3, 2 ** 64 - 1], dtype=np.uint64)
+        assert numpy_backend.numeric_dtype(big) is None
+        with pytest.raises(ValueError):
+            RadixSort().run_with_metrics(big, fast=True)
+        small = np.array([2 ** 40, 3, 7], dtype=np.uint64)
+        assert numpy_backend.numeric_dtype(small) == 'int64'
+        assert numpy_backend.radix_sort(small).tolist() == [3, 7, 2 ** 40]
+        assert numpy_backend.numeric_dtype(np.array([9, 1], dtype=np.uint32)) == 'int64'
+    
+    def test_vectorized_sorts(self, np):
+        rng = np.random.default_rng(5)
+        for arr in (rng.integers(-10**9, 10**9, 5000), rng.integers(0, 20, 3001), rng.random(4097)):
+            expected = np.sort(arr)
+            assert (numpy_backend.merge_sort(arr.copy()) == expected).all()
+            if arr.dtype.kind == 'i':
+                assert (numpy_backend.integer_sort(arr.copy())[0] == expected).all()
+                assert (numpy_backend.radix_sort(arr.copy()) == expected).all()
+    
+    def test_searchsorted_batch(self, np):
+        indices, found = numpy_backend.searchsorted_batch(np.array([1, 3, 3, 7]), [0, 3, 7, 8])
+        assert indices.tolist() == [0, 1, 3, 4]
+        assert found.tolist() == [False, True, True, False]
+    
+    def test_fast_variant_picks_numpy_for_numeric_lists(self):
+        rng = random.Random(11)
+        data = [rng.randint(0, 10**6) for _ in range(2000)]
+        result = MergeSort().run_with_metrics(data, fast=True)
+        assert result.result == sorted(data)
+        assert isinstance(result.result, list) and type(result.result[0]) is int
+        assert result.metadata['backend'] == 'numpy'
+        assert result.metadata['engine'] == 'numpy_merge_sort'
+        
+        strings = [str(value) for value in data]
+        assert MergeSort().run_with_metrics(strings, fast=True).metadata['backend'] == 'python'
+    
+    def test_generate_numeric_types(self, np):
+        for data_type in ('random', 'sorted', 'reverse', 'nearly_sorted', 'many_duplicates',
+                          'sawtooth', 'organ_pipe', 'zipf'):
+            arr = numpy_backend.generate(data_type, 5000, min_val=-50, max_val=50, seed=3)
+            assert arr.dtype == np.int64 and arr.size == 5000
+            assert arr.min() >= -50 and arr.max() <= 50
+            assert (arr == numpy_backend.generate(data_type, 5000, min_val=-50, max_val=50, seed=3)).all()
+        assert (np.diff(numpy_backend.generate('sorted', 5000, seed=1)) >= 0).all()
+        assert (np.diff(numpy_backend.generate('reverse', 5000, seed=1)) <= 0).all()
+        assert np.unique(numpy_backend.generate('many_duplicates', 5000, distinct=7, seed=1)).size == 7
+    
+    def test_selection_with_partition(self, np):
+        arr = np.random.default_rng(4).integers(0, 1000, 5000)
+        expected = np.sort(arr)
+        assert numpy_backend.select_kth(arr, 2500) == expected[2499]
+        assert (numpy_backend.smallest_k(arr, 100) == expected[:100]).all()
+        result = PartialSort().run_with_metrics(arr.tolist(), k=10, fast=True)
+        assert result.result == expected[:10].tolist() and result.metadata['engine'] == 'numpy_partition_sort'
+    
+    def test_adaptive_sort_profiles_arrays(self, np):
+        rng = np.random.default_rng(9)
+        for arr, engine in ((np.arange(3000)[::-1].copy(), 'numpy_timsort'),
+                            (rng.integers(0, 100, 3000), 'numpy_counting_sort'),
+                            (rng.random(3000), 'numpy_introsort')):
+            profile = numpy_backend.profile_input(arr)
+            assert profile == {**engines.profile_input(arr.tolist()), 'dtype': profile['dtype']}
+            result = AdaptiveSort().run_with_metrics(arr.tolist(), fast=True)
+            assert result.result == sorted(arr.tolist())
+            assert result.metadata['engine'] == engine
@@ -1,3 +1,6 @@
+import json
+import struct
+import time
 import pytest
 from app import create_app
 
@@ -41,6 +44,125 @@ class TestAPIEndpoints:
         })
         assert response.status_code == 400
     
+    def test_run_algorithm_trace_mode(self, client):
+        response = client.post('/api/run', json={
+            'algorithm': 'quick_sort',
+            'data': [3, 1, 2],
+            'trace_mode': 'delta',
+            'include_steps': True
+        })
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['result']['metadata']['trace_mode'] == 'delta'
+        assert all('array' not in step for step in data['result']['steps'])
+    
+    def test_run_algorithm_without_steps_skips_trace(self, client):
+        response = client.post('/api/run', json={'algorithm': 'bubble_sort', 'data': [3, 1, 2]})
+        metadata = response.get_json()['result']['metadata']
+        assert metadata['trace_mode'] == 'none'
+        assert metadata['steps_count'] == 0
+    
+    def test_run_algorithm_binary_trace(self, client):
+        import base64
+        from app.algorithms.trace_codec import TRACE_ENCODING, decode_trace
+        response = client.post('/api/run', json={
+            'algorithm': 'heap_sort',
+            'data': [3, 1, 2, 5, 4],
+            'trace_mode': 'delta',
+            'include_steps': True,
+            'trace_format': 'binary'
+        })
+        assert response.status_code == 200
+        result = response.get_json()['result']
+        assert 'steps' not in result
+        assert result['trace_encoding'] == TRACE_ENCODING
+        steps = decode_trace(base64.b64decode(result['trace']))
+        assert len(steps) == result['metadata']['steps_count']
+    
+    def test_run_algorithm_omit_result(self, client):
+        response = client.post('/api/run', json={
+            'algorithm': 'merge_sort',
+            'data': [3, 1, 2],
+            'include_result': False
+        })
+        result = response.get_json()['result']
+        assert 'result' not in result
+        assert result['result_omitted'] is True
+        assert result['metadata']['input_size'] == 3
+        assert float(response.headers['X-Serialization-Time-Ms']) >= 0
+    
+    @pytest.mark.parametrize('encoding', ['gzip', 'deflate'])
+    def test_response_compression(self, client, encoding):
+        import gzip
+        import zlib
+        data = list(range(2000, 0, -1))
+        response = client.post('/api/run', json={'algorithm': 'merge_sort:fast', 'data': data},
+                               headers={'Accept-Encoding': f'{encoding}, br;q=0.5'})
+        assert response.headers['Content-Encoding'] == encoding
+        assert 'Accept-Encoding' in response.headers['Vary']
+        raw = gzip.decompress(response.data) if encoding == 'gzip' else zlib.decompress(response.data)
+        assert len(raw) == int(response.headers['X-Uncompressed-Length'])
+        assert json.loads(raw)['result']['result'] == sorted(data)
+    
+    def test_small_or_unrequested_responses_not_compressed(self, client):
+        response = client.get('/api/algorithms')
+        assert 'Content-Encoding' not in response.headers
+        response = client.post('/api/run', json={'algorithm': 'merge_sort', 'data': [2, 1]},
+                               headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in response.headers
+    
+    def test_json_fallback_for_big_integers(self, client):
+        data = [2 ** 70, 3, -2 ** 65]
+        response = client.post('/api/run', json={'algorithm': 'merge_sort', 'data': data})
+        assert response.status_code == 200
+        assert response.get_json()['result']['result'] == sorted(data)
+    
+    def test_compare_omit_result(self, client):
+        response = client.post('/api/compare', json={
+            'algorithms': ['merge_sort', 'quick_sort'],
+            'data': [3, 1, 2],
+            'include_result': False
+        })
+        results = response.get_json()['results']
+        assert all('result' not in r and r['metadata']['comparisons'] > 0 for r in results.values())
+    
+    def test_run_algorithm_invalid_trace_format(self, client):
+        response = client.post('/api/run', json={
+            'algorithm': 'heap_sort',
+            'data': [3, 1, 2],
+            'trace_format': 'xml'
+        })
+        assert response.status_code == 400
+    
+    def test_run_algorithm_invalid_trace_mode(self, client):
+        response = client.post('/api/run', json={
+            'algorithm': 'quick_sort',
+            'data': [3, 1, 2],
+            'trace_mode': 'everything'
+        })
+        assert response.status_code == 400
+    
+    def test_run_stream_sse(self, client):
+        response = client.post('/api/run/stream', json={
+            'algorithm': 'bubble_sort',
+            'data': [3, 2, 1]
+        })
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        body = response.get_data(as_text=True)
+        assert body.startswith('event: start')
+        assert 'event: result' in body
+    
+    def test_run_stream_ndjson(self, client):
+        response = client.post('/api/run/stream', json={
+            'algorithm': 'quick_sort',
+            'data': [3, 2, 1],
+            'format': 'ndjson',
+            'max_fps': 0
+        })
+        events = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert events[-1]['result'] == [1, 2, 3]
+    
     def test_generate_data(self, client):
         response = client.post('/api/generate', json={
             'type': 'random',
@@ -50,6 +172,32 @@ class TestAPIEndpoints:
         data = response.get_json()
         assert data['success'] == True
         assert len(data['data']) == 10
+        assert isinstance(data['seed'], int)
+    
+    def test_generate_is_reproducible_with_seed(self, client):
+        request = {'type': 'zipf', 'size': 500, 'seed': 11, 'max_val': 50, 'exponent': 1.5}
+        first = client.post('/api/generate', json=request).get_json()
+        second = client.post('/api/generate', json=request).get_json()
+        assert first['seed'] == 11 and first['data'] == second['data']
+        assert all(1 <= value <= 50 for value in first['data'])
+        
+        response = client.post('/api/generate', json={'type': 'random', 'size': 10, 'min_val': 9, 'max_val': 1})
+        assert response.status_code == 400
+    
+    def test_generate_ndjson_stream(self, client):
+        response = client.post('/api/generate', json={
+            'type': 'sorted', 'size': 2500, 'seed': 7, 'format': 'ndjson', 'chunk_size': 1000
+        })
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert lines[0] == {'type': 'sorted', 'size': 2500, 'seed': 7}
+        assert [line['offset'] for line in lines[1:-1]] == [0, 1000, 2000]
+        data = [value for line in lines[1:-1] for value in line['chunk']]
+        assert data == client.post('/api/generate', json={'type': 'sorted', 'size': 2500, 'seed': 7}).get_json()['data']
+        assert lines[-1] == {'done': True, 'count': 2500}
+        
+        response = client.post('/api/generate', json={'type': 'unknown', 'size': 10, 'format': 'ndjson'})
+        assert response.status_code == 400
     
     def test_compare_algorithms(self, client):
         response = client.post('/api/compare', json={
@@ -61,12 +209,289 @@ class TestAPIEndpoints:
         assert data['success'] == True
         assert 'results' in data
     
+    def test_compare_algorithms_stream(self, client):
+        response = client.post('/api/compare', json={
+            'algorithms': ['merge_sort', 'heap_sort'],
+            'data': [3, 1, 2],
+            'stream': True
+        })
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert {line['algorithm'] for line in lines} == {'merge_sort', 'heap_sort'}
+        assert all(line['result'] == [1, 2, 3] for line in lines)
+    
+    def test_benchmark(self, client):
+        response = client.post('/api/benchmark', json={
+            'algorithms': ['merge_sort', 'quick_sort'],
+            'data': [3, 1, 4, 1, 5, 9, 2, 6],
+            'warmup': 1,
+            'max_repeats': 10
+        })
+        assert response.status_code == 200
+        data = response.get_json()
+        assert 'stats_ms' in data['results']['merge_sort']
+        assert 'median_ci_ms' in data['results']['quick_sort']
+    
+    def test_benchmark_rejects_unbounded_config(self, client):
+        base = {'algorithms': ['merge_sort'], 'data': [3, 1, 2], 'max_repeats': 2}
+        for options in ({'max_time_s': 1e12}, {'max_repeats': 1e12}, {'target_rel_error': -1},
+                        {'disable_gc': 'yes'}):
+            response = client.post('/api/benchmark', json={**base, **options})
+            assert response.status_code == 400
+        response = client.post('/api/benchmark', json={**base, 'disable_gc': 'false'})
+        assert response.get_json()['results']['merge_sort']['gc_disabled'] is False
+    
+    def test_scaling(self, client):
+        response = client.post('/api/scaling', json={
+            'algorithms': ['heap_sort'],
+            'min_size': 10,
+            'max_size': 100,
+            'points': 3,
+            'max_repeats': 2
+        })
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['sizes'] == [10, 32, 100]
+        assert 'fit' in data['results']['heap_sort']
+        
+        response = client.post('/api/scaling/workers', json={
+            'algorithm': 'sample_sort', 'size': 500, 'workers': [2], 'max_repeats': 1, 'fast': True
+        })
+        assert response.status_code == 200
+        assert [p['workers'] for p in response.get_json()['points']] == [1, 2]
+        
+        response = client.post('/api/run', json={'algorithm': 'parallel_merge_sort', 'data': [3, 1, 2], 'workers': 0})
+        assert response.status_code == 400
+    
+    def test_jobs(self, client):
+        response = client.post('/api/jobs', json={
+            'type': 'run',
+            'algorithm': 'heap_sort',
+            'data': [3, 1, 2]
+        })
+        assert response.status_code == 202
+        job_id = response.get_json()['job']['job_id']
+        
+        for _ in range(500):
+            job = client.get(f'/api/jobs/{job_id}').get_json()['job']
+            if job['status'] == 'completed':
+                break
+            time.sleep(0.01)
+        assert job['result']['result'] == [1, 2, 3]
+        
+        assert client.delete(f'/api/jobs/{job_id}').status_code == 200
+        assert client.get('/api/jobs/unknown').status_code == 404
+    
+    def test_generate_job(self, client):
+        # Más grande que la generación síncrona: hay que pasar por un job
+        response = client.post('/api/generate', json={'type': 'random', 'size': 10 ** 7 + 1, 'format': 'binary'})
+        assert response.status_code == 400
+        assert 'generate' in response.get_json()['error']
+        
+        response = client.post('/api/jobs', json={'type': 'generate', 'data_type': 'sorted', 'size': 1000, 'seed': 4})
+        assert response.status_code == 202
+        job_id = response.get_json()['job']['job_id']
+        for _ in range(500):
+            job = client.get(f'/api/jobs/{job_id}').get_json()['job']
+            if job['status'] == 'completed':
+                break
+            time.sleep(0.01)
+        dataset_id = job['result']['dataset_id']
+        generated = client.get(f'/api/datasets/{dataset_id}?include_data=1').get_json()['dataset']['data']
+        assert len(generated) == 1000 and generated == sorted(generated)
+        
+        response = client.post('/api/jobs', json={'type': 'generate', 'data_type': 'strings', 'size': 10})
+        assert response.status_code == 400
+    
+    def test_cache_stats(self, client):
+        client.post('/api/run', json={'algorithm': 'merge_sort', 'data': [9, 8, 7]})
+        client.post('/api/run', json={'algorithm': 'merge_sort', 'data': [9, 8, 7]})
+        stats = client.get('/api/cache').get_json()['cache']
+        assert stats['hits'] >= 1
+        
+        response = client.delete('/api/cache')
+        assert response.get_json()['cache']['entries'] == 0
+    
+    def test_compare_include_fast(self, client):
+        response = client.post('/api/compare', json={
+            'algorithms': ['quick_sort'],
+            'data': [4, 2, 9, 1],
+            'include_fast': True
+        })
+        results = response.get_json()['results']
+        assert list(results) == ['quick_sort', 'quick_sort:fast']
+        assert results['quick_sort:fast']['result'] == [1, 2, 4, 9]
+        assert results['quick_sort:fast']['metadata']['variant'] == 'fast'
+        assert results['quick_sort']['metadata']['variant'] == 'instrumented'
+    
+    def test_run_auto_sort(self, client):
+        response = client.post('/api/run', json={
+            'algorithm': 'auto',
+            'data': list(range(200, 0, -1)),
+            'fast': True
+        })
+        result = response.get_json()['result']
+        metadata = result['metadata']
+        assert result['result'] == list(range(1, 201))
+        assert metadata['strategy'] == 'reverse_run_merge'
+        assert metadata['engine'] == 'natural_merge_sort'
+        assert metadata['profile']['descending_runs'] == 1
+    
+    def test_selection_with_k(self, client):
+        data = [15, 3, 9, 1, 12, 7, 4]
+        response = client.post('/api/run', json={'algorithm': 'quickselect', 'data': data, 'k': 2})
+        assert response.get_json()['result']['result'] == {'k': 2, 'value': 3}
+        response = client.post('/api/run', json={'algorithm': 'partial_sort', 'data': data, 'k': 9})
+        assert response.status_code == 400
+        
+        # Los ordenamientos completos se recortan a k para comparar con la selección
+        response = client.post('/api/compare', json={
+            'algorithms': ['merge_sort', 'heap_top_k', 'partial_sort'], 'data': data, 'k': 3, 'include_fast': True
+        })
+        results = response.get_json()['results']
+        assert {name: result['result'] for name, result in results.items()} == {
+            name: [1, 3, 4] for name in ('merge_sort', 'merge_sort:fast', 'heap_top_k', 'heap_top_k:fast',
+                                         'partial_sort', 'partial_sort:fast')
+        }
+        assert results['merge_sort']['metadata']['sliced_to_k'] == 3
+        assert 'sliced_to_k' not in results['heap_top_k']['metadata']
+        
+        response = client.get('/api/algorithms')
+        assert response.get_json()['algorithms']['quickselect']['selection'] == True
+    
+    def test_batch_search(self, client):
+        response = client.post('/api/search/batch', json={
+            'algorithm': 'binary_search',
+            'data': [1, 3, 5, 7, 9],
+            'targets': [3, 4, 9]
+        })
+        assert response.status_code == 200
+        result = response.get_json()['result']
+        assert [r['found'] for r in result['result']] == [True, False, True]
+        assert result['metadata']['found_count'] == 2
+        
+        response = client.post('/api/search/batch', json={
+            'algorithm': 'merge_sort',
+            'data': [1, 2],
+            'targets': [1]
+        })
+        assert response.status_code == 400
+    
+    def test_generate_and_run_by_dataset_id(self, client):
+        response = client.post('/api/generate', json={'type': 'sorted', 'size': 50, 'include_data': False})
+        body = response.get_json()
+        assert 'data' not in body
+        dataset_id = body['dataset_id']
+        
+        info = client.get(f'/api/datasets/{dataset_id}').get_json()['dataset']
+        assert info['size'] == 50 and info['is_sorted'] == True
+        
+        response = client.post('/api/run', json={'algorithm': 'merge_sort', 'dataset_id': dataset_id})
+        assert response.status_code == 200
+        assert len(response.get_json()['result']['result']) == 50
+        
+        response = client.post('/api/compare', json={'algorithms': ['heap_sort'], 'dataset_id': dataset_id})
+        assert 'result' in response.get_json()['results']['heap_sort']
+        
+        assert client.delete(f'/api/datasets/{dataset_id}').status_code == 200
+        assert client.get(f'/api/datasets/{dataset_id}').status_code == 404
+        response = client.post('/api/run', json={'algorithm': 'merge_sort', 'dataset_id': dataset_id})
+        assert response.status_code == 400
+    
+    def test_sorted_collections(self, client):
+        response = client.post('/api/collections', json={'data': [30, 10, 20], 'load': 4})
+        assert response.status_code == 201
+        collection_id = response.get_json()['collection']['collection_id']
+        
+        response = client.post(f'/api/collections/{collection_id}/insert', json={'values': [25, 5]})
+        body = response.get_json()
+        assert body['inserted'] == 2 and body['collection']['size'] == 5
+        assert set(body['metadata']) >= {'comparisons', 'moves', 'execution_time_ms'}
+        
+        response = client.post(f'/api/collections/{collection_id}/query', json={'operation': 'rank', 'value': 21})
+        assert response.get_json()['result'] == 3
+        response = client.post(f'/api/collections/{collection_id}/query', json={
+            'operation': 'range', 'min': 10, 'max': 30, 'inclusive': [False, True]
+        })
+        assert response.get_json()['result']['values'] == [20, 25, 30]
+        response = client.post(f'/api/collections/{collection_id}/delete', json={'values': [20]})
+        assert response.get_json()['removed'] == 1
+        
+        response = client.post(f'/api/collections/{collection_id}/snapshot')
+        assert response.status_code == 201
+        dataset_id = response.get_json()['dataset']['dataset_id']
+        response = client.post('/api/run', json={'algorithm': 'binary_search', 'dataset_id': dataset_id, 'target': 25})
+        assert response.get_json()['result']['result']['index'] == 2
+        
+        response = client.get(f'/api/collections/{collection_id}?include_data=1')
+        assert response.get_json()['collection']['data'] == [5, 10, 25, 30]
+        response = client.post(f'/api/collections/{collection_id}/query', json={'operation': 'nope'})
+        assert response.status_code == 400
+        assert client.delete(f'/api/collections/{collection_id}').status_code == 200
+        response = client.post(f'/api/collections/{collection_id}/insert', json={'values': [1]})
+        assert response.status_code == 404
+    
+    def test_binary_datasets(self, client):
+        response = client.post('/api/generate', json={'type': 'sorted', 'size': 200000, 'format': 'binary', 'seed': 3})
+        assert response.status_code == 200
+        body = response.get_json()
+        assert 'data' not in body and body['dataset']['location'] == 'mapped'
+        
+        response = client.post('/api/search/batch', json={
+            'algorithm': 'binary_search', 'dataset_id': body['dataset_id'], 'targets': [-1]
+        })
+        assert response.get_json()['result']['result'][0]['found'] == False
+        # Más grande que el límite de las listas: ordenar requiere la variante rápida
+        response = client.post('/api/run', json={'algorithm': 'merge_sort', 'dataset_id': body['dataset_id']})
+        assert response.status_code == 400
+        
+        raw = struct.pack('<4sBcxxQI12x', b'ALGD', 1, b'q', 3, 0) + struct.pack('<3q', 9, 2, 5)
+        response = client.post('/api/datasets', data=raw, content_type='application/octet-stream')
+        assert response.status_code == 201
+        dataset_id = response.get_json()['dataset']['dataset_id']
+        response = client.post('/api/run', json={'algorithm': 'heap_sort', 'dataset_id': dataset_id})
+        assert response.get_json()['result']['result'] == [2, 5, 9]
+        assert client.post('/api/datasets', data=b'xx', content_type='application/octet-stream').status_code == 400
+        
+        response = client.post(f'/api/datasets/{dataset_id}/sort', json={'memory_budget_mb': 1, 'fan_in': 4})
+        assert response.status_code == 201
+        body = response.get_json()
+        assert body['metrics']['runs'] == 1 and body['dataset']['is_sorted']
+        assert client.get(f"/api/datasets/{body['dataset_id']}?include_data=1").get_json()['dataset']['data'] == [2, 5, 9]
+        assert client.post('/api/datasets/desconocido/sort', json={}).status_code == 404
+    
+    def test_upload_dataset(self, client):
+        response = client.post('/api/datasets', json={'data': [5, 1, 4]})
+        assert response.status_code == 201
+        dataset_id = response.get_json()['dataset']['dataset_id']
+        
+        response = client.post('/api/search/batch', json={
+            'algorithm': 'linear_search', 'dataset_id': dataset_id, 'targets': [4, 9]
+        })
+        assert [r['found'] for r in response.get_json()['result']['result']] == [True, False]
+        
+        assert client.post('/api/datasets', json={'data': [{'a': 1}]}).status_code == 400
+    
     def test_get_history(self, client):
         response = client.get('/api/history')
         assert response.status_code == 200
         data = response.get_json()
         assert data['success'] == True
         assert 'history' in data
+    
+    def test_history_filters_and_stats(self, client):
+        client.post('/api/run', json={'algorithm': 'bubble_sort', 'data': [4, 2, 3, 1]})
+        response = client.get('/api/history?algorithm=bubble_sort&min_size=4&limit=1')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['total'] >= 1
+        assert len(data['history']) == 1
+        assert data['history'][0]['algorithm'] == 'bubble_sort'
+        
+        stats = client.get('/api/history/stats?algorithm=bubble_sort').get_json()['stats']
+        assert stats['bubble_sort']['runs'] >= 1
+        
+        assert client.get('/api/history?limit=0').status_code == 400
 
 class TestWebPages:
     """Tests para páginas web"""
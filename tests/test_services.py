@@ -1,5 +1,19 @@
 import pytest
-from app.services import AlgorithmManager, DataGenerator
+from app.services import AlgorithmManager, DataGenerator, BenchmarkRunner
+from app.services.data_generator import DATA_TYPES
+from app.services.benchmark import percentile, bootstrap_ci
+from app.services.scaling import geometric_sizes, fit_complexity
+from app.services.job_manager import JobManager, JobQueueFull
+from app.services.step_stream import stream_steps
+from app.algorithms.sorting import HeapSort, BubbleSort
+from app.algorithms.trace import TraceReplayer
+from app.services.result_cache import ResultCache
+from app.services.dataset_store import DatasetStore, DatasetNotFound
+from app.services.history_store import HistoryStore
+from app.services.collection_store import CollectionStore, CollectionNotFound
+from app.algorithms.binary_format import MappedDataset
+import os
+import time
 
 class TestAlgorithmManager:
     """Tests para AlgorithmManager"""
@@ -21,6 +35,19 @@ class TestAlgorithmManager:
         assert result.result == [11, 12, 22, 25, 34, 64, 90]
         assert 'execution_time_ms' in result.metadata
     
+    def test_steps_recorded_only_when_requested(self):
+        manager = AlgorithmManager()
+        data = list(range(50, 0, -1))
+        result = manager.execute_algorithm('bubble_sort', data)
+        assert result.metadata['trace_mode'] == 'none'
+        assert len(result.steps) == 0
+        assert result.metadata['steps_total'] > 0
+        
+        result = manager.execute_algorithm('bubble_sort', data, include_steps=True)
+        assert result.metadata['cached'] is False
+        assert result.metadata['trace_mode'] == 'full'
+        assert len(result.steps) == result.metadata['steps_total']
+    
     def test_execute_nonexistent_algorithm(self):
         manager = AlgorithmManager()
         with pytest.raises(ValueError):
@@ -45,6 +72,457 @@ class TestAlgorithmManager:
         assert 'merge_sort' in results
         assert results['bubble_sort'].result == results['merge_sort'].result
 
+class TestParallelCompare:
+    """Tests para la comparación en el pool de procesos"""
+    
+    def test_parallel_compare(self):
+        manager = AlgorithmManager()
+        data = [64, 34, 25, 12, 22, 11, 90]
+        results = manager.compare_algorithms(['bubble_sort', 'merge_sort', 'heap_sort'], data, parallel=True)
+        
+        assert list(results) == ['bubble_sort', 'merge_sort', 'heap_sort']
+        for result in results.values():
+            assert result.result == sorted(data)
+            assert result.metadata['comparisons'] > 0
+    
+    def test_parallel_compare_strings_and_floats(self):
+        manager = AlgorithmManager()
+        for data in (['pera', 'uva', 'kiwi'], [2.5, 1.5, 3.0]):
+            results = manager.compare_algorithms(['quick_sort'], data, parallel=True)
+            assert results['quick_sort'].result == sorted(data)
+    
+    def test_parallel_compare_timeout(self):
+        manager = AlgorithmManager()
+        data = list(range(3000, 0, -1))
+        results = manager.compare_algorithms(['bubble_sort', 'heap_sort'], data, parallel=True,
+                                             timeout=0.05, two_pass=False)
+        assert 'error' in results['bubble_sort']
+        
+        # El pool sigue funcionando después de cancelar una tarea
+        results = manager.compare_algorithms(['merge_sort'], [3, 1, 2], parallel=True)
+        assert results['merge_sort'].result == [1, 2, 3]
+    
+    def test_iter_compare_unknown_algorithm(self):
+        manager = AlgorithmManager()
+        results = dict(manager.iter_compare(['nonexistent', 'merge_sort'], [2, 1]))
+        assert 'error' in results['nonexistent']
+        assert results['merge_sort'].result == [1, 2]
+
+def wait_for_job(job, timeout=10):
+    deadline = time.time() + timeout
+    while job.status in ('queued', 'running') and time.time() < deadline:
+        time.sleep(0.01)
+    return job
+
+class TestJobManager:
+    """Tests para los jobs en segundo plano"""
+    
+    def test_run_job(self):
+        jobs = JobManager(AlgorithmManager())
+        job = jobs.submit('run', ['merge_sort'], [3, 1, 2])
+        wait_for_job(job)
+        assert job.status == 'completed'
+        assert job.progress == 1.0
+        assert job.to_dict()['result']['result'] == [1, 2, 3]
+    
+    def test_compare_job(self):
+        jobs = JobManager(AlgorithmManager())
+        job = jobs.submit('compare', ['bubble_sort', 'heap_sort'], [3, 1, 2])
+        wait_for_job(job)
+        assert set(job.result) == {'bubble_sort', 'heap_sort'}
+    
+    def test_cancel_running_job(self):
+        jobs = JobManager(AlgorithmManager(), max_workers=1)
+        job = jobs.submit('run', ['bubble_sort'], list(range(5000, 0, -1)), trace_mode='none')
+        while job.status == 'queued':
+            time.sleep(0.001)
+        time.sleep(0.05)
+        assert 0 < job.progress < 1
+        jobs.cancel(job.id)
+        wait_for_job(job)
+        assert job.status == 'cancelled'
+    
+    def test_cancel_queued_job_never_fails(self):
+        jobs = JobManager(AlgorithmManager(), max_workers=2, max_queue=256)
+        submitted = []
+        for i in range(200):
+            job = jobs.submit('run', ['merge_sort'], [i, 2, 1])
+            jobs.cancel(job.id)
+            submitted.append(job)
+        for job in submitted:
+            wait_for_job(job)
+            assert job.status in ('cancelled', 'completed')
+            assert job.error is None
+        # Un job terminado ya no cambia de estado
+        jobs._finish(submitted[0], 'failed', error='tarde')
+        assert submitted[0].error is None
+    
+    def test_fast_variant_stops_between_phases(self):
+        import threading
+        from app.algorithms.base import ExecutionCancelled
+        event = threading.Event()
+        run = AlgorithmManager().get_algorithm('merge_sort').invocation(event)
+        event.set()
+        with pytest.raises(ExecutionCancelled):
+            run.run_with_metrics([3, 1, 2], fast=True)
+    
+    def test_queue_full(self):
+        jobs = JobManager(AlgorithmManager(), max_workers=1, max_queue=1)
+        big = list(range(3000, 0, -1))
+        first = jobs.submit('run', ['bubble_sort'], big, trace_mode='none')
+        while first.status == 'queued':
+            time.sleep(0.001)
+        second = jobs.submit('run', ['bubble_sort'], big, trace_mode='none')
+        with pytest.raises(JobQueueFull):
+            jobs.submit('run', ['bubble_sort'], big)
+        jobs.cancel(second.id)
+        jobs.cancel(first.id)
+        assert second.status == 'cancelled'
+        wait_for_job(first)
+    
+    def test_invalid_job(self):
+        jobs = JobManager(AlgorithmManager())
+        with pytest.raises(ValueError):
+            jobs.submit('run', ['nonexistent'], [1])
+        with pytest.raises(ValueError):
+            jobs.submit('run', ['merge_sort'], [])
+    
+    def test_cancelled_generate_job_removes_file(self):
+        manager = AlgorithmManager()
+        jobs = JobManager(manager, max_workers=1)
+        job = jobs.submit_generate('random', 5 * 10 ** 6, seed=1)
+        while job.status == 'queued':
+            time.sleep(0.001)
+        jobs.cancel(job.id)
+        wait_for_job(job, timeout=60)
+        assert job.status in ('cancelled', 'completed')
+        if job.status == 'cancelled':
+            assert not any(name.endswith('.tmp') for name in os.listdir(manager.datasets.spill_dir))
+        with pytest.raises(ValueError):
+            jobs.submit_generate('random', 0)
+
+class TestStepStream:
+    """Tests para el envío de pasos en streaming"""
+    
+    def replay(self, data, events):
+        steps = [event for event in events if event['type'] == 'step']
+        return list(TraceReplayer(data, steps).frames())[-1], steps
+    
+    def test_stream_delta_steps(self):
+        data = [9, 4, 7, 1, 8, 2, 6, 3, 5]
+        events = list(stream_steps(HeapSort(), data, max_buffer=2))
+        assert events[0]['type'] == 'start'
+        assert events[-1]['type'] == 'result'
+        final, steps = self.replay(data, events)
+        assert final == sorted(data)
+        assert len(steps) == events[-1]['metadata']['steps_total']
+    
+    def test_stream_throttled_frames_still_replay(self):
+        data = list(range(120, 0, -1))
+        events = list(stream_steps(BubbleSort(), data, max_fps=50))
+        final, steps = self.replay(data, events)
+        assert final == sorted(data)
+        assert len(steps) < events[-1]['metadata']['steps_total']
+    
+    def test_stream_close_cancels_algorithm(self):
+        events = stream_steps(BubbleSort(), list(range(3000, 0, -1)), max_buffer=1)
+        assert next(events)['type'] == 'start'
+        assert next(events)['type'] == 'step'
+        events.close()
+    
+    def test_stream_algorithm_error(self):
+        manager = AlgorithmManager()
+        events = list(manager.stream_algorithm('binary_search', [3, 1, 2], target=1))
+        assert events[-1]['type'] == 'error'
+
+class TestResultCache:
+    """Tests para la caché de resultados"""
+    
+    def test_execute_algorithm_uses_cache(self):
+        manager = AlgorithmManager()
+        data = [5, 3, 1, 4, 2]
+        first = manager.execute_algorithm('merge_sort', data)
+        second = manager.execute_algorithm('merge_sort', data)
+        
+        assert first.metadata['cached'] is False
+        assert second.metadata['cached'] is True
+        assert second.result == first.result
+        assert manager.result_cache.stats()['hits'] == 1
+    
+    def test_cache_key_depends_on_arguments(self):
+        manager = AlgorithmManager()
+        data = [1, 2, 3]
+        manager.execute_algorithm('linear_search', data, target=2)
+        result = manager.execute_algorithm('linear_search', data, target=3)
+        assert result.metadata['cached'] is False
+        manager.execute_algorithm('merge_sort', data, trace_mode='delta')
+        result = manager.execute_algorithm('merge_sort', data, trace_mode='none')
+        assert result.metadata['cached'] is False
+    
+    def test_cache_bypass(self):
+        manager = AlgorithmManager()
+        manager.execute_algorithm('heap_sort', [2, 1])
+        result = manager.execute_algorithm('heap_sort', [2, 1], use_cache=False)
+        assert result.metadata['cached'] is False
+    
+    def test_cached_result_is_a_copy(self):
+        manager = AlgorithmManager()
+        manager.execute_algorithm('heap_sort', [2, 1]).result.append(99)
+        assert manager.execute_algorithm('heap_sort', [2, 1]).result == [1, 2]
+    
+    def test_lru_eviction_by_bytes(self):
+        cache = ResultCache(max_bytes=400)
+        manager = AlgorithmManager(result_cache=cache)
+        for i in range(10):
+            manager.execute_algorithm('merge_sort', [i, 2, 1], trace_mode='none')
+        stats = cache.stats()
+        assert stats['bytes'] <= 400
+        assert stats['evictions'] > 0
+    
+    def test_oversized_entry_is_not_stored(self, tmp_path):
+        cache = ResultCache(max_bytes=200, persist_dir=str(tmp_path))
+        AlgorithmManager(result_cache=cache).execute_algorithm('merge_sort', list(range(100, 0, -1)))
+        stats = cache.stats()
+        assert stats['entries'] == 0
+        assert stats['oversized'] == 1
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_unrequested_steps_are_not_cached(self):
+        manager = AlgorithmManager()
+        data = [4, 1, 3, 2]
+        manager.execute_algorithm('heap_sort', data, trace_mode='full')
+        result = manager.execute_algorithm('heap_sort', data, trace_mode='full')
+        assert result.metadata['cached'] is True
+        assert len(result.steps) == 0
+        
+        result = manager.execute_algorithm('heap_sort', data, trace_mode='full', include_steps=True)
+        assert result.metadata['cached'] is False
+        result = manager.execute_algorithm('heap_sort', data, trace_mode='full', include_steps=True)
+        assert result.metadata['cached'] is True
+        assert len(result.steps) == result.metadata['steps_count'] > 0
+    
+    def test_disk_persistence(self, tmp_path):
+        data = [3, 1, 2]
+        AlgorithmManager(result_cache=ResultCache(persist_dir=str(tmp_path))).execute_algorithm('quick_sort', data)
+        cache = ResultCache(persist_dir=str(tmp_path))
+        result = AlgorithmManager(result_cache=cache).execute_algorithm('quick_sort', data)
+        assert result.metadata['cached'] is True
+        assert cache.stats()['disk_hits'] == 1
+
+class TestHistoryStore:
+    """Tests para el historial acotado de ejecuciones"""
+    
+    def test_records_have_no_payload(self):
+        manager = AlgorithmManager(history_store=HistoryStore())
+        manager.execute_algorithm('heap_sort', [3, 1, 2], use_cache=False)
+        record = manager.get_history()['records'][0]
+        assert record['algorithm'] == 'heap_sort'
+        assert record['input_size'] == 3
+        assert record['comparisons'] > 0
+        assert 'result' not in record and 'steps' not in record
+    
+    def test_ring_buffer_is_bounded(self):
+        history = HistoryStore(max_records=5)
+        for i in range(12):
+            history.record('heap_sort', i, {'execution_time_ms': float(i)})
+        assert len(history) == 5
+        page = history.query(limit=10)
+        assert [r['input_size'] for r in page['records']] == [11, 10, 9, 8, 7]
+        # Las estadísticas cubren también los registros descartados
+        assert history.stats()['heap_sort']['runs'] == 12
+        assert history.stats()['heap_sort']['min_time_ms'] == 0.0
+    
+    @pytest.mark.parametrize('use_db', [False, True])
+    def test_filters_and_pagination(self, tmp_path, use_db):
+        history = HistoryStore(db_path=str(tmp_path / 'history.db') if use_db else None)
+        for size in range(10):
+            history.record('merge_sort' if size % 2 else 'quick_sort', size, {'execution_time_ms': 1.0 + size})
+        page = history.query(algorithm='merge_sort', min_size=3, limit=2, offset=1)
+        assert page['total'] == 4
+        assert [r['input_size'] for r in page['records']] == [7, 5]
+        assert history.query(max_size=2)['total'] == 3
+        assert history.query(since=time.time() + 60)['total'] == 0
+        stats = history.stats('quick_sort')
+        assert list(stats) == ['quick_sort']
+        assert stats['quick_sort']['runs'] == 5
+        assert stats['quick_sort']['mean_time_ms'] == 5.0
+        assert stats['quick_sort']['max_time_ms'] == 9.0
+        with pytest.raises(ValueError):
+            history.query(limit=0)
+    
+    def test_sqlite_persistence(self, tmp_path):
+        path = str(tmp_path / 'history.db')
+        history = HistoryStore(max_records=2, db_path=path)
+        for size in range(4):
+            history.record('heap_sort', size, {'execution_time_ms': 2.0, 'cached': True})
+        history.close()
+        reopened = HistoryStore(db_path=path)
+        assert len(reopened) == 4
+        assert reopened.query()['records'][0]['cached'] is True
+        assert reopened.stats()['heap_sort']['runs'] == 4
+
+class TestDatasetStore:
+    """Tests para el registro de datasets"""
+    
+    def test_put_and_get(self):
+        store = DatasetStore()
+        info = store.put([3, 1, 2])
+        assert info['size'] == 3 and info['is_sorted'] == False
+        assert store.get(info['dataset_id']) == [3, 1, 2]
+        # Mismo contenido, mismo id
+        assert store.put([3, 1, 2])['dataset_id'] == info['dataset_id']
+        assert store.stats()['datasets'] == 1
+        
+        with pytest.raises(DatasetNotFound):
+            store.get('desconocido')
+    
+    def test_spills_to_disk_and_reloads(self, tmp_path):
+        store = DatasetStore(max_memory_bytes=2000, spill_dir=str(tmp_path))
+        first = store.put(list(range(50)))
+        second = store.put(list(range(50, 100)))
+        assert store.info(first['dataset_id'])['location'] == 'disk'
+        assert store.stats()['spills'] == 1
+        
+        dataset = store.get(first['dataset_id'])
+        assert dataset == list(range(50))
+        assert dataset.sortedness_known and dataset.is_sorted
+        assert store.info(second['dataset_id'])['location'] == 'disk'
+    
+    def test_disk_limit_evicts_oldest(self, tmp_path):
+        store = DatasetStore(max_memory_bytes=2000, max_disk_bytes=1, spill_dir=str(tmp_path))
+        first = store.put(list(range(50)))
+        store.put(list(range(50, 100)))
+        assert store.stats()['evictions'] == 1
+        with pytest.raises(DatasetNotFound):
+            store.get(first['dataset_id'])
+    
+    def test_ttl_expiration(self):
+        store = DatasetStore(ttl_s=0.05)
+        info = store.put([1, 2, 3])
+        time.sleep(0.1)
+        with pytest.raises(DatasetNotFound):
+            store.get(info['dataset_id'])
+        assert store.stats()['expirations'] == 1
+    
+    def test_manager_runs_stored_dataset(self):
+        manager = AlgorithmManager()
+        info = manager.store_dataset(list(range(0, 100, 2)))
+        dataset = manager.datasets.get(info['dataset_id'])
+        
+        result = manager.execute_algorithm('binary_search', dataset, target=40)
+        assert result.result['index'] == 20
+        assert result.metadata['sorted_check'] == 'cached'
+        assert manager.execute_algorithm('binary_search', dataset, target=40).metadata['cached'] == True
+    
+    def test_binary_file_is_mapped(self, tmp_path):
+        store = DatasetStore(spill_dir=str(tmp_path))
+        path = store.new_binary_path()
+        DataGenerator.write_binary(path, 'sorted', 5000, 1, 10 ** 6, seed=1, chunk_size=1000)
+        info = store.put_file(path)
+        assert info['location'] == 'mapped' and info['size'] == 5000 and info['is_sorted']
+        
+        manager = AlgorithmManager(dataset_store=store)
+        dataset = store.get(info['dataset_id'])
+        target = dataset[1234]
+        result = manager.execute_algorithm('binary_search', dataset, target=target)
+        assert result.result['found'] and dataset[result.result['index']] == target
+        assert result.metadata['sorted_check'] == 'cached'
+        assert manager.execute_algorithm('merge_sort', dataset, fast=True).result == list(dataset)
+        
+        
+        unsorted = manager.store_dataset([5, 3, 9, 1] * 1000)
+        result = manager.sort_dataset(unsorted['dataset_id'], memory_budget=40 * 1024, fan_in=2)
+        assert result['metrics']['runs'] == 4 and result['metrics']['merge_passes'] == 2
+        assert result['dataset']['is_sorted'] and result['dataset']['location'] == 'mapped'
+        assert list(store.get(result['dataset']['dataset_id'])) == sorted([5, 3, 9, 1] * 1000)
+        assert store.delete(info['dataset_id'])
+        assert store.stats()['mapped'] == 1
+
+class TestCollectionStore:
+    """Tests para las colecciones ordenadas"""
+    
+    def test_insert_query_and_delete(self):
+        store = CollectionStore()
+        created = store.create([5, 1, 3], load=4)
+        collection_id = created['collection']['collection_id']
+        assert created['metadata']['operation'] == 'create' and created['collection']['size'] == 3
+        
+        inserted = store.insert(collection_id, [4, 2, 6])
+        assert inserted['collection']['size'] == 6
+        assert inserted['metadata']['comparisons'] > 0 and inserted['metadata']['moves'] > 0
+        assert store.values(collection_id) == [1, 2, 3, 4, 5, 6]
+        
+        assert store.query(collection_id, 'rank', value=4)['result'] == 3
+        assert store.query(collection_id, 'contains', values=[2, 9])['result'] == [True, False]
+        assert store.query(collection_id, 'select', index=-1)['result'] == 6
+        ranged = store.query(collection_id, 'range', minimum=2, maximum=5, limit=2)['result']
+        assert ranged == {'start': 1, 'count': 4, 'values': [2, 3]}
+        
+        assert store.remove(collection_id, [3, 3, 10])['removed'] == 1
+        info = store.info(collection_id)
+        assert info['size'] == 5 and info['operations'] == 7
+        
+        with pytest.raises(ValueError):
+            store.insert(collection_id, ['a'])
+        with pytest.raises(ValueError):
+            store.query(collection_id, 'median')
+        with pytest.raises(ValueError):
+            store.query(collection_id, 'select', index=5)
+        assert store.delete(collection_id)
+        with pytest.raises(CollectionNotFound):
+            store.info(collection_id)
+    
+    def test_limits_and_expiration(self):
+        store = CollectionStore(max_collections=1, max_size=5, ttl_s=0.05)
+        collection_id = store.create([1, 2])['collection']['collection_id']
+        with pytest.raises(ValueError):
+            store.insert(collection_id, [3, 4, 5, 6])
+        with pytest.raises(ValueError):
+            store.create([1])
+        time.sleep(0.1)
+        assert store.list_collections() == [] and store.stats()['expirations'] == 1
+        store.create([1])
+    
+    def test_total_elements_limit(self):
+        store = CollectionStore(max_size=5, max_elements=6)
+        first = store.create([1, 2, 3])['collection']['collection_id']
+        second = store.create([4, 5])['collection']['collection_id']
+        with pytest.raises(ValueError):
+            store.create([6, 7])
+        with pytest.raises(ValueError):
+            store.insert(second, [6, 7])
+        store.insert(second, [6])
+        assert store.stats()['elements'] == 6
+        store.remove(first, [1, 2])
+        store.insert(second, [7, 8])
+        assert store.delete(second)
+        assert store.stats()['elements'] == 1
+        store.create([1, 2, 3, 4, 5])
+    
+    def test_rejects_nan(self):
+        store = CollectionStore()
+        with pytest.raises(ValueError):
+            store.create([1.0, float('nan')])
+        collection_id = store.create([1.0])['collection']['collection_id']
+        with pytest.raises(ValueError):
+            store.insert(collection_id, [float('nan')])
+        assert store.stats()['elements'] == 1
+    
+    def test_snapshot_is_a_sorted_dataset(self):
+        manager = AlgorithmManager(dataset_store=DatasetStore(), history_store=HistoryStore(),
+                                   collection_store=CollectionStore())
+        dataset_id = manager.datasets.put([9, 4, 7])['dataset_id']
+        created = manager.create_collection(manager.datasets.get(dataset_id))
+        collection_id = created['collection']['collection_id']
+        manager.collections.insert(collection_id, [1, 8])
+        
+        snapshot = manager.snapshot_collection(collection_id)
+        assert snapshot['is_sorted'] == True and snapshot['source'] == f'collection:{collection_id}'
+        dataset = manager.datasets.get(snapshot['dataset_id'])
+        assert dataset == [1, 4, 7, 8, 9]
+        result = manager.execute_algorithm('binary_search', dataset, target=8)
+        assert result.result['index'] == 3 and result.metadata['sorted_check'] == 'cached'
+
 class TestDataGenerator:
     """Tests para DataGenerator"""
     
@@ -57,6 +535,7 @@ class TestDataGenerator:
         data = DataGenerator.generate_sorted(10)
         assert len(data) == 10
         assert data == sorted(data)
+        assert data.sortedness_known
     
     def test_generate_reverse_sorted(self):
         data = DataGenerator.generate_reverse_sorted(10)
@@ -79,3 +558,176 @@ class TestDataGenerator:
     def test_generate_custom_invalid_type(self):
         with pytest.raises(ValueError):
             DataGenerator.generate_custom('invalid', 10)
+    
+    def test_seed_reproduces_data_in_any_chunk_size(self):
+        for data_type in DATA_TYPES:
+            data = DataGenerator.generate_custom(data_type, 1500, seed=42)
+            assert len(data) == 1500
+            assert DataGenerator.generate_custom(data_type, 1500, seed=42) == data
+            chunks = list(DataGenerator.iter_chunks(data_type, 1500, chunk_size=400, seed=42))
+            assert [len(chunk) for chunk in chunks] == [400, 400, 400, 300]
+            assert [value for chunk in chunks for value in chunk] == data
+        assert DataGenerator.generate_random(100, seed=1) != DataGenerator.generate_random(100, seed=2)
+    
+    def test_sorted_data_is_built_without_sorting(self):
+        data = DataGenerator.generate_sorted(70000, 5, 50, seed=3)
+        assert data == sorted(data) and data[0] >= 5 and data[-1] <= 50
+        assert len(set(data)) == 46
+        reverse = DataGenerator.generate_reverse_sorted(1000, 0, 2 ** 62, seed=3)
+        assert reverse == sorted(reverse, reverse=True) and 0 <= reverse[-1] <= reverse[0] <= 2 ** 62
+    
+    def test_new_distributions(self):
+        duplicates = DataGenerator.generate_custom('many_duplicates', 1000, distinct=5, seed=1)
+        assert len(set(duplicates)) == 5
+        
+        sawtooth = DataGenerator.generate_custom('sawtooth', 100, min_val=0, max_val=99, teeth=4)
+        assert sawtooth[:25] == sorted(sawtooth[:25]) and sawtooth[25] == 0
+        
+        pipe = DataGenerator.generate_custom('organ_pipe', 101, min_val=0, max_val=100)
+        assert pipe == pipe[::-1] and pipe[:51] == sorted(pipe[:51])
+        
+        zipf = DataGenerator.generate_custom('zipf', 5000, min_val=1, max_val=100, seed=4)
+        counts = [zipf.count(value) for value in (1, 2, 10)]
+        assert counts[0] > counts[1] > counts[2] and all(1 <= x <= 100 for x in zipf)
+    
+    def test_invalid_parameters(self):
+        with pytest.raises(ValueError):
+            DataGenerator.generate_custom('random', 10, min_val=5, max_val=1)
+        with pytest.raises(ValueError):
+            DataGenerator.generate_custom('random', 10, typo=1)
+        with pytest.raises(ValueError):
+            DataGenerator.generate_custom('zipf', 10, exponent=0)
+    
+    def test_write_binary(self, tmp_path):
+        path = str(tmp_path / 'data.bin')
+        for data_type in ('random', 'sorted', 'reverse', 'nearly_sorted'):
+            info = DataGenerator.write_binary(path, data_type, 1000, 1, 100, seed=7, chunk_size=64)
+            with MappedDataset(path) as data:
+                values = list(data)
+            assert info['count'] == 1000 and all(1 <= x <= 100 for x in values)
+            assert info['is_sorted'] == (values == sorted(values))
+            if data_type == 'sorted':
+                assert info['is_sorted']
+            if data_type == 'reverse':
+                assert values == sorted(values, reverse=True)
+        with pytest.raises(ValueError):
+            DataGenerator.write_binary(path, 'strings', 10)
+        
+        DataGenerator.write_binary(path, 'zipf', 1000, seed=9, chunk_size=64)
+        with MappedDataset(path) as data:
+            assert list(data) == DataGenerator.generate_custom('zipf', 1000, seed=9)
+
+class TestBenchmark:
+    """Tests para el motor de benchmarks"""
+    
+    def test_percentile(self):
+        assert percentile([1, 2, 3, 4, 5], 50) == 3
+        assert percentile([1, 2, 3, 4, 5], 95) == pytest.approx(4.8)
+    
+    def test_bootstrap_ci_contains_median(self):
+        import random
+        samples = [1.0, 1.1, 0.9, 1.05, 0.95, 1.2, 1.0]
+        ci = bootstrap_ci(samples, resamples=200, rng=random.Random(1))
+        assert ci['low'] <= 1.0 <= ci['high']
+    
+    def test_benchmark_algorithm(self):
+        manager = AlgorithmManager()
+        runner = BenchmarkRunner(warmup=1, min_repeats=3, max_repeats=10, seed=42)
+        result = manager.benchmark_algorithm('merge_sort', [5, 3, 1, 4, 2], runner)
+        
+        assert 3 <= result['repeats'] <= 10
+        assert len(result['samples_ms']) == result['repeats']
+        stats = result['stats_ms']
+        assert stats['min'] <= stats['median'] <= stats['p95']
+        assert result['median_ci_ms']['low'] <= result['median_ci_ms']['high']
+    
+    def test_benchmark_stops_at_max_repeats(self):
+        runner = BenchmarkRunner(warmup=0, min_repeats=2, max_repeats=4, target_rel_error=1e-9)
+        result = AlgorithmManager().benchmark_algorithm('bubble_sort', [3, 2, 1], runner)
+        assert result['repeats'] == 4
+        assert result['converged'] is False
+    
+    def test_benchmark_time_limit_includes_warmup(self):
+        runner = BenchmarkRunner(warmup=3, min_repeats=5, max_repeats=10, max_time_s=1e-9)
+        result = AlgorithmManager().benchmark_algorithm('bubble_sort', [3, 2, 1], runner)
+        assert result['repeats'] == 1
+        assert result['converged'] is False
+    
+    def test_concurrent_benchmarks_restore_gc(self):
+        import gc
+        import threading
+        runner = BenchmarkRunner(warmup=0, min_repeats=3, max_repeats=20, target_rel_error=1e-9)
+        manager = AlgorithmManager()
+        threads = [threading.Thread(target=manager.benchmark_algorithm, args=('heap_sort', list(range(200)), runner))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert gc.isenabled()
+    
+    def test_benchmark_invalid_config(self):
+        with pytest.raises(ValueError):
+            BenchmarkRunner(min_repeats=5, max_repeats=2)
+        for options in ({'max_repeats': 10 ** 12}, {'max_time_s': 1e12}, {'max_time_s': 0}, {'warmup': 1000},
+                        {'target_rel_error': -1}, {'target_rel_error': 0}, {'bootstrap_resamples': 10 ** 9}):
+            with pytest.raises(ValueError):
+                BenchmarkRunner(**options)
+    
+    def test_benchmark_lock_timeout(self):
+        from app.services.benchmark import BenchmarkBusy, _MEASUREMENT_LOCK
+        runner = BenchmarkRunner(warmup=0, min_repeats=1, max_repeats=1, lock_timeout_s=0.01)
+        with _MEASUREMENT_LOCK:
+            with pytest.raises(BenchmarkBusy):
+                AlgorithmManager().benchmark_algorithms(['merge_sort'], [2, 1], runner)
+        assert AlgorithmManager().benchmark_algorithm('merge_sort', [2, 1], runner)['repeats'] == 1
+
+class TestScaling:
+    """Tests para el barrido de tamaños y el ajuste de complejidad"""
+    
+    def test_geometric_sizes(self):
+        sizes = geometric_sizes(100, 100000, 4)
+        assert sizes == [100, 1000, 10000, 100000]
+    
+    def test_fit_complexity_quadratic(self):
+        sizes = [100, 200, 400, 800]
+        fit = fit_complexity(sizes, [n * n * 0.5 for n in sizes])
+        assert fit['best_model'] == 'n^2'
+        assert fit['power_law']['exponent'] == pytest.approx(2.0)
+    
+    def test_fit_complexity_linear(self):
+        sizes = [10, 100, 1000]
+        fit = fit_complexity(sizes, [3 * n for n in sizes])
+        assert fit['best_model'] == 'n'
+        assert fit['models']['n']['r_squared'] == pytest.approx(1.0)
+    
+    def test_scaling_sweep_uses_arrays_for_fast_variants(self):
+        pytest.importorskip('numpy')
+        manager = AlgorithmManager()
+        runner = BenchmarkRunner(warmup=0, min_repeats=1, max_repeats=1)
+        sweep = manager.scaling_sweep(['radix_sort:fast', 'quick_sort:fast'], [1000, 200000], 'random', runner)
+        assert sweep['backend_input'] == 'numpy'
+        assert [p['size'] for p in sweep['results']['quick_sort:fast']['points']] == [1000, 200000]
+        assert manager.max_input_size(['quick_sort:fast']) == 10 ** 7
+        assert manager.max_input_size(['quick_sort']) == 100000
+    
+    def test_scaling_sweep(self):
+        manager = AlgorithmManager()
+        runner = BenchmarkRunner(warmup=0, min_repeats=1, max_repeats=2)
+        sweep = manager.scaling_sweep(['bubble_sort', 'merge_sort'], [20, 40, 80], 'reverse', runner)
+        
+        bubble = sweep['results']['bubble_sort']
+        assert [p['size'] for p in bubble['points']] == [20, 40, 80]
+        assert bubble['fit']['comparisons']['best_model'] == 'n^2'
+        assert sweep['results']['merge_sort']['fit']['comparisons']['best_model'] != 'n^2'
+    
+    def test_worker_scaling(self, monkeypatch):
+        monkeypatch.setenv('PARALLEL_MAX_WORKERS', '2')
+        manager = AlgorithmManager()
+        runner = BenchmarkRunner(warmup=0, min_repeats=1, max_repeats=1)
+        sweep = manager.worker_scaling('parallel_merge_sort', 10000, [2], 'random', runner, fast=True)
+        assert [p['workers'] for p in sweep['points']] == [1, 2]
+        assert sweep['points'][0]['speedup'] == 1.0
+        assert sweep['points'][1]['effective_workers'] == 2
+        with pytest.raises(ValueError):
+            manager.worker_scaling('parallel_merge_sort', 100, [0], 'random', runner)